@@ -0,0 +1,164 @@
+########################
+# Array Operands       #
+########################
+
+from dataclasses import dataclass, field
+import hashlib
+import os
+from pathlib import Path
+import re
+import tempfile
+from typing import Any, Optional, Tuple
+
+import numpy as np
+
+from app.calculator_config import CalculatorConfig
+from app.exceptions import OperationError
+
+# How a reference is written in the history, e.g.
+# array<float64[3x4]:0f1e2d3c4b5a69788796a5b4c3d2e1f0@/path/to/file.npy>
+REFERENCE_PATTERN = re.compile(
+    r'^array<(?P<dtype>\w+)\[(?P<shape>\d+(?:x\d+)*)\]:(?P<digest>[0-9a-f]{32})(?:@(?P<path>.+))?>$'
+)
+
+
+def is_array(value: Any) -> bool:
+    """
+    Check whether a value is a vector or matrix operand.
+
+    Zero-dimensional arrays, which the numpy backend uses for scalars, do not count.
+
+    Args:
+        value (Any): Value to check.
+
+    Returns:
+        bool: True for NumPy arrays with at least one dimension.
+    """
+    return isinstance(value, np.ndarray) and value.ndim > 0
+
+
+def content_hash(array: np.ndarray) -> str:
+    """
+    Hash an array's dtype, shape and elements.
+
+    Args:
+        array (np.ndarray): The array.
+
+    Returns:
+        str: 32 hex digits of its BLAKE2b digest.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{array.dtype.str}{array.shape}".encode())
+    digest.update(np.ascontiguousarray(array).data)
+    return digest.hexdigest()
+
+
+@dataclass(frozen=True)
+class ArrayRef:
+    """
+    Compact reference to an array operand or result, as kept in the history.
+
+    The array itself is only kept if it was spilled to a .npy file, named by
+    its content hash so equal arrays share one file.
+    """
+
+    shape: Tuple[int, ...]
+    dtype: str
+    digest: str
+    path: Optional[Path] = field(default=None, compare=False)
+
+    @classmethod
+    def of(cls, array: np.ndarray, spill_dir: Optional[Path] = None, spill_bytes: Optional[int] = None) -> 'ArrayRef':
+        """
+        Reference an array, spilling it to a file if it is large enough.
+
+        Args:
+            array (np.ndarray): The array.
+            spill_dir (Optional[Path], optional): Directory for spill files. Defaults to None.
+            spill_bytes (Optional[int], optional): Spill arrays of at least this
+                many bytes; None never spills. Defaults to None.
+
+        Returns:
+            ArrayRef: The reference.
+        """
+        digest = content_hash(array)
+        path = None
+        if spill_dir is not None and spill_bytes is not None and array.nbytes >= spill_bytes:
+            path = spill_dir / f"{digest}.npy"
+            if not path.exists():
+                spill_dir.mkdir(parents=True, exist_ok=True)
+                # Write aside and rename, so a reader never sees a partial file
+                fd, temp = tempfile.mkstemp(dir=spill_dir, suffix='.npy')
+                try:
+                    with os.fdopen(fd, 'wb') as handle:
+                        np.save(handle, array)
+                    os.replace(temp, path)
+                except BaseException:
+                    os.unlink(temp)
+                    raise
+        return cls(tuple(array.shape), array.dtype.name, digest, path)
+
+    @classmethod
+    def parse(cls, text: str) -> Optional['ArrayRef']:
+        """
+        Read a reference back from its history text.
+
+        Args:
+            text (str): Text written by str().
+
+        Returns:
+            Optional[ArrayRef]: The reference, or None if the text is not one.
+        """
+        match = REFERENCE_PATTERN.match(str(text))
+        if match is None:
+            return None
+        shape = tuple(int(n) for n in match['shape'].split('x'))
+        path = Path(match['path']) if match['path'] else None
+        return cls(shape, match['dtype'], match['digest'], path)
+
+    def load(self) -> np.ndarray:
+        """
+        Load a spilled array, memory-mapped read-only.
+
+        Returns:
+            np.ndarray: The array.
+
+        Raises:
+            OperationError: If it was not spilled, or its file is missing or changed.
+        """
+        if self.path is None:
+            raise OperationError(f"{self} was not spilled to a file")
+        try:
+            array = np.load(self.path, mmap_mode='r')
+        except (OSError, ValueError) as e:
+            raise OperationError(f"Cannot load {self}: {e}")
+        if content_hash(array) != self.digest:
+            raise OperationError(f"{self.path} does not match its content hash")
+        return array
+
+    def __str__(self) -> str:
+        """
+        Return the reference as written in the history.
+
+        Returns:
+            str: e.g. array<float64[3x4]:digest> or array<float64[3x4]:digest@path>.
+        """
+        shape = 'x'.join(str(n) for n in self.shape)
+        location = f"@{self.path}" if self.path else ''
+        return f"array<{self.dtype}[{shape}]:{self.digest}{location}>"
+
+
+def reference(value: Any, config: CalculatorConfig) -> Any:
+    """
+    Replace an array operand or result with a reference for the history.
+
+    Args:
+        value (Any): An operand or result.
+        config (CalculatorConfig): Configuration naming the spill directory and threshold.
+
+    Returns:
+        Any: An ArrayRef for arrays; any other value unchanged.
+    """
+    if not is_array(value):
+        return value
+    return ArrayRef.of(value, config.array_dir, config.array_spill_bytes)
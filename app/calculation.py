@@ -2,13 +2,56 @@
 # Calculation Model    #
 ########################
 
-from dataclasses import dataclass, field
+from contextlib import nullcontext
+from dataclasses import InitVar, dataclass, field
 import datetime
-from decimal import Decimal, InvalidOperation
+from decimal import Context, Decimal, InvalidOperation
+from functools import lru_cache
 import logging
-from typing import Any, Dict
+from typing import Any, Callable, Dict, Optional
 
+from app import decimal_math
+from app.array_operands import ArrayRef
 from app.exceptions import OperationError
+from app.number_theory import integer_kernel
+from app.operations import (
+    divide, exact_power, promote, to_decimal, truncated_divide, truncated_modulus
+)
+from app.plugins import plugin_kernel
+
+
+@lru_cache(maxsize=None)
+def _quantum(precision: int) -> Decimal:
+    """
+    Get the quantization exponent for a number of decimal places.
+
+    Cached so repeated formatting does not rebuild the same Decimal.
+
+    Args:
+        precision (int): Number of decimal places.
+
+    Returns:
+        Decimal: A zero with exponent -precision (e.g., 0.000 for 3).
+    """
+    return Decimal((0, (0,), -precision))
+
+
+def round_places(value: Decimal, places: int) -> Decimal:
+    """
+    Round a result to a number of decimal places for display.
+
+    The rounding context holds every integer digit plus room for a carry,
+    so large results keep them all. Trailing zeros are stripped afterwards.
+
+    Args:
+        value (Decimal): Finite result to round.
+        places (int): Number of decimal places.
+
+    Returns:
+        Decimal: The rounded, normalized value.
+    """
+    context = Context(prec=max(value.adjusted(), 0) + places + 2)
+    return value.quantize(_quantum(places), context=context).normalize(context)
 
 
 @dataclass
@@ -30,6 +73,7 @@ class Calculation:
     # Fields with default values
     result: Decimal = field(init=False)  # The result of the calculation, computed post-initialization
     timestamp: datetime.datetime = field(default_factory=datetime.datetime.now)  # Time when the calculation was performed
+    backend: Optional[Any] = field(default=None, compare=False, repr=False)  # Non-native numeric backend, if any
 
     def __post_init__(self):
         """
@@ -54,36 +98,76 @@ class Calculation:
         Raises:
             OperationError: If the operation is unknown or the calculation fails.
         """
-        # Mapping of operation names to their corresponding functions
+        # Mapping of operation names to their corresponding functions. Operands
+        # arrive promoted to a common type on the numeric tower, so integral
+        # values are computed exactly with Python ints
         operations = {
             "Addition": lambda x, y: x + y,
             "Subtraction": lambda x, y: x - y,
             "Multiplication": lambda x, y: x * y,
-            "Division": lambda x, y: x / y if y != 0 else self._raise_div_zero(),
-            "Power": lambda x, y: Decimal(pow(float(x), float(y))) if y >= 0 else self._raise_neg_power(),
+            "Division": lambda x, y: divide(x, y) if y != 0 else self._raise_div_zero(),
+            "Power": lambda x, y: exact_power(x, y) if y >= 0 else self._raise_neg_power(),
             "Root": lambda x, y: (
-                Decimal(pow(float(x), 1 / float(y))) 
-                if x >= 0 and y != 0 
+                decimal_math.root(to_decimal(x), to_decimal(y))
+                if x >= 0 and y != 0
                 else self._raise_invalid_root(x, y)
             ),
-            "IntegerDivision": lambda x, y: x // y if y != 0 else self._raise_div_zero(),
-            "Modulus": lambda x, y: x % y if y != 0 else self._raise_div_zero(),
+            "IntegerDivision": lambda x, y: truncated_divide(x, y) if y != 0 else self._raise_div_zero(),
+            "Modulus": lambda x, y: truncated_modulus(x, y) if y != 0 else self._raise_div_zero(),
             "AbsoluteDifference": lambda x, y: abs(x - y),
-            "Percent": lambda x, y: (x * y) / Decimal("100")
+            "Percent": lambda x, y: divide(x * 100, y) if y != 0 else self._raise_div_zero()
         }
 
+        native = self.backend is None or self.backend.native
+        if not native:
+            # Non-native backends compute every operation with their own kernels
+            operations = self._backend_operations()
+
         # Retrieve the operation function based on the operation name
         op = operations.get(self.operation)
+        if not op:
+            # Number theory operations compute with ints, whatever the backend
+            op, native = integer_kernel(self.operation), True
+        if not op:
+            # Plugin operations take the operands as their execute does
+            op, native = plugin_kernel(self.operation, self.backend), False
         if not op:
             raise OperationError(f"Unknown operation: {self.operation}")
 
         try:
-            # Execute the operation with the provided operands
-            return op(self.operand1, self.operand2)
+            if not native:
+                # Recomputing does not count towards the backend's statistics
+                with self.backend.uncounted() if self.backend else nullcontext():
+                    return op(self.operand1, self.operand2)
+            # Execute the operation with the provided operands and convert the
+            # result back to Decimal for storage
+            x, y = promote(self.operand1, self.operand2)
+            return to_decimal(op(x, y))
         except (InvalidOperation, ValueError, ArithmeticError, TypeError) as e:
             # Handle any errors that occur during calculation
             raise OperationError(f"Calculation failed: {str(e)}")
 
+    def _backend_operations(self) -> Dict[str, Callable[[Any, Any], Any]]:
+        """
+        Map operation names to the kernels of the calculation's backend.
+
+        Returns:
+            Dict[str, Callable[[Any, Any], Any]]: Operation name to backend kernel.
+        """
+        backend = self.backend
+        return {
+            "Addition": backend.add,
+            "Subtraction": backend.subtract,
+            "Multiplication": backend.multiply,
+            "Division": backend.divide,
+            "Power": backend.power,
+            "Root": backend.root,
+            "IntegerDivision": backend.int_divide,
+            "Modulus": backend.modulus,
+            "AbsoluteDifference": backend.abs_diff,
+            "Percent": backend.percent
+        }
+
     @staticmethod
     def _raise_div_zero():  # pragma: no cover
         """
@@ -139,7 +223,7 @@ class Calculation:
         }
 
     @staticmethod
-    def from_dict(data: Dict[str, Any]) -> 'Calculation':
+    def from_dict(data: Dict[str, Any], backend: Optional[Any] = None) -> 'Calculation':
         """
         Create calculation from dictionary.
 
@@ -148,6 +232,8 @@ class Calculation:
 
         Args:
             data (Dict[str, Any]): Dictionary containing calculation data.
+            backend (Optional[NumericBackend], optional): Non-native backend to
+                convert operands and recompute with. Defaults to None (Decimal).
 
         Returns:
             Calculation: A new instance of Calculation with data populated from the dictionary.
@@ -156,7 +242,39 @@ class Calculation:
             OperationError: If data is invalid or missing required fields.
         """
         try:
+            if data['operation'] in REDUCTION_OPERATIONS:
+                return Reduction(
+                    operation=data['operation'],
+                    operand1=Decimal(data['operand1']),
+                    operand2=Decimal(data['operand2']),
+                    timestamp=datetime.datetime.fromisoformat(data['timestamp']),
+                    value=Decimal(data['result'])
+                )
+
+            references = [ArrayRef.parse(data[key]) for key in ('operand1', 'operand2', 'result')]
+            if any(references):
+                operand1, operand2, result = (
+                    reference or Decimal(data[key])
+                    for reference, key in zip(references, ('operand1', 'operand2', 'result'))
+                )
+                return ArrayCalculation(
+                    operation=data['operation'],
+                    operand1=operand1,
+                    operand2=operand2,
+                    timestamp=datetime.datetime.fromisoformat(data['timestamp']),
+                    value=result
+                )
+
             # Create the calculation object with the original operands
+            if backend is not None and not backend.native:
+                return Calculation(
+                    operation=data['operation'],
+                    operand1=backend.convert(data['operand1']),
+                    operand2=backend.convert(data['operand2']),
+                    timestamp=datetime.datetime.fromisoformat(data['timestamp']),
+                    backend=backend
+                )
+
             calc = Calculation(
                 operation=data['operation'],
                 operand1=Decimal(data['operand1']),
@@ -245,9 +363,71 @@ class Calculation:
             str: Formatted string representation of the result.
         """
         try:
+            # Backends such as float give non-Decimal results; convert them
+            # by their shortest repr so they round like the displayed value
+            result = self.result if type(self.result) is Decimal else Decimal(str(self.result))
             # Remove trailing zeros and format to specified precision
-            return str(self.result.normalize().quantize(
-                Decimal('0.' + '0' * precision)
-            ).normalize())
+            return str(result.normalize().quantize(_quantum(precision)).normalize())
         except InvalidOperation:  # pragma: no cover
             return str(self.result)
+
+
+# History names of the n-ary reductions in app.reductions and the prefix
+# scans in app.scans, whose entries record only the final element
+REDUCTION_OPERATIONS = (
+    'Sum', 'Product', 'Minimum', 'Maximum', 'Mean', 'Variance', 'PopulationVariance',
+    'RunningSum', 'RunningProduct', 'RunningMax', 'RunningMin', 'CompoundedPercent'
+)
+
+
+@dataclass(eq=False)
+class Reduction(Calculation):
+    """
+    A reduction or scan over many values, recorded as a single history entry.
+
+    operand1 holds the number of values reduced and operand2 is zero; for a
+    scan the result is its last element. The result cannot be recomputed
+    from those, so it is stored as given.
+    """
+
+    value: InitVar[Decimal] = Decimal(0)  # The reduced result
+
+    def __post_init__(self, value: Decimal):
+        """
+        Store the given result instead of computing one.
+
+        Args:
+            value (Decimal): The result of the reduction.
+        """
+        self.result = value
+
+    def __str__(self) -> str:
+        """
+        Return string representation of the reduction.
+
+        Returns:
+            str: Formatted string showing the reduction and result.
+        """
+        return f"{self.operation} of {self.operand1} values = {self.result}"
+
+
+@dataclass(eq=False)
+class ArrayCalculation(Calculation):
+    """
+    A calculation with vector or matrix operands, recorded by reference.
+
+    Array operands and results are held as ArrayRefs (shape, dtype, content
+    hash and an optional spill file) instead of the arrays themselves, so the
+    history stays small and prints compactly. The result is stored as given.
+    """
+
+    value: InitVar[Any] = None  # The result, an ArrayRef or a scalar
+
+    def __post_init__(self, value: Any):
+        """
+        Store the given result instead of computing one.
+
+        Args:
+            value (Any): The result of the calculation.
+        """
+        self.result = value
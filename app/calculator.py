@@ -2,27 +2,98 @@
 # Calculator Class      #
 ########################
 
-from decimal import Decimal
+from contextlib import nullcontext
+import copy
+from decimal import Context, Decimal, localcontext
 import logging
 import os
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+import threading
+from typing import Any, Iterable, Iterator, List, Optional, Tuple, Union
 
+import numpy as np
 import pandas as pd
 
-from app.calculation import Calculation
+from app.array_operands import is_array, reference
+from app.calculation import ArrayCalculation, Calculation, Reduction
+from app.cancellable import shared_worker
 from app.calculator_config import CalculatorConfig
 from app.calculator_memento import CalculatorMemento
+from app.cost_model import INLINE_SECONDS, check_budget
 from app.exceptions import OperationError, ValidationError
 from app.history import HistoryObserver
 from app.input_validators import InputValidator
-from app.operations import Operation
+from app.numeric_backends import NumericBackend, get_backend
+from app.operations import Operation, OperationFactory
+from app.plugins import install_plugins
+from app.reductions import DEFAULT_CHUNK_SIZE, EXACT_CONTEXT, get_reducer, reduce_values
+from app.result_store import install_result_store
+from app.scans import Scan, get_scan, scan as scan_values
+from app.shared_cache import install_shared_cache
 
 # Type aliases for better readability
 Number = Union[int, float, Decimal]
 CalculationResult = Union[Number, str]
 
 
+def execute_calculation(
+    operation: Operation,
+    a: Any,
+    b: Any,
+    context: Context,
+    backend: Optional[NumericBackend]
+) -> Tuple[Any, Calculation]:
+    """
+    Execute an operation and build its history entry, in any process.
+
+    Args:
+        operation (Operation): Operation to execute.
+        a (Any): Validated first operand.
+        b (Any): Validated second operand.
+        context (Context): Decimal context to compute in.
+        backend (Optional[NumericBackend]): Non-native backend of the calculator, if any.
+
+    Returns:
+        Tuple[Any, Calculation]: The result and the calculation to record.
+    """
+    with localcontext(context):
+        # Execute the operation strategy at the configured precision
+        result = operation.execute(a, b)
+
+        # Create a new Calculation instance with the operation details
+        calculation = Calculation(operation=str(operation), operand1=a, operand2=b, backend=backend)
+    return result, calculation
+
+
+def setup_logging(config: CalculatorConfig) -> None:
+    """
+    Configure the logging system for a configuration.
+
+    Sets up logging to the configured log file with a fixed format and log
+    level, replacing any existing logging configuration.
+
+    Args:
+        config (CalculatorConfig): Configuration naming the log directory and file.
+    """
+    try:
+        # Ensure the log directory exists
+        os.makedirs(config.log_dir, exist_ok=True)
+        log_file = config.log_file.resolve()
+
+        # Configure the basic logging settings
+        logging.basicConfig(
+            filename=str(log_file),
+            level=logging.INFO,
+            format='%(asctime)s - %(levelname)s - %(message)s',
+            force=True  # Overwrite any existing logging configuration
+        )
+        logging.info(f"Logging initialized at: {log_file}")
+    except Exception as e:
+        # Print an error message and re-raise the exception if logging setup fails
+        print(f"Error setting up logging: {e}")
+        raise
+
+
 class Calculator:
     """
     Main calculator class implementing multiple design patterns.
@@ -33,13 +104,16 @@ class Calculator:
     scalability.
     """
 
-    def __init__(self, config: Optional[CalculatorConfig] = None):
+    def __init__(self, config: Optional[CalculatorConfig] = None, lightweight: bool = False):
         """
         Initialize calculator with configuration.
 
         Args:
             config (Optional[CalculatorConfig], optional): Configuration settings for the calculator.
                 If not provided, default settings are loaded based on environment variables.
+            lightweight (bool, optional): Skip configuration validation, logging and
+                directory setup, and history loading, because an owner such as
+                CalculatorManager has already done them once. Defaults to False.
         """
         if config is None:
             # Determine the project root directory if no configuration is provided
@@ -49,13 +123,28 @@ class Calculator:
 
         # Assign the configuration and validate its parameters
         self.config = config
-        self.config.validate()
+        if not lightweight:
+            self.config.validate()
+
+        # Decimal context applied locally to every calculation
+        self.decimal_context = self.config.create_decimal_context()
 
-        # Ensure that the log directory exists
-        os.makedirs(self.config.log_dir, exist_ok=True)
+        # Numeric backend selected by the configuration
+        self.backend = get_backend(self.config.backend)
+
+        if not lightweight:
+            # Ensure that the log directory exists
+            os.makedirs(self.config.log_dir, exist_ok=True)
 
-        # Set up the logging system
-        self._setup_logging()
+            # Set up the logging system
+            self._setup_logging()
+
+            # Share power and root results with other processes and across restarts, if configured
+            install_shared_cache(self.config)
+            install_result_store(self.config)
+
+            # Make operation plugins available by name, if configured
+            install_plugins(self.config)
 
         # Initialize calculation history and operation strategy
         self.history: List[Calculation] = []
@@ -68,6 +157,19 @@ class Calculator:
         self.undo_stack: List[CalculatorMemento] = []
         self.redo_stack: List[CalculatorMemento] = []
 
+        # Most undo states kept, dropping the oldest; None keeps them all
+        self.max_undo_depth: Optional[int] = None
+
+        # Guards history and the undo/redo stacks, which change together.
+        # Calculations themselves run outside it
+        self._lock = threading.RLock()
+
+        # Serializes writes to the history file
+        self._save_lock = threading.Lock()
+
+        if lightweight:
+            return
+
         # Create required directories for history management
         self._setup_directories()
 
@@ -87,23 +189,7 @@ class Calculator:
 
         Sets up logging to a file with a specified format and log level.
         """
-        try:
-            # Ensure the log directory exists
-            os.makedirs(self.config.log_dir, exist_ok=True)
-            log_file = self.config.log_file.resolve()
-
-            # Configure the basic logging settings
-            logging.basicConfig(
-                filename=str(log_file),
-                level=logging.INFO,
-                format='%(asctime)s - %(levelname)s - %(message)s',
-                force=True  # Overwrite any existing logging configuration
-            )
-            logging.info(f"Logging initialized at: {log_file}")
-        except Exception as e:
-            # Print an error message and re-raise the exception if logging setup fails
-            print(f"Error setting up logging: {e}")
-            raise
+        setup_logging(self.config)
 
     def _setup_directories(self) -> None:
         """
@@ -159,9 +245,16 @@ class Calculator:
         This is part of the Strategy pattern, allowing the calculator to switch between
         different operation algorithms dynamically.
 
+        When a non-native numeric backend is configured, it is bound to a copy
+        of the operation so its kernels compute the result; the operation
+        itself may be shared (see OperationFactory) and is left unchanged.
+
         Args:
             operation (Operation): The operation strategy to be set.
         """
+        if not self.backend.native and operation.backend is not self.backend:
+            operation = copy.copy(operation)
+            operation.backend = self.backend
         self.operation_strategy = operation
         logging.info(f"Set operation: {operation}")
 
@@ -176,6 +269,9 @@ class Calculator:
         Validates and sanitizes user inputs, executes the calculation using the
         current operation strategy, updates the history, and notifies observers.
 
+        The strategy set by set_operation is shared by every caller, so
+        concurrent threads should use calculate() instead.
+
         Args:
             a (Union[str, Number]): The first operand, can be a string or a numeric type.
             b (Union[str, Number]): The second operand, can be a string or a numeric type.
@@ -187,26 +283,228 @@ class Calculator:
             OperationError: If no operation is set or if the operation fails.
             ValidationError: If input validation fails.
         """
-        if not self.operation_strategy:
+        operation = self.operation_strategy
+        if not operation:
             raise OperationError("No operation set")
+        return self._run(operation, a, b)
+
+    def calculate(
+        self,
+        operation: Union[str, int, Operation],
+        a: Union[str, Number],
+        b: Union[str, Number]
+    ) -> CalculationResult:
+        """
+        Perform a calculation without touching the current operation strategy.
+
+        Safe to call from many threads on one Calculator: validation and the
+        arithmetic run without holding a lock, and only recording the result
+        in the history and undo stack is serialized.
+
+        Args:
+            operation (Union[str, int, Operation]): Operation name (e.g. 'add'),
+                op code or instance.
+            a (Union[str, Number]): The first operand.
+            b (Union[str, Number]): The second operand.
+
+        Returns:
+            CalculationResult: The result of the calculation.
+
+        Raises:
+            ValueError: If the operation name or op code is unknown.
+            OperationError: If the operation fails.
+            ValidationError: If input validation fails.
+        """
+        if not isinstance(operation, Operation):
+            operation = self._operation(operation)
+        return self._run(operation, a, b)
+
+    def _operation(self, name: Union[str, int]) -> Operation:
+        """
+        Get the shared operation instance for a name or op code.
 
+        Args:
+            name (Union[str, int]): Operation name or op code.
+
+        Returns:
+            Operation: The operation, bound to a non-native backend if configured.
+
+        Raises:
+            ValueError: If the operation name or op code is unknown.
+        """
+        backend = None if self.backend.native else self.backend
+        return OperationFactory.create_operation(name, backend=backend)
+
+    def _run(self, operation: Operation, a: Union[str, Number], b: Union[str, Number]) -> CalculationResult:
+        """
+        Validate, execute and record one calculation.
+
+        Args:
+            operation (Operation): Operation to execute.
+            a (Union[str, Number]): The first operand.
+            b (Union[str, Number]): The second operand.
+
+        Returns:
+            CalculationResult: The result of the calculation.
+
+        Raises:
+            OperationError: If the operation fails.
+            ValidationError: If input validation fails.
+        """
         try:
-            # Validate and convert inputs to Decimal
-            validated_a = InputValidator.validate_number(a, self.config)
-            validated_b = InputValidator.validate_number(b, self.config)
-
-            # Execute the operation strategy
-            result = self.operation_strategy.execute(validated_a, validated_b)
-
-            # Create a new Calculation instance with the operation details
-            calculation = Calculation(
-                operation=str(self.operation_strategy),
-                operand1=validated_a,
-                operand2=validated_b
+            # Validate and convert inputs to the backend's number type. Integer
+            # operations take operands of any size, so those are not rounded
+            with localcontext(EXACT_CONTEXT) if operation.integral else nullcontext():
+                validated_a = InputValidator.validate_number(a, self.config)
+                validated_b = InputValidator.validate_number(b, self.config)
+
+            # Reject calculations that would take too long, and move slow
+            # ones off this thread when a deadline is configured
+            seconds = check_budget(
+                str(operation), validated_a, validated_b, self.decimal_context.prec, self.config.cost_budget
             )
+            backend = None if self.backend.native else self.backend
+
+            if is_array(validated_a) or is_array(validated_b):
+                with localcontext(self.decimal_context):
+                    result = operation.execute(validated_a, validated_b)
+                    # Record vectors and matrices by reference, not by value
+                    calculation = ArrayCalculation(
+                        operation=str(operation),
+                        operand1=reference(validated_a, self.config),
+                        operand2=reference(validated_b, self.config),
+                        value=reference(result, self.config)
+                    )
+            elif self.config.deadline is not None and seconds > INLINE_SECONDS:
+                result, calculation = shared_worker().call(
+                    execute_calculation,
+                    (operation, validated_a, validated_b, self.decimal_context, backend),
+                    self.config.deadline
+                )
+            else:
+                result, calculation = execute_calculation(
+                    operation, validated_a, validated_b, self.decimal_context, backend
+                )
+
+            self._record(calculation)
+            return result
+
+        except ValidationError as e:
+            # Log and re-raise validation errors
+            logging.error(f"Validation error: {str(e)}")
+            raise
+        except Exception as e:
+            # Log and raise operation errors for any other exceptions
+            logging.error(f"Operation failed: {str(e)}")
+            raise OperationError(f"Operation failed: {str(e)}")
+
+    def reduce(
+        self,
+        name: str,
+        values: Iterable[Union[str, Number]],
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        workers: int = 0
+    ) -> Decimal:
+        """
+        Reduce a stream of values with one n-ary operation.
+
+        The whole reduction is recorded as a single history entry, however
+        many values it consumed. See app.reductions for the reductions and
+        how chunks are validated, reduced and merged.
+
+        Args:
+            name (str): 'sum', 'product', 'min', 'max', 'mean', 'variance' or 'pvariance'.
+            values (Iterable[Union[str, Number]]): Values to reduce; any iterator works.
+            chunk_size (int, optional): Values per chunk. Defaults to DEFAULT_CHUNK_SIZE.
+            workers (int, optional): Worker processes, 0 to reduce in this process. Defaults to 0.
+
+        Returns:
+            Decimal: The result, at the configured precision.
+
+        Raises:
+            ValueError: If the reduction name is unknown.
+            OperationError: If the result is undefined.
+            ValidationError: If a value is invalid.
+        """
+        reducer = get_reducer(name)
+        try:
+            reduction = reduce_values(name, values, self.config, chunk_size, workers)
+        except (ValidationError, OperationError) as e:
+            logging.error(f"Reduction failed: {str(e)}")
+            raise
+        self._record(Reduction(
+            operation=reducer.name,
+            operand1=Decimal(reduction.count),
+            operand2=Decimal(0),
+            value=reduction.value
+        ))
+        return reduction.value
+
+    def scan(self, name: str, values: Iterable[Union[str, Number]]) -> Union[Iterator[Decimal], np.ndarray]:
+        """
+        Compute a prefix scan, one result per value.
+
+        The float and numpy backends return the whole scan as an array; the
+        decimal backend returns a lazy iterator. Either way the scan is
+        recorded as a single history entry holding the last result: at once
+        for an array, and once the iterator is exhausted otherwise. See
+        app.scans for the scans.
+
+        Args:
+            name (str): 'cumsum', 'cumprod', 'cummax', 'cummin' or 'compound'.
+            values (Iterable[Union[str, Number]]): Values to scan; any iterator works.
 
+        Returns:
+            Union[Iterator[Decimal], np.ndarray]: The result for each value.
+
+        Raises:
+            ValueError: If the scan name is unknown.
+            OperationError: If a result overflows.
+            ValidationError: If a value is invalid.
+        """
+        scan = get_scan(name)
+        try:
+            results = scan_values(name, values, self.config)
+        except (ValidationError, OperationError) as e:
+            logging.error(f"Scan failed: {str(e)}")
+            raise
+        if isinstance(results, np.ndarray):
+            if len(results):
+                self._record_scan(scan, len(results), float(results[-1]))
+            return results
+        return self._recording_scan(scan, results)
+
+    def _recording_scan(self, scan: Scan, results: Iterator[Decimal]) -> Iterator[Decimal]:
+        """Pass a lazy scan through, recording it once it is exhausted."""
+        count = 0
+        try:
+            for count, last in enumerate(results, 1):
+                yield last
+        except (ValidationError, OperationError) as e:
+            logging.error(f"Scan failed: {str(e)}")
+            raise
+        if count:
+            self._record_scan(scan, count, last)
+
+    def _record_scan(self, scan: Scan, count: int, last: Number) -> None:
+        """Record a scan as one history entry."""
+        if type(last) is not Decimal:
+            # Float results are stored as the Decimal the saved history reloads
+            last = Decimal(repr(float(last)))
+        self._record(Reduction(operation=scan.name, operand1=Decimal(count), operand2=Decimal(0), value=last))
+
+    def _record(self, calculation: Calculation) -> None:
+        """
+        Append a calculation to the history and notify the observers.
+
+        Args:
+            calculation (Calculation): The calculation to record.
+        """
+        with self._lock:
             # Save the current state to the undo stack before making changes
             self.undo_stack.append(CalculatorMemento(self.history.copy()))
+            if self.max_undo_depth is not None and len(self.undo_stack) > self.max_undo_depth:
+                del self.undo_stack[0]
 
             # Clear the redo stack since new operation invalidates the redo history
             self.redo_stack.clear()
@@ -218,19 +516,18 @@ class Calculator:
             if len(self.history) > self.config.max_history_size:
                 self.history.pop(0)
 
-            # Notify all observers about the new calculation
-            self.notify_observers(calculation)
+        # Notify all observers about the new calculation
+        self.notify_observers(calculation)
 
-            return result
+    def snapshot(self) -> Tuple[Calculation, ...]:
+        """
+        Get a consistent copy of the history.
 
-        except ValidationError as e:
-            # Log and re-raise validation errors
-            logging.error(f"Validation error: {str(e)}")
-            raise
-        except Exception as e:
-            # Log and raise operation errors for any other exceptions
-            logging.error(f"Operation failed: {str(e)}")
-            raise OperationError(f"Operation failed: {str(e)}")
+        Returns:
+            Tuple[Calculation, ...]: The history as it was at a single point in time.
+        """
+        with self._lock:
+            return tuple(self.history)
 
     def save_history(self) -> None:
         """
@@ -247,7 +544,7 @@ class Calculator:
             self.config.history_dir.mkdir(parents=True, exist_ok=True)
 
             history_data = []
-            for calc in self.history:
+            for calc in self.snapshot():
                 # Serialize each Calculation instance to a dictionary
                 history_data.append({
                     'operation': str(calc.operation),
@@ -257,17 +554,18 @@ class Calculator:
                     'timestamp': calc.timestamp.isoformat()
                 })
 
-            if history_data:
-                # Create a pandas DataFrame from the history data
-                df = pd.DataFrame(history_data)
-                # Write the DataFrame to a CSV file without the index
-                df.to_csv(self.config.history_file, index=False)
-                logging.info(f"History saved successfully to {self.config.history_file}")
-            else:
-                # If history is empty, create an empty CSV with headers
-                pd.DataFrame(columns=['operation', 'operand1', 'operand2', 'result', 'timestamp']
-                           ).to_csv(self.config.history_file, index=False)
-                logging.info("Empty history saved")
+            with self._save_lock:
+                if history_data:
+                    # Create a pandas DataFrame from the history data
+                    df = pd.DataFrame(history_data)
+                    # Write the DataFrame to a CSV file without the index
+                    df.to_csv(self.config.history_file, index=False)
+                    logging.info(f"History saved successfully to {self.config.history_file}")
+                else:
+                    # If history is empty, create an empty CSV with headers
+                    pd.DataFrame(columns=['operation', 'operand1', 'operand2', 'result', 'timestamp']
+                               ).to_csv(self.config.history_file, index=False)
+                    logging.info("Empty history saved")
 
         except Exception as e:
             # Log and raise an OperationError if saving fails
@@ -286,20 +584,25 @@ class Calculator:
         """
         try:
             if self.config.history_file.exists():
-                # Read the CSV file into a pandas DataFrame
-                df = pd.read_csv(self.config.history_file)
+                # Read the CSV file into a pandas DataFrame, as text so numbers
+                # keep every digit instead of being parsed as floats
+                df = pd.read_csv(self.config.history_file, dtype=str)
                 if not df.empty:
-                    # Deserialize each row into a Calculation instance
-                    self.history = [
-                        Calculation.from_dict({
-                            'operation': row['operation'],
-                            'operand1': row['operand1'],
-                            'operand2': row['operand2'],
-                            'result': row['result'],
-                            'timestamp': row['timestamp']
-                        })
-                        for _, row in df.iterrows()
-                    ]
+                    # Deserialize each row into a Calculation instance, recomputing
+                    # results at the configured precision
+                    with localcontext(self.decimal_context):
+                        history = [
+                            Calculation.from_dict({
+                                'operation': row['operation'],
+                                'operand1': row['operand1'],
+                                'operand2': row['operand2'],
+                                'result': row['result'],
+                                'timestamp': row['timestamp']
+                            }, backend=None if self.backend.native else self.backend)
+                            for _, row in df.iterrows()
+                        ]
+                    with self._lock:
+                        self.history = history
                     logging.info(f"Loaded {len(self.history)} calculations from history")
                 else:
                     logging.info("Loaded empty history file")
@@ -322,7 +625,7 @@ class Calculator:
             pd.DataFrame: DataFrame containing the calculation history.
         """
         history_data = []
-        for calc in self.history:
+        for calc in self.snapshot():
             history_data.append({
                 'operation': str(calc.operation),
                 'operand1': str(calc.operand1),
@@ -343,7 +646,7 @@ class Calculator:
         """
         return [
             f"{calc.operation}({calc.operand1}, {calc.operand2}) = {calc.result}"
-            for calc in self.history
+            for calc in self.snapshot()
         ]
 
     def clear_history(self) -> None:
@@ -352,9 +655,10 @@ class Calculator:
 
         Empties the calculation history and clears the undo and redo stacks.
         """
-        self.history.clear()
-        self.undo_stack.clear()
-        self.redo_stack.clear()
+        with self._lock:
+            self.history.clear()
+            self.undo_stack.clear()
+            self.redo_stack.clear()
         logging.info("History cleared")
 
     def undo(self) -> bool:
@@ -367,15 +671,16 @@ class Calculator:
         Returns:
             bool: True if an operation was undone, False if there was nothing to undo.
         """
-        if not self.undo_stack:
-            return False
-        # Pop the last state from the undo stack
-        memento = self.undo_stack.pop()
-        # Push the current state onto the redo stack
-        self.redo_stack.append(CalculatorMemento(self.history.copy()))
-        # Restore the history from the memento
-        self.history = memento.history.copy()
-        return True
+        with self._lock:
+            if not self.undo_stack:
+                return False
+            # Pop the last state from the undo stack
+            memento = self.undo_stack.pop()
+            # Push the current state onto the redo stack
+            self.redo_stack.append(CalculatorMemento(self.history.copy()))
+            # Restore the history from the memento
+            self.history = memento.history.copy()
+            return True
 
     def redo(self) -> bool:
         """
@@ -386,12 +691,13 @@ class Calculator:
         Returns:
             bool: True if an operation was redone, False if there was nothing to redo.
         """
-        if not self.redo_stack:
-            return False
-        # Pop the last state from the redo stack
-        memento = self.redo_stack.pop()
-        # Push the current state onto the undo stack
-        self.undo_stack.append(CalculatorMemento(self.history.copy()))
-        # Restore the history from the memento
-        self.history = memento.history.copy()
-        return True
+        with self._lock:
+            if not self.redo_stack:
+                return False
+            # Pop the last state from the redo stack
+            memento = self.redo_stack.pop()
+            # Push the current state onto the undo stack
+            self.undo_stack.append(CalculatorMemento(self.history.copy()))
+            # Restore the history from the memento
+            self.history = memento.history.copy()
+            return True
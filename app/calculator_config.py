@@ -3,7 +3,7 @@
 ########################
 
 from dataclasses import dataclass
-from decimal import Decimal
+from decimal import Context, Decimal
 from numbers import Number
 from pathlib import Path
 import os
@@ -11,11 +11,18 @@ from typing import Optional
 
 from dotenv import load_dotenv
 
+from app.cost_model import DEFAULT_COST_BUDGET
 from app.exceptions import ConfigurationError
 
 # Load environment variables from a .env file into the program's environment
 load_dotenv()
 
+# Precision cap applied in fast mode; roughly what a binary64 float can hold
+FAST_MODE_PRECISION = 16
+
+# Names accepted for the numeric backend setting
+NUMERIC_BACKENDS = ('decimal', 'float', 'numpy', 'hybrid')
+
 
 def get_project_root() -> Path:
     """
@@ -53,7 +60,16 @@ class CalculatorConfig:
         auto_save: Optional[bool] = None,
         precision: Optional[int] = None,
         max_input_value: Optional[Number] = None,
-        default_encoding: Optional[str] = None
+        default_encoding: Optional[str] = None,
+        fast_mode: Optional[bool] = None,
+        backend: Optional[str] = None,
+        shared_cache: Optional[Path] = None,
+        result_store: Optional[Path] = None,
+        array_spill_bytes: Optional[int] = None,
+        cost_budget: Optional[float] = None,
+        deadline: Optional[float] = None,
+        plugins: Optional[bool] = None,
+        significant_digits: Optional[int] = None
     ):
         """
         Initialize configuration with environment variables and defaults.
@@ -62,9 +78,22 @@ class CalculatorConfig:
             base_dir (Optional[Path], optional): Base directory for the calculator. Defaults to None.
             max_history_size (Optional[int], optional): Maximum number of history entries. Defaults to None.
             auto_save (Optional[bool], optional): Whether to auto-save history. Defaults to None.
-            precision (Optional[int], optional): Number of decimal places for calculations. Defaults to None.
+            precision (Optional[int], optional): Number of decimal places for calculation results. Defaults to None.
             max_input_value (Optional[Number], optional): Maximum allowed input value. Defaults to None.
             default_encoding (Optional[str], optional): Default encoding for file operations. Defaults to None.
+            fast_mode (Optional[bool], optional): Whether to cap precision for throughput. Defaults to None.
+            backend (Optional[str], optional): Numeric backend ('decimal', 'float', 'numpy' or 'hybrid'). Defaults to None.
+            shared_cache (Optional[Path], optional): File of a cross-process power/root result cache. Defaults to None.
+            result_store (Optional[Path], optional): File of a persistent power/root result store. Defaults to None.
+            array_spill_bytes (Optional[int], optional): Size from which array operands and results are
+                saved to files referenced by the history. Defaults to None.
+            cost_budget (Optional[float], optional): Largest estimated time of a calculation, in
+                seconds; longer ones are rejected. Defaults to None.
+            deadline (Optional[float], optional): Seconds a slow calculation may run in a
+                cancellable worker before it is stopped. Defaults to None.
+            plugins (Optional[bool], optional): Whether to discover operation plugins. Defaults to None.
+            significant_digits (Optional[int], optional): Number of significant digits calculations
+                run with. Defaults to None.
         """
         # Set base directory to project root by default
         project_root = get_project_root()
@@ -94,6 +123,12 @@ class CalculatorConfig:
             else int(os.getenv('CALCULATOR_PRECISION', '10'))
         )
 
+        # Significant digits of the Decimal context calculations run in
+        self.significant_digits = (
+            significant_digits if significant_digits is not None
+            else int(os.getenv('CALCULATOR_SIGNIFICANT_DIGITS', '28'))
+        )
+
         # Maximum input value allowed
         self.max_input_value = (
             max_input_value if max_input_value is not None
@@ -105,6 +140,51 @@ class CalculatorConfig:
             'CALCULATOR_DEFAULT_ENCODING', 'utf-8'
         )
 
+        # Low-precision fast mode preference
+        fast_mode_env = os.getenv('CALCULATOR_FAST_MODE', 'false').lower()
+        self.fast_mode = fast_mode if fast_mode is not None else (
+            fast_mode_env == 'true' or fast_mode_env == '1'
+        )
+
+        # Numeric backend used for inputs, operations and history
+        self.backend = (backend or os.getenv('CALCULATOR_BACKEND', 'decimal')).lower()
+
+        # Cross-process result cache file; disabled when unset
+        shared_cache_env = os.getenv('CALCULATOR_SHARED_CACHE')
+        self.shared_cache = Path(shared_cache) if shared_cache else (
+            Path(shared_cache_env) if shared_cache_env else None
+        )
+
+        # Persistent result store file; disabled when unset
+        result_store_env = os.getenv('CALCULATOR_RESULT_STORE')
+        self.result_store = Path(result_store) if result_store else (
+            Path(result_store_env) if result_store_env else None
+        )
+
+        # Arrays at least this large are spilled to files; never when unset
+        spill_env = os.getenv('CALCULATOR_ARRAY_SPILL_BYTES')
+        self.array_spill_bytes = array_spill_bytes if array_spill_bytes is not None else (
+            int(spill_env) if spill_env else None
+        )
+
+        # Budget for the estimated time of one calculation
+        self.cost_budget = (
+            cost_budget if cost_budget is not None
+            else float(os.getenv('CALCULATOR_COST_BUDGET', str(DEFAULT_COST_BUDGET)))
+        )
+
+        # Deadline for slow calculations, which then run in a worker; unset runs them inline
+        deadline_env = os.getenv('CALCULATOR_DEADLINE')
+        self.deadline = deadline if deadline is not None else (
+            float(deadline_env) if deadline_env else None
+        )
+
+        # Discovery of operation plugins from entry points and the plugin directory
+        plugins_env = os.getenv('CALCULATOR_PLUGINS', 'false').lower()
+        self.plugins = plugins if plugins is not None else (
+            plugins_env == 'true' or plugins_env == '1'
+        )
+
     @property
     def log_dir(self) -> Path:
         """
@@ -150,6 +230,45 @@ class CalculatorConfig:
             str(self.history_dir / "calculator_history.csv")
         )).resolve()
 
+    @property
+    def array_dir(self) -> Path:
+        """
+        Get the directory for spilled array operands and results.
+
+        Returns:
+            Path: The array directory path.
+        """
+        return Path(os.getenv(
+            'CALCULATOR_ARRAY_DIR',
+            str(self.history_dir / "arrays")
+        )).resolve()
+
+    @property
+    def plugin_dir(self) -> Path:
+        """
+        Get the directory scanned for operation plugin modules.
+
+        Returns:
+            Path: The plugin directory path.
+        """
+        return Path(os.getenv(
+            'CALCULATOR_PLUGIN_DIR',
+            str(self.base_dir / "plugins")
+        )).resolve()
+
+    @property
+    def plugin_index(self) -> Path:
+        """
+        Get the file caching the index of discovered operation plugins.
+
+        Returns:
+            Path: The plugin index file path.
+        """
+        return Path(os.getenv(
+            'CALCULATOR_PLUGIN_INDEX',
+            str(self.history_dir / "plugin_index.json")
+        )).resolve()
+
     @property
     def log_file(self) -> Path:
         """
@@ -165,6 +284,22 @@ class CalculatorConfig:
             str(self.log_dir / "calculator.log")
         )).resolve()
 
+    def create_decimal_context(self) -> Context:
+        """
+        Create the Decimal context calculations should run in.
+
+        The context uses the configured significant digits, capped at
+        FAST_MODE_PRECISION when fast mode is enabled. It is meant to be applied with
+        decimal.localcontext so the global context is left untouched.
+
+        Returns:
+            Context: A new Decimal context for this configuration.
+        """
+        digits = self.significant_digits
+        if self.fast_mode:
+            digits = min(digits, FAST_MODE_PRECISION)
+        return Context(prec=digits)
+
     def validate(self) -> None:
         """
         Validate configuration settings.
@@ -179,5 +314,17 @@ class CalculatorConfig:
             raise ConfigurationError("max_history_size must be positive")
         if self.precision <= 0:
             raise ConfigurationError("precision must be positive")
+        if self.significant_digits <= 0:
+            raise ConfigurationError("significant_digits must be positive")
         if self.max_input_value <= 0:
             raise ConfigurationError("max_input_value must be positive")
+        if self.array_spill_bytes is not None and self.array_spill_bytes < 0:
+            raise ConfigurationError("array_spill_bytes must not be negative")
+        if self.cost_budget <= 0:
+            raise ConfigurationError("cost_budget must be positive")
+        if self.deadline is not None and self.deadline <= 0:
+            raise ConfigurationError("deadline must be positive")
+        if self.backend not in NUMERIC_BACKENDS:
+            raise ConfigurationError(
+                f"backend must be one of: {', '.join(NUMERIC_BACKENDS)}"
+            )
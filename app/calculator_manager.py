@@ -0,0 +1,416 @@
+########################
+# Calculator Manager   #
+########################
+
+from abc import ABC, abstractmethod
+from collections import Counter, OrderedDict
+from contextlib import contextmanager
+from decimal import localcontext
+import json
+import logging
+import os
+from pathlib import Path
+import time
+from typing import Any, Dict, Iterator, List, Optional, Union
+from urllib.parse import quote
+
+from app.calculation import Calculation
+from app.calculator import Calculator, setup_logging
+from app.calculator_config import CalculatorConfig
+from app.calculator_memento import CalculatorMemento
+from app.operations import Operation, OperationFactory
+from app.plugins import install_plugins
+from app.result_store import install_result_store
+from app.shared_cache import install_shared_cache
+
+# Rough resident sizes used to estimate a session's memory footprint
+SESSION_OVERHEAD_BYTES = 2048   # Calculator object, its lists and Decimal context
+CALCULATION_BYTES = 800         # One Calculation with its Decimals and timestamp
+MEMENTO_BYTES = 120             # One undo/redo memento without its list slots
+REFERENCE_BYTES = 8             # One list slot in a memento's history copy
+
+DEFAULT_MEMORY_BUDGET = 64 * 1024 * 1024
+
+# Undo states each session keeps; every one holds a copy of the history list
+DEFAULT_UNDO_DEPTH = 100
+
+
+def estimate_session_bytes(calculator: Calculator) -> int:
+    """
+    Estimate the memory held by a calculator's history and undo/redo stacks.
+
+    Every memento copies the history list, so each holds about one reference
+    per history entry. The estimate is O(1) so it can run on every request.
+
+    Args:
+        calculator (Calculator): Calculator to measure.
+
+    Returns:
+        int: Estimated size in bytes.
+    """
+    history = len(calculator.history)
+    mementos = len(calculator.undo_stack) + len(calculator.redo_stack)
+    return (
+        SESSION_OVERHEAD_BYTES
+        + (history + mementos) * CALCULATION_BYTES
+        + mementos * (MEMENTO_BYTES + history * REFERENCE_BYTES)
+    )
+
+
+class SessionStore(ABC):
+    """
+    Abstract persistence backend for evicted sessions.
+
+    A store keeps a session's history together with its undo and redo
+    stacks, so an evicted session comes back exactly as it was.
+    """
+
+    @abstractmethod
+    def save(self, session_id: str, calculator: Calculator) -> None:
+        """
+        Persist a session.
+
+        Args:
+            session_id (str): Session identifier.
+            calculator (Calculator): The session's calculator.
+        """
+        pass  # pragma: no cover
+
+    @abstractmethod
+    def load(self, session_id: str, calculator: Calculator) -> bool:
+        """
+        Restore a session into a fresh calculator.
+
+        Args:
+            session_id (str): Session identifier.
+            calculator (Calculator): Empty calculator to restore into.
+
+        Returns:
+            bool: True if the session was found.
+        """
+        pass  # pragma: no cover
+
+    @abstractmethod
+    def delete(self, session_id: str) -> None:
+        """
+        Remove a persisted session, if any.
+
+        Args:
+            session_id (str): Session identifier.
+        """
+        pass  # pragma: no cover
+
+
+class JSONSessionStore(SessionStore):
+    """
+    Stores each session as one JSON file.
+
+    Mementos share Calculation objects with the history, so each distinct
+    calculation is written once and the history and stacks refer to it by
+    index. Files are replaced atomically.
+    """
+
+    def __init__(self, directory: Path, encoding: str = 'utf-8'):
+        """
+        Create the store.
+
+        Args:
+            directory (Path): Directory holding one file per session.
+            encoding (str, optional): File encoding. Defaults to 'utf-8'.
+        """
+        self.directory = Path(directory)
+        self.encoding = encoding
+
+    def path(self, session_id: str) -> Path:
+        """
+        Get the file for a session; the identifier is percent-encoded.
+
+        Args:
+            session_id (str): Session identifier.
+
+        Returns:
+            Path: The session's file.
+        """
+        return self.directory / f"{quote(session_id, safe='')}.json"
+
+    def save(self, session_id: str, calculator: Calculator) -> None:
+        calculations: List[Dict[str, Any]] = []
+        indexes: Dict[int, int] = {}
+
+        def refs(history: List[Calculation]) -> List[int]:
+            result = []
+            for calc in history:
+                index = indexes.get(id(calc))
+                if index is None:
+                    index = indexes[id(calc)] = len(calculations)
+                    calculations.append(calc.to_dict())
+                result.append(index)
+            return result
+
+        state = {
+            'history': refs(calculator.history),
+            'undo': [refs(m.history) for m in calculator.undo_stack],
+            'redo': [refs(m.history) for m in calculator.redo_stack],
+        }
+        state['calculations'] = calculations
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.path(session_id)
+        temporary = path.with_suffix('.tmp')
+        temporary.write_text(json.dumps(state), encoding=self.encoding)
+        os.replace(temporary, path)
+
+    def load(self, session_id: str, calculator: Calculator) -> bool:
+        path = self.path(session_id)
+        if not path.exists():
+            return False
+        state = json.loads(path.read_text(encoding=self.encoding))
+        backend = None if calculator.backend.native else calculator.backend
+        with localcontext(calculator.decimal_context):
+            calculations = [Calculation.from_dict(data, backend=backend) for data in state['calculations']]
+        calculator.history = [calculations[i] for i in state['history']]
+        calculator.undo_stack = [
+            CalculatorMemento([calculations[i] for i in refs]) for refs in state['undo']
+        ]
+        calculator.redo_stack = [
+            CalculatorMemento([calculations[i] for i in refs]) for refs in state['redo']
+        ]
+        return True
+
+    def delete(self, session_id: str) -> None:
+        self.path(session_id).unlink(missing_ok=True)
+
+
+class CalculatorManager:
+    """
+    Hosts many calculator sessions in one process.
+
+    Configuration is validated, and logging and directories are set up, once
+    for all sessions. Sessions are lightweight Calculators that share one
+    configuration, OperationFactory's shared Operation instances and one SessionStore.
+    Resident sessions are kept in least-recently-used order; when their
+    estimated memory exceeds the budget, the least recently used sessions
+    are saved to the store and dropped, and reloaded transparently on their
+    next access. Each session keeps at most max_undo_depth undo states.
+    """
+
+    def __init__(
+        self,
+        config: Optional[CalculatorConfig] = None,
+        memory_budget: int = DEFAULT_MEMORY_BUDGET,
+        store: Optional[SessionStore] = None,
+        max_undo_depth: Optional[int] = DEFAULT_UNDO_DEPTH
+    ):
+        """
+        Create the manager and its shared resources.
+
+        Args:
+            config (Optional[CalculatorConfig], optional): Configuration shared by
+                every session. Defaults to the environment configuration.
+            memory_budget (int, optional): Estimated bytes of resident sessions
+                to keep in memory. Defaults to DEFAULT_MEMORY_BUDGET.
+            store (Optional[SessionStore], optional): Persistence backend for
+                evicted sessions. Defaults to a JSONSessionStore under the
+                history directory.
+            max_undo_depth (Optional[int], optional): Undo states kept per
+                session, or None for no limit. Defaults to DEFAULT_UNDO_DEPTH.
+        """
+        self.config = config or CalculatorConfig()
+        self.config.validate()
+        setup_logging(self.config)
+        install_shared_cache(self.config)
+        install_result_store(self.config)
+        install_plugins(self.config)
+        self.config.history_dir.mkdir(parents=True, exist_ok=True)
+
+        self.memory_budget = memory_budget
+        self.max_undo_depth = max_undo_depth
+        self.store = store or JSONSessionStore(
+            self.config.history_dir / 'sessions', self.config.default_encoding
+        )
+        self.sessions: 'OrderedDict[str, Calculator]' = OrderedDict()
+        self.memory_usage = 0
+        self.evictions = 0
+        self._sizes: Dict[str, int] = {}
+        self._last_used: Dict[str, float] = {}
+        # Sessions with calculations running on other threads, never evicted
+        self._held: Counter = Counter()
+        logging.info("Calculator manager initialized")
+
+    def operation(self, name: Union[str, int]) -> Operation:
+        """
+        Get the shared Operation instance for a name.
+
+        Operations are stateless apart from their backend, which is the same
+        for every session, so OperationFactory's shared instance serves all of them.
+
+        Args:
+            name (Union[str, int]): Operation name, e.g. 'add', or op code.
+
+        Returns:
+            Operation: The shared operation.
+
+        Raises:
+            ValueError: If the operation is unknown.
+        """
+        return OperationFactory.create_operation(name)
+
+    def get(self, session_id: str) -> Calculator:
+        """
+        Get a session's calculator, restoring or creating it as needed.
+
+        Marks the session most recently used and refreshes its size estimate,
+        which also accounts for changes made since the previous access.
+
+        Args:
+            session_id (str): Session identifier.
+
+        Returns:
+            Calculator: The session's calculator.
+        """
+        calculator = self.sessions.get(session_id)
+        if calculator is None:
+            calculator = Calculator(self.config, lightweight=True)
+            calculator.max_undo_depth = self.max_undo_depth
+            if self.store.load(session_id, calculator):
+                logging.info(f"Restored session {session_id}")
+                excess = len(calculator.undo_stack) - (self.max_undo_depth or 0)
+                if self.max_undo_depth is not None and excess > 0:
+                    del calculator.undo_stack[:excess]
+            self.sessions[session_id] = calculator
+        else:
+            self.sessions.move_to_end(session_id)
+        self._last_used[session_id] = time.monotonic()
+        self._refresh(session_id)
+        return calculator
+
+    @contextmanager
+    def hold(self, session_id: str) -> Iterator[Calculator]:
+        """
+        Use a session's calculator from another thread.
+
+        The session stays resident until the block ends, so a calculation
+        running elsewhere is not recorded in a calculator that was already
+        saved and dropped. Enter and leave the block on the manager's thread.
+
+        Args:
+            session_id (str): Session identifier.
+
+        Yields:
+            Calculator: The session's calculator.
+        """
+        calculator = self.get(session_id)
+        self._held[session_id] += 1
+        try:
+            yield calculator
+        finally:
+            self._held[session_id] -= 1
+            if not self._held[session_id]:
+                del self._held[session_id]
+            if session_id in self.sessions:
+                self._refresh(session_id)
+
+    def calculate(self, session_id: str, operation: Union[str, int], a: Any, b: Any) -> Any:
+        """
+        Perform an operation in a session.
+
+        Args:
+            session_id (str): Session identifier.
+            operation (Union[str, int]): Operation name or op code.
+            a (Any): First operand.
+            b (Any): Second operand.
+
+        Returns:
+            Any: The result.
+
+        Raises:
+            ValueError: If the operation is unknown.
+            ValidationError: If an operand is invalid.
+            OperationError: If the operation fails.
+        """
+        calculator = self.get(session_id)
+        shared = self.operation(operation)
+        if calculator.operation_strategy is not shared:
+            calculator.set_operation(shared)
+        try:
+            return calculator.perform_operation(a, b)
+        finally:
+            self._refresh(session_id)
+
+    def evict(self, session_id: str) -> bool:
+        """
+        Save a resident session to the store and drop it from memory.
+
+        Args:
+            session_id (str): Session identifier.
+
+        Returns:
+            bool: True if the session was resident.
+        """
+        calculator = self.sessions.pop(session_id, None)
+        if calculator is None:
+            return False
+        self.store.save(session_id, calculator)
+        self.memory_usage -= self._sizes.pop(session_id)
+        del self._last_used[session_id]
+        self.evictions += 1
+        logging.info(f"Evicted session {session_id}")
+        return True
+
+    def evict_idle(self, max_idle_seconds: float) -> int:
+        """
+        Evict every session not used for a given time.
+
+        Args:
+            max_idle_seconds (float): Idle time after which a session is evicted.
+
+        Returns:
+            int: Number of sessions evicted.
+        """
+        cutoff = time.monotonic() - max_idle_seconds
+        # Sessions are in LRU order, so the idle ones come first
+        idle = []
+        for session_id in self.sessions:
+            if self._last_used[session_id] > cutoff:
+                break
+            if session_id not in self._held:
+                idle.append(session_id)
+        for session_id in idle:
+            self.evict(session_id)
+        return len(idle)
+
+    def discard(self, session_id: str) -> None:
+        """
+        Forget a session entirely, in memory and in the store.
+
+        Args:
+            session_id (str): Session identifier.
+        """
+        if self.sessions.pop(session_id, None) is not None:
+            self.memory_usage -= self._sizes.pop(session_id)
+            del self._last_used[session_id]
+        self.store.delete(session_id)
+
+    def close(self) -> None:
+        """Save every resident session to the store."""
+        for session_id in list(self.sessions):
+            self.evict(session_id)
+
+    def _refresh(self, session_id: str) -> None:
+        """
+        Update a session's size estimate and enforce the memory budget.
+
+        The session being refreshed is the most recently used, so it is never
+        the one evicted, and neither are held sessions.
+        """
+        size = estimate_session_bytes(self.sessions[session_id])
+        self.memory_usage += size - self._sizes.get(session_id, 0)
+        self._sizes[session_id] = size
+        if self.memory_usage <= self.memory_budget:
+            return
+        # Evict least recently used sessions, never the one being used
+        candidates = [s for s in self.sessions if s != session_id and s not in self._held]
+        for candidate in candidates:
+            if self.memory_usage <= self.memory_budget:
+                break
+            self.evict(candidate)
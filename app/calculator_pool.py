@@ -0,0 +1,470 @@
+########################
+# Calculator Pool      #
+########################
+
+import hashlib
+import logging
+import multiprocessing
+from multiprocessing.connection import Connection
+import os
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from app.calculator_config import CalculatorConfig
+from app.calculator_manager import DEFAULT_MEMORY_BUDGET, CalculatorManager
+from app.exceptions import CalculatorError
+
+# Multiplier of the linear congruential generator used by jump consistent hashing
+JUMP_MULTIPLIER = 2862933555777941757
+UINT64_MASK = (1 << 64) - 1
+
+
+def shard_for(session_id: str, shards: int) -> int:
+    """
+    Map a session to a shard with jump consistent hashing.
+
+    The mapping is stable across processes (unlike hash()), and changing the
+    number of shards from n to n + 1 moves only the sessions that land on
+    the new shard.
+
+    Args:
+        session_id (str): Session identifier.
+        shards (int): Number of shards; must be positive.
+
+    Returns:
+        int: Shard index in range(shards).
+    """
+    key = int.from_bytes(hashlib.blake2b(session_id.encode(), digest_size=8).digest(), 'big')
+    bucket, candidate = -1, 0
+    while candidate < shards:
+        bucket = candidate
+        key = (key * JUMP_MULTIPLIER + 1) & UINT64_MASK
+        candidate = int((bucket + 1) * ((1 << 31) / ((key >> 33) + 1)))
+    return bucket
+
+
+def _handle(manager: CalculatorManager, index: int, command: str, args: Tuple[Any, ...]) -> Any:
+    """
+    Execute one command in a worker.
+
+    Args:
+        manager (CalculatorManager): The worker's sessions.
+        index (int): The worker's shard index.
+        command (str): Command name.
+        args (Tuple[Any, ...]): Command arguments.
+
+    Returns:
+        Any: The command's reply.
+
+    Raises:
+        ValueError: If the command is unknown.
+    """
+    if command == 'calculate':
+        return manager.calculate(*args)
+    if command == 'batch':
+        results: List[Any] = []
+        for item in args[0]:
+            try:
+                results.append(manager.calculate(*item))
+            except Exception as e:
+                results.append(e)
+        return results
+    if command == 'history':
+        return [calc.to_dict() for calc in manager.get(args[0]).history]
+    if command in ('undo', 'redo'):
+        return getattr(manager.get(args[0]), command)()
+    if command == 'rebalance':
+        # Hand over sessions that now belong to another shard through the store
+        moved = [sid for sid in manager.sessions if shard_for(sid, args[0]) != index]
+        for session_id in moved:
+            manager.evict(session_id)
+        return len(moved)
+    if command == 'stats':
+        return {
+            'pid': os.getpid(),
+            'sessions': len(manager.sessions),
+            'memory_usage': manager.memory_usage,
+            'evictions': manager.evictions,
+        }
+    raise ValueError(f"Unknown command: {command}")
+
+
+def _serve(index: int, config: CalculatorConfig, memory_budget: int, connection: Connection) -> None:
+    """
+    Run a worker: answer commands from the pool until told to close.
+
+    Each reply is ('ok', value) or ('error', exception). On 'close', or if
+    the pool goes away, every resident session is saved to the store first,
+    so whichever worker owns a session next can load it.
+
+    Args:
+        index (int): The worker's shard index.
+        config (CalculatorConfig): Configuration for the worker's sessions.
+        memory_budget (int): Memory budget of the worker's CalculatorManager.
+        connection (Connection): The worker's end of the pipe.
+    """
+    manager = CalculatorManager(config, memory_budget)
+    closing = False
+    while not closing:
+        try:
+            command, *args = connection.recv()
+        except EOFError:
+            break
+        closing = command == 'close'
+        if closing:
+            continue
+        try:
+            reply = ('ok', _handle(manager, index, command, tuple(args)))
+        except Exception as e:
+            reply = ('error', e)
+        connection.send(reply)
+    manager.close()
+    if closing:
+        connection.send(('ok', None))
+    connection.close()
+
+
+class _Worker:
+    """A worker process, the pool's end of its pipe and the lock serializing its use."""
+
+    def __init__(self, pool: 'WorkerPool', index: int):
+        self.pool = pool
+        self.index = index
+        self.lock = threading.Lock()
+        self.restarts = 0
+        self.start()
+
+    def start(self) -> None:
+        """Start a fresh process for this shard."""
+        self.connection, child = self.pool.context.Pipe()
+        self.process = self.pool.context.Process(
+            target=_serve,
+            args=(self.index, self.pool.config, self.pool.memory_budget, child),
+            name=f"calculator-worker-{self.index}",
+            daemon=True,
+        )
+        self.process.start()
+        child.close()
+
+    def send(self, command: str, *args: Any) -> None:
+        """
+        Send a command; the caller must hold the lock.
+
+        Raises:
+            CalculatorError: If the worker has died; it is restarted first.
+        """
+        try:
+            self.connection.send((command, *args))
+        except OSError:
+            self._crashed()
+
+    def receive(self) -> Any:
+        """
+        Receive a reply; the caller must hold the lock.
+
+        Returns:
+            Any: The reply value.
+
+        Raises:
+            CalculatorError: If the worker has died; it is restarted first.
+            Exception: Whatever the command raised in the worker.
+        """
+        try:
+            status, value = self.connection.recv()
+        except (EOFError, OSError):
+            self._crashed()
+        if status == 'error':
+            raise value
+        return value
+
+    def request(self, command: str, *args: Any) -> Any:
+        """Send a command and wait for its reply; the caller must hold the lock."""
+        self.send(command, *args)
+        return self.receive()
+
+    def stop(self) -> None:
+        """Ask the process to save its sessions and exit; the caller must hold the lock."""
+        try:
+            self.connection.send(('close',))
+            self.connection.recv()
+        except (EOFError, OSError):
+            pass  # Already dead; its sessions stay as last saved
+        self.process.join()
+        self.connection.close()
+
+    def _crashed(self) -> None:
+        """Replace a dead process, then report the failure to the caller."""
+        self.process.join()
+        exitcode = self.process.exitcode
+        self.connection.close()
+        self.restarts += 1
+        logging.error(f"Worker {self.index} exited with code {exitcode}; restarting")
+        self.start()
+        raise CalculatorError(
+            f"Worker {self.index} exited with code {exitcode}; "
+            "its sessions were restored from their last save"
+        )
+
+
+class WorkerPool:
+    """
+    Shards calculator sessions across worker processes.
+
+    Each worker process runs its own CalculatorManager and owns the sessions
+    that shard_for() maps to it, so calculations in different shards run on
+    different cores. The pool routes each request to the owning worker over
+    a pipe; it is thread-safe, and requests for different workers proceed in
+    parallel.
+
+    Sessions move between workers through the manager's SessionStore: a
+    worker saves every session it gives up before another one loads it.
+    Restarting a worker therefore keeps its sessions, and resizing the pool
+    moves only the sessions whose shard changes. If a worker dies instead,
+    it is restarted and its sessions come back as of their last save.
+    """
+
+    def __init__(
+        self,
+        config: Optional[CalculatorConfig] = None,
+        workers: Optional[int] = None,
+        memory_budget: int = DEFAULT_MEMORY_BUDGET,
+        start_method: Optional[str] = None
+    ):
+        """
+        Start the worker processes.
+
+        Args:
+            config (Optional[CalculatorConfig], optional): Configuration shared by
+                every worker. Defaults to the environment configuration.
+            workers (Optional[int], optional): Number of worker processes.
+                Defaults to the number of CPUs.
+            memory_budget (int, optional): Memory budget of each worker's
+                CalculatorManager. Defaults to DEFAULT_MEMORY_BUDGET.
+            start_method (Optional[str], optional): multiprocessing start method.
+                Defaults to the platform default.
+
+        Raises:
+            ValueError: If workers is less than 1.
+        """
+        workers = workers or os.cpu_count() or 1
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        self.config = config or CalculatorConfig()
+        self.config.validate()
+        self.memory_budget = memory_budget
+        self.context = multiprocessing.get_context(start_method)
+        # Serializes restart, resize and close
+        self._admin = threading.Lock()
+        self._workers: List[_Worker] = [_Worker(self, index) for index in range(workers)]
+        logging.info(f"Worker pool started with {workers} workers")
+
+    @property
+    def size(self) -> int:
+        """int: Number of worker processes."""
+        return len(self._workers)
+
+    def shard(self, session_id: str) -> int:
+        """
+        Get the index of the worker that owns a session.
+
+        Args:
+            session_id (str): Session identifier.
+
+        Returns:
+            int: Worker index.
+        """
+        return shard_for(session_id, len(self._workers))
+
+    def _call(self, session_id: str, command: str, *args: Any) -> Any:
+        """Run a command on the worker owning a session."""
+        while True:
+            workers = self._workers
+            worker = workers[shard_for(session_id, len(workers))]
+            with worker.lock:
+                # resize() swaps the list while holding every lock; route again
+                if self._workers is workers:
+                    return worker.request(command, session_id, *args)
+
+    def calculate(self, session_id: str, operation: str, a: Any, b: Any) -> Any:
+        """
+        Perform an operation in a session.
+
+        Args:
+            session_id (str): Session identifier.
+            operation (str): Operation name.
+            a (Any): First operand.
+            b (Any): Second operand.
+
+        Returns:
+            Any: The result.
+
+        Raises:
+            ValueError: If the operation is unknown.
+            ValidationError: If an operand is invalid.
+            OperationError: If the operation fails.
+            CalculatorError: If the worker died during the request.
+        """
+        return self._call(session_id, 'calculate', operation, a, b)
+
+    def calculate_many(self, items: Iterable[Tuple[str, str, Any, Any]]) -> List[Any]:
+        """
+        Perform many operations, each worker running its share in parallel.
+
+        Items of the same session run in order. Failures are returned in place
+        of their results rather than raised.
+
+        Args:
+            items (Iterable[Tuple[str, str, Any, Any]]): (session_id, operation, a, b) tuples.
+
+        Returns:
+            List[Any]: A result or exception per item, in input order.
+        """
+        items = list(items)
+        results: List[Any] = [None] * len(items)
+        while True:
+            workers = self._workers
+            shards: Dict[int, List[int]] = {}
+            for position, item in enumerate(items):
+                shards.setdefault(shard_for(item[0], len(workers)), []).append(position)
+            # Lock in index order so concurrent callers cannot deadlock
+            order = sorted(shards)
+            for index in order:
+                workers[index].lock.acquire()
+            try:
+                if self._workers is not workers:
+                    continue
+                sent = []
+                for index in order:
+                    try:
+                        workers[index].send('batch', [items[p] for p in shards[index]])
+                        sent.append(index)
+                    except CalculatorError as e:
+                        for position in shards[index]:
+                            results[position] = e
+                for index in sent:
+                    try:
+                        replies = workers[index].receive()
+                    except CalculatorError as e:
+                        replies = [e] * len(shards[index])
+                    for position, reply in zip(shards[index], replies):
+                        results[position] = reply
+                return results
+            finally:
+                for index in order:
+                    workers[index].lock.release()
+
+    def history(self, session_id: str) -> List[Dict[str, Any]]:
+        """
+        Get a session's history.
+
+        Args:
+            session_id (str): Session identifier.
+
+        Returns:
+            List[Dict[str, Any]]: The calculations, as Calculation.to_dict() dictionaries.
+        """
+        return self._call(session_id, 'history')
+
+    def undo(self, session_id: str) -> bool:
+        """
+        Undo a session's last operation.
+
+        Args:
+            session_id (str): Session identifier.
+
+        Returns:
+            bool: True if an operation was undone.
+        """
+        return self._call(session_id, 'undo')
+
+    def redo(self, session_id: str) -> bool:
+        """
+        Redo a session's last undone operation.
+
+        Args:
+            session_id (str): Session identifier.
+
+        Returns:
+            bool: True if an operation was redone.
+        """
+        return self._call(session_id, 'redo')
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """
+        Get each worker's process id, resident sessions, memory estimate and evictions.
+
+        Returns:
+            List[Dict[str, Any]]: One dictionary per worker, with its restart count added.
+        """
+        result = []
+        for worker in self._workers:
+            with worker.lock:
+                stats = worker.request('stats')
+            stats['restarts'] = worker.restarts
+            result.append(stats)
+        return result
+
+    def restart(self, index: int) -> None:
+        """
+        Replace a worker process without losing its sessions.
+
+        The old process saves its sessions and exits, and the new one loads
+        them on demand. Requests for other workers continue meanwhile;
+        requests for this one wait until the new process is up.
+
+        Args:
+            index (int): Worker index.
+        """
+        with self._admin:
+            worker = self._workers[index]
+            with worker.lock:
+                worker.stop()
+                worker.start()
+                worker.restarts += 1
+            logging.info(f"Restarted worker {index}")
+
+    def resize(self, workers: int) -> None:
+        """
+        Change the number of workers, moving only the sessions whose shard changes.
+
+        Remaining workers first hand over the sessions they no longer own,
+        removed workers save all of theirs, and then requests are routed
+        with the new shard count.
+
+        Args:
+            workers (int): New number of worker processes.
+
+        Raises:
+            ValueError: If workers is less than 1.
+        """
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        with self._admin:
+            current = self._workers
+            for worker in current:
+                worker.lock.acquire()
+            try:
+                kept = current[:workers]
+                for worker in kept:
+                    worker.request('rebalance', workers)
+                for worker in current[workers:]:
+                    worker.stop()
+                self._workers = kept + [_Worker(self, index) for index in range(len(current), workers)]
+            finally:
+                for worker in current:
+                    worker.lock.release()
+            logging.info(f"Resized worker pool from {len(current)} to {workers} workers")
+
+    def close(self) -> None:
+        """Save every session and stop all workers."""
+        with self._admin:
+            for worker in self._workers:
+                with worker.lock:
+                    worker.stop()
+            logging.info("Worker pool closed")
+
+    def __enter__(self) -> 'WorkerPool':
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
@@ -5,6 +5,7 @@
 from decimal import Decimal
 import logging
 
+from app.calculation import round_places
 from app.calculator import Calculator
 from app.exceptions import OperationError, ValidationError
 from app.history import AutoSaveObserver, LoggingObserver
@@ -110,7 +111,7 @@ def calculator_repl():
                         print(Fore.RED + f"Error loading history: {e}")
                     continue
 
-                if command in ['add', 'subtract', 'multiply', 'divide', 'power', 'root', 'modulus', 'int_divide','percent', 'abs_diff']:
+                if OperationFactory.has_operation(command):
                     # Perform the specified arithmetic operation
                     try:
                         print(Fore.CYAN + "\nEnter numbers (or 'cancel' to abort):")
@@ -123,17 +124,19 @@ def calculator_repl():
                             print(Fore.RED + "Operation cancelled")
                             continue
 
-                        # Create the appropriate operation instance using the Factory pattern
+                        # Get the shared operation instance using the Factory pattern
                         operation = OperationFactory.create_operation(command)
                         calc.set_operation(operation)
 
                         # Perform the calculation
                         result = calc.perform_operation(a, b)
 
-                        # Normalize the result if it's a Decimal
+                        # Round fractional results to the configured decimal places,
+                        # strip trailing zeros and avoid scientific notation.
+                        # Exact integer results are shown in full.
                         if isinstance(result, Decimal):
-                            #result = result.normalize() # This caused inconsistent results being reported in sci notation
-                            result = result.quantize(Decimal("1.000"))
+                            if result.as_tuple().exponent < 0:
+                                result = round_places(result, calc.config.precision)
                             result = format(result, "f")
 
                         print(Fore.GREEN + f"\nResult: {result}")
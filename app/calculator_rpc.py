@@ -0,0 +1,641 @@
+########################
+# Calculator RPC       #
+########################
+
+import argparse
+import asyncio
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from decimal import Decimal
+import logging
+import os
+import queue
+import socket
+import struct
+import threading
+from typing import Any, Deque, Iterable, Iterator, List, Optional, Tuple, Union
+
+from app.calculator import Calculator
+from app.calculator_config import CalculatorConfig
+from app.calculator_manager import CalculatorManager
+from app.exceptions import CalculatorError, OperationError, ValidationError
+from app.operations import OperationFactory
+
+# Wire format: every message is a frame: a 4-byte big-endian payload length followed by the
+# payload. A request payload is (request id: u32, op code: u8, operand a,
+# operand b); a response payload is (request id: u32, status: u8) followed by
+# the result operand on success or a length-prefixed UTF-8 message on error.
+# An operand is a 1-byte tag and its value: a signed 64-bit integer, a
+# binary64 float, or a length-prefixed ASCII decimal literal (exact).
+
+FRAME_HEADER = struct.Struct('!I')
+MESSAGE_HEADER = struct.Struct('!IB')
+INT64 = struct.Struct('!q')
+FLOAT64 = struct.Struct('!d')
+TEXT_LENGTH = struct.Struct('!H')
+
+# Longest decimal literal an operand can carry; longer results are answered
+# with an operation error
+MAX_TEXT_LENGTH = 0xFFFF
+
+TAG_INT = 0
+TAG_FLOAT = 1
+TAG_TEXT = 2
+
+# Op code 0 opens a session; its first operand is the session name and the
+# result is the session's history size. Other op codes are OperationFactory's
+# (add 1, subtract 2, ... abs_diff 10, then operations registered later)
+OP_HELLO = 0
+
+STATUS_OK = 0
+STATUS_VALIDATION_ERROR = 1
+STATUS_OPERATION_ERROR = 2
+STATUS_PROTOCOL_ERROR = 3
+
+# Largest accepted frame payload in bytes
+MAX_FRAME_SIZE = 1 << 16
+
+# Requests a client sends ahead of reading responses when pipelining
+MAX_IN_FLIGHT = 256
+
+DEFAULT_SOCKET_PATH = "/tmp/calculator.sock"
+DEFAULT_SESSION = "default"
+DEFAULT_POOL_SIZE = 4
+DEFAULT_WORKERS = 4
+
+_INT64_MIN, _INT64_MAX = -(1 << 63), (1 << 63) - 1
+
+
+def encode_operand(value: Any) -> bytes:
+    """
+    Encode one operand.
+
+    Args:
+        value (Any): An int, float, Decimal or numeric string.
+
+    Returns:
+        bytes: Tag and value.
+
+    Raises:
+        OperationError: If the value's literal is longer than MAX_TEXT_LENGTH.
+    """
+    if type(value) is int and _INT64_MIN <= value <= _INT64_MAX:
+        return bytes((TAG_INT,)) + INT64.pack(value)
+    if isinstance(value, float):
+        return bytes((TAG_FLOAT,)) + FLOAT64.pack(value)
+    text = str(value).encode('ascii', 'replace')
+    if len(text) > MAX_TEXT_LENGTH:
+        raise OperationError(f"Value too long to encode: {len(text)} characters, at most {MAX_TEXT_LENGTH}")
+    return bytes((TAG_TEXT,)) + TEXT_LENGTH.pack(len(text)) + text
+
+
+def decode_operand(payload: bytes, offset: int) -> Tuple[Any, int]:
+    """
+    Decode one operand.
+
+    Args:
+        payload (bytes): Frame payload.
+        offset (int): Position of the operand's tag.
+
+    Returns:
+        Tuple[Any, int]: The value (int, float or str) and the offset after it.
+
+    Raises:
+        ValueError: If the tag is unknown or the payload is truncated.
+    """
+    tag = payload[offset]
+    offset += 1
+    if tag == TAG_INT:
+        return INT64.unpack_from(payload, offset)[0], offset + INT64.size
+    if tag == TAG_FLOAT:
+        return FLOAT64.unpack_from(payload, offset)[0], offset + FLOAT64.size
+    if tag == TAG_TEXT:
+        (length,) = TEXT_LENGTH.unpack_from(payload, offset)
+        start = offset + TEXT_LENGTH.size
+        if start + length > len(payload):
+            raise ValueError("Truncated text operand")
+        return payload[start:start + length].decode('ascii'), start + length
+    raise ValueError(f"Unknown operand tag: {tag}")
+
+
+def encode_request(request_id: int, op_code: int, a: Any, b: Any) -> bytes:
+    """
+    Encode a request frame.
+
+    Args:
+        request_id (int): Identifier echoed in the response.
+        op_code (int): Operation code.
+        a (Any): First operand.
+        b (Any): Second operand.
+
+    Returns:
+        bytes: The framed request.
+    """
+    payload = MESSAGE_HEADER.pack(request_id, op_code) + encode_operand(a) + encode_operand(b)
+    return FRAME_HEADER.pack(len(payload)) + payload
+
+
+def encode_response(request_id: int, status: int, value: Any) -> bytes:
+    """
+    Encode a response frame.
+
+    Args:
+        request_id (int): Identifier of the request being answered.
+        status (int): STATUS_* code.
+        value (Any): Result on success, error message otherwise.
+
+    Returns:
+        bytes: The framed response.
+
+    Raises:
+        OperationError: If a result is too long to encode.
+    """
+    if status == STATUS_OK:
+        body = encode_operand(value)
+    else:
+        message = str(value).encode('utf-8')[:MAX_TEXT_LENGTH]
+        body = TEXT_LENGTH.pack(len(message)) + message
+    payload = MESSAGE_HEADER.pack(request_id, status) + body
+    return FRAME_HEADER.pack(len(payload)) + payload
+
+
+def decode_response(payload: bytes) -> Tuple[int, int, Any]:
+    """
+    Decode a response payload.
+
+    Args:
+        payload (bytes): Frame payload.
+
+    Returns:
+        Tuple[int, int, Any]: Request id, status, and the result or error message.
+    """
+    request_id, status = MESSAGE_HEADER.unpack_from(payload)
+    offset = MESSAGE_HEADER.size
+    if status == STATUS_OK:
+        value, _ = decode_operand(payload, offset)
+        if isinstance(value, str):
+            value = Decimal(value)
+        return request_id, status, value
+    (length,) = TEXT_LENGTH.unpack_from(payload, offset)
+    start = offset + TEXT_LENGTH.size
+    return request_id, status, payload[start:start + length].decode('utf-8')
+
+
+@dataclass
+class RPCSession:
+    """A named session, whose calculator the server's CalculatorManager hosts."""
+
+    name: str
+    manager: CalculatorManager
+
+    @property
+    def calculator(self) -> Calculator:
+        """The session's calculator, restored if it was evicted."""
+        return self.manager.get(self.name)
+
+    def perform(self, op_code: int, a: Any, b: Any) -> Any:
+        """
+        Run an operation through OperationFactory's shared instance for its code.
+
+        Args:
+            op_code (int): Operation code.
+            a (Any): First operand.
+            b (Any): Second operand.
+
+        Returns:
+            Any: The result.
+
+        Raises:
+            ValueError: If the op code is unknown.
+            ValidationError: If an operand is invalid.
+            OperationError: If the operation fails.
+        """
+        return self.manager.calculate(self.name, op_code, a, b)
+
+
+def _failure(request_id: int, error: Exception) -> bytes:
+    """Encode the response to a request that raised an error."""
+    if isinstance(error, ValidationError):
+        return encode_response(request_id, STATUS_VALIDATION_ERROR, error)
+    if isinstance(error, OperationError):
+        return encode_response(request_id, STATUS_OPERATION_ERROR, error)
+    return encode_response(request_id, STATUS_PROTOCOL_ERROR, error)
+
+
+class _RPCProtocol(asyncio.Protocol):
+    """
+    Per-connection frame parser.
+
+    Requests are answered in order. Cheap ones are computed on the event
+    loop, and every response ready in one pass goes out in one write. A
+    heavy operation runs on the server's worker pool, and the requests
+    after it wait in the queue until it is answered.
+    """
+
+    def __init__(self, server: 'RPCServer'):
+        self.server = server
+        self.session = server.session(DEFAULT_SESSION)
+        self.buffer = bytearray()
+        self.requests: Deque[bytes] = deque()
+        self.worker: Optional[asyncio.Task] = None
+        self.transport: Optional[asyncio.Transport] = None
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        self.transport = transport
+
+    def data_received(self, data: bytes) -> None:
+        buffer = self.buffer
+        buffer += data
+        offset = 0
+        while len(buffer) - offset >= FRAME_HEADER.size:
+            (length,) = FRAME_HEADER.unpack_from(buffer, offset)
+            if length > MAX_FRAME_SIZE:
+                self.requests.clear()
+                self.transport.write(encode_response(0, STATUS_PROTOCOL_ERROR, "Frame too large"))
+                self.transport.close()
+                buffer.clear()
+                return
+            end = offset + FRAME_HEADER.size + length
+            if len(buffer) < end:
+                break
+            self.requests.append(bytes(buffer[offset + FRAME_HEADER.size:end]))
+            offset = end
+        del buffer[:offset]
+        if self.worker is None:
+            self._answer()
+
+    def _answer(self) -> None:
+        """Answer queued requests on the loop until one needs the worker pool."""
+        responses = []
+        while self.requests:
+            response = self._handle(self.requests.popleft())
+            if not isinstance(response, bytes):
+                self.worker = asyncio.ensure_future(self._offload(*response))
+                break
+            responses.append(response)
+        if responses and not self.transport.is_closing():
+            self.transport.write(b''.join(responses))
+
+    def _handle(self, payload: bytes) -> Union[bytes, Tuple[int, int, Any, Any]]:
+        """Answer one request payload, or return a heavy request to offload."""
+        request_id = 0
+        try:
+            request_id, op_code = MESSAGE_HEADER.unpack_from(payload)
+            a, offset = decode_operand(payload, MESSAGE_HEADER.size)
+            if op_code == OP_HELLO:
+                self.session = self.server.session(str(a))
+                return encode_response(request_id, STATUS_OK, len(self.session.calculator.history))
+            b, _ = decode_operand(payload, offset)
+            if OperationFactory.create_operation(op_code).heavy:
+                return request_id, op_code, a, b
+            result = self.session.perform(op_code, a, b)
+            return encode_response(request_id, STATUS_OK, result)
+        except (ValidationError, OperationError, ValueError, IndexError, struct.error) as e:
+            return _failure(request_id, e)
+
+    async def _offload(self, request_id: int, op_code: int, a: Any, b: Any) -> None:
+        """Compute a heavy request on the worker pool, then resume the queue."""
+        try:
+            with self.server.manager.hold(self.session.name) as calculator:
+                result = await asyncio.get_running_loop().run_in_executor(
+                    self.server.executor, calculator.calculate, op_code, a, b
+                )
+            response = encode_response(request_id, STATUS_OK, result)
+        except Exception as e:
+            # Whatever the worker raised is answered, so the requests queued
+            # behind this one are not left waiting
+            response = _failure(request_id, e)
+        finally:
+            self.worker = None
+        if not self.transport.is_closing():
+            self.transport.write(response)
+            self._answer()
+
+
+class RPCServer:
+    """
+    Binary RPC server on a Unix domain socket.
+
+    Each connection starts in the default session and may switch with a
+    HELLO request. Sessions are hosted by a CalculatorManager, which caps
+    their memory by saving the least recently used ones to its store and
+    bounds their undo stacks; all sessions share OperationFactory's
+    instance for each op code. Frames are answered as soon as they are
+    complete, so clients can pipeline many requests per connection. Heavy
+    operations run on a worker pool so they do not stall other connections.
+    """
+
+    def __init__(
+        self,
+        config: Optional[CalculatorConfig] = None,
+        workers: int = DEFAULT_WORKERS,
+        manager: Optional[CalculatorManager] = None
+    ):
+        """
+        Create the server.
+
+        Args:
+            config (Optional[CalculatorConfig], optional): Configuration shared by
+                every session's calculator. Defaults to the environment configuration.
+            workers (int, optional): Size of the worker pool. Defaults to DEFAULT_WORKERS.
+            manager (Optional[CalculatorManager], optional): Manager hosting the
+                sessions. Defaults to a new one for the configuration.
+        """
+        self.config = config or CalculatorConfig()
+        self.manager = manager or CalculatorManager(self.config)
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='calculator-rpc')
+        self.server: Optional[asyncio.AbstractServer] = None
+        self.path: Optional[str] = None
+
+    def session(self, name: str) -> RPCSession:
+        """
+        Get a session, creating it with an empty history on first use.
+
+        Args:
+            name (str): Session name.
+
+        Returns:
+            RPCSession: The session.
+        """
+        if name not in self.manager.sessions:
+            logging.info(f"Opened RPC session: {name}")
+        self.manager.get(name)
+        return RPCSession(name, self.manager)
+
+    async def start(self, path: str = DEFAULT_SOCKET_PATH) -> asyncio.AbstractServer:
+        """
+        Start listening, replacing a stale socket file if present.
+
+        Args:
+            path (str, optional): Socket path. Defaults to DEFAULT_SOCKET_PATH.
+
+        Returns:
+            asyncio.AbstractServer: The listening server.
+        """
+        if os.path.exists(path):
+            os.unlink(path)
+        self.path = path
+        self.server = await asyncio.get_running_loop().create_unix_server(
+            lambda: _RPCProtocol(self), path
+        )
+        logging.info(f"Calculator RPC listening on {path}")
+        return self.server
+
+    async def close(self) -> None:
+        """Stop listening, remove the socket file, shut down the worker pool and save the sessions."""
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        if self.path and os.path.exists(self.path):
+            os.unlink(self.path)
+        self.executor.shutdown(wait=True)
+        self.manager.close()
+
+    async def serve_forever(self, path: str = DEFAULT_SOCKET_PATH) -> None:
+        """
+        Start the server and run until cancelled.
+
+        Args:
+            path (str, optional): Socket path. Defaults to DEFAULT_SOCKET_PATH.
+        """
+        await self.start(path)
+        print(f"Calculator RPC listening on {path}")
+        try:
+            await self.server.serve_forever()
+        finally:
+            await self.close()
+
+
+def _raise_for_status(status: int, value: Any) -> Any:
+    """Return a successful result or raise the matching calculator error."""
+    if status == STATUS_OK:
+        return value
+    if status == STATUS_VALIDATION_ERROR:
+        raise ValidationError(value)
+    if status == STATUS_OPERATION_ERROR:
+        raise OperationError(value)
+    raise CalculatorError(f"Protocol error: {value}")
+
+
+class RPCConnection:
+    """
+    One blocking client connection.
+
+    Not thread-safe; RPCClient hands each connection to one thread at a time.
+    """
+
+    def __init__(self, path: str = DEFAULT_SOCKET_PATH, session: str = DEFAULT_SESSION,
+                 timeout: Optional[float] = None):
+        """
+        Connect and join a session.
+
+        Args:
+            path (str, optional): Socket path. Defaults to DEFAULT_SOCKET_PATH.
+            session (str, optional): Session name. Defaults to DEFAULT_SESSION.
+            timeout (Optional[float], optional): Socket timeout in seconds.
+                Defaults to blocking.
+        """
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(timeout)
+        self.sock.connect(path)
+        self._buffer = bytearray()
+        self._next_id = 0
+        if session != DEFAULT_SESSION:
+            self._request(OP_HELLO, session, 0)
+
+    def close(self) -> None:
+        """Close the socket."""
+        self.sock.close()
+
+    def _send(self, frames: bytes) -> None:
+        self.sock.sendall(frames)
+
+    def _receive(self) -> Tuple[int, int, Any]:
+        """Read one response frame."""
+        buffer = self._buffer
+        while True:
+            if len(buffer) >= FRAME_HEADER.size:
+                (length,) = FRAME_HEADER.unpack_from(buffer)
+                end = FRAME_HEADER.size + length
+                if len(buffer) >= end:
+                    payload = bytes(buffer[FRAME_HEADER.size:end])
+                    del buffer[:end]
+                    return decode_response(payload)
+            chunk = self.sock.recv(1 << 16)
+            if not chunk:
+                raise ConnectionError("RPC server closed the connection")
+            buffer += chunk
+
+    def _request(self, op_code: int, a: Any, b: Any) -> Any:
+        self._next_id = (self._next_id + 1) & 0xFFFFFFFF
+        self._send(encode_request(self._next_id, op_code, a, b))
+        _, status, value = self._receive()
+        return _raise_for_status(status, value)
+
+    def call(self, operation: str, a: Any, b: Any) -> Any:
+        """
+        Perform one operation and wait for its result.
+
+        Args:
+            operation (str): Operation name, e.g. 'add'.
+            a (Any): First operand.
+            b (Any): Second operand.
+
+        Returns:
+            Any: The result (a Decimal for the default backend).
+
+        Raises:
+            ValueError: If the operation name is unknown.
+            ValidationError: If an operand is invalid.
+            OperationError: If the operation fails.
+        """
+        return self._request(OperationFactory.op_code(operation), a, b)
+
+    def pipeline(self, items: Iterable[Tuple[str, Any, Any]]) -> List[Any]:
+        """
+        Perform many operations with up to MAX_IN_FLIGHT requests in flight.
+
+        Args:
+            items (Iterable[Tuple[str, Any, Any]]): (operation, a, b) triples.
+
+        Returns:
+            List[Any]: Results in order; a failed item holds the exception
+                instance instead of raising.
+        """
+        frames = []
+        for operation, a, b in items:
+            self._next_id = (self._next_id + 1) & 0xFFFFFFFF
+            frames.append(encode_request(self._next_id, OperationFactory.op_code(operation), a, b))
+
+        results = []
+        for start in range(0, len(frames), MAX_IN_FLIGHT):
+            window = frames[start:start + MAX_IN_FLIGHT]
+            self._send(b''.join(window))
+            for _ in window:
+                _, status, value = self._receive()
+                try:
+                    results.append(_raise_for_status(status, value))
+                except CalculatorError as e:
+                    results.append(e)
+        return results
+
+
+class RPCClient:
+    """
+    Thread-safe client with a pool of connections to one session.
+
+    At most ``pool_size`` connections are open at once; callers beyond that
+    wait for a connection to be returned. Connections that fail at the
+    socket level are discarded rather than reused.
+    """
+
+    def __init__(self, path: str = DEFAULT_SOCKET_PATH, session: str = DEFAULT_SESSION,
+                 pool_size: int = DEFAULT_POOL_SIZE, timeout: Optional[float] = None):
+        """
+        Create the client; connections are opened lazily.
+
+        Args:
+            path (str, optional): Socket path. Defaults to DEFAULT_SOCKET_PATH.
+            session (str, optional): Session name. Defaults to DEFAULT_SESSION.
+            pool_size (int, optional): Maximum open connections. Defaults to DEFAULT_POOL_SIZE.
+            timeout (Optional[float], optional): Socket timeout in seconds.
+        """
+        self.path = path
+        self.session = session
+        self.timeout = timeout
+        self._idle: queue.LifoQueue = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(pool_size)
+
+    @contextmanager
+    def connection(self) -> Iterator[RPCConnection]:
+        """
+        Borrow a pooled connection.
+
+        Yields:
+            RPCConnection: A connection for the duration of the block.
+        """
+        self._slots.acquire()
+        try:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                conn = RPCConnection(self.path, self.session, self.timeout)
+            try:
+                yield conn
+            except OSError:
+                conn.close()
+                raise
+            self._idle.put(conn)
+        finally:
+            self._slots.release()
+
+    def calculate(self, operation: str, a: Any, b: Any) -> Any:
+        """
+        Perform one operation on a pooled connection.
+
+        Args:
+            operation (str): Operation name.
+            a (Any): First operand.
+            b (Any): Second operand.
+
+        Returns:
+            Any: The result.
+        """
+        with self.connection() as conn:
+            return conn.call(operation, a, b)
+
+    def calculate_many(self, items: Iterable[Tuple[str, Any, Any]]) -> List[Any]:
+        """
+        Pipeline many operations on one pooled connection.
+
+        Args:
+            items (Iterable[Tuple[str, Any, Any]]): (operation, a, b) triples.
+
+        Returns:
+            List[Any]: Results in order, with exception instances for failures.
+        """
+        with self.connection() as conn:
+            return conn.pipeline(items)
+
+    def close(self) -> None:
+        """Close every idle connection."""
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+    def __enter__(self) -> 'RPCClient':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Command-line entry point for the RPC server.
+
+    Args:
+        argv (Optional[List[str]], optional): Command-line arguments. Defaults
+            to sys.argv.
+
+    Returns:
+        int: Exit status.
+    """
+    parser = argparse.ArgumentParser(description="Serve the calculator over a Unix domain socket.")
+    parser.add_argument("--socket", default=DEFAULT_SOCKET_PATH, help="socket path")
+    args = parser.parse_args(argv)
+
+    server = RPCServer()
+    try:
+        asyncio.run(server.serve_forever(args.socket))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    raise SystemExit(main())
@@ -0,0 +1,532 @@
+########################
+# Calculator Service   #
+########################
+
+import argparse
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from decimal import Decimal
+import json
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from urllib.parse import parse_qs, urlsplit
+from weakref import WeakValueDictionary
+
+from app.calculator import Calculator
+from app.calculator_config import CalculatorConfig
+from app.calculator_manager import CalculatorManager
+from app.exceptions import CalculatorError
+from app.operations import OperationFactory
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_WORKERS = 4
+
+# Requests read ahead on one connection before the reader waits for responses
+MAX_PIPELINE_DEPTH = 32
+
+# Largest accepted request body in bytes
+MAX_BODY_SIZE = 1 << 20
+
+# Header naming the session a request belongs to
+SESSION_HEADER = 'x-session-id'
+DEFAULT_SESSION = 'default'
+
+REASONS = {
+    200: 'OK',
+    400: 'Bad Request',
+    404: 'Not Found',
+    405: 'Method Not Allowed',
+    413: 'Payload Too Large',
+    500: 'Internal Server Error',
+}
+
+
+class _HTTPError(Exception):
+    """Request failure that maps directly onto an HTTP status."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+@dataclass
+class Request:
+    """A parsed HTTP request."""
+
+    method: str
+    path: str
+    query: Dict[str, List[str]]
+    version: str
+    headers: Dict[str, str]
+    body: bytes = b''
+
+    @property
+    def keep_alive(self) -> bool:
+        """Whether the connection stays open after this request."""
+        connection = self.headers.get('connection', '').lower()
+        if self.version == 'HTTP/1.0':
+            return connection == 'keep-alive'
+        return connection != 'close'
+
+    @property
+    def session_id(self) -> str:
+        """Session named by the X-Session-Id header."""
+        return self.headers.get(SESSION_HEADER) or DEFAULT_SESSION
+
+
+@dataclass
+class Session:
+    """A client session with requests in progress; its calculator is hosted by a CalculatorManager."""
+
+    session_id: str
+    # Serializes the session's requests, in arrival order
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+
+def encode_response(status: int, payload: Dict[str, Any], keep_alive: bool) -> bytes:
+    """
+    Serialize a JSON response.
+
+    Args:
+        status (int): HTTP status code.
+        payload (Dict[str, Any]): JSON-serializable body.
+        keep_alive (bool): Whether the connection stays open.
+
+    Returns:
+        bytes: Status line, headers and body.
+    """
+    body = json.dumps(payload).encode('utf-8')
+    head = (
+        f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+        f"Content-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+    )
+    return head.encode('latin-1') + body
+
+
+async def read_request(reader: asyncio.StreamReader) -> Optional[Request]:
+    """
+    Read one HTTP/1.x request from a stream.
+
+    Args:
+        reader (asyncio.StreamReader): Connection to read from.
+
+    Returns:
+        Optional[Request]: The request, or None if the peer closed the
+            connection between requests.
+
+    Raises:
+        _HTTPError: If the request is malformed or too large.
+    """
+    try:
+        head = await reader.readuntil(b"\r\n\r\n")
+    except asyncio.IncompleteReadError as e:
+        if not e.partial.strip():
+            return None
+        raise _HTTPError(400, "Incomplete request")
+    except asyncio.LimitOverrunError:
+        raise _HTTPError(400, "Request header too large")
+
+    lines = head.decode('latin-1').strip().split("\r\n")
+    try:
+        method, target, version = lines[0].split()
+    except ValueError:
+        raise _HTTPError(400, "Malformed request line")
+
+    headers = {}
+    for line in lines[1:]:
+        name, separator, value = line.partition(':')
+        if not separator:
+            raise _HTTPError(400, "Malformed header line")
+        headers[name.strip().lower()] = value.strip()
+
+    if 'transfer-encoding' in headers:
+        raise _HTTPError(400, "Chunked request bodies are not supported")
+    try:
+        length = int(headers.get('content-length', '0'))
+    except ValueError:
+        raise _HTTPError(400, "Invalid Content-Length")
+    if length < 0:
+        raise _HTTPError(400, "Invalid Content-Length")
+    if length > MAX_BODY_SIZE:
+        raise _HTTPError(413, f"Request body exceeds {MAX_BODY_SIZE} bytes")
+    try:
+        body = await reader.readexactly(length) if length else b''
+    except asyncio.IncompleteReadError:
+        raise _HTTPError(400, "Incomplete request body")
+
+    url = urlsplit(target)
+    return Request(method.upper(), url.path, parse_qs(url.query), version, headers, body)
+
+
+def _json_body(request: Request) -> Dict[str, Any]:
+    """
+    Decode a JSON object body, keeping JSON numbers exact as Decimals.
+
+    Args:
+        request (Request): Request whose body is decoded.
+
+    Returns:
+        Dict[str, Any]: The decoded object, empty for an empty body.
+
+    Raises:
+        _HTTPError: If the body is not a JSON object.
+    """
+    if not request.body:
+        return {}
+    try:
+        data = json.loads(request.body, parse_float=Decimal)
+    except (UnicodeDecodeError, json.JSONDecodeError):
+        raise _HTTPError(400, "Request body is not valid JSON")
+    if not isinstance(data, dict):
+        raise _HTTPError(400, "Request body must be a JSON object")
+    return data
+
+
+def _operation_key(item: Any) -> Any:
+    """Get an item's operation as an op code or a name, for OperationFactory."""
+    operation = item['operation']
+    return operation if type(operation) is int else str(operation)
+
+
+def _is_heavy(item: Any) -> bool:
+    """
+    Check whether a request item names a heavy operation, by name or op code.
+
+    Args:
+        item (Any): Decoded request item.
+
+    Returns:
+        bool: False for malformed items and unknown operations, which fail fast.
+    """
+    try:
+        return OperationFactory.create_operation(_operation_key(item)).heavy
+    except (TypeError, KeyError, ValueError):
+        return False
+
+
+def _perform(calculator: Calculator, item: Any) -> Dict[str, str]:
+    """
+    Run one {"operation", "a", "b"} item on a session's calculator.
+
+    The operation is a name or an op code. The calculator's operation
+    strategy is left untouched, so this is safe on a worker thread.
+
+    Args:
+        calculator (Calculator): The session's calculator.
+        item (Any): Decoded request item.
+
+    Returns:
+        Dict[str, str]: {"result": ...} on success or {"error": ...} on failure.
+    """
+    if not isinstance(item, dict) or not {'operation', 'a', 'b'} <= item.keys():
+        return {'error': "Expected an object with 'operation', 'a' and 'b'"}
+    try:
+        return {'result': str(calculator.calculate(_operation_key(item), item['a'], item['b']))}
+    except (CalculatorError, ValueError) as e:
+        return {'error': str(e)}
+
+
+class CalculatorService:
+    """
+    Asyncio HTTP/JSON front end for the calculator.
+
+    Every session (the X-Session-Id header) gets its own Calculator, so
+    history and undo/redo are per client. Sessions are hosted by a
+    CalculatorManager, which saves and drops the least recently used ones
+    over its memory budget and bounds their undo stacks. Connections are
+    kept alive and may pipeline requests; responses are written in request
+    order. Cheap operations run on the event loop, while heavy operations
+    (named or by op code) and batches run on a bounded thread pool so they
+    cannot stall other connections.
+
+    Endpoints (all JSON):
+        POST /calculate  {"operation", "a", "b"} -> {"result"}
+        POST /batch      {"operations": [...]} -> {"results": [{"result"} | {"error"}]}
+        GET  /history    [?limit=N] -> {"history": [...]}
+        POST /undo       -> {"success", "history_size"}
+        POST /redo       -> {"success", "history_size"}
+        GET  /health     -> {"status", "sessions"}
+    """
+
+    def __init__(
+        self,
+        config: Optional[CalculatorConfig] = None,
+        workers: int = DEFAULT_WORKERS,
+        manager: Optional[CalculatorManager] = None
+    ):
+        """
+        Create the service.
+
+        Args:
+            config (Optional[CalculatorConfig], optional): Configuration shared by
+                every session's calculator. Defaults to the environment configuration.
+            workers (int, optional): Size of the worker pool. Defaults to DEFAULT_WORKERS.
+            manager (Optional[CalculatorManager], optional): Manager hosting the
+                sessions. Defaults to a new one for the configuration.
+        """
+        self.config = config or CalculatorConfig()
+        self.manager = manager or CalculatorManager(self.config)
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='calculator-worker')
+        # Sessions with requests in progress; each is dropped when its last request finishes
+        self.sessions: 'WeakValueDictionary[str, Session]' = WeakValueDictionary()
+        self.server: Optional[asyncio.AbstractServer] = None
+        self._writers: set = set()
+        self.routes: Dict[str, Dict[str, Callable[[Request], Awaitable[Dict[str, Any]]]]] = {
+            '/calculate': {'POST': self._calculate},
+            '/batch': {'POST': self._batch},
+            '/history': {'GET': self._history},
+            '/undo': {'POST': self._undo},
+            '/redo': {'POST': self._redo},
+            '/health': {'GET': self._health},
+        }
+
+    @property
+    def port(self) -> int:
+        """Port the server is bound to."""
+        return self.server.sockets[0].getsockname()[1]
+
+    def session(self, session_id: str) -> Session:
+        """
+        Get the lock holder of a session, shared by its requests in progress.
+
+        Args:
+            session_id (str): Session identifier.
+
+        Returns:
+            Session: The session's identifier and lock.
+        """
+        session = self.sessions.get(session_id)
+        if session is None:
+            session = self.sessions[session_id] = Session(session_id)
+        return session
+
+    async def start(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> asyncio.AbstractServer:
+        """
+        Start listening.
+
+        Args:
+            host (str, optional): Interface to bind. Defaults to DEFAULT_HOST.
+            port (int, optional): Port to bind, 0 for any free port. Defaults to DEFAULT_PORT.
+
+        Returns:
+            asyncio.AbstractServer: The listening server.
+        """
+        self.server = await asyncio.start_server(self._handle_connection, host, port)
+        logging.info(f"Calculator service listening on {host}:{self.port}")
+        return self.server
+
+    async def close(self) -> None:
+        """Stop listening, close open connections, shut down the worker pool and save the sessions."""
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        for writer in list(self._writers):
+            writer.close()
+        self.executor.shutdown(wait=True)
+        self.manager.close()
+
+    async def serve_forever(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> None:
+        """
+        Start the server and run until cancelled.
+
+        Args:
+            host (str, optional): Interface to bind. Defaults to DEFAULT_HOST.
+            port (int, optional): Port to bind. Defaults to DEFAULT_PORT.
+        """
+        await self.start(host, port)
+        print(f"Calculator service listening on http://{host}:{self.port}")
+        try:
+            await self.server.serve_forever()
+        finally:
+            await self.close()
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """
+        Serve one keep-alive connection.
+
+        Requests are read ahead up to MAX_PIPELINE_DEPTH and dispatched as soon
+        as they arrive; a separate task writes the responses in request order.
+
+        Args:
+            reader (asyncio.StreamReader): Incoming stream.
+            writer (asyncio.StreamWriter): Outgoing stream.
+        """
+        self._writers.add(writer)
+        pending: asyncio.Queue = asyncio.Queue(maxsize=MAX_PIPELINE_DEPTH)
+        sender = asyncio.create_task(self._send_responses(pending, writer))
+        try:
+            while True:
+                try:
+                    request = await read_request(reader)
+                except _HTTPError as e:
+                    failed = asyncio.get_running_loop().create_future()
+                    failed.set_result(encode_response(e.status, {'error': e.message}, False))
+                    await pending.put(failed)
+                    break
+                except ConnectionError:
+                    break
+                if request is None:
+                    break
+                await pending.put(asyncio.ensure_future(self._respond(request)))
+                if not request.keep_alive:
+                    break
+        finally:
+            await pending.put(None)
+            await sender
+            self._writers.discard(writer)
+            writer.close()
+
+    async def _send_responses(self, pending: asyncio.Queue, writer: asyncio.StreamWriter) -> None:
+        """
+        Write responses in request order until the connection is done.
+
+        Args:
+            pending (asyncio.Queue): Response futures, ending with None.
+            writer (asyncio.StreamWriter): Outgoing stream.
+        """
+        broken = False
+        while True:
+            response = await pending.get()
+            if response is None:
+                return
+            data = await response
+            if broken:
+                continue
+            try:
+                writer.write(data)
+                await writer.drain()
+            except ConnectionError:
+                # Keep draining the queue so the reader is never blocked
+                broken = True
+
+    async def _respond(self, request: Request) -> bytes:
+        """
+        Route a request and serialize its response.
+
+        Args:
+            request (Request): Parsed request.
+
+        Returns:
+            bytes: The encoded response.
+        """
+        try:
+            methods = self.routes.get(request.path)
+            if methods is None:
+                raise _HTTPError(404, f"Unknown endpoint: {request.path}")
+            handler = methods.get(request.method)
+            if handler is None:
+                raise _HTTPError(405, f"Method {request.method} not allowed for {request.path}")
+            status, payload = 200, await handler(request)
+        except _HTTPError as e:
+            status, payload = e.status, {'error': e.message}
+        except Exception as e:
+            logging.error(f"Service request failed: {e}")
+            status, payload = 500, {'error': "Internal server error"}
+        return encode_response(status, payload, request.keep_alive)
+
+    async def _calculate(self, request: Request) -> Dict[str, Any]:
+        """Perform a single operation in the request's session."""
+        item = _json_body(request)
+        session = self.session(request.session_id)
+        async with session.lock:
+            with self.manager.hold(session.session_id) as calculator:
+                if _is_heavy(item):
+                    outcome = await asyncio.get_running_loop().run_in_executor(
+                        self.executor, _perform, calculator, item
+                    )
+                else:
+                    outcome = _perform(calculator, item)
+        if 'error' in outcome:
+            raise _HTTPError(400, outcome['error'])
+        return outcome
+
+    async def _batch(self, request: Request) -> Dict[str, Any]:
+        """Perform a list of operations in order on the worker pool."""
+        items = _json_body(request).get('operations')
+        if not isinstance(items, list):
+            raise _HTTPError(400, "Expected 'operations' to be a list")
+        session = self.session(request.session_id)
+        async with session.lock:
+            with self.manager.hold(session.session_id) as calculator:
+
+                def run_batch() -> List[Dict[str, str]]:
+                    return [_perform(calculator, item) for item in items]
+
+                results = await asyncio.get_running_loop().run_in_executor(self.executor, run_batch)
+        return {'results': results}
+
+    async def _history(self, request: Request) -> Dict[str, Any]:
+        """Return the session's history, optionally only the last N entries."""
+        try:
+            limit = int(request.query.get('limit', ['0'])[0])
+        except ValueError:
+            raise _HTTPError(400, "limit must be an integer")
+        session = self.session(request.session_id)
+        async with session.lock:
+            calculator = self.manager.get(session.session_id)
+            history = calculator.history[-limit:] if limit > 0 else calculator.history
+            entries = [
+                {
+                    'operation': calc.operation,
+                    'operand1': str(calc.operand1),
+                    'operand2': str(calc.operand2),
+                    'result': str(calc.result),
+                    'timestamp': calc.timestamp.isoformat(),
+                }
+                for calc in history
+            ]
+        return {'history': entries}
+
+    async def _undo(self, request: Request) -> Dict[str, Any]:
+        """Undo the session's last calculation."""
+        session = self.session(request.session_id)
+        async with session.lock:
+            calculator = self.manager.get(session.session_id)
+            success = calculator.undo()
+            return {'success': success, 'history_size': len(calculator.history)}
+
+    async def _redo(self, request: Request) -> Dict[str, Any]:
+        """Redo the session's last undone calculation."""
+        session = self.session(request.session_id)
+        async with session.lock:
+            calculator = self.manager.get(session.session_id)
+            success = calculator.redo()
+            return {'success': success, 'history_size': len(calculator.history)}
+
+    async def _health(self, request: Request) -> Dict[str, Any]:
+        """Report liveness and the number of resident sessions."""
+        return {'status': 'ok', 'sessions': len(self.manager.sessions)}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Command-line entry point for the HTTP service.
+
+    Args:
+        argv (Optional[List[str]], optional): Command-line arguments. Defaults
+            to sys.argv.
+
+    Returns:
+        int: Exit status.
+    """
+    parser = argparse.ArgumentParser(description="Serve the calculator over HTTP/JSON.")
+    parser.add_argument("--host", default=DEFAULT_HOST, help="interface to bind")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="port to bind")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="worker pool size")
+    args = parser.parse_args(argv)
+
+    service = CalculatorService(workers=args.workers)
+    try:
+        asyncio.run(service.serve_forever(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    raise SystemExit(main())
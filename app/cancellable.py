@@ -0,0 +1,145 @@
+########################
+# Cancellable Workers  #
+########################
+
+import atexit
+from dataclasses import dataclass
+import multiprocessing
+from multiprocessing.connection import Connection
+from multiprocessing.process import BaseProcess
+import threading
+from typing import Any, Callable, List, Optional, Tuple
+
+from app.exceptions import OperationError
+
+
+@dataclass
+class _Worker:
+    """A worker process and the parent's end of its pipe."""
+
+    process: BaseProcess
+    connection: Connection
+
+
+def serve(connection: Connection) -> None:
+    """
+    Run calls sent over a connection until it is closed. Runs in a worker.
+
+    Each message is a (function, args) pair. The reply is (True, result), or
+    (False, exception) if the call raised.
+
+    Args:
+        connection (Connection): The worker's end of the pipe.
+    """
+    while True:
+        try:
+            function, args = connection.recv()
+        except EOFError:
+            return
+        try:
+            reply = (True, function(*args))
+        except Exception as e:
+            reply = (False, e)
+        connection.send(reply)
+
+
+class CancellableWorker:
+    """
+    Runs calls in worker processes that can be killed mid-call.
+
+    A thread cannot be stopped from outside, so a runaway calculation on the
+    REPL or a service thread would hold it until done. Here each call runs in
+    a worker process instead; if it overruns its timeout the process is
+    terminated and the caller gets an OperationError on time. Idle processes
+    are reused, and concurrent calls each get their own.
+    """
+
+    def __init__(self, start_method: Optional[str] = None):
+        """
+        Create a worker pool that starts processes on demand.
+
+        Args:
+            start_method (Optional[str], optional): multiprocessing start method.
+                Defaults to the platform default.
+        """
+        self._context = multiprocessing.get_context(start_method)
+        self._idle: List[_Worker] = []
+        self._lock = threading.Lock()
+
+    def _acquire(self) -> _Worker:
+        """Take an idle worker, or start one."""
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+        parent, child = self._context.Pipe()
+        process = self._context.Process(target=serve, args=(child,), daemon=True)
+        process.start()
+        child.close()
+        return _Worker(process, parent)
+
+    @staticmethod
+    def _kill(worker: _Worker) -> None:
+        """Terminate a worker and release its resources."""
+        worker.process.terminate()
+        worker.process.join()
+        worker.connection.close()
+
+    def call(self, function: Callable[..., Any], args: Tuple[Any, ...], timeout: float) -> Any:
+        """
+        Call a function in a worker process, giving up after a timeout.
+
+        Args:
+            function (Callable[..., Any]): Module-level function to call.
+            args (Tuple[Any, ...]): Its arguments, which must pickle.
+            timeout (float): Seconds to wait for the result.
+
+        Returns:
+            Any: What the function returned.
+
+        Raises:
+            OperationError: If the call times out or the worker dies.
+            Exception: Whatever the function raised.
+        """
+        worker = self._acquire()
+        try:
+            worker.connection.send((function, args))
+            if not worker.connection.poll(timeout):
+                raise OperationError(f"Calculation did not finish within {timeout:g}s and was cancelled")
+            ok, value = worker.connection.recv()
+        except EOFError:
+            self._kill(worker)
+            raise OperationError("Calculation worker exited unexpectedly")
+        except BaseException:
+            self._kill(worker)
+            raise
+        with self._lock:
+            self._idle.append(worker)
+        if ok:
+            return value
+        raise value
+
+    def close(self) -> None:
+        """Terminate the idle workers. Safe to call more than once."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for worker in idle:
+            self._kill(worker)
+
+
+_worker: Optional[CancellableWorker] = None
+_worker_lock = threading.Lock()
+
+
+def shared_worker() -> CancellableWorker:
+    """
+    Get this process's cancellable worker pool, creating it once.
+
+    Returns:
+        CancellableWorker: The pool, closed at exit.
+    """
+    global _worker
+    with _worker_lock:
+        if _worker is None:
+            _worker = CancellableWorker()
+            atexit.register(_worker.close)
+        return _worker
@@ -0,0 +1,239 @@
+########################
+# Combinatorics        #
+########################
+
+from collections import OrderedDict
+from decimal import Decimal
+import math
+import sys
+import threading
+from typing import Any, Callable, Hashable, List, Optional
+
+# Memory for the table of consecutive factorials, which then holds 0! up to
+# about 6,000!, and for memoized binomials, permutations and larger factorials
+DEFAULT_TABLE_BYTES = 32 * 1024 * 1024
+DEFAULT_MEMO_BYTES = 32 * 1024 * 1024
+
+# Ranges with fewer terms than this are multiplied in a plain loop
+SPLIT_TERMS = 16
+
+
+def range_product(start: int, stop: int, step: int = 1) -> int:
+    """
+    Multiply the terms of range(start, stop, step) by binary splitting.
+
+    Multiplying the two halves recursively keeps the operands of each
+    multiplication about the same size, which big-int multiplication
+    handles far faster than a long run of small by large products.
+
+    Args:
+        start (int): First term.
+        stop (int): End of the range, excluded.
+        step (int, optional): Difference between terms. Defaults to 1.
+
+    Returns:
+        int: The product; 1 for an empty range.
+    """
+    terms = len(range(start, stop, step))
+    if terms < SPLIT_TERMS:
+        return math.prod(range(start, stop, step))
+    middle = start + (terms // 2) * step
+    return range_product(start, middle, step) * range_product(middle, stop, step)
+
+
+class FactorialTable:
+    """
+    Factorials, binomial coefficients and permutations, remembered.
+
+    Consecutive factorials 0!, 1!, 2!, ... are kept in a table that grows on
+    demand, one multiplication per entry, until it reaches its memory limit.
+    Other results (larger factorials, multifactorials, binomials and
+    permutations) are computed with the divide-and-conquer algorithms of
+    math.factorial, math.comb and math.perm, or range_product, and kept in a
+    memo that drops the least recently used entries beyond its own limit.
+    Repeated calls in a tight loop are then a lookup. Safe to share between
+    threads.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_TABLE_BYTES, memo_bytes: int = DEFAULT_MEMO_BYTES):
+        """
+        Create an empty table.
+
+        Args:
+            max_bytes (int, optional): Memory for consecutive factorials.
+                Defaults to DEFAULT_TABLE_BYTES.
+            memo_bytes (int, optional): Memory for other results. Defaults to
+                DEFAULT_MEMO_BYTES.
+        """
+        self.max_bytes = max_bytes
+        self.memo_bytes = memo_bytes
+        self._factorials: List[int] = [1]
+        self._bytes = sys.getsizeof(1)
+        self._full = False
+        self._memo: 'OrderedDict[Hashable, Any]' = OrderedDict()
+        self._memo_used = 0
+        self._lock = threading.Lock()
+
+    @property
+    def size(self) -> int:
+        """Number of consecutive factorials in the table."""
+        return len(self._factorials)
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the table and the memo, in bytes."""
+        return self._bytes + self._memo_used
+
+    def _grow(self, n: int) -> bool:
+        """
+        Extend the table to n!, if it fits. Called with the lock held.
+
+        Args:
+            n (int): Largest factorial wanted.
+
+        Returns:
+            bool: Whether n! is now in the table.
+        """
+        factorials = self._factorials
+        while len(factorials) <= n:
+            if self._full:
+                return False
+            value = factorials[-1] * len(factorials)
+            size = sys.getsizeof(value)
+            if self._bytes + size > self.max_bytes:
+                self._full = True
+                return False
+            factorials.append(value)
+            self._bytes += size
+        return True
+
+    def _remember(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """
+        Look a result up in the memo, computing and storing it on a miss.
+
+        The computation runs without the lock, so racing threads may both
+        compute a result; either copy is kept.
+
+        Args:
+            key (Hashable): Kind of result and its operands.
+            compute (Callable[[], Any]): Function computing the result.
+
+        Returns:
+            Any: The result.
+        """
+        with self._lock:
+            value = self._memo.get(key)
+            if value is not None:
+                self._memo.move_to_end(key)
+                return value
+        value = compute()
+        size = sys.getsizeof(value)
+        if size > self.memo_bytes:
+            return value
+        with self._lock:
+            if key not in self._memo:
+                self._memo[key] = value
+                self._memo_used += size
+                while self._memo_used > self.memo_bytes:
+                    _, dropped = self._memo.popitem(last=False)
+                    self._memo_used -= sys.getsizeof(dropped)
+        return value
+
+    def factorial(self, n: int, step: int = 1) -> int:
+        """
+        Compute n!, or the multifactorial n (n - step) (n - 2 step) ... for step > 1.
+
+        Args:
+            n (int): Non-negative integer.
+            step (int, optional): Positive step; 2 gives the double factorial.
+                Defaults to 1.
+
+        Returns:
+            int: The factorial.
+        """
+        if step == 1:
+            with self._lock:
+                if n < len(self._factorials) or self._grow(n):
+                    return self._factorials[n]
+            return self._remember(('factorial', n, 1), lambda: math.factorial(n))
+        return self._remember(('factorial', n, step), lambda: range_product(n, 0, -step))
+
+    def binomial(self, n: int, k: int) -> int:
+        """
+        Compute the binomial coefficient C(n, k), zero when k > n.
+
+        Args:
+            n (int): Non-negative number of items.
+            k (int): Non-negative number chosen.
+
+        Returns:
+            int: The number of ways to choose k of n items.
+        """
+        # C(n, k) == C(n, n - k), so both share one memo entry
+        k = min(k, n - k) if k <= n else k
+        return self._remember(('binomial', n, k), lambda: math.comb(n, k))
+
+    def permutations(self, n: int, k: int) -> int:
+        """
+        Compute the number of ordered arrangements of k of n items, zero when k > n.
+
+        Args:
+            n (int): Non-negative number of items.
+            k (int): Non-negative number arranged.
+
+        Returns:
+            int: n! / (n - k)!
+        """
+        return self._remember(('permutations', n, k), lambda: math.perm(n, k))
+
+    def as_decimal(self, kind: str, n: int, k: int) -> Decimal:
+        """
+        Get a result as a Decimal, remembering the conversion too.
+
+        Converting a big int to Decimal takes time quadratic in its digits,
+        far longer than looking the int up, so the Decimal is memoized as well.
+
+        Args:
+            kind (str): 'factorial', 'binomial' or 'permutations'.
+            n (int): First operand of that method.
+            k (int): Second operand of that method.
+
+        Returns:
+            Decimal: The result.
+        """
+        return self._remember(('decimal', kind, n, k), lambda: Decimal(getattr(self, kind)(n, k)))
+
+
+_table: Optional[FactorialTable] = None
+_table_lock = threading.Lock()
+
+
+def factorial_table() -> FactorialTable:
+    """
+    Get this process's shared factorial table, creating it once.
+
+    Returns:
+        FactorialTable: The table used by the combinatorics operations.
+    """
+    global _table
+    with _table_lock:
+        if _table is None:
+            _table = FactorialTable()
+        return _table
+
+
+def set_factorial_table(table: Optional[FactorialTable]) -> Optional[FactorialTable]:
+    """
+    Replace this process's shared factorial table, e.g. to change its limits.
+
+    Args:
+        table (Optional[FactorialTable]): The new table, or None for a default
+            one on next use.
+
+    Returns:
+        Optional[FactorialTable]: The previous table.
+    """
+    global _table
+    with _table_lock:
+        previous, _table = _table, table
+    return previous
@@ -0,0 +1,247 @@
+########################
+# Cost Model           #
+########################
+
+from decimal import Decimal
+from fractions import Fraction
+import math
+from typing import Any
+
+import numpy as np
+
+from app.decimal_math import GUARD_DIGITS
+from app.exceptions import OperationError
+
+# Rough seconds per unit of work on one core, fitted to libmpdec timings.
+# Only the order of magnitude matters: estimates decide whether a calculation
+# runs at all and where, they do not predict how long it takes
+CALL_SECONDS = 2e-6        # Fixed overhead of any calculation
+MULTIPLY_SECONDS = 4.5e-9  # Times digits ** 1.4, for one multiplication
+SERIES_SECONDS = 1e-9      # Times digits ** 2.6, for a ln/exp evaluation
+ELEMENT_SECONDS = 2e-9     # Per float or array element
+INTEGER_SECONDS = 4e-11    # Times digits ** 2, for a big-int division or Decimal/int conversion
+
+# A division costs about this many multiplications
+DIVIDE_FACTOR = 4
+
+# Operations that divide
+DIVIDING_OPERATIONS = frozenset({'Division', 'Percent', 'IntegerDivision', 'Modulus'})
+
+# Operations on integers of any size, from app.number_theory
+INTEGER_OPERATIONS = frozenset({
+    'GreatestCommonDivisor', 'LeastCommonMultiple', 'IntegerPower', 'IntegerRoot', 'ModularPower',
+    'Factorial', 'Binomial', 'Permutations'
+})
+
+# Integer operations whose results are counted with factorials
+COMBINATORIAL_OPERATIONS = frozenset({'Factorial', 'Binomial', 'Permutations'})
+
+# Calculations estimated to take longer than this are rejected by default
+DEFAULT_COST_BUDGET = 10.0
+
+# With a deadline configured, calculations estimated to take longer than this
+# run on a cancellable worker instead of the calling thread
+INLINE_SECONDS = 0.01
+
+
+def _digits(value: Any) -> int:
+    """Number of significant decimal digits of an exact operand."""
+    if isinstance(value, Decimal):
+        return len(value.as_tuple().digits)
+    if isinstance(value, Fraction):
+        return max(_digits(value.numerator), _digits(value.denominator))
+    return (abs(int(value)).bit_length() * 30103) // 100000 + 1
+
+
+def _integral(value: Any) -> bool:
+    """Check whether an exact operand holds an integer value."""
+    if isinstance(value, Decimal):
+        return value.is_finite() and value == value.to_integral_value()
+    return value == int(value)
+
+
+def multiply_seconds(digits: int) -> float:
+    """
+    Estimate the time of one multiplication.
+
+    Args:
+        digits (int): Digits of the operands.
+
+    Returns:
+        float: Estimated seconds.
+    """
+    return MULTIPLY_SECONDS * digits ** 1.4
+
+
+def integer_seconds(digits: int) -> float:
+    """
+    Estimate the time of one big-int division, or of converting an integer
+    between Decimal and int. Both are quadratic in CPython.
+
+    Args:
+        digits (int): Digits of the integer.
+
+    Returns:
+        float: Estimated seconds.
+    """
+    return INTEGER_SECONDS * digits ** 2
+
+
+def _magnitude(value: Any) -> int:
+    """Number of digits in the integer part of an operand."""
+    if isinstance(value, Decimal):
+        return max(value.adjusted() + 1, 1) if value.is_finite() else 1
+    return _digits(value)
+
+
+def _log10_factorial(n: float) -> float:
+    """Number of digits of n!, as a float."""
+    return math.lgamma(n + 1) / math.log(10)
+
+
+def _combinatorial_digits(operation: str, a: Any, b: Any) -> float:
+    """
+    Estimate the number of digits of a factorial, binomial or permutation count.
+
+    Args:
+        operation (str): 'Factorial', 'Binomial' or 'Permutations'.
+        a (Any): First validated operand, n.
+        b (Any): Second validated operand, the step or k.
+
+    Returns:
+        float: Digits of the result; at least 1.
+    """
+    n, k = max(float(a), 0.0), max(float(b), 0.0)
+    if operation == 'Factorial':
+        return 1 + _log10_factorial(n) / max(k, 1.0)
+    if k > n:
+        return 1
+    if operation == 'Binomial':
+        k = min(k, n - k)
+        digits = _log10_factorial(n) - _log10_factorial(k) - _log10_factorial(n - k)
+    else:
+        digits = _log10_factorial(n) - _log10_factorial(n - k)
+    # Differences of large lgammas lose precision, and k factors of at most
+    # n digits each bound the result anyway
+    return 1 + max(min(digits, k * math.log10(n + 1)), 0.0)
+
+
+def _integer_estimate(operation: str, a: Any, b: Any) -> float:
+    """
+    Estimate a number theory calculation, from the sizes of its integers.
+
+    Operands are converted to ints and the result back to Decimal, which
+    costs as much as a division. Powers and combinatorial counts cost their
+    last multiplications and the conversion of the result; modular powers
+    one reduction per exponent bit.
+
+    Args:
+        operation (str): Operation name as recorded in the history.
+        a (Any): First validated operand.
+        b (Any): Second validated operand.
+
+    Returns:
+        float: Estimated seconds.
+    """
+    name, _, modulus = operation.partition('[')
+    digits = max(_magnitude(a), _magnitude(b))
+    if name == 'IntegerPower':
+        # Powers of 0, 1 and -1 stay one digit long
+        if abs(a) <= 1:
+            result = 1
+        elif _magnitude(b) > 18:
+            return math.inf
+        else:
+            result = _magnitude(a) * abs(int(b))
+        return 2 * multiply_seconds(result) + integer_seconds(result) + 2 * integer_seconds(digits)
+    if name in COMBINATORIAL_OPERATIONS:
+        result = _combinatorial_digits(name, a, b)
+        return 2 * multiply_seconds(result) + integer_seconds(result) + 2 * integer_seconds(digits)
+    if name == 'ModularPower':
+        bits = _magnitude(b) * math.log2(10)
+        return bits * integer_seconds(len(modulus)) + 2 * integer_seconds(digits)
+    # Conversions in and out, the calculation itself, and a division for lcm
+    return 5 * integer_seconds(digits)
+
+
+def series_seconds(digits: int) -> float:
+    """
+    Estimate the time of a ln/exp evaluation, as used by fractional powers.
+
+    Args:
+        digits (int): Working precision.
+
+    Returns:
+        float: Estimated seconds.
+    """
+    return SERIES_SECONDS * digits ** 2.6
+
+
+def estimate_seconds(operation: str, a: Any, b: Any, precision: int) -> float:
+    """
+    Estimate how long a calculation will take, from its operands and precision.
+
+    Float and array operands cost a fixed amount per element. Exact operands
+    cost by the work the Decimal engine does: one multiplication or division
+    at the working precision for arithmetic, a squaring chain for integral
+    powers, Newton iteration for integral roots and ln/exp for fractional
+    powers and roots.
+
+    Args:
+        operation (str): Operation name as recorded in the history (e.g., 'Power').
+        a (Any): First validated operand.
+        b (Any): Second validated operand.
+        precision (int): Precision the calculation runs at.
+
+    Returns:
+        float: Estimated seconds.
+    """
+    if isinstance(a, (float, np.ndarray)) or isinstance(b, (float, np.ndarray)):
+        return CALL_SECONDS + ELEMENT_SECONDS * max(np.size(a), np.size(b))
+
+    if operation.partition('[')[0] in INTEGER_OPERATIONS:
+        return CALL_SECONDS + _integer_estimate(operation, a, b)
+
+    digits = max(precision + GUARD_DIGITS, _digits(a), _digits(b))
+    if operation == 'Power':
+        if not _integral(b):
+            return CALL_SECONDS + series_seconds(digits)
+        # Each squaring step carries one more guard digit
+        steps = abs(int(b)).bit_length()
+        return CALL_SECONDS + 2 * steps * multiply_seconds(digits + steps)
+    if operation == 'Root':
+        if not _integral(b):
+            return CALL_SECONDS + series_seconds(digits)
+        # Newton doubles the correct digits per iteration, from about ten;
+        # each iteration raises to degree - 1 and divides twice
+        iterations = max(1, (digits // 10).bit_length())
+        work = abs(int(b)).bit_length() + 2 * DIVIDE_FACTOR
+        return CALL_SECONDS + iterations * work * multiply_seconds(digits)
+    if operation in DIVIDING_OPERATIONS:
+        return CALL_SECONDS + DIVIDE_FACTOR * multiply_seconds(digits)
+    return CALL_SECONDS + multiply_seconds(digits)
+
+
+def check_budget(operation: str, a: Any, b: Any, precision: int, budget: float) -> float:
+    """
+    Estimate a calculation and reject it if it is over budget.
+
+    Args:
+        operation (str): Operation name as recorded in the history.
+        a (Any): First validated operand.
+        b (Any): Second validated operand.
+        precision (int): Precision the calculation runs at.
+        budget (float): Largest estimate allowed, in seconds.
+
+    Returns:
+        float: The estimate, in seconds.
+
+    Raises:
+        OperationError: If the estimate exceeds the budget.
+    """
+    seconds = estimate_seconds(operation, a, b, precision)
+    if seconds > budget:
+        raise OperationError(
+            f"{operation} is estimated to take {seconds:.3g}s, over the budget of {budget:g}s"
+        )
+    return seconds
@@ -0,0 +1,292 @@
+########################
+# CSV Batch Jobs       #
+########################
+
+import argparse
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+import csv
+from dataclasses import dataclass
+import io
+import json
+import logging
+import multiprocessing
+import os
+from pathlib import Path
+import time
+from typing import BinaryIO, Deque, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.calculator_config import CalculatorConfig
+from app import shared_batch
+from app.operations import OperationFactory
+from app.shared_batch import (
+    FLOAT_BACKENDS, STATUS_OK, STATUS_OPERATION_ERROR, STATUS_VALIDATION_ERROR,
+    _init_worker, compute_decimal_rows, compute_float_rows, encode_floats
+)
+
+DEFAULT_CHUNK_ROWS = 65536
+
+INPUT_HEADER = ['operation', 'operand1', 'operand2']
+OUTPUT_HEADER = INPUT_HEADER + ['result', 'status']
+
+# Status column values; the shared batch codes plus row-level problems
+STATUS_NAMES = {
+    STATUS_OK: 'ok',
+    STATUS_VALIDATION_ERROR: 'validation_error',
+    STATUS_OPERATION_ERROR: 'operation_error',
+}
+UNKNOWN_OPERATION = 'unknown_operation'
+MALFORMED_ROW = 'malformed_row'
+
+# No decimal result is too long for a CSV cell
+UNLIMITED_WIDTH = 1 << 20
+
+
+@dataclass
+class JobReport:
+    """
+    Outcome of a CSV batch job.
+
+    Attributes:
+        rows: Rows evaluated by this run
+        failures: Rows of this run whose status is not 'ok'
+        chunks: Chunks evaluated by this run
+        resumed_rows: Rows already done by an earlier, interrupted run
+        elapsed: Wall-clock seconds of this run
+    """
+
+    rows: int = 0
+    failures: int = 0
+    chunks: int = 0
+    resumed_rows: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def throughput(self) -> float:
+        """float: Rows per second of this run."""
+        return self.rows / self.elapsed if self.elapsed else 0.0
+
+    def summary(self) -> str:
+        """
+        Format the report for display.
+
+        Returns:
+            str: A human-readable summary.
+        """
+        lines = [
+            f"Rows: {self.rows} in {self.chunks} chunks ({self.failures} failed)",
+            f"Throughput: {self.throughput:.0f} rows/s",
+        ]
+        if self.resumed_rows:
+            lines.append(f"Resumed after {self.resumed_rows} rows")
+        return "\n".join(lines)
+
+
+def evaluate_rows(rows: List[List[str]]) -> List[Tuple[str, str]]:
+    """
+    Evaluate one chunk of parsed rows in a worker.
+
+    Rows are grouped by operation so each group is computed by the shared
+    batch kernels: row by row in the Decimal context for the decimal and
+    hybrid backends, with one vectorized call for the float backends.
+
+    Args:
+        rows (List[List[str]]): Rows of operation name and two operand literals.
+
+    Returns:
+        List[Tuple[str, str]]: Result literal ('' if failed) and status per row.
+    """
+    results: List[Tuple[str, str]] = [('', MALFORMED_ROW)] * len(rows)
+    groups: Dict[str, List[int]] = {}
+    for index, row in enumerate(rows):
+        if len(row) == 3:
+            groups.setdefault(row[0].strip().lower(), []).append(index)
+    for name, indices in groups.items():
+        if not OperationFactory.has_operation(name):
+            for index in indices:
+                results[index] = ('', UNKNOWN_OPERATION)
+            continue
+        a = [rows[index][1] for index in indices]
+        b = [rows[index][2] for index in indices]
+        if shared_batch._config.backend in FLOAT_BACKENDS:
+            values = np.empty(len(indices))
+            statuses = np.empty(len(indices), np.uint8)
+            compute_float_rows(name, encode_floats(a), encode_floats(b), values, statuses)
+            texts = [repr(value) if status == STATUS_OK else '' for value, status in zip(values.tolist(), statuses)]
+        else:
+            texts, statuses = compute_decimal_rows(name, a, b, UNLIMITED_WIDTH)
+        for index, text, status in zip(indices, texts, statuses):
+            results[index] = (text, STATUS_NAMES[int(status)])
+    return results
+
+
+def _read_chunk(source: BinaryIO, rows: int, encoding: str) -> List[str]:
+    """Read up to a number of lines, so the file offset marks a row boundary."""
+    lines = []
+    while len(lines) < rows:
+        line = source.readline()
+        if not line:
+            break
+        lines.append(line.decode(encoding))
+    return lines
+
+
+def _load_checkpoint(checkpoint: Path, source: Path) -> Optional[Dict]:
+    """Read a checkpoint left for the same input file, if any."""
+    if not checkpoint.exists():
+        return None
+    state = json.loads(checkpoint.read_text())
+    stat = source.stat()
+    if (state['input'], state['input_size'], state['input_mtime']) != (str(source.resolve()), stat.st_size, stat.st_mtime_ns):
+        logging.warning(f"Ignoring checkpoint {checkpoint}: it belongs to another input")
+        return None
+    return state
+
+
+def _save_checkpoint(checkpoint: Path, state: Dict) -> None:
+    """Replace the checkpoint atomically."""
+    temporary = checkpoint.with_name(checkpoint.name + '.tmp')
+    temporary.write_text(json.dumps(state))
+    os.replace(temporary, checkpoint)
+
+
+def run_csv_job(
+    source: Path,
+    target: Path,
+    config: Optional[CalculatorConfig] = None,
+    workers: Optional[int] = None,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    checkpoint: Optional[Path] = None,
+    start_method: Optional[str] = None
+) -> JobReport:
+    """
+    Evaluate every row of an operation,operand1,operand2 CSV into another CSV.
+
+    The input is streamed in chunks of lines that are evaluated in parallel
+    by a process pool, and results are written in input order. After each
+    chunk is written and synced, the input and output offsets are recorded
+    in the checkpoint file. If the job is killed, running it again truncates
+    the output to the last checkpoint and continues from the matching input
+    offset. The checkpoint is removed when the job completes.
+
+    Rows must not contain quoted line breaks; a header row is optional.
+
+    Args:
+        source (Path): Input CSV.
+        target (Path): Output CSV, with result and status columns added.
+        config (Optional[CalculatorConfig], optional): Configuration for the
+            computations. Defaults to the environment configuration.
+        workers (Optional[int], optional): Number of worker processes.
+            Defaults to the number of CPUs.
+        chunk_rows (int, optional): Rows per chunk. Defaults to DEFAULT_CHUNK_ROWS.
+        checkpoint (Optional[Path], optional): Checkpoint file. Defaults to
+            the output path with '.checkpoint' appended.
+        start_method (Optional[str], optional): multiprocessing start method.
+            Defaults to the platform default.
+
+    Returns:
+        JobReport: Rows, failures and timing of this run.
+    """
+    config = config or CalculatorConfig()
+    config.validate()
+    source, target = Path(source), Path(target)
+    checkpoint = Path(checkpoint) if checkpoint else target.with_name(target.name + '.checkpoint')
+    workers = workers or os.cpu_count() or 1
+    encoding = config.default_encoding
+    report = JobReport()
+    start = time.perf_counter()
+
+    state = _load_checkpoint(checkpoint, source)
+    with open(source, 'rb') as reader, open(target, 'r+b' if state else 'wb') as writer:
+        if state:
+            report.resumed_rows = state['rows']
+            reader.seek(state['input_offset'])
+            # Anything written after the checkpoint is redone
+            writer.truncate(state['output_offset'])
+            writer.seek(state['output_offset'])
+        else:
+            stat = source.stat()
+            state = {'input': str(source.resolve()), 'input_size': stat.st_size, 'input_mtime': stat.st_mtime_ns, 'rows': 0}
+            first = reader.readline()
+            if next(csv.reader([first.decode(encoding)]), [''])[0].strip().lower() != 'operation':
+                reader.seek(0)
+            writer.write((','.join(OUTPUT_HEADER) + '\r\n').encode(encoding))
+
+        executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context(start_method),
+            initializer=_init_worker,
+            initargs=(config,),
+        )
+        # Keep a couple of chunks per worker in flight, so reading and
+        # writing overlap evaluation without holding the whole file
+        pending: Deque[Tuple[List[List[str]], int, Future]] = deque()
+        try:
+            while True:
+                while len(pending) < 2 * workers:
+                    lines = _read_chunk(reader, chunk_rows, encoding)
+                    if not lines:
+                        break
+                    rows = [row for row in csv.reader(lines) if row]
+                    pending.append((rows, reader.tell(), executor.submit(evaluate_rows, rows)))
+                if not pending:
+                    break
+                rows, input_offset, future = pending.popleft()
+                results = future.result()
+                text = _format_rows(rows, results)
+                writer.write(text.encode(encoding))
+                writer.flush()
+                os.fsync(writer.fileno())
+                report.rows += len(rows)
+                report.chunks += 1
+                report.failures += sum(status != 'ok' for _, status in results)
+                state.update(rows=state['rows'] + len(rows), input_offset=input_offset, output_offset=writer.tell())
+                _save_checkpoint(checkpoint, state)
+        finally:
+            executor.shutdown(cancel_futures=True)
+
+    checkpoint.unlink(missing_ok=True)
+    report.elapsed = time.perf_counter() - start
+    return report
+
+
+def _format_rows(rows: List[List[str]], results: List[Tuple[str, str]]) -> str:
+    """Render a chunk of input rows with their results as CSV text."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row, result in zip(rows, results):
+        writer.writerow((row + ['', '', ''])[:3] + list(result))
+    return buffer.getvalue()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Command-line entry point for a CSV batch job.
+
+    Args:
+        argv (Optional[List[str]], optional): Command-line arguments. Defaults
+            to sys.argv.
+
+    Returns:
+        int: Exit status, non-zero if any row failed.
+    """
+    parser = argparse.ArgumentParser(description="Evaluate an operation,operand1,operand2 CSV in parallel.")
+    parser.add_argument("input", type=Path, help="CSV of operation,operand1,operand2 rows")
+    parser.add_argument("output", type=Path, help="CSV to write, with result and status columns")
+    parser.add_argument("--workers", type=int, help="worker processes (default: one per CPU)")
+    parser.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS, help="rows per chunk")
+    parser.add_argument("--checkpoint", type=Path, help="checkpoint file (default: OUTPUT.checkpoint)")
+    args = parser.parse_args(argv)
+
+    report = run_csv_job(
+        args.input, args.output, workers=args.workers,
+        chunk_rows=args.chunk_rows, checkpoint=args.checkpoint
+    )
+    print(report.summary())
+    return 1 if report.failures else 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    raise SystemExit(main())
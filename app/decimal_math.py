@@ -0,0 +1,311 @@
+########################
+# Decimal Math Engine  #
+########################
+
+from decimal import Context, Decimal, getcontext
+from typing import Any, Optional
+
+# Extra digits carried through intermediate steps so the final rounding to the
+# requested precision is not disturbed by accumulated error
+GUARD_DIGITS = 10
+
+# Integer powers up to this exponent are computed exactly with Python ints
+SMALL_EXPONENT_LIMIT = 64
+
+# Integer roots are first tried exactly for radicands below this bound
+SMALL_RADICAND_LIMIT = 2 ** 1000
+
+# Upper bound on Newton iterations; convergence is quadratic so this is never
+# reached for a sensible starting guess
+MAX_NEWTON_ITERATIONS = 200
+
+# Optional cache consulted by power() and root(), see set_result_cache. Only
+# the series and Newton paths use it; integral powers and square roots are
+# cheaper to recompute than to look up
+_result_cache: Optional[Any] = None
+
+
+def set_result_cache(cache: Optional[Any]) -> Optional[Any]:
+    """
+    Install a cache for power() and root() results in this process.
+
+    The cache needs a get_or_compute(operation, a, b, precision, compute)
+    method, such as SharedResultCache provides. Pass None to remove it.
+
+    Args:
+        cache (Optional[Any]): The cache, or None.
+
+    Returns:
+        Optional[Any]: The previously installed cache.
+    """
+    global _result_cache
+    previous, _result_cache = _result_cache, cache
+    return previous
+
+
+def _is_integral(value: Decimal) -> bool:
+    """
+    Check whether a Decimal holds an integer value.
+
+    Args:
+        value (Decimal): Value to check.
+
+    Returns:
+        bool: True if the value is finite and has no fractional part.
+    """
+    return value.is_finite() and value == value.to_integral_value()
+
+
+def _working_context(precision: int) -> Context:
+    """
+    Build a context for intermediate steps.
+
+    Copies the active context so exponent limits and traps are preserved, and
+    raises the precision by the guard digits.
+
+    Args:
+        precision (int): Target number of significant digits.
+
+    Returns:
+        Context: Context with the working precision.
+    """
+    ctx = getcontext().copy()
+    ctx.prec = precision + GUARD_DIGITS
+    return ctx
+
+
+def _round(value: Decimal, precision: int) -> Decimal:
+    """
+    Round a value to the target precision.
+
+    Args:
+        value (Decimal): Value to round.
+        precision (int): Number of significant digits.
+
+    Returns:
+        Decimal: Rounded value.
+    """
+    ctx = getcontext().copy()
+    ctx.prec = precision
+    return ctx.plus(value)
+
+
+def _power_by_squaring(base: Decimal, exponent: int, ctx: Context) -> Decimal:
+    """
+    Raise a Decimal to a non-negative integer power by repeated squaring.
+
+    Args:
+        base (Decimal): Base number.
+        exponent (int): Non-negative integer exponent.
+        ctx (Context): Context used for every multiplication.
+
+    Returns:
+        Decimal: base ** exponent, rounded at each step in ctx.
+    """
+    result = Decimal(1)
+    while exponent:
+        if exponent & 1:
+            result = ctx.multiply(result, base)
+        exponent >>= 1
+        if exponent:
+            base = ctx.multiply(base, base)
+    return result
+
+
+def _power_fractional(base: Decimal, exponent: Decimal, precision: int) -> Decimal:
+    """
+    Raise a non-negative Decimal to a fractional power via exp(exponent * ln(base)).
+
+    The argument to exp is computed with enough extra digits to cover its
+    integer part, since exp turns absolute error there into relative error in
+    the result.
+
+    Args:
+        base (Decimal): Non-negative base.
+        exponent (Decimal): Fractional exponent.
+        precision (int): Number of significant digits in the result.
+
+    Returns:
+        Decimal: base ** exponent.
+
+    Raises:
+        ValueError: If the base is negative, or zero with a negative exponent.
+    """
+    if base < 0:
+        raise ValueError("Negative base with fractional exponent is undefined")
+    if base == 0:
+        if exponent < 0:
+            raise ValueError("Zero cannot be raised to a negative power")
+        return Decimal(0)
+
+    ctx = _working_context(precision)
+    argument = ctx.multiply(exponent, ctx.ln(base))
+    extra = max(0, argument.adjusted() + 1)
+    if extra:
+        ctx.prec += extra
+        argument = ctx.multiply(exponent, ctx.ln(base))
+    return _round(ctx.exp(argument), precision)
+
+
+def power(base: Decimal, exponent: Decimal, precision: Optional[int] = None) -> Decimal:
+    """
+    Raise a number to a power without leaving Decimal arithmetic.
+
+    Small integer cases are computed exactly with Python ints, other integer
+    exponents use exponentiation by squaring, and fractional exponents use
+    ln/exp. The result is rounded to ``precision`` significant digits.
+
+    Args:
+        base (Decimal): Base number.
+        exponent (Decimal): Exponent.
+        precision (Optional[int], optional): Significant digits in the result.
+            Defaults to the precision of the active Decimal context.
+
+    Returns:
+        Decimal: base ** exponent.
+
+    Raises:
+        ValueError: If the result is undefined for the given operands.
+    """
+    precision = precision or getcontext().prec
+    if _result_cache is not None and not _is_integral(exponent):
+        return _result_cache.get_or_compute('power', base, exponent, precision, _power)
+    return _power(base, exponent, precision)
+
+
+def _power(base: Decimal, exponent: Decimal, precision: int) -> Decimal:
+    """Compute power() without consulting the result cache."""
+    if exponent == 0:
+        return Decimal(1)
+    if not _is_integral(exponent):
+        return _power_fractional(base, exponent, precision)
+
+    n = int(exponent)
+    if base == 0:
+        if n < 0:
+            raise ValueError("Zero cannot be raised to a negative power")
+        return Decimal(0)
+
+    # Fast path: small integer base and exponent are exact in int arithmetic
+    if 0 < n <= SMALL_EXPONENT_LIMIT and _is_integral(base):
+        return _round(Decimal(int(base) ** n), precision)
+
+    # Each squaring step can lose a digit, so carry enough guard digits for
+    # the number of steps as well
+    ctx = _working_context(precision + abs(n).bit_length())
+    result = _power_by_squaring(base, abs(n), ctx)
+    if n < 0:
+        result = ctx.divide(Decimal(1), result)
+    return _round(result, precision)
+
+
+def _exact_integer_root(value: int, degree: int) -> Optional[int]:
+    """
+    Find the exact integer root of an integer, if one exists.
+
+    Args:
+        value (int): Non-negative radicand.
+        degree (int): Positive root degree.
+
+    Returns:
+        Optional[int]: The integer r with r ** degree == value, or None.
+    """
+    if degree >= value.bit_length():
+        # Only 0 and 1 have integer roots this large
+        return value if value in (0, 1) else None
+    guess = round(value ** (1.0 / degree))
+    for candidate in (guess - 1, guess, guess + 1):
+        if candidate >= 0 and candidate ** degree == value:
+            return candidate
+    return None
+
+
+def _nth_root_newton(value: Decimal, degree: int, precision: int) -> Decimal:
+    """
+    Compute the positive nth root of a positive Decimal with Newton's method.
+
+    Iterates x = ((n - 1) * x + value / x ** (n - 1)) / n starting from a
+    low-precision ln/exp estimate, until successive values agree to the
+    working precision.
+
+    Args:
+        value (Decimal): Positive radicand.
+        degree (int): Root degree of at least 2.
+        precision (int): Significant digits in the result.
+
+    Returns:
+        Decimal: The nth root of value.
+    """
+    ctx = _working_context(precision)
+    estimate = _working_context(10)
+    x = estimate.exp(estimate.divide(estimate.ln(value), degree))
+
+    n = Decimal(degree)
+    n_minus_one = Decimal(degree - 1)
+    for _ in range(MAX_NEWTON_ITERATIONS):
+        correction = ctx.divide(value, _power_by_squaring(x, degree - 1, ctx))
+        y = ctx.divide(ctx.add(ctx.multiply(n_minus_one, x), correction), n)
+        tolerance = Decimal(1).scaleb(y.adjusted() - ctx.prec + 2)
+        if abs(y - x) <= tolerance:
+            x = y
+            break
+        x = y
+    return _round(x, precision)
+
+
+def root(value: Decimal, degree: Decimal, precision: Optional[int] = None) -> Decimal:
+    """
+    Calculate the nth root of a number without leaving Decimal arithmetic.
+
+    Integer degrees return exact integer roots when they exist and otherwise
+    use Newton iteration (or the native square root for degree 2). Fractional
+    degrees are computed as value ** (1 / degree). The result is rounded to
+    ``precision`` significant digits.
+
+    Args:
+        value (Decimal): Non-negative number from which the root is taken.
+        degree (Decimal): Non-zero degree of the root.
+        precision (Optional[int], optional): Significant digits in the result.
+            Defaults to the precision of the active Decimal context.
+
+    Returns:
+        Decimal: The degree-th root of value.
+
+    Raises:
+        ValueError: If the value is negative or the degree is zero.
+    """
+    precision = precision or getcontext().prec
+    if _result_cache is not None and not (_is_integral(degree) and abs(degree) <= 2):
+        return _result_cache.get_or_compute('root', value, degree, precision, _root)
+    return _root(value, degree, precision)
+
+
+def _root(value: Decimal, degree: Decimal, precision: int) -> Decimal:
+    """Compute root() without consulting the result cache."""
+    if degree == 0:
+        raise ValueError("Zero root is undefined")
+    if value < 0:
+        raise ValueError("Cannot calculate root of negative number")
+
+    if not _is_integral(degree):
+        ctx = _working_context(precision)
+        return _power(value, ctx.divide(Decimal(1), degree), precision)
+
+    n = int(degree)
+    if n < 0:
+        if value == 0:
+            raise ValueError("Zero cannot be raised to a negative power")
+        ctx = _working_context(precision)
+        return _round(ctx.divide(Decimal(1), _root(value, Decimal(-n), ctx.prec)), precision)
+    if n == 1 or value == 0:
+        return _round(value, precision)
+
+    # Fast path: exact roots of small integers, e.g. root(27, 3) == 3
+    if _is_integral(value) and value < SMALL_RADICAND_LIMIT:
+        exact = _exact_integer_root(int(value), n)
+        if exact is not None:
+            return _round(Decimal(exact), precision)
+
+    if n == 2:
+        return _round(_working_context(precision).sqrt(value), precision)
+    return _nth_root_newton(value, n, precision)
@@ -3,36 +3,170 @@
 ########################
 
 from dataclasses import dataclass
-from decimal import Decimal, InvalidOperation
-from typing import Any
+from decimal import Decimal, InvalidOperation, getcontext
+from functools import lru_cache
+from typing import Any, Iterable
+import numpy as np
 from app.calculator_config import CalculatorConfig
 from app.exceptions import ValidationError
+from app.numeric_backends import DEFAULT_BACKEND, NumericBackend, get_backend
+
+# Number of distinct string literals remembered by validate_number
+LITERAL_CACHE_SIZE = 1024
+
+
+def _validate(value: Any, backend: NumericBackend, limit: Decimal) -> Any:
+    """
+    Convert, range-check and normalize a single value.
+
+    Args:
+        value (Any): Input value, already stripped if it is a string.
+        backend (NumericBackend): Backend that converts the value.
+        limit (Decimal): Maximum allowed magnitude.
+
+    Returns:
+        Any: The validated number.
+
+    Raises:
+        ValidationError: If the value is invalid or out of range.
+    """
+    try:
+        number = backend.convert(value)
+        if backend.exceeds(number, limit):
+            raise ValidationError(f"Value exceeds maximum allowed: {limit}")
+        return backend.normalize(number)
+    except (InvalidOperation, ValueError, TypeError) as e:
+        raise ValidationError(f"Invalid number format: {value}") from e
+
+
+@lru_cache(maxsize=LITERAL_CACHE_SIZE)
+def _validate_literal(text: str, backend: NumericBackend, limit: Decimal, prec: int, rounding: str) -> Any:
+    """
+    Validate a stripped string literal, remembering the result.
+
+    Normalization rounds in the active Decimal context, so its precision and
+    rounding mode are part of the cache key. Invalid literals raise and are
+    therefore never cached.
+
+    Args:
+        text (str): Stripped literal.
+        backend (NumericBackend): Shared backend instance that converts it.
+        limit (Decimal): Maximum allowed magnitude.
+        prec (int): Precision of the active Decimal context.
+        rounding (str): Rounding mode of the active Decimal context.
+
+    Returns:
+        Any: The validated number.
+
+    Raises:
+        ValidationError: If the literal is invalid or out of range.
+    """
+    return _validate(text, backend, limit)
+
+
+def _float_or_nan(value: Any) -> float:
+    """Convert one element to float, mapping anything unparsable to NaN."""
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return float('nan')
+
+
+@dataclass
+class BulkValidation:
+    """Result of validating many values at once."""
+
+    values: Any           # Validated numbers; None (or NaN for numpy) at invalid rows
+    invalid: np.ndarray   # Boolean mask, True where a row failed validation
+
+    @property
+    def invalid_count(self) -> int:
+        """Number of rows that failed validation."""
+        return int(self.invalid.sum())
+
 
 @dataclass
 class InputValidator:
     """Validates and sanitizes calculator inputs."""
-    
+
     @staticmethod
-    def validate_number(value: Any, config: CalculatorConfig) -> Decimal:
+    def validate_number(value: Any, config: CalculatorConfig) -> Any:
         """
-        Validate and convert input to Decimal.
-        
+        Validate and convert input to the configured backend's number type.
+
+        Conversion, range checking and normalization are dispatched through the
+        numeric backend named by ``config.backend`` (Decimal by default).
+        Repeated string literals are served from a small LRU cache. Lists,
+        tuples and arrays are validated element-wise into a float64 array,
+        whatever the backend.
+
         Args:
             value: Input value to validate
             config: Calculator configuration
-            
+
         Returns:
-            Decimal: Validated and converted number
-            
+            Any: Validated and converted number (a Decimal for the default backend)
+
         Raises:
             ValidationError: If input is invalid
         """
-        try:
-            if isinstance(value, str):
-                value = value.strip()
-            number = Decimal(str(value))
-            if abs(number) > config.max_input_value:
-                raise ValidationError(f"Value exceeds maximum allowed: {config.max_input_value}")
-            return number.normalize()
-        except InvalidOperation as e:
-            raise ValidationError(f"Invalid number format: {value}") from e
+        backend = get_backend(getattr(config, 'backend', DEFAULT_BACKEND))
+        if isinstance(value, (list, tuple, np.ndarray)) and not backend.vectorized:
+            # Vectors and matrices are always NumPy float64 arrays
+            backend = get_backend('numpy')
+        elif isinstance(value, str):
+            value = value.strip()
+            # Array results are mutable, so they are never shared
+            if not backend.vectorized:
+                context = getcontext()
+                return _validate_literal(
+                    value, backend, config.max_input_value, context.prec, context.rounding
+                )
+        return _validate(value, backend, config.max_input_value)
+
+    @staticmethod
+    def validate_many(values: Iterable[Any], config: CalculatorConfig) -> BulkValidation:
+        """
+        Validate a whole array or column of inputs in one pass.
+
+        Unlike validate_number, invalid rows do not raise; they are flagged in
+        the returned mask. The NumPy backend converts and range-checks the
+        column with vectorized operations; other backends validate each row
+        through the same cached path as validate_number.
+
+        Args:
+            values: Sequence, array or pandas Series of inputs
+            config: Calculator configuration
+
+        Returns:
+            BulkValidation: Validated values and the mask of invalid rows
+        """
+        backend = get_backend(getattr(config, 'backend', DEFAULT_BACKEND))
+        limit = config.max_input_value
+
+        if backend.vectorized:
+            try:
+                array = np.asarray(values, dtype=np.float64)
+            except (ValueError, TypeError):
+                # At least one row is unparsable; convert row by row instead
+                array = np.array([_float_or_nan(v) for v in values], dtype=np.float64)
+            invalid = ~np.isfinite(array) | (np.abs(array) > float(limit))
+            return BulkValidation(np.where(invalid, np.nan, array), invalid)
+
+        # Resolve the cache key parts once for the whole column
+        context = getcontext()
+        prec, rounding = context.prec, context.rounding
+        numbers = []
+        flags = []
+        for value in values:
+            try:
+                if isinstance(value, str):
+                    number = _validate_literal(value.strip(), backend, limit, prec, rounding)
+                else:
+                    number = _validate(value, backend, limit)
+                numbers.append(number)
+                flags.append(False)
+            except ValidationError:
+                numbers.append(None)
+                flags.append(True)
+        return BulkValidation(numbers, np.array(flags, dtype=bool))
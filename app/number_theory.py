@@ -0,0 +1,320 @@
+########################
+# Number Theory        #
+########################
+
+from decimal import Decimal, InvalidOperation
+from fractions import Fraction
+import math
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from app.combinatorics import factorial_table
+from app.exceptions import ValidationError
+from app.operations import Operation
+
+
+def to_integer(value: Any) -> int:
+    """
+    Convert an integral operand to int, exactly.
+
+    Args:
+        value (Any): Validated operand (int, Decimal, Fraction or float).
+
+    Returns:
+        int: The operand as an int.
+
+    Raises:
+        ValidationError: If the operand is not an integer.
+    """
+    if isinstance(value, int):
+        return value
+    if isinstance(value, Decimal) and value.is_finite() and value == value.to_integral_value():
+        return int(value)
+    if isinstance(value, Fraction) and value.denominator == 1:
+        return value.numerator
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    raise ValidationError(f"Integer operand required: {value}")
+
+
+def integer_root(a: int, n: int) -> int:
+    """
+    Take the integer nth root of a non-negative integer, rounded down.
+
+    Square roots use math.isqrt. Other degrees root the top half of the bits
+    recursively, which leaves Newton's method from above a step or two to
+    converge at full size.
+
+    Args:
+        a (int): Non-negative radicand.
+        n (int): Positive degree.
+
+    Returns:
+        int: The largest x with x ** n <= a.
+    """
+    if n == 1 or a < 2:
+        return a
+    if n == 2:
+        return math.isqrt(a)
+    bits = a.bit_length()
+    shift = bits // (2 * n)
+    if shift == 0:
+        # The root is below 4
+        x = 1 << (bits // n + 1)
+    else:
+        # Rooting the top bits and adding one bounds the root from above
+        x = (integer_root(a >> (n * shift), n) + 1) << shift
+    while True:
+        y = ((n - 1) * x + a // x ** (n - 1)) // n
+        if y >= x:
+            return x
+        x = y
+
+
+def modular_power(base: int, exponent: int, modulus: int) -> int:
+    """
+    Raise an integer to a power modulo another, with Python's three-argument pow.
+
+    Negative exponents take powers of the modular inverse.
+
+    Args:
+        base (int): Base.
+        exponent (int): Exponent.
+        modulus (int): Positive modulus.
+
+    Returns:
+        int: base ** exponent mod modulus, in [0, modulus).
+
+    Raises:
+        ValidationError: If the exponent is negative and base has no inverse.
+    """
+    try:
+        return pow(base, exponent, modulus)
+    except ValueError:
+        raise ValidationError("Base has no inverse modulo the modulus")
+
+
+class IntegerOperation(Operation):
+    """
+    Base class for operations on integers of any size.
+
+    Operands are converted to Python ints and computed exactly, with no
+    rounding and no float round trip. The result is a Decimal (an int in
+    exact mode), which holds any integer. With a float backend the operands
+    arrive as floats, so only integers up to 2 ** 53 are exact.
+    """
+
+    integral = True
+    heavy = True
+
+    def _integers(self, a: Any, b: Any) -> Tuple[int, int]:
+        """
+        Validate the operands and convert them to ints.
+
+        Args:
+            a (Any): First operand.
+            b (Any): Second operand.
+
+        Returns:
+            Tuple[int, int]: Both operands as ints.
+
+        Raises:
+            ValidationError: If an operand is not an integer, or is invalid
+                for the operation.
+        """
+        x, y = to_integer(a), to_integer(b)
+        self.validate_operands(x, y)
+        return x, y
+
+
+class GreatestCommonDivisor(IntegerOperation):
+    """Greatest common divisor of two integers."""
+
+    def execute(self, a: Any, b: Any) -> Decimal:
+        x, y = self._integers(a, b)
+        return self._result(math.gcd(x, y))
+
+
+class LeastCommonMultiple(IntegerOperation):
+    """Least common multiple of two integers."""
+
+    def execute(self, a: Any, b: Any) -> Decimal:
+        x, y = self._integers(a, b)
+        return self._result(math.lcm(x, y))
+
+
+class IntegerPower(IntegerOperation):
+    """
+    Exact power of two integers.
+
+    Unlike Power, the result is never rounded to the working precision, so
+    it can have any number of digits; the cost budget bounds how many.
+    """
+
+    def validate_operands(self, a: int, b: int) -> None:
+        if b < 0:
+            raise ValidationError("Negative exponents not supported")
+
+    def execute(self, a: Any, b: Any) -> Decimal:
+        x, y = self._integers(a, b)
+        return self._result(x ** y)
+
+
+class IntegerRoot(IntegerOperation):
+    """
+    Integer nth root, rounded down.
+
+    The square root of a is int_root(a, 2).
+    """
+
+    def validate_operands(self, a: int, b: int) -> None:
+        if a < 0:
+            raise ValidationError("Cannot calculate root of negative number")
+        if b < 1:
+            raise ValidationError("Root degree must be a positive integer")
+
+    def execute(self, a: Any, b: Any) -> Decimal:
+        x, y = self._integers(a, b)
+        return self._result(integer_root(x, y))
+
+
+class ModularPower(IntegerOperation):
+    """
+    Modular exponentiation: the first operand raised to the second, modulo a
+    modulus fixed when the operation is created.
+
+    OperationFactory creates it from a name with the modulus in brackets,
+    e.g. modpow[97]. The modulus is also part of the recorded name,
+    ModularPower[97], so the history can recompute the result.
+    """
+
+    parameterized = True
+
+    def __init__(self, modulus: Optional[Any] = None, exact: bool = False, backend: Optional[Any] = None):
+        """
+        Initialize the operation.
+
+        Args:
+            modulus (Optional[Any], optional): Positive integer modulus, or its
+                decimal literal. Defaults to None, which fails at execution.
+            exact (bool, optional): Whether to return ints. Defaults to False.
+            backend (Optional[Any], optional): Ignored; computed with ints.
+
+        Raises:
+            ValidationError: If the modulus is not a positive integer.
+        """
+        super().__init__(exact=exact, backend=backend)
+        if isinstance(modulus, str):
+            try:
+                modulus = Decimal(modulus)
+            except InvalidOperation:
+                raise ValidationError(f"Modulus must be a positive integer: {modulus}")
+        self.modulus = None if modulus is None else to_integer(modulus)
+        if self.modulus is not None and self.modulus < 1:
+            raise ValidationError("Modulus must be a positive integer")
+
+    def execute(self, a: Any, b: Any) -> Decimal:
+        if self.modulus is None:
+            raise ValidationError("Modular power needs a modulus, e.g. modpow[97]")
+        x, y = self._integers(a, b)
+        return self._result(modular_power(x, y, self.modulus))
+
+    def __str__(self) -> str:
+        if self.modulus is None:
+            return "ModularPower"
+        # Decimal formats integers of any size, unlike str(int)
+        return f"ModularPower[{Decimal(self.modulus)}]"
+
+
+# The combinatorics operations stay with the other IntegerOperations and the
+# history kernels, while app.combinatorics keeps only the integer algorithms
+# and their memo. That module depends on nothing in the operation framework,
+# so this one imports it without an import cycle.
+
+
+class Factorial(IntegerOperation):
+    """
+    Factorial of the first operand, stepping down by the second.
+
+    factorial(n, 1) is n!, factorial(n, 2) the double factorial n!! and so
+    on. Results come from the shared FactorialTable, so repeated calls are
+    lookups.
+    """
+
+    def validate_operands(self, a: int, b: int) -> None:
+        if a < 0:
+            raise ValidationError("Factorial of a negative number is undefined")
+        if b < 1:
+            raise ValidationError("Factorial step must be a positive integer")
+
+    def execute(self, a: Any, b: Any) -> Decimal:
+        x, y = self._integers(a, b)
+        if self.exact:
+            return factorial_table().factorial(x, y)
+        return factorial_table().as_decimal('factorial', x, y)
+
+
+class Binomial(IntegerOperation):
+    """
+    Binomial coefficient: the number of ways to choose the second operand's
+    count of items from the first's, memoized in the shared FactorialTable.
+    """
+
+    def validate_operands(self, a: int, b: int) -> None:
+        if a < 0 or b < 0:
+            raise ValidationError("Binomial coefficients need non-negative operands")
+
+    def execute(self, a: Any, b: Any) -> Decimal:
+        x, y = self._integers(a, b)
+        if self.exact:
+            return factorial_table().binomial(x, y)
+        return factorial_table().as_decimal('binomial', x, y)
+
+
+class Permutations(IntegerOperation):
+    """
+    Number of ordered arrangements of the second operand's count of items
+    from the first's, memoized in the shared FactorialTable.
+    """
+
+    def validate_operands(self, a: int, b: int) -> None:
+        if a < 0 or b < 0:
+            raise ValidationError("Permutations need non-negative operands")
+
+    def execute(self, a: Any, b: Any) -> Decimal:
+        x, y = self._integers(a, b)
+        if self.exact:
+            return factorial_table().permutations(x, y)
+        return factorial_table().as_decimal('permutations', x, y)
+
+
+# Kernels recomputing history entries by operation name
+_KERNELS: Dict[str, Callable[[int, int], Any]] = {
+    'GreatestCommonDivisor': math.gcd,
+    'LeastCommonMultiple': math.lcm,
+    'IntegerPower': pow,
+    'IntegerRoot': integer_root,
+    'Factorial': lambda n, k: factorial_table().as_decimal('factorial', n, k),
+    'Binomial': lambda n, k: factorial_table().as_decimal('binomial', n, k),
+    'Permutations': lambda n, k: factorial_table().as_decimal('permutations', n, k),
+}
+
+
+def integer_kernel(operation: str) -> Optional[Callable[[Any, Any], int]]:
+    """
+    Get the function that recomputes a number theory history entry.
+
+    Args:
+        operation (str): Operation name as recorded, e.g. 'ModularPower[97]'.
+
+    Returns:
+        Optional[Callable[[Any, Any], int]]: Function of the two operands, or
+            None if the name is not a number theory operation.
+    """
+    name, _, modulus = operation.partition('[')
+    if name == 'ModularPower' and modulus.endswith(']'):
+        m = to_integer(Decimal(modulus[:-1]))
+        return lambda a, b: modular_power(to_integer(a), to_integer(b), m)
+    kernel = _KERNELS.get(operation)
+    if kernel is None:
+        return None
+    return lambda a, b: kernel(to_integer(a), to_integer(b))
@@ -0,0 +1,578 @@
+########################
+# Numeric Backends     #
+########################
+
+from abc import ABC, abstractmethod
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass
+from decimal import ROUND_HALF_EVEN, Decimal, getcontext
+import math
+import threading
+from typing import Any, Callable, ContextManager, Dict, Iterator, Optional
+
+import numpy as np
+
+from app.decimal_math import GUARD_DIGITS
+from app.operations import (
+    AbsoluteDifference, Addition, Division, IntegerDivision, Modulus,
+    Multiplication, Percent, Power, Root, Subtraction
+)
+
+# Largest precision a binary64 result can be certified at; beyond this the
+# hybrid backend always falls back to Decimal
+MAX_HYBRID_PRECISION = 15
+
+# Magnitudes below this are treated as possibly subnormal, where the relative
+# error bounds below do not hold
+MIN_NORMAL_MAGNITUDE = 2.0 ** -1000
+
+# Unit roundoff of binary64, doubled twice for headroom
+ERROR_UNIT = 2.0 ** -51
+
+# Kernels the hybrid backend can evaluate float-first
+HYBRID_KERNELS = frozenset({'add', 'subtract', 'multiply', 'divide', 'abs_diff', 'power', 'root'})
+
+# Kernels where float-first pays for its certification by default. The basic
+# arithmetic kernels are already a single libmpdec call, which is cheaper than
+# converting to float and back
+DEFAULT_FAST_KERNELS = frozenset({'power', 'root'})
+
+# Kernels the native tower computes exactly for integral operands, so the
+# hybrid backend skips the float path for them. Dividing or taking roots of
+# integers is generally inexact and still tries it
+INTEGRAL_EXACT_KERNELS = frozenset({'add', 'subtract', 'multiply', 'abs_diff', 'power'})
+
+
+class NumericBackend(ABC):
+    """
+    Abstract base class for numeric backends.
+
+    A backend decides how operands are represented and how each arithmetic
+    kernel is computed. InputValidator uses it to convert inputs, operations
+    use its kernels and predicates, and Calculation uses it to recompute
+    results. The Decimal backend is native: operations bound to it use their
+    own numeric tower code.
+    """
+
+    name: str = ""
+    native: bool = False
+    vectorized: bool = False  # Converts and computes whole arrays at once
+
+    @abstractmethod
+    def convert(self, value: Any) -> Any:
+        """
+        Convert a raw input into the backend's number type.
+
+        Args:
+            value (Any): Input value, typically a stripped string or a number.
+
+        Returns:
+            Any: The converted number.
+
+        Raises:
+            ValueError: If the value cannot be converted.
+        """
+        pass  # pragma: no cover
+
+    @abstractmethod
+    def exceeds(self, value: Any, limit: Decimal) -> bool:
+        """
+        Check whether a converted value is out of range.
+
+        Args:
+            value (Any): Converted number.
+            limit (Decimal): Maximum allowed magnitude.
+
+        Returns:
+            bool: True if the value is non-finite or larger than the limit.
+        """
+        pass  # pragma: no cover
+
+    def normalize(self, value: Any) -> Any:
+        """
+        Normalize a validated value.
+
+        Args:
+            value (Any): Converted number.
+
+        Returns:
+            Any: The normalized number. Defaults to the value unchanged.
+        """
+        return value
+
+    def any_zero(self, value: Any) -> bool:
+        """
+        Check whether a value, or any element of it, is zero.
+
+        Args:
+            value (Any): Number to check.
+
+        Returns:
+            bool: True if any element is zero.
+        """
+        return bool(value == 0)
+
+    def any_negative(self, value: Any) -> bool:
+        """
+        Check whether a value, or any element of it, is negative.
+
+        Args:
+            value (Any): Number to check.
+
+        Returns:
+            bool: True if any element is negative.
+        """
+        return bool(value < 0)
+
+    def add(self, a: Any, b: Any) -> Any:
+        """Return a + b."""
+        return a + b
+
+    def subtract(self, a: Any, b: Any) -> Any:
+        """Return a - b."""
+        return a - b
+
+    def multiply(self, a: Any, b: Any) -> Any:
+        """Return a * b."""
+        return a * b
+
+    def divide(self, a: Any, b: Any) -> Any:
+        """Return a / b."""
+        return a / b
+
+    @abstractmethod
+    def power(self, a: Any, b: Any) -> Any:
+        """Return a raised to the power b."""
+        pass  # pragma: no cover
+
+    @abstractmethod
+    def root(self, a: Any, b: Any) -> Any:
+        """Return the b-th root of a."""
+        pass  # pragma: no cover
+
+    @abstractmethod
+    def modulus(self, a: Any, b: Any) -> Any:
+        """Return the remainder of a / b with the sign of a."""
+        pass  # pragma: no cover
+
+    @abstractmethod
+    def int_divide(self, a: Any, b: Any) -> Any:
+        """Return a / b truncated toward zero."""
+        pass  # pragma: no cover
+
+    def percent(self, a: Any, b: Any) -> Any:
+        """Return a as a percentage of b."""
+        return self.divide(self.multiply(a, self.convert(100)), b)
+
+    def abs_diff(self, a: Any, b: Any) -> Any:
+        """Return the absolute difference of a and b."""
+        return abs(self.subtract(a, b))
+
+    def uncounted(self) -> ContextManager[None]:
+        """
+        Get a context in which kernel calls are not counted as calculations.
+
+        Calculation recomputes its result through the backend, which should
+        not show up in a backend's statistics a second time.
+
+        Returns:
+            ContextManager[None]: A context that does nothing for most backends.
+        """
+        return nullcontext()
+
+
+class DecimalBackend(NumericBackend):
+    """
+    Exact Decimal backend (the default).
+
+    Inputs are validated exactly as before backends existed, and kernels run
+    the native operation classes with their integer and Fraction fast paths.
+    """
+
+    name = "decimal"
+    native = True
+
+    def __init__(self):
+        """Create one native operation per kernel."""
+        self._native = {
+            'add': Addition(),
+            'subtract': Subtraction(),
+            'multiply': Multiplication(),
+            'divide': Division(),
+            'power': Power(),
+            'root': Root(),
+            'modulus': Modulus(),
+            'int_divide': IntegerDivision(),
+            'percent': Percent(),
+            'abs_diff': AbsoluteDifference(),
+        }
+
+    def convert(self, value: Any) -> Decimal:
+        # Decimals and ints are already exact, so skip the string round trip
+        if type(value) is Decimal:
+            return value
+        if type(value) is int:
+            return Decimal(value)
+        return Decimal(str(value))
+
+    def exceeds(self, value: Decimal, limit: Decimal) -> bool:
+        return abs(value) > limit
+
+    def normalize(self, value: Decimal) -> Decimal:
+        return value.normalize()
+
+    def add(self, a: Decimal, b: Decimal) -> Decimal:
+        return self._native['add'].execute(a, b)
+
+    def subtract(self, a: Decimal, b: Decimal) -> Decimal:
+        return self._native['subtract'].execute(a, b)
+
+    def multiply(self, a: Decimal, b: Decimal) -> Decimal:
+        return self._native['multiply'].execute(a, b)
+
+    def divide(self, a: Decimal, b: Decimal) -> Decimal:
+        return self._native['divide'].execute(a, b)
+
+    def power(self, a: Decimal, b: Decimal) -> Decimal:
+        return self._native['power'].execute(a, b)
+
+    def root(self, a: Decimal, b: Decimal) -> Decimal:
+        return self._native['root'].execute(a, b)
+
+    def modulus(self, a: Decimal, b: Decimal) -> Decimal:
+        return self._native['modulus'].execute(a, b)
+
+    def int_divide(self, a: Decimal, b: Decimal) -> Decimal:
+        return self._native['int_divide'].execute(a, b)
+
+    def percent(self, a: Decimal, b: Decimal) -> Decimal:
+        return self._native['percent'].execute(a, b)
+
+    def abs_diff(self, a: Decimal, b: Decimal) -> Decimal:
+        return self._native['abs_diff'].execute(a, b)
+
+
+class FloatBackend(NumericBackend):
+    """
+    Native binary64 float backend.
+
+    Trades exactness for per-call latency. Modulus and integer division keep
+    Decimal's round-toward-zero semantics.
+    """
+
+    name = "float"
+
+    def convert(self, value: Any) -> float:
+        return float(value)
+
+    def exceeds(self, value: float, limit: Decimal) -> bool:
+        return not math.isfinite(value) or abs(value) > float(limit)
+
+    def power(self, a: float, b: float) -> float:
+        return math.pow(a, b)
+
+    def root(self, a: float, b: float) -> float:
+        return math.pow(a, 1 / b)
+
+    def modulus(self, a: float, b: float) -> float:
+        return math.fmod(a, b)
+
+    def int_divide(self, a: float, b: float) -> float:
+        return (a - math.fmod(a, b)) / b
+
+
+class NumpyBackend(NumericBackend):
+    """
+    NumPy float64 array backend for bulk work.
+
+    Operands may be scalars or arrays; kernels broadcast element-wise and
+    validation predicates consider every element.
+    """
+
+    name = "numpy"
+    vectorized = True
+
+    def convert(self, value: Any) -> np.ndarray:
+        return np.asarray(value, dtype=np.float64)
+
+    def exceeds(self, value: np.ndarray, limit: Decimal) -> bool:
+        return bool(not np.all(np.isfinite(value)) or np.any(np.abs(value) > float(limit)))
+
+    def any_zero(self, value: np.ndarray) -> bool:
+        return bool(np.any(value == 0))
+
+    def any_negative(self, value: np.ndarray) -> bool:
+        return bool(np.any(value < 0))
+
+    def add(self, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        return np.add(a, b)
+
+    def subtract(self, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        return np.subtract(a, b)
+
+    def multiply(self, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        return np.multiply(a, b)
+
+    def divide(self, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        return np.divide(a, b)
+
+    def power(self, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        return np.power(a, b)
+
+    def root(self, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        return np.power(a, np.divide(1.0, b))
+
+    def modulus(self, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        return np.fmod(a, b)
+
+    def int_divide(self, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        return np.divide(np.subtract(a, np.fmod(a, b)), b)
+
+    def abs_diff(self, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        return np.abs(np.subtract(a, b))
+
+
+@dataclass
+class HybridStats:
+    """
+    Counters for the hybrid backend.
+
+    Records how many calculations were answered from the binary64 fast path
+    and how many needed full Decimal evaluation.
+    """
+
+    fast_path: int = 0   # Results certified from binary64
+    fallback: int = 0    # Results computed in Decimal
+
+    @property
+    def fast_path_ratio(self) -> float:
+        """
+        Get the share of calculations answered by the fast path.
+
+        Returns:
+            float: Fraction between 0.0 and 1.0, or 0.0 if nothing was counted.
+        """
+        total = self.fast_path + self.fallback
+        return self.fast_path / total if total else 0.0
+
+
+def _is_integral(value: Decimal) -> bool:
+    """Return True if a Decimal holds an integer value."""
+    return value == value.to_integral_value()
+
+
+def _to_float(value: Decimal) -> Optional[float]:
+    """
+    Convert a Decimal to a float the error bounds hold for.
+
+    Args:
+        value (Decimal): Value to convert.
+
+    Returns:
+        Optional[float]: The float, or None if it overflowed or may be subnormal.
+    """
+    converted = float(value)
+    if not math.isfinite(converted) or (converted != 0 and abs(converted) < MIN_NORMAL_MAGNITUDE):
+        return None
+    return converted
+
+
+class HybridBackend(DecimalBackend):
+    """
+    Float-first Decimal backend.
+
+    Each supported kernel is first evaluated in binary64 together with a
+    rigorous bound on its error. If rounding both ends of the error interval
+    to the active context precision gives the same Decimal, that Decimal is
+    the correctly rounded result and is returned. Otherwise, and for integral
+    operands of kernels the native tower computes exactly for them, the kernel
+    falls back to full Decimal evaluation. Results are numerically identical to the
+    Decimal backend; ``stats`` counts how often each path was taken.
+
+    Only ``fast_kernels`` try the float path; the rest always use Decimal.
+    """
+
+    name = "hybrid"
+    native = False
+
+    def __init__(self, fast_kernels: frozenset = DEFAULT_FAST_KERNELS):
+        """
+        Create the native fallback operations and reset the counters.
+
+        Args:
+            fast_kernels (frozenset, optional): Kernels to evaluate float-first,
+                a subset of HYBRID_KERNELS. Defaults to DEFAULT_FAST_KERNELS.
+        """
+        super().__init__()
+        self.fast_kernels = frozenset(fast_kernels) & HYBRID_KERNELS
+        self.stats = HybridStats()
+        self._local = threading.local()
+
+    def reset_stats(self) -> None:
+        """Reset the fast path and fallback counters."""
+        self.stats = HybridStats()
+
+    @contextmanager
+    def uncounted(self) -> Iterator[None]:
+        """Leave the counters alone for kernel calls in this thread."""
+        counting = getattr(self._local, 'counting', True)
+        self._local.counting = False
+        try:
+            yield
+        finally:
+            self._local.counting = counting
+
+    def _certify(self, result: float, error: float) -> Optional[Decimal]:
+        """
+        Round a float result to the context precision if its error allows it.
+
+        Both ends of the error interval are rounded to the context precision
+        with Python's correctly rounded float formatting, which rounds half to
+        even like the default Decimal context. Rounding is monotonic, so if the
+        ends agree every value in between, including the exact result, rounds
+        to the same Decimal.
+
+        Args:
+            result (float): Result computed in binary64.
+            error (float): Bound on the absolute error of result.
+
+        Returns:
+            Optional[Decimal]: The correctly rounded result, or None if the
+                error interval straddles a rounding boundary.
+        """
+        ctx = getcontext()
+        if (ctx.rounding != ROUND_HALF_EVEN or not math.isfinite(result + error)
+                or abs(result) < MIN_NORMAL_MAGNITUDE):
+            return None
+        # Widen by one more rounding so computing the ends in float stays safe
+        error += abs(result) * ERROR_UNIT
+        digits = ctx.prec - 1
+        low = '%.*e' % (digits, result - error)
+        if low != '%.*e' % (digits, result + error):
+            return None
+        return Decimal(low)
+
+    def _hybrid(
+        self,
+        kernel: str,
+        a: Decimal,
+        b: Decimal,
+        estimate: Callable[[float, float], Optional[tuple]]
+    ) -> Decimal:
+        """
+        Try the binary64 fast path for a kernel and fall back to Decimal.
+
+        Args:
+            kernel (str): Name of the native kernel to fall back to.
+            a (Decimal): First operand.
+            b (Decimal): Second operand.
+            estimate (Callable): Computes (result, error bound) from the float
+                operands, or returns None if no bound applies.
+
+        Returns:
+            Decimal: The result at the active context precision.
+        """
+        counting = getattr(self._local, 'counting', True)
+        if (kernel in self.fast_kernels and getcontext().prec <= MAX_HYBRID_PRECISION
+                and not (kernel in INTEGRAL_EXACT_KERNELS and _is_integral(a) and _is_integral(b))):
+            fa, fb = _to_float(a), _to_float(b)
+            if fa is not None and fb is not None:
+                try:
+                    bounded = estimate(fa, fb)
+                except (ArithmeticError, ValueError):
+                    bounded = None
+                if bounded is not None:
+                    certified = self._certify(*bounded)
+                    if certified is not None:
+                        if counting:
+                            self.stats.fast_path += 1
+                        return certified
+        if counting:
+            self.stats.fallback += 1
+        return self._native[kernel].execute(a, b)
+
+    @staticmethod
+    def _sum_estimate(fa: float, fb: float) -> tuple:
+        """Bound a + b; the error scales with the operands, so cancellation widens it."""
+        result = fa + fb
+        return result, (abs(fa) + abs(fb) + abs(result)) * ERROR_UNIT
+
+    @staticmethod
+    def _power_estimate(fa: float, fb: float) -> Optional[tuple]:
+        """
+        Bound a ** b for a positive base.
+
+        Conversion error in the exponent is amplified by |b * ln(a)|, and the
+        result is widened to cover the Decimal engine's own working precision.
+        """
+        if fa <= 0:
+            return None
+        result = math.pow(fa, fb)
+        relative = ERROR_UNIT * (4 + abs(fb) * (1 + abs(math.log(fa))))
+        relative = max(relative, 10.0 ** -(getcontext().prec + GUARD_DIGITS - 2))
+        return result, abs(result) * relative
+
+    def add(self, a: Decimal, b: Decimal) -> Decimal:
+        return self._hybrid('add', a, b, self._sum_estimate)
+
+    def subtract(self, a: Decimal, b: Decimal) -> Decimal:
+        return self._hybrid('subtract', a, b, lambda fa, fb: self._sum_estimate(fa, -fb))
+
+    def multiply(self, a: Decimal, b: Decimal) -> Decimal:
+        def estimate(fa: float, fb: float) -> tuple:
+            result = fa * fb
+            return result, abs(result) * 2 * ERROR_UNIT
+        return self._hybrid('multiply', a, b, estimate)
+
+    def divide(self, a: Decimal, b: Decimal) -> Decimal:
+        def estimate(fa: float, fb: float) -> tuple:
+            result = fa / fb
+            return result, abs(result) * 2 * ERROR_UNIT
+        return self._hybrid('divide', a, b, estimate)
+
+    def abs_diff(self, a: Decimal, b: Decimal) -> Decimal:
+        def estimate(fa: float, fb: float) -> tuple:
+            result, error = self._sum_estimate(fa, -fb)
+            return abs(result), error
+        return self._hybrid('abs_diff', a, b, estimate)
+
+    def power(self, a: Decimal, b: Decimal) -> Decimal:
+        return self._hybrid('power', a, b, self._power_estimate)
+
+    def root(self, a: Decimal, b: Decimal) -> Decimal:
+        # The reciprocal of the degree adds one more rounding to the exponent
+        def estimate(fa: float, fb: float) -> Optional[tuple]:
+            bounded = self._power_estimate(fa, 1 / fb)
+            if bounded is None:
+                return None
+            result, error = bounded
+            return result, error + abs(result) * ERROR_UNIT * abs(math.log(fa) / fb)
+        return self._hybrid('root', a, b, estimate)
+
+
+# Registry of available backends, keyed by the name used in CalculatorConfig
+BACKENDS: Dict[str, NumericBackend] = {
+    backend.name: backend
+    for backend in (DecimalBackend(), FloatBackend(), NumpyBackend(), HybridBackend())
+}
+
+DEFAULT_BACKEND = "decimal"
+
+def get_backend(name: str = DEFAULT_BACKEND) -> NumericBackend:
+    """
+    Look up a numeric backend by name.
+
+    Args:
+        name (str, optional): Backend name ('decimal', 'float', 'numpy' or 'hybrid').
+            Defaults to 'decimal'.
+
+    Returns:
+        NumericBackend: The shared backend instance.
+
+    Raises:
+        ValueError: If the backend name is unknown.
+    """
+    backend = BACKENDS.get(name.lower())
+    if backend is None:
+        raise ValueError(f"Unknown numeric backend: {name}")
+    return backend
@@ -3,10 +3,230 @@
 ########################
 
 from abc import ABC, abstractmethod
-from decimal import Decimal
-from typing import Dict
+from decimal import Decimal, getcontext
+from fractions import Fraction
+import importlib
+import threading
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple, Union
+import numpy as np
+from app import decimal_math
 from app.exceptions import ValidationError
 
+if TYPE_CHECKING:  # pragma: no cover
+    from app.numeric_backends import NumericBackend
+
+# Numbers handled by the numeric tower, from cheapest to most general
+ExactNumber = Union[int, Fraction, Decimal]
+
+# Integral Decimals with more digits than this are left as Decimal rather than
+# converted to int, since the conversion would cost more than it saves
+MAX_EXACT_DIGITS = 1000
+
+# Integer powers whose result would exceed this many bits are left to the
+# Decimal engine instead of being computed exactly
+MAX_EXACT_POWER_BITS = 4096
+
+# Vectorized backend that computes vector and matrix operands element-wise;
+# NumPy's unless another is installed, looked up on first use
+_array_backend: Optional['NumericBackend'] = None
+
+
+def set_array_backend(backend: 'NumericBackend') -> None:
+    """
+    Install the backend that computes array operands.
+
+    Args:
+        backend (NumericBackend): A vectorized backend.
+    """
+    global _array_backend
+    _array_backend = backend
+
+
+def array_backend() -> 'NumericBackend':
+    """
+    Get the backend that computes array operands.
+
+    app.numeric_backends imports this module, so the NumPy backend is
+    imported on first use rather than at import time.
+
+    Returns:
+        NumericBackend: The installed backend, by default NumPy's.
+    """
+    if _array_backend is None:
+        from app.numeric_backends import get_backend
+        set_array_backend(get_backend('numpy'))
+    return _array_backend
+
+
+def to_exact(value: ExactNumber, exact: bool = False) -> ExactNumber:
+    """
+    Lower a number to the cheapest type that represents it exactly.
+
+    Integral Decimals become ints. In exact mode, other finite Decimals become
+    Fractions; otherwise they are left as Decimal.
+
+    Args:
+        value (ExactNumber): Number to lower.
+        exact (bool, optional): Whether to use Fractions for non-integers. Defaults to False.
+
+    Returns:
+        ExactNumber: The number as an int, Fraction or Decimal.
+    """
+    if not isinstance(value, Decimal) or not value.is_finite():
+        return value
+    if value == value.to_integral_value() and value.adjusted() < MAX_EXACT_DIGITS:
+        return int(value)
+    if exact:
+        return Fraction(value)
+    return value
+
+
+def to_decimal(value: ExactNumber) -> Decimal:
+    """
+    Convert a tower number back to Decimal for storage and display.
+
+    Ints convert losslessly. Fractions are divided out in the active Decimal
+    context, which is exact whenever the fraction terminates within its precision.
+
+    Args:
+        value (ExactNumber): Number to convert.
+
+    Returns:
+        Decimal: The number as a Decimal.
+    """
+    if isinstance(value, Decimal):
+        return value
+    if isinstance(value, int):
+        return Decimal(value)
+    if value.denominator == 1:
+        return Decimal(value.numerator)
+    return Decimal(value.numerator) / Decimal(value.denominator)
+
+
+def promote(a: ExactNumber, b: ExactNumber, exact: bool = False) -> Tuple[ExactNumber, ExactNumber]:
+    """
+    Bring two operands to a common type on the numeric tower.
+
+    Both operands are lowered with to_exact, then the less general one is
+    promoted: int to Fraction or Decimal, and Decimal to Fraction when the
+    other operand is already a Fraction.
+
+    Args:
+        a (ExactNumber): First operand.
+        b (ExactNumber): Second operand.
+        exact (bool, optional): Whether to use Fractions for non-integers. Defaults to False.
+
+    Returns:
+        Tuple[ExactNumber, ExactNumber]: Both operands as the same type.
+    """
+    x, y = to_exact(a, exact), to_exact(b, exact)
+    if type(x) is type(y):
+        return x, y
+    if isinstance(x, Fraction) or isinstance(y, Fraction):
+        if all(not isinstance(v, Decimal) or v.is_finite() for v in (x, y)):
+            return Fraction(x), Fraction(y)
+    return to_decimal(x), to_decimal(y)
+
+
+def divide(x: ExactNumber, y: ExactNumber, exact: bool = False) -> ExactNumber:
+    """
+    Divide two promoted operands.
+
+    Ints that divide evenly stay ints. Otherwise ints become a Fraction in
+    exact mode and a Decimal quotient in the active context.
+
+    Args:
+        x (ExactNumber): Dividend.
+        y (ExactNumber): Non-zero divisor of the same type.
+        exact (bool, optional): Whether to keep inexact quotients as Fractions. Defaults to False.
+
+    Returns:
+        ExactNumber: The quotient.
+    """
+    if isinstance(x, int):
+        quotient, remainder = divmod(x, y)
+        if remainder == 0:
+            return quotient
+        if exact:
+            return Fraction(x, y)
+        return Decimal(x) / Decimal(y)
+    return x / y
+
+
+def truncated_divide(x: ExactNumber, y: ExactNumber) -> ExactNumber:
+    """
+    Integer-divide two promoted operands, rounding toward zero like Decimal.
+
+    Args:
+        x (ExactNumber): Dividend.
+        y (ExactNumber): Non-zero divisor of the same type.
+
+    Returns:
+        ExactNumber: The truncated quotient.
+    """
+    if isinstance(x, Decimal):
+        return x // y
+    quotient = abs(x) // abs(y)
+    return -quotient if (x < 0) != (y < 0) else quotient
+
+
+def truncated_modulus(x: ExactNumber, y: ExactNumber) -> ExactNumber:
+    """
+    Take the remainder of two promoted operands with the sign of the dividend, like Decimal.
+
+    Args:
+        x (ExactNumber): Dividend.
+        y (ExactNumber): Non-zero divisor of the same type.
+
+    Returns:
+        ExactNumber: The remainder.
+    """
+    if isinstance(x, Decimal):
+        return x % y
+    remainder = abs(x) % abs(y)
+    return -remainder if x < 0 else remainder
+
+
+def exact_power(x: ExactNumber, y: ExactNumber) -> ExactNumber:
+    """
+    Raise one promoted operand to the power of another.
+
+    Integer exponents on int or Fraction bases are computed exactly as long as
+    the result stays within MAX_EXACT_POWER_BITS; everything else goes through
+    the Decimal engine.
+
+    Args:
+        x (ExactNumber): Base.
+        y (ExactNumber): Exponent.
+
+    Returns:
+        ExactNumber: The power.
+    """
+    if isinstance(y, int) and isinstance(x, (int, Fraction)) and y >= 0:
+        size = x.bit_length() if isinstance(x, int) else max(
+            x.numerator.bit_length(), x.denominator.bit_length()
+        )
+        if size * y <= MAX_EXACT_POWER_BITS:
+            return x ** y
+    return decimal_math.power(to_decimal(x), to_decimal(y))
+
+
+def unrounded(value: Decimal) -> bool:
+    """
+    Check whether a Decimal result computed from integral operands is exact.
+
+    An integral result smaller than 10**prec fits in the active context, so
+    computing it in Decimal did not round it. Larger ones may have been
+    rounded and are recomputed with Python ints.
+
+    Args:
+        value (Decimal): Result of Decimal arithmetic.
+
+    Returns:
+        bool: True if the result is below 10**prec in magnitude.
+    """
+    return value.adjusted() < getcontext().prec
+
 
 class Operation(ABC):
     """
@@ -14,8 +234,45 @@ class Operation(ABC):
 
     Defines the interface for all arithmetic operations. Each operation must
     implement the execute method and can optionally override operand validation.
+
+    Integral operands are computed with Python ints. In exact mode, non-integral
+    operands are computed as Fractions and the result is returned unconverted,
+    so chains of divisions stay exact until converted with to_decimal.
+
+    Vector and matrix operands (NumPy arrays) are computed element-wise with
+    broadcasting, by the vectorized array backend.
     """
 
+    # Whether the operation works on integers of any size, whose operands must
+    # therefore be validated without rounding to the working precision
+    integral = False
+
+    # Whether the operation can run long enough that servers compute it on a
+    # worker thread rather than their event loop
+    heavy = False
+
+    # Whether the operation is created with a parameter given in its name,
+    # e.g. modpow[97]; the text in brackets is passed to the constructor
+    parameterized = False
+
+    # Optional vectorized kernel, execute_batch(a, b), computing float64 arrays
+    # element-wise; float batch jobs call it instead of execute
+    execute_batch: Optional[Callable[[np.ndarray, np.ndarray], np.ndarray]] = None
+
+    def __init__(self, exact: bool = False, backend: Optional['NumericBackend'] = None):
+        """
+        Initialize the operation.
+
+        Args:
+            exact (bool, optional): Whether to compute with Fractions instead of
+                Decimals for non-integral values. Defaults to False.
+            backend (Optional[NumericBackend], optional): Non-native numeric backend
+                whose kernels compute the result. Defaults to None, meaning the
+                native Decimal numeric tower.
+        """
+        self.exact = exact
+        self.backend = backend
+
     @abstractmethod
     def execute(self, a: Decimal, b: Decimal) -> Decimal:
         """
@@ -51,6 +308,111 @@ class Operation(ABC):
         """
         pass
 
+    def _is_zero(self, value: Any) -> bool:
+        """
+        Check whether an operand is zero, using the backend if one is bound.
+
+        Args:
+            value (Any): Operand to check.
+
+        Returns:
+            bool: True if the operand (or any element of it) is zero.
+        """
+        backend = self._kernels(value)
+        return backend.any_zero(value) if backend else value == 0
+
+    def _is_negative(self, value: Any) -> bool:
+        """
+        Check whether an operand is negative, using the backend if one is bound.
+
+        Args:
+            value (Any): Operand to check.
+
+        Returns:
+            bool: True if the operand (or any element of it) is negative.
+        """
+        backend = self._kernels(value)
+        return backend.any_negative(value) if backend else value < 0
+
+    def _kernels(self, a: Any, b: Any = None) -> Optional['NumericBackend']:
+        """
+        Get the backend whose kernels compute one or two operands.
+
+        Vector and matrix operands are computed element-wise by the array
+        backend, unless the operation is already bound to a vectorized one.
+
+        Args:
+            a (Any): First operand.
+            b (Any, optional): Second operand. Defaults to None.
+
+        Returns:
+            Optional[NumericBackend]: The backend, or None for the native tower.
+        """
+        if (isinstance(a, np.ndarray) or isinstance(b, np.ndarray)) and (
+            self.backend is None or not self.backend.vectorized
+        ):
+            return array_backend()
+        return self.backend
+
+    def _bind(self, a: Any, b: Any) -> Tuple[Optional['NumericBackend'], Any, Any]:
+        """
+        Pick the backend for two operands and convert them to its number type.
+
+        Args:
+            a (Any): First operand.
+            b (Any): Second operand.
+
+        Returns:
+            Tuple[Optional[NumericBackend], Any, Any]: The backend (None for the
+                native tower) and both operands, converted if it is the array backend.
+        """
+        backend = self._kernels(a, b)
+        if backend is None or backend is self.backend:
+            return backend, a, b
+        return backend, backend.convert(a), backend.convert(b)
+
+    def _decimal(self, a: Any, b: Any) -> bool:
+        """
+        Check whether two operands can use plain Decimal arithmetic.
+
+        That holds for Decimal operands of a native, non-exact operation.
+        Lowering them on the numeric tower costs about ten times the
+        arithmetic itself, so it is left for results unrounded() rejects.
+
+        Args:
+            a (Any): First operand.
+            b (Any): Second operand.
+
+        Returns:
+            bool: True if both operands are Decimals and no backend is bound.
+        """
+        return type(a) is Decimal and type(b) is Decimal and self.backend is None and not self.exact
+
+    def _operands(self, a: ExactNumber, b: ExactNumber) -> Tuple[ExactNumber, ExactNumber]:
+        """
+        Promote operands to a common type on the numeric tower.
+
+        Args:
+            a (ExactNumber): First operand.
+            b (ExactNumber): Second operand.
+
+        Returns:
+            Tuple[ExactNumber, ExactNumber]: Both operands as the same type.
+        """
+        return promote(a, b, self.exact)
+
+    def _result(self, value: ExactNumber) -> ExactNumber:
+        """
+        Convert a computed value into the operation's result type.
+
+        Args:
+            value (ExactNumber): Value computed on the numeric tower.
+
+        Returns:
+            ExactNumber: The value itself in exact mode, otherwise a Decimal.
+        """
+        return value if self.exact else to_decimal(value)
+
     def __str__(self) -> str:
         """
         Return operation name for display.
@@ -82,7 +444,15 @@ class Addition(Operation):
             Decimal: Sum of the two operands.
         """
         self.validate_operands(a, b)
-        return a + b
+        if self._decimal(a, b):
+            result = a + b
+            if unrounded(result):
+                return result
+        backend, a, b = self._bind(a, b)
+        if backend:
+            return backend.add(a, b)
+        x, y = self._operands(a, b)
+        return self._result(x + y)
 
 
 class Subtraction(Operation):
@@ -104,7 +474,15 @@ class Subtraction(Operation):
             Decimal: Difference between the two operands.
         """
         self.validate_operands(a, b)
-        return a - b
+        if self._decimal(a, b):
+            result = a - b
+            if unrounded(result):
+                return result
+        backend, a, b = self._bind(a, b)
+        if backend:
+            return backend.subtract(a, b)
+        x, y = self._operands(a, b)
+        return self._result(x - y)
 
 
 class Multiplication(Operation):
@@ -126,7 +504,15 @@ class Multiplication(Operation):
             Decimal: Product of the two operands.
         """
         self.validate_operands(a, b)
-        return a * b
+        if self._decimal(a, b):
+            result = a * b
+            if unrounded(result):
+                return result
+        backend, a, b = self._bind(a, b)
+        if backend:
+            return backend.multiply(a, b)
+        x, y = self._operands(a, b)
+        return self._result(x * y)
 
 
 class Division(Operation):
@@ -150,7 +536,7 @@ class Division(Operation):
             ValidationError: If the divisor is zero.
         """
         super().validate_operands(a, b)
-        if b == 0:
+        if self._is_zero(b):
             raise ValidationError("Division by zero is not allowed")
 
     def execute(self, a: Decimal, b: Decimal) -> Decimal:
@@ -165,7 +551,15 @@ class Division(Operation):
             Decimal: Quotient of the division.
         """
         self.validate_operands(a, b)
-        return a / b
+        if self._decimal(a, b):
+            result = a / b
+            if unrounded(result):
+                return result
+        backend, a, b = self._bind(a, b)
+        if backend:
+            return backend.divide(a, b)
+        x, y = self._operands(a, b)
+        return self._result(divide(x, y, self.exact))
 
 
 class Power(Operation):
@@ -175,6 +569,8 @@ class Power(Operation):
     Raises one number to the power of another.
     """
 
+    heavy = True
+
     def validate_operands(self, a: Decimal, b: Decimal) -> None:
         """
         Validate operands for power operation.
@@ -189,7 +585,7 @@ class Power(Operation):
             ValidationError: If the exponent is negative.
         """
         super().validate_operands(a, b)
-        if b < 0:
+        if self._is_negative(b):
             raise ValidationError("Negative exponents not supported")
 
     def execute(self, a: Decimal, b: Decimal) -> Decimal:
@@ -204,7 +600,11 @@ class Power(Operation):
             Decimal: Result of the exponentiation.
         """
         self.validate_operands(a, b)
-        return Decimal(pow(float(a), float(b)))
+        backend, a, b = self._bind(a, b)
+        if backend:
+            return backend.power(a, b)
+        x, y = self._operands(a, b)
+        return self._result(exact_power(x, y))
 
 
 class Root(Operation):
@@ -214,6 +614,8 @@ class Root(Operation):
     Calculates the nth root of a number.
     """
 
+    heavy = True
+
     def validate_operands(self, a: Decimal, b: Decimal) -> None:
         """
         Validate operands for root operation.
@@ -229,9 +631,9 @@ class Root(Operation):
             ValidationError: If the number is negative or the root degree is zero.
         """
         super().validate_operands(a, b)
-        if a < 0:
+        if self._is_negative(a):
             raise ValidationError("Cannot calculate root of negative number")
-        if b == 0:
+        if self._is_zero(b):
             raise ValidationError("Zero root is undefined")
 
     def execute(self, a: Decimal, b: Decimal) -> Decimal:
@@ -246,39 +648,54 @@ class Root(Operation):
             Decimal: Result of the root calculation.
         """
         self.validate_operands(a, b)
-        return Decimal(pow(float(a), 1 / float(b)))
+        backend, a, b = self._bind(a, b)
+        if backend:
+            return backend.root(a, b)
+        return decimal_math.root(to_decimal(a), to_decimal(b))
     
 class Modulus(Operation):
     """Modulus operation implementation."""
     def validate_operands(self, a: Decimal, b: Decimal) -> None:
-        if b == 0:
+        if self._is_zero(b):
             raise ValidationError("Modulus by zero is not allowed")
 
     def execute(self, a: Decimal, b: Decimal) -> Decimal:
         self.validate_operands(a, b)
-        return a % b
+        backend, a, b = self._bind(a, b)
+        if backend:
+            return backend.modulus(a, b)
+        x, y = self._operands(a, b)
+        return self._result(truncated_modulus(x, y))
 
 
 class IntegerDivision(Operation):
     """Integer division operation implementation."""
     def validate_operands(self, a: Decimal, b: Decimal) -> None:
-        if b == 0:
+        if self._is_zero(b):
             raise ValidationError("Integer division by zero is not allowed")
 
     def execute(self, a: Decimal, b: Decimal) -> Decimal:
         self.validate_operands(a, b)
-        return a // b
+        backend, a, b = self._bind(a, b)
+        if backend:
+            return backend.int_divide(a, b)
+        x, y = self._operands(a, b)
+        return self._result(truncated_divide(x, y))
 
 
 class Percent(Operation):
     """Percent operation implementation."""
     def validate_operands(self, a: Decimal, b: Decimal) -> None:
-        if b == 0:
+        if self._is_zero(b):
             raise ValidationError("Cannot calculate percent of zero")
 
     def execute(self, a: Decimal, b: Decimal) -> Decimal:
         self.validate_operands(a, b)
-        return (a * Decimal("100")) / b
+        backend, a, b = self._bind(a, b)
+        if backend:
+            return backend.percent(a, b)
+        x, y = self._operands(a, b)
+        return self._result(divide(x * 100, y, self.exact))
     
 class AbsoluteDifference(Operation):
     """
@@ -289,9 +706,52 @@ class AbsoluteDifference(Operation):
 
     def execute(self, a: Decimal, b: Decimal) -> Decimal:
         self.validate_operands(a, b)
-        return abs(a - b)
+        backend, a, b = self._bind(a, b)
+        if backend:
+            return backend.abs_diff(a, b)
+        x, y = self._operands(a, b)
+        return self._result(abs(x - y))
 
 
+class MatrixMultiplication(Operation):
+    """
+    Matrix product of two vectors or matrices.
+
+    Not registered with OperationFactory by default, since every other
+    operation works element-wise on arrays and row by row in batches. Opt in
+    with OperationFactory.register_operation('matmul', MatrixMultiplication).
+    """
+
+    def validate_operands(self, a: Any, b: Any) -> None:
+        """
+        Validate operands, checking that they are arrays with aligned shapes.
+
+        Args:
+            a (Any): Left vector or matrix.
+            b (Any): Right vector or matrix.
+
+        Raises:
+            ValidationError: If an operand is not an array or the shapes do not align.
+        """
+        if not all(isinstance(value, np.ndarray) and value.ndim for value in (a, b)):
+            raise ValidationError("Matrix multiplication needs vector or matrix operands")
+        if a.shape[-1] != b.shape[-2 if b.ndim > 1 else 0]:
+            raise ValidationError(f"Shapes {a.shape} and {b.shape} are not aligned")
+
+    def execute(self, a: Any, b: Any) -> Any:
+        """
+        Multiply two vectors or matrices.
+
+        Args:
+            a (Any): Left vector or matrix.
+            b (Any): Right vector or matrix.
+
+        Returns:
+            Any: The matrix product; a scalar for two vectors.
+        """
+        self.validate_operands(a, b)
+        return np.matmul(a, b)
+
 
 class OperationFactory:
     """
@@ -300,28 +760,44 @@ class OperationFactory:
     Implements the Factory pattern by providing a method to instantiate
     different operation classes based on a given operation type. This promotes
     scalability and decouples the creation logic from the Calculator class.
+
+    Operations hold no state beyond their construction arguments, so each
+    combination of name, exact mode and backend is instantiated once and the
+    instance is shared (Flyweight). Every registered name also gets an integer
+    op code, in registration order from 1, with a slot in a dispatch table
+    holding the shared native operation's execute method. Hot paths resolve
+    a name once and then call through the code, with no per-call lookup or
+    instantiation.
+
+    Parameterized operations are named with their parameter in brackets,
+    e.g. modpow[97]. Each such name creates a new instance, and only the
+    bare name has an op code.
     """
 
     # Dictionary mapping operation identifiers to their corresponding classes
-    _operations: Dict[str, type] = {
-        'add': Addition,
-        'subtract': Subtraction,
-        'multiply': Multiplication,
-        'divide': Division,
-        'power': Power,
-        'root': Root,
-        'modulus': Modulus,
-        'int_divide': IntegerDivision,
-        'percent': Percent,
-        'abs_diff': AbsoluteDifference
-    }
+    _operations: Dict[str, type] = {}
+
+    # Op code of each name, and the name and native execute method of each
+    # code; code 0 is reserved (the RPC protocol uses it to open a session)
+    _codes: Dict[str, int] = {}
+    _names: List[str] = ['']
+    _dispatch: List[Optional[Callable[[Any, Any], Any]]] = [None]
+
+    # Shared instances by (name, exact, backend)
+    _instances: Dict[Tuple[str, bool, Optional['NumericBackend']], Operation] = {}
+
+    # Loaders of operations registered lazily, by name, until first use
+    _loaders: Dict[str, Callable[[], type]] = {}
+    _lock = threading.Lock()
 
     @classmethod
     def register_operation(cls, name: str, operation_class: type) -> None:
         """
         Register a new operation type.
 
-        Allows dynamic addition of new operations to the factory.
+        Allows dynamic addition of new operations to the factory. A new name
+        gets the next op code; registering a name again replaces its class
+        and shared instances but keeps its code.
 
         Args:
             name (str): Operation identifier (e.g., 'modulus').
@@ -332,26 +808,293 @@ class OperationFactory:
         """
         if not issubclass(operation_class, Operation):
             raise TypeError("Operation class must inherit from Operation")
-        cls._operations[name.lower()] = operation_class
+        key = name.lower()
+        # Parameterized operations have no instance without their parameter
+        operation = None if operation_class.parameterized else operation_class()
+        with cls._lock:
+            code = cls._reset(key)
+            cls._operations[key] = operation_class
+            if operation is not None:
+                cls._instances[(key, False, None)] = cls._instances[(code, False, None)] = operation
+                cls._dispatch[code] = operation.execute
+
+    @classmethod
+    def register_lazy(cls, name: str, loader: Callable[[], type]) -> None:
+        """
+        Register an operation whose class is loaded on first use.
+
+        The name gets its op code at once, so has_operation and op_code know
+        it, but the loader (which typically imports a plugin module) only
+        runs when create_operation or dispatch first needs the class. A
+        loader that fails is kept and retried on the next use.
+
+        Args:
+            name (str): Operation identifier.
+            loader (Callable[[], type]): Function returning the operation class.
+        """
+        key = name.lower()
+        with cls._lock:
+            cls._reset(key)
+            cls._loaders[key] = loader
+
+    @classmethod
+    def _reset(cls, key: str) -> int:
+        """
+        Forget a name's class, loader and shared instances. Called with the lock held.
+
+        Args:
+            key (str): Lower-case operation name.
+
+        Returns:
+            int: The name's op code, assigned now if it is new.
+        """
+        code = cls._codes.get(key)
+        if code is None:
+            code = cls._codes[key] = len(cls._names)
+            cls._names.append(key)
+            cls._dispatch.append(None)
+        cls._operations.pop(key, None)
+        cls._loaders.pop(key, None)
+        for instance in [k for k in cls._instances if k[0] in (key, code)]:
+            del cls._instances[instance]
+        cls._dispatch[code] = None
+        return code
+
+    @classmethod
+    def _load(cls, key: str) -> Optional[type]:
+        """
+        Load and register a lazily registered operation.
+
+        Args:
+            key (str): Lower-case operation name.
+
+        Returns:
+            Optional[type]: The operation class, or None if the name has no loader.
+
+        Raises:
+            ValueError: If the loader fails.
+        """
+        loader = cls._loaders.get(key)
+        if loader is None:
+            return None
+        try:
+            operation_class = loader()
+            cls.register_operation(key, operation_class)
+        except Exception as e:
+            raise ValueError(f"Cannot load operation {key}: {e}") from e
+        return operation_class
+
+    @classmethod
+    def create_operation(
+        cls,
+        operation_type: Union[str, int],
+        exact: bool = False,
+        backend: Optional['NumericBackend'] = None
+    ) -> Operation:
+        """
+        Get the operation instance for an operation type.
+
+        Instances are created from the registered class on first use and
+        shared afterwards, so callers must not modify them.
+
+        Args:
+            operation_type (Union[str, int]): The type of operation (e.g., 'add')
+                or its op code.
+            exact (bool, optional): Whether to create the operation in exact
+                Fraction mode. Defaults to False.
+            backend (Optional[NumericBackend], optional): Non-native numeric backend
+                to bind to the operation. Defaults to None.
+
+        Returns:
+            Operation: The shared instance of the specified operation class.
+
+        Raises:
+            ValueError: If the operation type or op code is unknown, or a
+                parameterized operation's parameter is missing or invalid.
+        """
+        if type(operation_type) is bool:
+            # True and False are ints equal to 1 and 0, so rule them out
+            # before they hit the instance cache as op codes
+            raise ValueError(f"Unknown op code: {operation_type}")
+        operation = cls._instances.get((operation_type, exact, backend))
+        if operation is None:
+            if isinstance(operation_type, int):
+                key = cls.operation_name(operation_type)
+            else:
+                key = operation_type.lower()
+            key, parameter = cls._split(key)
+            operation_class = cls._operations.get(key) or cls._load(key)
+            if not operation_class or (parameter is not None and not operation_class.parameterized):
+                raise ValueError(f"Unknown operation: {operation_type}")
+            if parameter is not None:
+                try:
+                    return operation_class(parameter, exact=exact, backend=backend)
+                except ValidationError as e:
+                    raise ValueError(f"Invalid operation {operation_type}: {e}") from e
+            if operation_class.parameterized:
+                raise ValueError(f"Operation {key} needs a parameter, e.g. {key}[n]")
+            # Racing threads may both create one; either instance is equivalent
+            operation = cls._instances.setdefault(
+                (key, exact, backend), operation_class(exact=exact, backend=backend)
+            )
+            # Cache by op code too, so calls by code skip the name lookup
+            cls._instances.setdefault((cls._codes[key], exact, backend), operation)
+        return operation
 
     @classmethod
-    def create_operation(cls, operation_type: str) -> Operation:
+    def has_operation(cls, name: str) -> bool:
         """
-        Create an operation instance based on the operation type.
+        Check whether an operation name is registered.
+
+        Args:
+            name (str): Operation name, in any case.
 
-        This method retrieves the appropriate operation class from the
-        _operations dictionary and instantiates it.
+        Returns:
+            bool: True if create_operation knows the name.
+        """
+        key, parameter = cls._split(name.lower())
+        if key not in cls._codes or parameter is None:
+            return key in cls._codes
+        try:
+            operation_class = cls._operations.get(key) or cls._load(key)
+        except ValueError:
+            return False
+        return operation_class.parameterized
+
+    @classmethod
+    def operation_names(cls) -> List[str]:
+        """
+        Get every registered operation name, including lazily registered ones.
+
+        Returns:
+            List[str]: Lower-case names in op code order.
+        """
+        return cls._names[1:]
+
+    @classmethod
+    def operation_class(cls, name: str) -> type:
+        """
+        Get the class registered for an operation name, loading it if needed.
 
         Args:
-            operation_type (str): The type of operation to create (e.g., 'add').
+            name (str): Operation name, in any case.
 
         Returns:
-            Operation: An instance of the specified operation class.
+            type: The operation class.
 
         Raises:
-            ValueError: If the operation type is unknown.
+            ValueError: If the name is unknown or its class fails to load.
         """
-        operation_class = cls._operations.get(operation_type.lower())
+        key = name.lower()
+        operation_class = cls._operations.get(key) or cls._load(key)
         if not operation_class:
-            raise ValueError(f"Unknown operation: {operation_type}")
-        return operation_class()
+            raise ValueError(f"Unknown operation: {name}")
+        return operation_class
+
+    @staticmethod
+    def _split(key: str) -> Tuple[str, Optional[str]]:
+        """
+        Split a parameterized operation name into its name and parameter.
+
+        Args:
+            key (str): Lower-case operation name, e.g. 'modpow[97]'.
+
+        Returns:
+            Tuple[str, Optional[str]]: The name and the text in brackets, or
+                the key and None if it has no parameter.
+        """
+        name, bracket, rest = key.partition('[')
+        if bracket and rest.endswith(']'):
+            return name, rest[:-1]
+        return key, None
+
+    @classmethod
+    def op_code(cls, name: str) -> int:
+        """
+        Get the op code of an operation name.
+
+        Args:
+            name (str): Operation name, in any case.
+
+        Returns:
+            int: The op code, 1 or more.
+
+        Raises:
+            ValueError: If the operation is unknown.
+        """
+        code = cls._codes.get(name) or cls._codes.get(name.lower())
+        if code is None:
+            raise ValueError(f"Unknown operation: {name}")
+        return code
+
+    @classmethod
+    def operation_name(cls, op_code: int) -> str:
+        """
+        Get the operation name of an op code.
+
+        Args:
+            op_code (int): Op code.
+
+        Returns:
+            str: The registered, lower-case name.
+
+        Raises:
+            ValueError: If the op code is unknown.
+        """
+        if type(op_code) is bool or not 0 < op_code < len(cls._names):
+            raise ValueError(f"Unknown op code: {op_code}")
+        return cls._names[op_code]
+
+    @classmethod
+    def dispatch(cls, op_code: int) -> Callable[[Any, Any], Any]:
+        """
+        Get the function that executes an op code on the native numeric tower.
+
+        The function is the shared operation's bound execute method, so calls
+        through it validate operands as usual.
+
+        Args:
+            op_code (int): Op code.
+
+        Returns:
+            Callable[[Any, Any], Any]: Function of the two operands.
+
+        Raises:
+            ValueError: If the op code is unknown, or its operation fails to load.
+        """
+        name = cls.operation_name(op_code)
+        kernel = cls._dispatch[op_code]
+        if kernel is None:
+            kernel = cls.create_operation(name).execute
+        return kernel
+
+
+for _name, _operation_class in (
+    ('add', Addition),
+    ('subtract', Subtraction),
+    ('multiply', Multiplication),
+    ('divide', Division),
+    ('power', Power),
+    ('root', Root),
+    ('modulus', Modulus),
+    ('int_divide', IntegerDivision),
+    ('percent', Percent),
+    ('abs_diff', AbsoluteDifference),
+):
+    OperationFactory.register_operation(_name, _operation_class)
+
+# Exact integer operations, registered lazily because their modules import
+# this one; each gets its op code now and its module is imported on first use
+for _name, _module, _attr in (
+    ('gcd', 'app.number_theory', 'GreatestCommonDivisor'),
+    ('lcm', 'app.number_theory', 'LeastCommonMultiple'),
+    ('int_power', 'app.number_theory', 'IntegerPower'),
+    ('int_root', 'app.number_theory', 'IntegerRoot'),
+    ('modpow', 'app.number_theory', 'ModularPower'),
+    ('factorial', 'app.number_theory', 'Factorial'),
+    ('binomial', 'app.number_theory', 'Binomial'),
+    ('permutations', 'app.number_theory', 'Permutations'),
+):
+    OperationFactory.register_lazy(
+        _name, lambda module=_module, attr=_attr: getattr(importlib.import_module(module), attr)
+    )
@@ -0,0 +1,258 @@
+########################
+# Parameter Sweep      #
+########################
+
+import csv
+from dataclasses import dataclass
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Iterator, List, Optional, Sequence, Union
+
+import numpy as np
+
+from app.calculator_config import CalculatorConfig
+from app.csv_jobs import STATUS_NAMES, UNLIMITED_WIDTH
+from app.operations import OperationFactory
+from app.shared_batch import (
+    DECIMAL_WIDTH, FLOAT_BACKENDS, STATUS_OK, compute_decimal_rows, compute_float_rows
+)
+
+# Cells evaluated per block; bounds the memory of one block of results
+DEFAULT_BLOCK_CELLS = 1 << 20
+
+
+@dataclass(frozen=True)
+class OperandRange:
+    """
+    Evenly spaced operands from start to stop inclusive, generated on demand.
+
+    Values are computed as start + i * step in Decimal, so a step such as 0.1
+    does not drift the way repeated float addition does.
+    """
+
+    start: Decimal
+    stop: Decimal
+    step: Decimal = Decimal(1)
+
+    def __post_init__(self) -> None:
+        for name in ('start', 'stop', 'step'):
+            object.__setattr__(self, name, Decimal(str(getattr(self, name))))
+        if self.step <= 0:
+            raise ValueError("Range step must be positive")
+
+    def __len__(self) -> int:
+        if self.stop < self.start:
+            return 0
+        return int((self.stop - self.start) // self.step) + 1
+
+    def decimals(self, first: int = 0, last: Optional[int] = None) -> List[Decimal]:
+        """
+        Get a slice of the range as Decimals.
+
+        Args:
+            first (int, optional): Index of the first value. Defaults to 0.
+            last (Optional[int], optional): Index after the last value. Defaults to the end.
+
+        Returns:
+            List[Decimal]: The values.
+        """
+        last = len(self) if last is None else last
+        return [self.start + i * self.step for i in range(first, last)]
+
+    def floats(self, first: int = 0, last: Optional[int] = None) -> np.ndarray:
+        """
+        Get a slice of the range as a float64 array.
+
+        Args:
+            first (int, optional): Index of the first value. Defaults to 0.
+            last (Optional[int], optional): Index after the last value. Defaults to the end.
+
+        Returns:
+            np.ndarray: The values.
+        """
+        last = len(self) if last is None else last
+        return float(self.start) + np.arange(first, last, dtype=np.float64) * float(self.step)
+
+
+Axis = Union[OperandRange, Sequence[Any], np.ndarray]
+
+
+def _decimals(axis: Axis, first: int, last: int) -> List[Any]:
+    """Slice an axis for the Decimal path."""
+    if isinstance(axis, OperandRange):
+        return axis.decimals(first, last)
+    return list(axis[first:last])
+
+
+def _floats(axis: Axis, first: int, last: int) -> np.ndarray:
+    """Slice an axis for the float path."""
+    if isinstance(axis, OperandRange):
+        return axis.floats(first, last)
+    return np.asarray(axis[first:last], dtype=np.float64)
+
+
+@dataclass
+class SweepBlock:
+    """
+    Results for a block of consecutive rows of a sweep.
+
+    Attributes:
+        start: Index of the block's first row, along the a axis
+        a: Operands of the block's rows
+        b: Operands of the columns, the same for every block
+        values: 2-D results; floats (NaN if failed) or Decimals (None if failed)
+        status: 2-D uint8 status codes, as in app.shared_batch
+    """
+
+    start: int
+    a: Any
+    b: Any
+    values: np.ndarray
+    status: np.ndarray
+
+
+class ParameterSweep:
+    """
+    One operation evaluated over every pair of two operand axes.
+
+    Cell (i, j) holds operation(a[i], b[j]). Rows are evaluated in blocks of
+    about DEFAULT_BLOCK_CELLS cells, generating the a operands of each block
+    as it is reached. With the float and numpy backends a block is one
+    broadcast NumPy computation; with the decimal and hybrid backends every
+    cell is validated and computed exactly in the configured Decimal context.
+    Failed cells never abort the sweep: they get a status code instead.
+    """
+
+    def __init__(
+        self,
+        operation: str,
+        a: Axis,
+        b: Axis,
+        config: Optional[CalculatorConfig] = None,
+        block_cells: int = DEFAULT_BLOCK_CELLS
+    ):
+        """
+        Define the sweep; nothing is computed until its blocks are read.
+
+        Args:
+            operation (str): Operation name.
+            a (Axis): Row operands, an OperandRange or a sequence of numbers.
+            b (Axis): Column operands, an OperandRange or a sequence of numbers.
+            config (Optional[CalculatorConfig], optional): Configuration to
+                compute with. Defaults to the environment configuration.
+            block_cells (int, optional): Cells per block. Defaults to DEFAULT_BLOCK_CELLS.
+
+        Raises:
+            ValueError: If the operation is unknown.
+        """
+        self.operation = operation.lower()
+        OperationFactory.create_operation(self.operation)
+        self.a = a
+        self.b = b
+        self.config = config or CalculatorConfig()
+        self.config.validate()
+        self.kind = 'float' if self.config.backend in FLOAT_BACKENDS else 'decimal'
+        self.shape = (len(a), len(b))
+        self.block_rows = max(1, block_cells // max(1, self.shape[1]))
+
+    def blocks(self) -> Iterator[SweepBlock]:
+        """
+        Evaluate the sweep block by block.
+
+        Yields:
+            SweepBlock: Results for the next rows, in order.
+        """
+        rows, columns = self.shape
+        if self.kind == 'float':
+            b = _floats(self.b, 0, columns)
+        else:
+            b = _decimals(self.b, 0, columns)
+        for start in range(0, rows, self.block_rows):
+            stop = min(start + self.block_rows, rows)
+            if self.kind == 'float':
+                yield self._float_block(start, _floats(self.a, start, stop), b)
+            else:
+                yield self._decimal_block(start, _decimals(self.a, start, stop), b)
+
+    def _float_block(self, start: int, a: np.ndarray, b: np.ndarray) -> SweepBlock:
+        """Broadcast one block of rows against the columns."""
+        shape = (len(a), len(b))
+        values = np.empty(shape)
+        status = np.empty(shape, np.uint8)
+        grid_a, grid_b = np.broadcast_arrays(a[:, None], b[None, :])
+        compute_float_rows(self.operation, grid_a.ravel(), grid_b.ravel(), values.reshape(-1), status.reshape(-1), self.config)
+        return SweepBlock(start, a, b, values, status)
+
+    def _decimal_block(self, start: int, a: List[Any], b: List[Any]) -> SweepBlock:
+        """Compute one block of rows exactly, cell by cell."""
+        texts, statuses = compute_decimal_rows(
+            self.operation, [x for x in a for _ in b], b * len(a), UNLIMITED_WIDTH, self.config
+        )
+        shape = (len(a), len(b))
+        values = np.empty(len(texts), dtype=object)
+        values[:] = [Decimal(text) if text else None for text in texts]
+        return SweepBlock(start, a, b, values.reshape(shape), np.array(statuses, np.uint8).reshape(shape))
+
+    def to_array(self, path: Optional[Path] = None, width: int = DECIMAL_WIDTH) -> np.ndarray:
+        """
+        Collect the results into one 2-D array, optionally memory-mapped.
+
+        Float sweeps give float64 with NaN for failed cells. Decimal sweeps
+        give fixed-width ASCII literals (like SharedColumns), empty for failed
+        cells and for results longer than width.
+
+        Args:
+            path (Optional[Path], optional): .npy file to write the array to
+                through a memory map, so it never has to fit in memory.
+                Defaults to an in-memory array.
+            width (int, optional): Bytes per Decimal literal. Defaults to DECIMAL_WIDTH.
+
+        Returns:
+            np.ndarray: The results; a memmap if a path was given.
+        """
+        dtype = np.float64 if self.kind == 'float' else np.dtype(f'S{width}')
+        if path is None:
+            table = np.empty(self.shape, dtype)
+        else:
+            table = np.lib.format.open_memmap(path, mode='w+', dtype=dtype, shape=self.shape)
+        for block in self.blocks():
+            rows = slice(block.start, block.start + len(block.a))
+            if self.kind == 'float':
+                table[rows] = block.values
+            else:
+                literals = [
+                    str(value).encode('ascii') if status == STATUS_OK else b''
+                    for value, status in zip(block.values.ravel(), block.status.ravel())
+                ]
+                table[rows] = np.array(
+                    [literal if len(literal) <= width else b'' for literal in literals], dtype=dtype
+                ).reshape(block.values.shape)
+        if path is not None:
+            table.flush()
+        return table
+
+    def write_csv(self, path: Path) -> int:
+        """
+        Stream the results to a CSV table of a, b, result and status rows.
+
+        Args:
+            path (Path): Output file.
+
+        Returns:
+            int: Number of failed cells.
+        """
+        failures = 0
+        with open(path, 'w', newline='', encoding=self.config.default_encoding) as file:
+            writer = csv.writer(file)
+            writer.writerow(['a', 'b', 'result', 'status'])
+            for block in self.blocks():
+                failures += int(np.count_nonzero(block.status))
+                a, b = list(block.a), list(block.b)
+                if self.kind == 'float':
+                    a, b = block.a.tolist(), block.b.tolist()
+                for x, values, statuses in zip(a, block.values.tolist(), block.status.tolist()):
+                    writer.writerows(
+                        (x, y, value if status == STATUS_OK else '', STATUS_NAMES[status])
+                        for y, value, status in zip(b, values, statuses)
+                    )
+        return failures
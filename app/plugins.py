@@ -0,0 +1,284 @@
+########################
+# Operation Plugins    #
+########################
+
+import ast
+from dataclasses import asdict, dataclass
+import importlib
+import importlib.metadata
+import importlib.util
+import json
+import logging
+import os
+from pathlib import Path
+import sys
+import tempfile
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from app.calculator_config import CalculatorConfig
+from app.operations import Operation, OperationFactory
+
+# Entry point group of installed operation plugins; each entry point is named
+# after its operation and refers to the class, e.g. hypot = my_pkg.ops:Hypot
+ENTRY_POINT_GROUP = 'calculator.operations'
+
+# Plugin directory modules are imported under this package name
+PLUGIN_PACKAGE = 'calculator_plugins'
+
+# Module-level name of the {operation name: class} dict in plugin directory modules
+OPERATIONS_NAME = 'OPERATIONS'
+
+# Bumped when the index file layout changes, so old files are rebuilt
+INDEX_VERSION = 1
+
+
+@dataclass(frozen=True)
+class PluginSpec:
+    """Where one plugin operation's class is found, as recorded in the index."""
+
+    name: str                   # Operation name, lower-case
+    module: str                 # Module defining the class
+    attr: str                   # Name of the class in the module
+    path: Optional[str] = None  # Source file, for plugin directory modules
+
+
+def scan_entry_points(group: str = ENTRY_POINT_GROUP) -> List[PluginSpec]:
+    """
+    Find the operation plugins declared by installed distributions.
+
+    This reads the metadata of every installed distribution, which is what
+    the on-disk index saves at startup.
+
+    Args:
+        group (str, optional): Entry point group. Defaults to ENTRY_POINT_GROUP.
+
+    Returns:
+        List[PluginSpec]: One spec per entry point that names a class.
+    """
+    specs = []
+    for entry_point in importlib.metadata.entry_points(group=group):
+        if not entry_point.attr:
+            logging.warning(f"Skipping operation plugin {entry_point.name}: {entry_point.value} is not module:Class")
+            continue
+        specs.append(PluginSpec(entry_point.name.lower(), entry_point.module, entry_point.attr))
+    return specs
+
+
+def scan_directory(directory: Path) -> List[PluginSpec]:
+    """
+    Find the operation plugins in a directory without importing them.
+
+    Each *.py file not starting with an underscore is parsed, and its
+    module-level OPERATIONS dict literal, mapping operation names to classes
+    defined in the file, is read from the syntax tree.
+
+    Args:
+        directory (Path): Plugin directory; missing means no plugins.
+
+    Returns:
+        List[PluginSpec]: One spec per declared operation, by file name order.
+    """
+    if not directory.is_dir():
+        return []
+    specs = []
+    for path in sorted(directory.glob('*.py')):
+        if path.name.startswith('_'):
+            continue
+        try:
+            operations = _declared_operations(ast.parse(path.read_bytes(), str(path)))
+        except (SyntaxError, ValueError) as e:
+            logging.warning(f"Skipping operation plugin file {path}: {e}")
+            continue
+        module = f"{PLUGIN_PACKAGE}.{path.stem}"
+        specs.extend(PluginSpec(name.lower(), module, attr, str(path)) for name, attr in operations)
+    return specs
+
+
+def _declared_operations(tree: ast.Module) -> List[Tuple[str, str]]:
+    """
+    Read the OPERATIONS dict of a parsed plugin module.
+
+    Args:
+        tree (ast.Module): Parsed module.
+
+    Returns:
+        List[Tuple[str, str]]: (operation name, class name) pairs.
+
+    Raises:
+        ValueError: If OPERATIONS is missing or not a literal dict of names to classes.
+    """
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and any(
+            isinstance(target, ast.Name) and target.id == OPERATIONS_NAME for target in node.targets
+        ):
+            if not isinstance(node.value, ast.Dict):
+                break
+            pairs = []
+            for key, value in zip(node.value.keys, node.value.values):
+                if not (isinstance(key, ast.Constant) and isinstance(key.value, str) and isinstance(value, ast.Name)):
+                    raise ValueError(f"{OPERATIONS_NAME} must map operation names to classes")
+                pairs.append((key.value, value.id))
+            return pairs
+    raise ValueError(f"no literal {OPERATIONS_NAME} dict")
+
+
+def _fingerprint(directory: Path) -> Dict[str, Any]:
+    """
+    Describe what the plugin scan depends on, cheaply.
+
+    Installing or removing a distribution changes the modification time of
+    its sys.path directory, and editing a plugin file changes its own, so a
+    few stat calls tell whether a saved index is still current.
+
+    Args:
+        directory (Path): Plugin directory.
+
+    Returns:
+        Dict[str, Any]: JSON-serializable fingerprint.
+    """
+    paths = [[path, os.stat(path).st_mtime_ns] for path in sys.path if path and os.path.isdir(path)]
+    files = []
+    if directory.is_dir():
+        for path in sorted(directory.glob('*.py')):
+            stat = path.stat()
+            files.append([path.name, stat.st_mtime_ns, stat.st_size])
+    return {'version': INDEX_VERSION, 'sys_path': paths, 'plugin_dir': str(directory), 'files': files}
+
+
+def plugin_index(index: Path, directory: Path, refresh: bool = False) -> List[PluginSpec]:
+    """
+    Get the operation plugins, from the index file if it is current.
+
+    Otherwise entry points and the plugin directory are scanned and the
+    index file is rewritten atomically.
+
+    Args:
+        index (Path): Index file.
+        directory (Path): Plugin directory.
+        refresh (bool, optional): Whether to rescan even if the index looks
+            current. Defaults to False.
+
+    Returns:
+        List[PluginSpec]: Entry point plugins, then plugin directory ones.
+    """
+    fingerprint = _fingerprint(directory)
+    if not refresh:
+        try:
+            saved = json.loads(index.read_text())
+            if saved['fingerprint'] == fingerprint:
+                return [PluginSpec(**spec) for spec in saved['plugins']]
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+    specs = scan_entry_points() + scan_directory(directory)
+    text = json.dumps({'fingerprint': fingerprint, 'plugins': [asdict(spec) for spec in specs]})
+    index.parent.mkdir(parents=True, exist_ok=True)
+    descriptor, temporary = tempfile.mkstemp(dir=index.parent, prefix=index.name + '.')
+    with os.fdopen(descriptor, 'w') as file:
+        file.write(text)
+    os.replace(temporary, index)
+    logging.info(f"Indexed {len(specs)} operation plugins in {index}")
+    return specs
+
+
+def load_plugin(spec: PluginSpec) -> type:
+    """
+    Import a plugin's module and get its operation class.
+
+    Args:
+        spec (PluginSpec): Plugin to load.
+
+    Returns:
+        type: The operation class.
+
+    Raises:
+        Exception: Whatever importing the module raises.
+        TypeError: If the attribute is not an Operation class.
+    """
+    if spec.path is None:
+        module = importlib.import_module(spec.module)
+    else:
+        module = sys.modules.get(spec.module)
+        if module is None:
+            module_spec = importlib.util.spec_from_file_location(spec.module, spec.path)
+            module = importlib.util.module_from_spec(module_spec)
+            sys.modules[spec.module] = module
+            try:
+                module_spec.loader.exec_module(module)
+            except BaseException:
+                del sys.modules[spec.module]
+                raise
+    operation_class = getattr(module, spec.attr, None)
+    if not (isinstance(operation_class, type) and issubclass(operation_class, Operation)):
+        raise TypeError(f"{spec.module}.{spec.attr} is not an Operation class")
+    logging.info(f"Loaded operation plugin {spec.name} from {spec.module}")
+    return operation_class
+
+
+# Plugins registered by this process, by operation name, and the index
+# files already installed from
+_installed: Dict[str, PluginSpec] = {}
+_indexes: Dict[Tuple[Path, Path], List[str]] = {}
+_lock = threading.Lock()
+
+
+def install_plugins(config: CalculatorConfig, refresh: bool = False) -> List[str]:
+    """
+    Register this process's operation plugins with OperationFactory, lazily.
+
+    Does nothing unless config.plugins is set. Each plugin's name is
+    registered with a loader, so its module is only imported when the
+    operation is first used. Names already registered otherwise (such as
+    the built-in operations) keep their class, and the first plugin with a
+    name wins. Installing from the same index again is free unless refresh
+    is set.
+
+    Args:
+        config (CalculatorConfig): Configuration naming the index file and
+            plugin directory.
+        refresh (bool, optional): Whether to rescan for plugins. Defaults to False.
+
+    Returns:
+        List[str]: Names of the plugin operations.
+    """
+    if not config.plugins:
+        return []
+    key = (config.plugin_index, config.plugin_dir)
+    with _lock:
+        if key in _indexes and not refresh:
+            return _indexes[key]
+        names = []
+        for spec in plugin_index(config.plugin_index, config.plugin_dir, refresh):
+            if spec.name in names:
+                logging.warning(f"Skipping duplicate operation plugin {spec.name} from {spec.module}")
+                continue
+            installed = _installed.get(spec.name)
+            if installed is None and OperationFactory.has_operation(spec.name):
+                logging.warning(f"Skipping operation plugin {spec.name}: the name is taken")
+                continue
+            if installed != spec:
+                OperationFactory.register_lazy(spec.name, lambda spec=spec: load_plugin(spec))
+                _installed[spec.name] = spec
+            names.append(spec.name)
+        _indexes[key] = names
+        return names
+
+
+def plugin_kernel(operation: str, backend: Optional[Any] = None) -> Optional[Callable[[Any, Any], Any]]:
+    """
+    Get the function that recomputes a plugin operation's history entry.
+
+    Args:
+        operation (str): Operation name as recorded, i.e. the class name.
+        backend (Optional[NumericBackend], optional): The entry's backend.
+            Defaults to None.
+
+    Returns:
+        Optional[Callable[[Any, Any], Any]]: The operation's execute, loading
+            the plugin if needed, or None if no installed plugin has that class.
+    """
+    for spec in list(_installed.values()):
+        if spec.attr == operation:
+            bound = None if backend is None or backend.native else backend
+            return OperationFactory.create_operation(spec.name, backend=bound).execute
+    return None
@@ -0,0 +1,387 @@
+########################
+# N-ary Reductions     #
+########################
+
+from abc import ABC, abstractmethod
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+import copy
+from dataclasses import dataclass
+from decimal import MAX_EMAX, MAX_PREC, MIN_EMIN, Context, Decimal, Overflow, localcontext
+from itertools import islice
+import multiprocessing
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from app.calculator_config import CalculatorConfig
+from app.decimal_math import GUARD_DIGITS
+from app.exceptions import OperationError
+from app.input_validators import InputValidator
+from app.shared_batch import FLOAT_BACKENDS
+
+DEFAULT_CHUNK_SIZE = 65536
+
+# Sums and products in this context never round, so they are exact
+EXACT_CONTEXT = Context(prec=MAX_PREC, Emax=MAX_EMAX, Emin=MIN_EMIN)
+
+
+class Reducer(ABC):
+    """
+    An associative reduction over a stream of Decimals.
+
+    Chunks are reduced independently to partial states, which are then
+    merged pairwise, so chunks can be reduced in any process.
+    """
+
+    name: str  # Name recorded in the history
+
+    @abstractmethod
+    def reduce(self, values: List[Decimal], context: Context) -> Any:
+        """
+        Reduce one non-empty chunk to a partial state.
+
+        Args:
+            values (List[Decimal]): Validated values.
+            context (Context): Working context for inexact steps.
+
+        Returns:
+            Any: The partial state.
+        """
+        pass  # pragma: no cover
+
+    @abstractmethod
+    def merge(self, left: Any, right: Any, context: Context) -> Any:
+        """
+        Combine the states of two adjacent runs of values.
+
+        Args:
+            left (Any): State of the earlier values.
+            right (Any): State of the later values.
+            context (Context): Working context for inexact steps.
+
+        Returns:
+            Any: The state of both runs.
+        """
+        pass  # pragma: no cover
+
+    @abstractmethod
+    def finish(self, state: Optional[Any], count: int) -> Decimal:
+        """
+        Turn a final state into the result, in the caller's context.
+
+        Args:
+            state (Optional[Any]): The merged state, or None if there were no values.
+            count (int): Number of values reduced.
+
+        Returns:
+            Decimal: The result.
+
+        Raises:
+            OperationError: If the result is undefined for that many values.
+        """
+        pass  # pragma: no cover
+
+
+def _tree(values: List[Any], combine) -> Any:
+    """Combine a non-empty list pairwise, so operand sizes stay balanced."""
+    while len(values) > 1:
+        paired = [combine(values[i], values[i + 1]) for i in range(0, len(values) - 1, 2)]
+        if len(values) % 2:
+            paired.append(values[-1])
+        values = paired
+    return values[0]
+
+
+class Sum(Reducer):
+    """Exact sum, rounded once at the end."""
+
+    name = 'Sum'
+
+    def reduce(self, values: List[Decimal], context: Context) -> Decimal:
+        total = Decimal(0)
+        for value in values:
+            total = EXACT_CONTEXT.add(total, value)
+        return total
+
+    def merge(self, left: Decimal, right: Decimal, context: Context) -> Decimal:
+        return EXACT_CONTEXT.add(left, right)
+
+    def finish(self, state: Optional[Decimal], count: int) -> Decimal:
+        return +state if count else Decimal(0)
+
+
+class Product(Reducer):
+    """
+    Product at the working precision, rounded once at the end.
+
+    An exact product grows by the digits of every factor, so the state is
+    kept at the working precision, whose guard digits absorb the rounding
+    of each step, and memory stays constant however many values there are.
+    """
+
+    name = 'Product'
+
+    def reduce(self, values: List[Decimal], context: Context) -> Decimal:
+        return _tree(values, context.multiply)
+
+    def merge(self, left: Decimal, right: Decimal, context: Context) -> Decimal:
+        return context.multiply(left, right)
+
+    def finish(self, state: Optional[Decimal], count: int) -> Decimal:
+        return +state if count else Decimal(1)
+
+
+class Extreme(Reducer):
+    """Smallest or largest value."""
+
+    def __init__(self, name: str, pick):
+        self.name = name
+        self.pick = pick
+
+    def reduce(self, values: List[Decimal], context: Context) -> Decimal:
+        return self.pick(values)
+
+    def merge(self, left: Decimal, right: Decimal, context: Context) -> Decimal:
+        return self.pick(left, right)
+
+    def finish(self, state: Optional[Decimal], count: int) -> Decimal:
+        if not count:
+            raise OperationError(f"{self.name} of no values is undefined")
+        return state
+
+
+class Moments(Reducer):
+    """
+    Mean or variance by Welford's algorithm.
+
+    The state is (count, mean, sum of squared deviations). Chunks are merged
+    with the pairwise update of Chan et al., so the result does not depend
+    on how the values were chunked beyond the working precision.
+    """
+
+    def __init__(self, name: str, statistic: str):
+        self.name = name
+        self.statistic = statistic
+        # The sample variance divides by count - 1
+        self.minimum = 2 if statistic == 'sample' else 1
+
+    def reduce(self, values: List[Decimal], context: Context) -> Tuple[int, Decimal, Decimal]:
+        n, mean, m2 = 0, Decimal(0), Decimal(0)
+        for value in values:
+            n += 1
+            delta = context.subtract(value, mean)
+            mean = context.add(mean, context.divide(delta, n))
+            m2 = context.add(m2, context.multiply(delta, context.subtract(value, mean)))
+        return n, mean, m2
+
+    def merge(self, left: Tuple[int, Decimal, Decimal], right: Tuple[int, Decimal, Decimal], context: Context) -> Tuple[int, Decimal, Decimal]:
+        (na, ma, m2a), (nb, mb, m2b) = left, right
+        n = na + nb
+        delta = context.subtract(mb, ma)
+        mean = context.add(ma, context.divide(context.multiply(delta, nb), n))
+        correction = context.divide(context.multiply(context.multiply(delta, delta), na * nb), n)
+        return n, mean, context.add(context.add(m2a, m2b), correction)
+
+    def finish(self, state: Optional[Tuple[int, Decimal, Decimal]], count: int) -> Decimal:
+        if count < self.minimum:
+            raise OperationError(f"{self.name} of fewer than {self.minimum} values is undefined")
+        if self.statistic == 'mean':
+            return +state[1]
+        return state[2] / (count - 1 if self.statistic == 'sample' else count)
+
+
+REDUCERS: Dict[str, Reducer] = {
+    'sum': Sum(),
+    'product': Product(),
+    'min': Extreme('Minimum', min),
+    'max': Extreme('Maximum', max),
+    'mean': Moments('Mean', 'mean'),
+    'variance': Moments('Variance', 'sample'),
+    'pvariance': Moments('PopulationVariance', 'population'),
+}
+
+
+def get_reducer(name: str) -> Reducer:
+    """
+    Look up a reduction by name.
+
+    Args:
+        name (str): 'sum', 'product', 'min', 'max', 'mean', 'variance' or 'pvariance'.
+
+    Returns:
+        Reducer: The reduction.
+
+    Raises:
+        ValueError: If the name is unknown.
+    """
+    reducer = REDUCERS.get(name.lower())
+    if reducer is None:
+        raise ValueError(f"Unknown reduction: {name}")
+    return reducer
+
+
+@dataclass
+class ReductionResult:
+    """
+    Result of a reduction.
+
+    Attributes:
+        value: The reduced value, rounded to the configured precision
+        count: Number of values reduced
+        chunks: Number of chunks the values were read in
+    """
+
+    value: Decimal
+    count: int
+    chunks: int
+
+
+def _decimal_config(config: CalculatorConfig) -> CalculatorConfig:
+    """Get a configuration that validates inputs as Decimals."""
+    if config.backend not in FLOAT_BACKENDS:
+        return config
+    decimal_config = copy.copy(config)
+    decimal_config.backend = 'decimal'
+    return decimal_config
+
+
+def _working_context(config: CalculatorConfig) -> Context:
+    """Context for inexact intermediate steps, with guard digits."""
+    context = config.create_decimal_context()
+    context.prec += GUARD_DIGITS
+    return context
+
+
+def reduce_chunk(name: str, values: List[Any], config: CalculatorConfig) -> Tuple[int, Any]:
+    """
+    Validate and reduce one chunk, in any process.
+
+    Args:
+        name (str): Reduction name.
+        values (List[Any]): Raw values.
+        config (CalculatorConfig): Configuration to validate and compute with.
+
+    Returns:
+        Tuple[int, Any]: Number of values and the partial state.
+
+    Raises:
+        ValidationError: If a value is invalid.
+        OperationError: If the partial state overflows.
+    """
+    reducer = get_reducer(name)
+    with localcontext(config.create_decimal_context()):
+        numbers = [InputValidator.validate_number(value, config) for value in values]
+    try:
+        return len(numbers), reducer.reduce(numbers, _working_context(config))
+    except Overflow:
+        raise OperationError(f"{reducer.name} overflowed")
+
+
+class _TreeAccumulator:
+    """
+    Merge partial states in order, as a balanced binary tree.
+
+    Like a binary counter, it holds at most one state per level, so memory
+    stays logarithmic in the number of chunks while every merge combines
+    runs of similar size.
+    """
+
+    def __init__(self, reducer: Reducer, context: Context):
+        self.reducer = reducer
+        self.context = context
+        self.stack: List[Tuple[int, Any]] = []
+
+    def push(self, state: Any) -> None:
+        level = 0
+        while self.stack and self.stack[-1][0] == level:
+            _, left = self.stack.pop()
+            state = self.reducer.merge(left, state, self.context)
+            level += 1
+        self.stack.append((level, state))
+
+    def result(self) -> Optional[Any]:
+        state = None
+        while self.stack:
+            _, left = self.stack.pop()
+            state = left if state is None else self.reducer.merge(left, state, self.context)
+        return state
+
+
+def reduce_values(
+    name: str,
+    values: Iterable[Any],
+    config: Optional[CalculatorConfig] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    workers: int = 0,
+    start_method: Optional[str] = None
+) -> ReductionResult:
+    """
+    Reduce a stream of values, holding only a few chunks in memory.
+
+    Values are validated like calculator inputs and always computed in
+    Decimal, whatever the configured backend. Chunks are reduced in this
+    process, or with workers > 0 on a process pool with a couple of chunks
+    per worker in flight. Either way the partial states are merged as a
+    balanced tree.
+
+    Args:
+        name (str): Reduction name, see get_reducer.
+        values (Iterable[Any]): Values to reduce; any iterator works.
+        config (Optional[CalculatorConfig], optional): Configuration to
+            validate and compute with. Defaults to the environment configuration.
+        chunk_size (int, optional): Values per chunk. Defaults to DEFAULT_CHUNK_SIZE.
+        workers (int, optional): Worker processes, 0 to reduce in this process. Defaults to 0.
+        start_method (Optional[str], optional): multiprocessing start method.
+            Defaults to the platform default.
+
+    Returns:
+        ReductionResult: The value, count and number of chunks.
+
+    Raises:
+        ValueError: If the reduction name is unknown.
+        ValidationError: If a value is invalid.
+        OperationError: If the result is undefined, e.g. the mean of no values,
+            or overflows.
+    """
+    reducer = get_reducer(name)
+    name = name.lower()
+    config = _decimal_config(config or CalculatorConfig())
+    accumulator = _TreeAccumulator(reducer, _working_context(config))
+    iterator = iter(values)
+    chunks = iter(lambda: list(islice(iterator, chunk_size)), [])
+    count = 0
+    number = 0
+    if workers:
+        partials = _reduce_in_pool(name, chunks, config, workers, start_method)
+    else:
+        partials = (reduce_chunk(name, chunk, config) for chunk in chunks)
+    try:
+        for n, state in partials:
+            count += n
+            number += 1
+            accumulator.push(state)
+
+        with localcontext(config.create_decimal_context()):
+            return ReductionResult(reducer.finish(accumulator.result(), count), count, number)
+    except Overflow:
+        raise OperationError(f"{reducer.name} overflowed")
+
+
+def _reduce_in_pool(
+    name: str,
+    chunks: Iterator[List[Any]],
+    config: CalculatorConfig,
+    workers: int,
+    start_method: Optional[str]
+) -> Iterator[Tuple[int, Any]]:
+    """Reduce chunks on a process pool, yielding partial states in order."""
+    executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context(start_method))
+    pending: Deque[Future] = deque()
+    try:
+        for chunk in chunks:
+            pending.append(executor.submit(reduce_chunk, name, chunk, config))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        executor.shutdown(cancel_futures=True)
@@ -0,0 +1,461 @@
+########################
+# Result Store         #
+########################
+
+import atexit
+from collections import Counter
+from decimal import Decimal
+import fcntl
+import hashlib
+import logging
+import mmap
+import os
+from pathlib import Path
+import struct
+import tempfile
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from app import decimal_math
+from app.calculator_config import CalculatorConfig
+from app.shared_cache import SharedResultCache, result_key
+
+# File layout: a header, then an open-addressing table of fixed-size slots
+# probed linearly. A slot is empty while its timestamp is zero. Files are
+# never changed in place: writers build a new one and rename it over the old.
+MAGIC = b'CALCRS01'
+HEADER = struct.Struct('<8sIIQ')         # magic, capacity, value width, entries
+HEADER_SIZE = 64
+SLOT_HEAD = struct.Struct('<16sdIH')     # key digest, stored at, hits, value length
+
+DEFAULT_MAX_ENTRIES = 65536
+DEFAULT_VALUE_WIDTH = 96
+DEFAULT_FLUSH_EVERY = 256
+
+# Seconds between checks for a newer file written by another process
+REFRESH_INTERVAL = 1.0
+
+# An entry as held in memory: stored at (epoch seconds), hits, value
+Entry = Tuple[float, int, str]
+
+
+def _digest(key: bytes) -> bytes:
+    """Hash a key to its 16-byte digest."""
+    return hashlib.blake2b(key, digest_size=16).digest()
+
+
+class PersistentResultStore:
+    """
+    Result store on disk that outlives the processes using it.
+
+    The file is an immutable hash table. Readers map it read-only and look
+    keys up in place, so opening costs nothing and only the pages a lookup
+    touches are read: the store warms up lazily. New results collect in
+    memory and are written out by flush(), which merges them with the
+    current file under an fcntl lock, drops expired and rarely used
+    entries, and atomically renames the new file into place. Once
+    flush_every results are pending, a background thread flushes them, so
+    put() never waits for the file to be rewritten. Processes
+    that still map the old file keep a consistent view and pick up the new
+    one within REFRESH_INTERVAL.
+
+    Entries expire ttl seconds after they were stored. When more than
+    max_entries remain, the ones with the fewest hits are evicted, oldest
+    first among equals. Hits are counted in writable processes only.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        ttl: Optional[float] = None,
+        read_only: Optional[bool] = None,
+        value_width: int = DEFAULT_VALUE_WIDTH,
+        flush_every: int = DEFAULT_FLUSH_EVERY
+    ):
+        """
+        Prepare the store; the file is not opened until the first lookup.
+
+        Args:
+            path (Path): Store file.
+            max_entries (int, optional): Most entries kept by a flush. Defaults to DEFAULT_MAX_ENTRIES.
+            ttl (Optional[float], optional): Seconds an entry stays valid, or None for no limit. Defaults to None.
+            read_only (Optional[bool], optional): Never write the file. Defaults to whether its directory is read-only.
+            value_width (int, optional): Longest storable result literal. Defaults to DEFAULT_VALUE_WIDTH.
+            flush_every (int, optional): Pending results that trigger a flush. Defaults to DEFAULT_FLUSH_EVERY.
+        """
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.read_only = not os.access(self.path.parent, os.W_OK) if read_only is None else read_only
+        self.value_width = value_width
+        self.flush_every = flush_every
+        self.slot_size = SLOT_HEAD.size + value_width
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._map: Optional[mmap.mmap] = None
+        self._identity: Optional[Tuple[int, int]] = None
+        self._checked = float('-inf')
+        self._pending: Dict[bytes, Tuple[float, str]] = {}
+        self._counts: Counter = Counter()
+        # Results being written by a flush, still visible to lookups
+        self._flushing: Dict[bytes, Tuple[float, str]] = {}
+        self._flush_lock = threading.Lock()
+        self._flusher: Optional[threading.Thread] = None
+
+    def _mapping(self) -> Optional[mmap.mmap]:
+        """Map the current file, replacing a mapping the file has been renamed over."""
+        now = time.monotonic()
+        if now - self._checked < REFRESH_INTERVAL:
+            return self._map
+        self._checked = now
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return self._map
+        if (stat.st_ino, stat.st_mtime_ns) != self._identity:
+            self._unmap()
+            with open(self.path, 'rb') as file:
+                mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            if mapped[:len(MAGIC)] == MAGIC:
+                self._map = mapped
+            else:
+                mapped.close()
+            self._identity = (stat.st_ino, stat.st_mtime_ns)
+        return self._map
+
+    def _unmap(self) -> None:
+        """Drop the current mapping, if any."""
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+    @staticmethod
+    def _find(data: mmap.mmap, digest: bytes) -> Optional[Entry]:
+        """Probe a mapped table for a digest."""
+        _, capacity, width, _ = HEADER.unpack_from(data)
+        slot_size = SLOT_HEAD.size + width
+        index = int.from_bytes(digest[:8], 'little') & (capacity - 1)
+        # Tables are at most half full, so probing always reaches an empty slot
+        while True:
+            offset = HEADER_SIZE + index * slot_size
+            slot_digest, stored_at, hits, length = SLOT_HEAD.unpack_from(data, offset)
+            if not stored_at:
+                return None
+            if slot_digest == digest:
+                start = offset + SLOT_HEAD.size
+                return stored_at, hits, data[start:start + length].decode('ascii')
+            index = (index + 1) & (capacity - 1)
+
+    @staticmethod
+    def _entries(data: mmap.mmap) -> Dict[bytes, List]:
+        """Read every entry of a mapped table."""
+        _, capacity, width, _ = HEADER.unpack_from(data)
+        slot_size = SLOT_HEAD.size + width
+        entries = {}
+        for offset in range(HEADER_SIZE, HEADER_SIZE + capacity * slot_size, slot_size):
+            digest, stored_at, hits, length = SLOT_HEAD.unpack_from(data, offset)
+            if stored_at:
+                start = offset + SLOT_HEAD.size
+                entries[digest] = [stored_at, hits, data[start:start + length].decode('ascii')]
+        return entries
+
+    def _expired(self, stored_at: float, now: float) -> bool:
+        """Check whether an entry stored at a time has outlived the TTL."""
+        return self.ttl is not None and now - stored_at > self.ttl
+
+    def get(self, key: bytes) -> Optional[str]:
+        """
+        Look a key up.
+
+        Args:
+            key (bytes): The key.
+
+        Returns:
+            Optional[str]: The stored value, or None if missing or expired.
+        """
+        digest = _digest(key)
+        with self._lock:
+            pending = self._pending.get(digest) or self._flushing.get(digest)
+            if pending is not None:
+                stored_at, value = pending
+            else:
+                data = self._mapping()
+                entry = self._find(data, digest) if data is not None else None
+                stored_at, _, value = entry if entry else (0.0, 0, None)
+            if value is None or self._expired(stored_at, time.time()):
+                self.misses += 1
+                return None
+            self.hits += 1
+            if not self.read_only:
+                self._counts[digest] += 1
+            return value
+
+    def put(self, key: bytes, value: str) -> bool:
+        """
+        Queue a value for the next flush.
+
+        Reaching flush_every pending results starts a background flush.
+
+        Args:
+            key (bytes): The key.
+            value (str): ASCII value of at most value_width characters.
+
+        Returns:
+            bool: False if the store is read-only or the value is too long.
+        """
+        if self.read_only or len(value) > self.value_width:
+            return False
+        with self._lock:
+            self._pending[_digest(key)] = (time.time(), value)
+            # A flusher inherited through fork is not running in this process
+            if len(self._pending) >= self.flush_every and not (self._flusher and self._flusher.is_alive()):
+                self._flusher = threading.Thread(target=self._flush_in_background, daemon=True)
+                self._flusher.start()
+        return True
+
+    def get_or_compute(
+        self,
+        operation: str,
+        a: Decimal,
+        b: Decimal,
+        precision: int,
+        compute: Callable[[Decimal, Decimal, int], Decimal]
+    ) -> Decimal:
+        """
+        Get a result from the store, or compute and queue it.
+
+        Entries are keyed by result_key(); failures are not stored.
+
+        Args:
+            operation (str): Operation name.
+            a (Decimal): First operand.
+            b (Decimal): Second operand.
+            precision (int): Significant digits of the result.
+            compute (Callable[[Decimal, Decimal, int], Decimal]): Computes the result on a miss.
+
+        Returns:
+            Decimal: The result.
+        """
+        key = result_key(operation, a, b, precision)
+        stored = self.get(key)
+        if stored is not None:
+            return Decimal(stored)
+        result = compute(a, b, precision)
+        self.put(key, str(result))
+        return result
+
+    def flush(self) -> int:
+        """
+        Write pending results and hit counts to the file.
+
+        Lookups and puts go on while the file is rewritten; only flushes
+        wait for each other.
+
+        Returns:
+            int: Entries in the new file, or 0 if there was nothing to write.
+        """
+        with self._flush_lock:
+            with self._lock:
+                if self.read_only or not (self._pending or self._counts):
+                    return 0
+                pending, counts = self._pending, self._counts
+                self._pending, self._counts = {}, Counter()
+                self._flushing = pending
+            try:
+                kept = self._rewrite(pending, counts)
+            except BaseException:
+                # Keep the results for the next flush; newer puts win
+                with self._lock:
+                    self._pending = {**pending, **self._pending}
+                    self._counts.update(counts)
+                    self._flushing = {}
+                raise
+            with self._lock:
+                self._flushing = {}
+                self._checked = float('-inf')
+            return kept
+
+    def _flush_in_background(self) -> None:
+        """Flush until fewer than flush_every results are pending."""
+        while True:
+            try:
+                self.flush()
+                failed = False
+            except Exception as e:
+                # The results stay pending, and the next put past the threshold retries
+                logging.error(f"Failed to flush result store {self.path}: {e}")
+                failed = True
+            with self._lock:
+                if failed or len(self._pending) < self.flush_every:
+                    self._flusher = None
+                    return
+
+    def _rewrite(self, pending: Dict[bytes, Tuple[float, str]], counts: Counter) -> int:
+        """Merge, evict and rewrite the file under the writers' file lock."""
+        with open(self.path.with_name(self.path.name + '.lock'), 'w') as lock:
+            # Serializes writers so none loses another's results; readers never lock
+            fcntl.lockf(lock, fcntl.LOCK_EX)
+            entries = self._read_current()
+            for digest, (stored_at, value) in pending.items():
+                hits = entries[digest][1] if digest in entries else 0
+                entries[digest] = [stored_at, hits, value]
+            for digest, count in counts.items():
+                if digest in entries:
+                    entries[digest][1] += count
+            now = time.time()
+            kept = [(digest, entry) for digest, entry in entries.items() if not self._expired(entry[0], now)]
+            if len(kept) > self.max_entries:
+                kept.sort(key=lambda item: (item[1][1], item[1][0]), reverse=True)
+                self.evictions += len(kept) - self.max_entries
+                kept = kept[:self.max_entries]
+            self._write(kept)
+        return len(kept)
+
+    def _read_current(self) -> Dict[bytes, List]:
+        """Read the entries of the file as it is now, not as last mapped."""
+        try:
+            with open(self.path, 'rb') as file:
+                data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except FileNotFoundError:
+            return {}
+        try:
+            return self._entries(data) if data[:len(MAGIC)] == MAGIC else {}
+        finally:
+            data.close()
+
+    def _write(self, entries: List[Tuple[bytes, List]]) -> None:
+        """Write a new table and rename it over the store file."""
+        # Keep the table at most half full so probe chains stay short
+        capacity = 1 << max(2 * len(entries) - 1, 1).bit_length()
+        table = bytearray(HEADER_SIZE + capacity * self.slot_size)
+        HEADER.pack_into(table, 0, MAGIC, capacity, self.value_width, len(entries))
+        for digest, (stored_at, hits, value) in entries:
+            index = int.from_bytes(digest[:8], 'little') & (capacity - 1)
+            while SLOT_HEAD.unpack_from(table, HEADER_SIZE + index * self.slot_size)[1]:
+                index = (index + 1) & (capacity - 1)
+            offset = HEADER_SIZE + index * self.slot_size
+            data = value.encode('ascii')
+            SLOT_HEAD.pack_into(table, offset, digest, stored_at, min(hits, 0xFFFFFFFF), len(data))
+            table[offset + SLOT_HEAD.size:offset + SLOT_HEAD.size + len(data)] = data
+        descriptor, temporary = tempfile.mkstemp(dir=self.path.parent, prefix=self.path.name + '.')
+        try:
+            with os.fdopen(descriptor, 'wb') as file:
+                file.write(table)
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(temporary, self.path)
+        except BaseException:
+            os.unlink(temporary)
+            raise
+
+    def __len__(self) -> int:
+        """Number of entries in the file as last mapped."""
+        with self._lock:
+            data = self._mapping()
+            return HEADER.unpack_from(data)[3] if data is not None else 0
+
+    def close(self) -> None:
+        """Wait for a background flush, flush and unmap; closing again does nothing."""
+        flusher = self._flusher
+        if flusher is not None:
+            flusher.join()
+        self.flush()
+        with self._lock:
+            self._unmap()
+
+
+class TieredResultCache:
+    """
+    Shared result cache in front of a persistent store.
+
+    A miss in the shared cache looks in the store before computing, so
+    results stored before a restart warm the shared cache as they are used.
+    """
+
+    def __init__(self, front: SharedResultCache, back: PersistentResultStore):
+        """
+        Args:
+            front (SharedResultCache): Cache looked up first.
+            back (PersistentResultStore): Store behind it.
+        """
+        self.front = front
+        self.back = back
+
+    def get_or_compute(
+        self,
+        operation: str,
+        a: Decimal,
+        b: Decimal,
+        precision: int,
+        compute: Callable[[Decimal, Decimal, int], Decimal]
+    ) -> Decimal:
+        """
+        Get a result from the front cache, else the store, else compute it.
+
+        Args:
+            operation (str): Operation name.
+            a (Decimal): First operand.
+            b (Decimal): Second operand.
+            precision (int): Significant digits of the result.
+            compute (Callable[[Decimal, Decimal, int], Decimal]): Computes the result on a miss in both.
+
+        Returns:
+            Decimal: The result.
+        """
+        def from_store(a: Decimal, b: Decimal, precision: int) -> Decimal:
+            return self.back.get_or_compute(operation, a, b, precision, compute)
+
+        return self.front.get_or_compute(operation, a, b, precision, from_store)
+
+
+# One instance per file per process, flushed when the interpreter exits
+_open_stores: Dict[Path, PersistentResultStore] = {}
+
+
+def open_result_store(path: Path) -> PersistentResultStore:
+    """
+    Get this process's instance of the store at a path, creating it once.
+
+    Args:
+        path (Path): Store file.
+
+    Returns:
+        PersistentResultStore: The store.
+    """
+    path = Path(path).resolve()
+    store = _open_stores.get(path)
+    if store is None:
+        store = _open_stores[path] = PersistentResultStore(path)
+        atexit.register(store.close)
+    return store
+
+
+def install_result_store(config: CalculatorConfig) -> Optional[PersistentResultStore]:
+    """
+    Route this process's power and root results through the configured store.
+
+    Does nothing unless config.result_store names a store file. Call it
+    after install_shared_cache(): an installed shared cache is kept in
+    front of the store.
+
+    Args:
+        config (CalculatorConfig): Configuration to read the store path from.
+
+    Returns:
+        Optional[PersistentResultStore]: The installed store, if any.
+    """
+    if not config.result_store:
+        return None
+    store = open_result_store(config.result_store)
+    front = decimal_math._result_cache
+    if isinstance(front, TieredResultCache):
+        front = front.front
+    if isinstance(front, SharedResultCache):
+        decimal_math.set_result_cache(TieredResultCache(front, store))
+    else:
+        decimal_math.set_result_cache(store)
+    return store
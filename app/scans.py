@@ -0,0 +1,254 @@
+########################
+# Prefix Scans         #
+########################
+
+from abc import ABC, abstractmethod
+from decimal import Context, Decimal, InvalidOperation, Overflow, localcontext
+from typing import Any, Callable, Dict, Iterable, Iterator, Union
+
+import numpy as np
+
+from app.calculator_config import CalculatorConfig
+from app.decimal_math import GUARD_DIGITS
+from app.exceptions import OperationError, ValidationError
+from app.input_validators import InputValidator
+from app.numeric_backends import NumericBackend, get_backend
+from app.reductions import EXACT_CONTEXT
+from app.shared_batch import FLOAT_BACKENDS
+
+
+class Scan(ABC):
+    """
+    A prefix scan: one result per element, each covering every element so far.
+
+    Each scan streams exact Decimals one element at a time, or computes a
+    whole float64 array in a single vectorized pass.
+    """
+
+    name: str  # Name recorded in the history
+
+    @abstractmethod
+    def stream(self, values: Iterator[Decimal], context: Context, working: Context) -> Iterator[Decimal]:
+        """
+        Scan validated Decimals lazily.
+
+        Args:
+            values (Iterator[Decimal]): Validated values.
+            context (Context): Context each result is rounded in.
+            working (Context): Context with guard digits for running state.
+
+        Yields:
+            Decimal: The result for each element.
+        """
+        pass  # pragma: no cover
+
+    @abstractmethod
+    def vectorized(self, values: np.ndarray, backend: NumericBackend) -> np.ndarray:
+        """
+        Scan a float64 array in one pass.
+
+        Args:
+            values (np.ndarray): Validated values.
+            backend (NumericBackend): The numpy backend.
+
+        Returns:
+            np.ndarray: The result for each element.
+        """
+        pass  # pragma: no cover
+
+
+class RunningSum(Scan):
+    """Running total, kept exact and rounded only on output."""
+
+    name = 'RunningSum'
+
+    def stream(self, values: Iterator[Decimal], context: Context, working: Context) -> Iterator[Decimal]:
+        total = Decimal(0)
+        for value in values:
+            total = EXACT_CONTEXT.add(total, value)
+            yield context.plus(total)
+
+    def vectorized(self, values: np.ndarray, backend: NumericBackend) -> np.ndarray:
+        return np.cumsum(values)
+
+
+class RunningProduct(Scan):
+    """Running product, kept at the working precision."""
+
+    name = 'RunningProduct'
+
+    def stream(self, values: Iterator[Decimal], context: Context, working: Context) -> Iterator[Decimal]:
+        product = Decimal(1)
+        for value in values:
+            product = working.multiply(product, value)
+            yield context.plus(product)
+
+    def vectorized(self, values: np.ndarray, backend: NumericBackend) -> np.ndarray:
+        return np.cumprod(values)
+
+
+class RunningExtreme(Scan):
+    """Running maximum or minimum."""
+
+    def __init__(self, name: str, pick: Callable[[Decimal, Decimal], Decimal], ufunc: np.ufunc):
+        self.name = name
+        self.pick = pick
+        self.ufunc = ufunc
+
+    def stream(self, values: Iterator[Decimal], context: Context, working: Context) -> Iterator[Decimal]:
+        current = None
+        for value in values:
+            current = value if current is None else self.pick(current, value)
+            yield current
+
+    def vectorized(self, values: np.ndarray, backend: NumericBackend) -> np.ndarray:
+        return self.ufunc.accumulate(values)
+
+
+class CompoundedPercent(Scan):
+    """
+    Compounded percent change of a series of period percent changes.
+
+    Element k is the total change over periods 0..k: the running product of
+    the growth factors (1 + p / 100), expressed with the Percent operation
+    as a percentage of 1. For example 10 then -10 gives 10 then -1.
+    """
+
+    name = 'CompoundedPercent'
+
+    def stream(self, values: Iterator[Decimal], context: Context, working: Context) -> Iterator[Decimal]:
+        decimal = get_backend('decimal')
+        one = Decimal(1)
+        factor = one
+        for value in values:
+            factor = working.multiply(factor, working.add(one, working.divide(value, 100)))
+            with localcontext(context):
+                change = decimal.percent(working.subtract(factor, one), one)
+            yield change
+
+    def vectorized(self, values: np.ndarray, backend: NumericBackend) -> np.ndarray:
+        factors = np.cumprod(1.0 + values / 100.0)
+        return backend.percent(factors - 1.0, backend.convert(1.0))
+
+
+SCANS: Dict[str, Scan] = {
+    'cumsum': RunningSum(),
+    'cumprod': RunningProduct(),
+    'cummax': RunningExtreme('RunningMax', max, np.maximum),
+    'cummin': RunningExtreme('RunningMin', min, np.minimum),
+    'compound': CompoundedPercent(),
+}
+
+
+def get_scan(name: str) -> Scan:
+    """
+    Look up a scan by name.
+
+    Args:
+        name (str): 'cumsum', 'cumprod', 'cummax', 'cummin' or 'compound'.
+
+    Returns:
+        Scan: The scan.
+
+    Raises:
+        ValueError: If the name is unknown.
+    """
+    scan = SCANS.get(name.lower())
+    if scan is None:
+        raise ValueError(f"Unknown scan: {name}")
+    return scan
+
+
+def scan_decimal(name: str, values: Iterable[Any], config: CalculatorConfig) -> Iterator[Decimal]:
+    """
+    Scan values as exact Decimals, one element at a time.
+
+    Each value is validated like a calculator input when it is reached, so
+    an invalid value raises after the results before it have been yielded.
+
+    Args:
+        name (str): Scan name, see get_scan.
+        values (Iterable[Any]): Values to scan; any iterator works.
+        config (CalculatorConfig): Configuration to validate and round with.
+
+    Yields:
+        Decimal: The result for each element, at the configured precision.
+
+    Raises:
+        ValueError: If the scan name is unknown.
+        ValidationError: If a value is invalid.
+        OperationError: If a result overflows.
+    """
+    scan = get_scan(name)
+    context = config.create_decimal_context()
+    working = context.copy()
+    working.prec += GUARD_DIGITS
+
+    def validated() -> Iterator[Decimal]:
+        for value in values:
+            # Never hold the local context across a yield, or it would leak
+            # into the consumer
+            with localcontext(context):
+                number = InputValidator.validate_number(value, config)
+            yield number
+
+    def checked() -> Iterator[Decimal]:
+        position = 0
+        try:
+            for result in scan.stream(validated(), context, working):
+                yield result
+                position += 1
+        except (Overflow, InvalidOperation) as e:
+            reason = 'overflowed' if isinstance(e, Overflow) else 'is undefined'
+            raise OperationError(f"{scan.name} {reason} at position {position}")
+
+    return checked()
+
+
+def scan_array(name: str, values: Iterable[Any], config: CalculatorConfig) -> np.ndarray:
+    """
+    Scan values as float64 in one vectorized pass.
+
+    Args:
+        name (str): Scan name, see get_scan.
+        values (Iterable[Any]): Values to scan.
+        config (CalculatorConfig): Configuration to validate with.
+
+    Returns:
+        np.ndarray: The result for each element.
+
+    Raises:
+        ValueError: If the scan name is unknown.
+        ValidationError: If a value is invalid.
+        OperationError: If a result overflows.
+    """
+    scan = get_scan(name)
+    backend = get_backend('numpy')
+    validation = InputValidator.validate_many(list(values), config)
+    if validation.invalid_count:
+        position = int(np.argmax(validation.invalid))
+        raise ValidationError(f"Invalid number at position {position}")
+    with np.errstate(all='ignore'):
+        results = scan.vectorized(validation.values, backend)
+    if not np.all(np.isfinite(results)):
+        position = int(np.argmax(~np.isfinite(results)))
+        raise OperationError(f"{scan.name} overflowed at position {position}")
+    return results
+
+
+def scan(name: str, values: Iterable[Any], config: CalculatorConfig) -> Union[Iterator[Decimal], np.ndarray]:
+    """
+    Scan values with the configured backend.
+
+    Args:
+        name (str): Scan name, see get_scan.
+        values (Iterable[Any]): Values to scan.
+        config (CalculatorConfig): Configuration to validate and compute with.
+
+    Returns:
+        Union[Iterator[Decimal], np.ndarray]: A float64 array for the float and
+        numpy backends; otherwise a lazy iterator of Decimals.
+    """
+    if config.backend in FLOAT_BACKENDS:
+        return scan_array(name, values, config)
+    return scan_decimal(name, values, config)
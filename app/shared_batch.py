@@ -0,0 +1,507 @@
+########################
+# Shared Batch         #
+########################
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from decimal import Decimal, localcontext
+import multiprocessing
+from multiprocessing import resource_tracker, shared_memory
+import os
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.calculator_config import CalculatorConfig
+from app.exceptions import OperationError, ValidationError
+from app.input_validators import InputValidator
+from app.numeric_backends import get_backend
+from app.operations import OperationFactory
+from app.plugins import install_plugins
+from app.result_store import install_result_store
+from app.shared_cache import install_shared_cache
+
+# Columns hold either binary64 floats (float and numpy backends) or Decimal
+# literals as fixed-width, NUL-padded ASCII (decimal and hybrid backends).
+FLOAT_BACKENDS = ('float', 'numpy')
+DECIMAL_WIDTH = 48
+# A rounded Decimal literal needs, besides its digits, a sign, a decimal point,
+# and an exponent marker and sign (or up to six leading zeros): four characters
+# plus the digits of the context's Emax
+LITERAL_OVERHEAD = 4
+DEFAULT_CHUNK_ROWS = 65536
+
+# Per-row status codes
+STATUS_OK = 0
+STATUS_VALIDATION_ERROR = 1
+STATUS_OPERATION_ERROR = 2
+STATUS_RESULT_TOO_WIDE = 3
+
+
+@dataclass(frozen=True)
+class ChunkDescriptor:
+    """
+    Everything a worker needs to process one chunk of a shared batch.
+
+    Only this crosses the process boundary; the data stays in shared memory.
+    """
+
+    name: str
+    rows: int
+    kind: str
+    width: int
+    operation: str
+    start: int
+    stop: int
+
+
+class SharedColumns:
+    """
+    Operand, result and status columns in one shared memory block.
+
+    The block holds four columns of `rows` entries, back to back: operands a
+    and b, the result, and a uint8 status per row. Each column is exposed as
+    a NumPy array over the shared buffer, so callers and workers read and
+    write it in place.
+    """
+
+    def __init__(self, rows: int, kind: str = 'decimal', width: int = DECIMAL_WIDTH, name: Optional[str] = None):
+        """
+        Create a new block, or attach to an existing one by name.
+
+        Args:
+            rows (int): Number of rows.
+            kind (str, optional): 'decimal' or 'float'. Defaults to 'decimal'.
+            width (int, optional): Bytes per Decimal literal. Defaults to DECIMAL_WIDTH.
+            name (Optional[str], optional): Name of an existing block to attach to.
+
+        Raises:
+            ValueError: If kind is unknown.
+        """
+        if kind not in ('decimal', 'float'):
+            raise ValueError(f"Unknown column kind: {kind}")
+        self.rows = rows
+        self.kind = kind
+        self.width = width or decimal_width(self.config)
+        self.dtype = np.dtype(np.float64) if kind == 'float' else np.dtype(f'S{width}')
+        column = rows * self.dtype.itemsize
+        self.owner = name is None
+        self.memory = shared_memory.SharedMemory(name=name, create=self.owner, size=max(1, 3 * column + rows))
+        buffer = self.memory.buf
+        self.a = np.ndarray(rows, self.dtype, buffer=buffer, offset=0)
+        self.b = np.ndarray(rows, self.dtype, buffer=buffer, offset=column)
+        self.result = np.ndarray(rows, self.dtype, buffer=buffer, offset=2 * column)
+        self.status = np.ndarray(rows, np.uint8, buffer=buffer, offset=3 * column)
+
+    @property
+    def name(self) -> str:
+        """str: Name other processes attach by."""
+        return self.memory.name
+
+    def descriptor(self, operation: str, start: int, stop: int) -> ChunkDescriptor:
+        """
+        Describe a chunk of rows for a worker.
+
+        Args:
+            operation (str): Operation name.
+            start (int): First row.
+            stop (int): Row after the last.
+
+        Returns:
+            ChunkDescriptor: The chunk's descriptor.
+        """
+        return ChunkDescriptor(self.name, self.rows, self.kind, self.width, operation, start, stop)
+
+    def close(self) -> None:
+        """Detach from the block, and free it if this process created it."""
+        # The arrays export the buffer, which must be released before closing
+        self.a = self.b = self.result = self.status = None
+        self.memory.close()
+        if self.owner:
+            self.memory.unlink()
+
+    def __enter__(self) -> 'SharedColumns':
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+def decimal_width(config: CalculatorConfig) -> int:
+    """
+    Column width that fits any rounded result of config's Decimal context.
+
+    Exact integer results are not rounded and can be longer than this; they
+    are reported as STATUS_RESULT_TOO_WIDE unless a larger width is used.
+
+    Args:
+        config (CalculatorConfig): Configuration the batch computes with.
+
+    Returns:
+        int: Bytes per Decimal literal, never less than DECIMAL_WIDTH.
+    """
+    context = config.create_decimal_context()
+    return max(DECIMAL_WIDTH, context.prec + LITERAL_OVERHEAD + len(str(context.Emax)))
+
+
+def encode_decimals(values: Sequence[Any], width: int = DECIMAL_WIDTH) -> np.ndarray:
+    """
+    Encode numbers or literals as fixed-width ASCII.
+
+    Args:
+        values (Sequence[Any]): Decimals, ints or numeric strings.
+        width (int, optional): Bytes per literal. Defaults to DECIMAL_WIDTH.
+
+    Returns:
+        np.ndarray: An array of dtype S<width>.
+
+    Raises:
+        ValidationError: If a literal is longer than width.
+    """
+    texts = [value if type(value) is str else str(value) for value in values]
+    if texts and max(map(len, texts)) > width:
+        raise ValidationError(f"Operand does not fit in {width} characters")
+    return np.array(texts, dtype=f'S{width}')
+
+
+def encode_floats(values: Sequence[Any]) -> np.ndarray:
+    """
+    Convert numbers or literals to binary64, with NaN for unparsable rows.
+
+    Args:
+        values (Sequence[Any]): Numbers or numeric strings.
+
+    Returns:
+        np.ndarray: A float64 array.
+    """
+    try:
+        return np.asarray(values, dtype=np.float64)
+    except (ValueError, TypeError):
+        floats = []
+        for value in values:
+            try:
+                floats.append(float(value))
+            except (ValueError, TypeError):
+                floats.append(np.nan)
+        return np.array(floats, dtype=np.float64)
+
+
+@dataclass
+class BatchResult:
+    """
+    Results of a shared batch.
+
+    Attributes:
+        values: Decimals (None for failed rows) or a float64 array (NaN for failed rows)
+        status: uint8 status code per row
+    """
+
+    values: Any
+    status: np.ndarray
+
+    @property
+    def failures(self) -> int:
+        """int: Number of rows that did not produce a result."""
+        return int(np.count_nonzero(self.status))
+
+
+# Worker process state, set up once by _init_worker
+_config: Optional[CalculatorConfig] = None
+_columns: Optional[SharedColumns] = None
+
+
+def _init_worker(config: CalculatorConfig) -> None:
+    """
+    Initialize a worker process.
+
+    Args:
+        config (CalculatorConfig): Configuration for the computations.
+    """
+    global _config, _columns
+    _config = config
+    install_shared_cache(config)
+    install_result_store(config)
+    install_plugins(config)
+    _columns = None
+
+
+def _kernel(name: str, backend: str) -> Callable[[Any, Any], Any]:
+    """
+    Get the function computing an operation on a backend.
+
+    Native operations use their shared instance's execute, which is what the
+    dispatch table holds; parameterized ones such as modpow[97] have no op
+    code to dispatch on. On a vectorized backend, an operation's own
+    execute_batch kernel is preferred to execute.
+    """
+    bound = get_backend(backend)
+    if bound.native:
+        return OperationFactory.create_operation(name).execute
+    operation = OperationFactory.create_operation(name, backend=bound)
+    if bound.vectorized and operation.execute_batch is not None:
+        return operation.execute_batch
+    return operation.execute
+
+
+def compute_decimal_rows(
+    operation: str,
+    a: Sequence[Any],
+    b: Sequence[Any],
+    width: int,
+    config: Optional[CalculatorConfig] = None
+) -> Tuple[List[str], List[int]]:
+    """
+    Compute one chunk of Decimal rows in a worker.
+
+    Operands go through the same validation as Calculator.perform_operation
+    and the operation runs in the configured Decimal context.
+
+    Args:
+        operation (str): Operation name.
+        a (Sequence[Any]): First operand literals or numbers.
+        b (Sequence[Any]): Second operand literals or numbers.
+        width (int): Maximum result literal length.
+        config (Optional[CalculatorConfig], optional): Configuration to compute
+            with. Defaults to the worker's.
+
+    Returns:
+        Tuple[List[str], List[int]]: Result literals ('' for failed rows) and status codes.
+    """
+    config = config or _config
+    execute = _kernel(operation, config.backend)
+    texts = []
+    statuses = []
+    with localcontext(config.create_decimal_context()):
+        for x, y in zip(a, b):
+            try:
+                text = str(execute(
+                    InputValidator.validate_number(x, config),
+                    InputValidator.validate_number(y, config)
+                ))
+            except ValidationError:
+                texts.append('')
+                statuses.append(STATUS_VALIDATION_ERROR)
+                continue
+            except Exception:
+                texts.append('')
+                statuses.append(STATUS_OPERATION_ERROR)
+                continue
+            if len(text) > width:
+                texts.append('')
+                statuses.append(STATUS_RESULT_TOO_WIDE)
+            else:
+                texts.append(text)
+                statuses.append(STATUS_OK)
+    return texts, statuses
+
+
+def compute_float_rows(
+    operation: str,
+    a: np.ndarray,
+    b: np.ndarray,
+    result: np.ndarray,
+    status: np.ndarray,
+    config: Optional[CalculatorConfig] = None
+) -> None:
+    """
+    Compute one chunk of float rows in a worker, writing into result and status.
+
+    The chunk is computed with one vectorized NumPy call (the operation's
+    execute_batch, if it declares one). If that call fails for the chunk as a
+    whole (a zero divisor or negative root in some row, or an operation or
+    arithmetic error), it is computed row by row with the float backend
+    instead, so only the failing rows are marked.
+
+    Args:
+        operation (str): Operation name.
+        a (np.ndarray): First operands.
+        b (np.ndarray): Second operands.
+        result (np.ndarray): Output array, NaN for failed rows.
+        status (np.ndarray): Output status codes.
+        config (Optional[CalculatorConfig], optional): Configuration to compute
+            with. Defaults to the worker's.
+    """
+    limit = float((config or _config).max_input_value)
+    with np.errstate(all='ignore'):
+        invalid = ~(np.isfinite(a) & np.isfinite(b) & (np.abs(a) <= limit) & (np.abs(b) <= limit))
+        try:
+            values = _kernel(operation, 'numpy')(a, b)
+            status[:] = STATUS_OK
+        except (ValidationError, OperationError, ArithmeticError):
+            scalar = _kernel(operation, 'float')
+            values = np.empty(len(a))
+            for i in range(len(a)):
+                try:
+                    values[i] = scalar(float(a[i]), float(b[i]))
+                    status[i] = STATUS_OK
+                except ValidationError:
+                    values[i] = np.nan
+                    status[i] = STATUS_VALIDATION_ERROR
+                except Exception:
+                    values[i] = np.nan
+                    status[i] = STATUS_OPERATION_ERROR
+        failed = ~np.isfinite(values)
+        status[failed & (status == STATUS_OK)] = STATUS_OPERATION_ERROR
+        status[invalid] = STATUS_VALIDATION_ERROR
+        result[:] = np.where(invalid | failed, np.nan, values)
+
+
+def _run_chunk(descriptor: ChunkDescriptor) -> int:
+    """
+    Process one chunk of a shared batch in place.
+
+    The worker keeps the most recent block attached, since consecutive
+    chunks usually belong to the same batch.
+
+    Args:
+        descriptor (ChunkDescriptor): The chunk to process.
+
+    Returns:
+        int: Number of failed rows in the chunk.
+    """
+    global _columns
+    if _columns is None or _columns.name != descriptor.name:
+        if _columns is not None:
+            _columns.close()
+        _columns = SharedColumns(descriptor.rows, descriptor.kind, descriptor.width, name=descriptor.name)
+    rows = slice(descriptor.start, descriptor.stop)
+    if descriptor.kind == 'float':
+        compute_float_rows(
+            descriptor.operation, _columns.a[rows], _columns.b[rows],
+            _columns.result[rows], _columns.status[rows]
+        )
+    else:
+        texts, statuses = compute_decimal_rows(
+            descriptor.operation,
+            _columns.a[rows].astype('U').tolist(),
+            _columns.b[rows].astype('U').tolist(),
+            descriptor.width
+        )
+        _columns.result[rows] = texts
+        _columns.status[rows] = statuses
+    return int(np.count_nonzero(_columns.status[rows]))
+
+
+class SharedBatchExecutor:
+    """
+    Runs large batches of one operation on a process pool through shared memory.
+
+    Operands and results live in a SharedColumns block: floats as binary64
+    for the float and numpy backends, Decimals as fixed-width literals
+    otherwise. Workers attach to the block by name and process chunks of
+    rows in place, so only ChunkDescriptors are pickled, never the values.
+    """
+
+    def __init__(
+        self,
+        config: Optional[CalculatorConfig] = None,
+        workers: Optional[int] = None,
+        chunk_rows: int = DEFAULT_CHUNK_ROWS,
+        width: Optional[int] = None,
+        start_method: Optional[str] = None
+    ):
+        """
+        Start the worker processes.
+
+        Args:
+            config (Optional[CalculatorConfig], optional): Configuration for the
+                computations. Defaults to the environment configuration.
+            workers (Optional[int], optional): Number of worker processes.
+                Defaults to the number of CPUs.
+            chunk_rows (int, optional): Rows per chunk. Defaults to DEFAULT_CHUNK_ROWS.
+            width (Optional[int], optional): Bytes per Decimal literal. Defaults to
+                decimal_width(config); pass more to keep long exact integer results.
+            start_method (Optional[str], optional): multiprocessing start method.
+                Defaults to the platform default.
+        """
+        self.config = config or CalculatorConfig()
+        self.config.validate()
+        self.kind = 'float' if self.config.backend in FLOAT_BACKENDS else 'decimal'
+        self.chunk_rows = chunk_rows
+        self.width = width or decimal_width(self.config)
+        # Workers must share this process's resource tracker; one of their own
+        # would report blocks they attached to as leaked, and unlink them
+        resource_tracker.ensure_running()
+        self.executor = ProcessPoolExecutor(
+            max_workers=workers or os.cpu_count() or 1,
+            mp_context=multiprocessing.get_context(start_method),
+            initializer=_init_worker,
+            initargs=(self.config,),
+        )
+
+    def columns(self, rows: int) -> SharedColumns:
+        """
+        Allocate a block for a batch, to be filled in place.
+
+        Args:
+            rows (int): Number of rows.
+
+        Returns:
+            SharedColumns: The block; the caller closes it.
+        """
+        return SharedColumns(rows, self.kind, self.width)
+
+    def compute(self, operation: str, columns: SharedColumns) -> int:
+        """
+        Apply an operation to every row of a block, in place.
+
+        Args:
+            operation (str): Operation name.
+            columns (SharedColumns): Block with a and b filled in.
+
+        Returns:
+            int: Number of failed rows.
+
+        Raises:
+            ValueError: If the operation is unknown.
+        """
+        operation = operation.lower()
+        OperationFactory.create_operation(operation)
+        futures = [
+            self.executor.submit(_run_chunk, columns.descriptor(operation, start, min(start + self.chunk_rows, columns.rows)))
+            for start in range(0, columns.rows, self.chunk_rows)
+        ]
+        return sum(future.result() for future in futures)
+
+    def run(self, operation: str, a: Sequence[Any], b: Sequence[Any]) -> BatchResult:
+        """
+        Apply an operation to pairs of operands.
+
+        Args:
+            operation (str): Operation name.
+            a (Sequence[Any]): First operands.
+            b (Sequence[Any]): Second operands, as many as a.
+
+        Returns:
+            BatchResult: Values and status codes per row.
+
+        Raises:
+            ValueError: If the operand columns differ in length or the operation is unknown.
+            ValidationError: If a Decimal operand is too long for the column width.
+        """
+        if len(a) != len(b):
+            raise ValueError("Operand columns must have the same length")
+        with self.columns(len(a)) as columns:
+            if self.kind == 'float':
+                columns.a[:] = encode_floats(a)
+                columns.b[:] = encode_floats(b)
+            else:
+                columns.a[:] = encode_decimals(a, self.width)
+                columns.b[:] = encode_decimals(b, self.width)
+            self.compute(operation, columns)
+            status = columns.status.copy()
+            if self.kind == 'float':
+                values = columns.result.copy()
+            else:
+                values = [Decimal(text) if text else None for text in columns.result.astype('U').tolist()]
+        return BatchResult(values, status)
+
+    def close(self) -> None:
+        """Stop the worker processes."""
+        self.executor.shutdown()
+
+    def __enter__(self) -> 'SharedBatchExecutor':
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
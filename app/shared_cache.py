@@ -0,0 +1,398 @@
+########################
+# Shared Result Cache  #
+########################
+
+from contextlib import contextmanager
+from dataclasses import dataclass
+from decimal import Decimal, getcontext
+import fcntl
+import hashlib
+import logging
+import mmap
+import os
+from pathlib import Path
+import struct
+import tempfile
+import threading
+import zlib
+from typing import Callable, Dict, Iterator, Optional
+
+from app import decimal_math
+from app.calculator_config import CalculatorConfig
+
+# File layout: a header, one 64-byte record per lock stripe, one CLOCK hand
+# byte per set, then the slots. The table is set-associative: a key hashes
+# to one set of WAYS slots, and set i is guarded by stripe i % stripes.
+MAGIC = b'CALCRC01'
+HEADER = struct.Struct('<8sIIII')        # magic, sets, ways, stripes, value width
+HEADER_SIZE = 64
+STRIPE = struct.Struct('<qQQQQQ')        # writer pid, hits, misses, inserts, evictions, recoveries
+STRIPE_SIZE = 64
+COUNTER = struct.Struct('<Q')
+SLOT_HEAD = struct.Struct('<BBHI16s')    # used, referenced, value length, CRC-32, key digest
+
+DEFAULT_SETS = 8192
+DEFAULT_WAYS = 8
+DEFAULT_STRIPES = 64
+DEFAULT_VALUE_WIDTH = 96
+
+# Offsets of the counters inside a stripe record
+HITS, MISSES, INSERTS, EVICTIONS, RECOVERIES = (8 + 8 * i for i in range(5))
+
+
+def default_cache_path() -> Path:
+    """
+    Get the default location of the cache file.
+
+    Returns:
+        Path: A file in /dev/shm (memory-backed) if available, else in the temp directory.
+    """
+    directory = Path('/dev/shm')
+    if not directory.is_dir():
+        directory = Path(tempfile.gettempdir())
+    return directory / 'calculator-result-cache'
+
+
+def result_key(operation: str, a: Decimal, b: Decimal, precision: int) -> bytes:
+    """
+    Build the cache key of a result.
+
+    The key covers the operation, the exact operand literals, the precision
+    and the active rounding mode.
+
+    Args:
+        operation (str): Operation name.
+        a (Decimal): First operand.
+        b (Decimal): Second operand.
+        precision (int): Significant digits of the result.
+
+    Returns:
+        bytes: The key.
+    """
+    return f"{operation}|{a}|{b}|{precision}|{getcontext().rounding}".encode()
+
+
+@dataclass
+class CacheStats:
+    """
+    Counters for the shared result cache, summed over all processes using it.
+    """
+
+    hits: int = 0
+    misses: int = 0
+    inserts: int = 0
+    evictions: int = 0
+    recoveries: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """
+        Get the share of lookups answered from the cache.
+
+        Returns:
+            float: Hits divided by lookups, or 0.0 before any lookup.
+        """
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class SharedResultCache:
+    """
+    Fixed-size result cache shared by every process on the host.
+
+    The table lives in a memory-mapped file, so any process that opens the
+    same path shares it. Each set is guarded by a lock stripe: a byte-range
+    fcntl lock between processes plus a threading lock within one, so the
+    locks of a process that dies are released by the kernel. Writers mark
+    their stripe while they change it; whoever takes the lock next and
+    finds the mark knows its holder died mid-write, and scrubs the stripe
+    by dropping slots whose checksum no longer matches.
+
+    Full sets evict with the CLOCK algorithm: hits set a slot's referenced
+    bit, and the hand clears bits until it finds a slot not used since its
+    last pass.
+    """
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        sets: int = DEFAULT_SETS,
+        ways: int = DEFAULT_WAYS,
+        stripes: int = DEFAULT_STRIPES,
+        value_width: int = DEFAULT_VALUE_WIDTH
+    ):
+        """
+        Open the cache file, creating and initializing it if needed.
+
+        An existing cache keeps its own geometry; the sizing arguments only
+        apply to a new one.
+
+        Args:
+            path (Optional[Path], optional): Cache file. Defaults to default_cache_path().
+            sets (int, optional): Number of sets. Defaults to DEFAULT_SETS.
+            ways (int, optional): Slots per set. Defaults to DEFAULT_WAYS.
+            stripes (int, optional): Number of lock stripes. Defaults to DEFAULT_STRIPES.
+            value_width (int, optional): Longest cacheable result literal. Defaults to DEFAULT_VALUE_WIDTH.
+        """
+        self.path = Path(path) if path else default_cache_path()
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        # Byte 0 of the file serializes initialization
+        fcntl.lockf(self._fd, fcntl.LOCK_EX, 1, 0)
+        try:
+            header = os.pread(self._fd, HEADER.size, 0)
+            if len(header) == HEADER.size and header.startswith(MAGIC):
+                _, sets, ways, stripes, value_width = HEADER.unpack(header)
+            else:
+                self._geometry(sets, ways, stripes, value_width)
+                os.ftruncate(self._fd, self.size)
+                os.pwrite(self._fd, HEADER.pack(MAGIC, sets, ways, stripes, value_width), 0)
+        finally:
+            fcntl.lockf(self._fd, fcntl.LOCK_UN, 1, 0)
+        self._geometry(sets, ways, stripes, value_width)
+        self._map = mmap.mmap(self._fd, self.size)
+        self._locks = [threading.Lock() for _ in range(stripes)]
+
+    def _geometry(self, sets: int, ways: int, stripes: int, value_width: int) -> None:
+        """Compute the table layout."""
+        self.sets = sets
+        self.ways = ways
+        self.stripes = stripes
+        self.value_width = value_width
+        self.slot_size = SLOT_HEAD.size + value_width
+        self._hands = HEADER_SIZE + stripes * STRIPE_SIZE
+        self._slots = (self._hands + sets + 63) // 64 * 64
+        self.size = self._slots + sets * ways * self.slot_size
+
+    @contextmanager
+    def _stripe(self, stripe: int) -> Iterator[int]:
+        """
+        Hold a stripe's lock, recovering the stripe first if its last writer died.
+
+        Yields:
+            int: Offset of the stripe's record.
+        """
+        record = HEADER_SIZE + stripe * STRIPE_SIZE
+        with self._locks[stripe]:
+            # Bytes 1.. of the file stand for the stripes
+            fcntl.lockf(self._fd, fcntl.LOCK_EX, 1, 1 + stripe)
+            try:
+                (writer,) = struct.unpack_from('<q', self._map, record)
+                if writer:
+                    self._recover(stripe, record, writer)
+                yield record
+            finally:
+                fcntl.lockf(self._fd, fcntl.LOCK_UN, 1, 1 + stripe)
+
+    def _recover(self, stripe: int, record: int, writer: int) -> None:
+        """Drop the torn slots of a stripe whose writer died holding its lock."""
+        dropped = 0
+        for index in range(stripe, self.sets, self.stripes):
+            for way in range(self.ways):
+                offset = self._slots + (index * self.ways + way) * self.slot_size
+                used, _, length, crc, digest = SLOT_HEAD.unpack_from(self._map, offset)
+                if used and (length > self.value_width or crc != self._checksum(digest, offset, length)):
+                    self._map[offset] = 0
+                    dropped += 1
+        struct.pack_into('<q', self._map, record, 0)
+        self._add(record, RECOVERIES)
+        logging.warning(
+            f"Recovered shared cache stripe {stripe} after process {writer} died; "
+            f"dropped {dropped} slots"
+        )
+
+    def _checksum(self, digest: bytes, offset: int, length: int) -> int:
+        """CRC-32 of a slot's key digest and value."""
+        start = offset + SLOT_HEAD.size
+        return zlib.crc32(self._map[start:start + length], zlib.crc32(digest))
+
+    def _add(self, record: int, counter: int) -> None:
+        """Increment a stripe counter; the caller holds the stripe lock."""
+        (value,) = COUNTER.unpack_from(self._map, record + counter)
+        COUNTER.pack_into(self._map, record + counter, value + 1)
+
+    def _locate(self, key: bytes):
+        """Hash a key to its digest, set and stripe."""
+        digest = hashlib.blake2b(key, digest_size=16).digest()
+        index = int.from_bytes(digest[:8], 'little') % self.sets
+        return digest, index, index % self.stripes
+
+    def get(self, key: bytes) -> Optional[str]:
+        """
+        Look up a cached value.
+
+        Args:
+            key (bytes): Cache key.
+
+        Returns:
+            Optional[str]: The value, or None on a miss.
+        """
+        digest, index, stripe = self._locate(key)
+        base = self._slots + index * self.ways * self.slot_size
+        with self._stripe(stripe) as record:
+            for way in range(self.ways):
+                offset = base + way * self.slot_size
+                used, _, length, _, slot_digest = SLOT_HEAD.unpack_from(self._map, offset)
+                if used and slot_digest == digest:
+                    self._map[offset + 1] = 1
+                    self._add(record, HITS)
+                    start = offset + SLOT_HEAD.size
+                    return self._map[start:start + length].decode('ascii')
+            self._add(record, MISSES)
+        return None
+
+    def put(self, key: bytes, value: str) -> bool:
+        """
+        Store a value, evicting with CLOCK if its set is full.
+
+        Args:
+            key (bytes): Cache key.
+            value (str): ASCII value.
+
+        Returns:
+            bool: False if the value is too long to cache.
+        """
+        data = value.encode('ascii')
+        if len(data) > self.value_width:
+            return False
+        digest, index, stripe = self._locate(key)
+        base = self._slots + index * self.ways * self.slot_size
+        with self._stripe(stripe) as record:
+            victim = None
+            for way in range(self.ways):
+                used, _, _, _, slot_digest = SLOT_HEAD.unpack_from(self._map, base + way * self.slot_size)
+                if used and slot_digest == digest:
+                    return True
+                if not used and victim is None:
+                    victim = way
+            if victim is None:
+                victim = self._clock(index)
+                self._add(record, EVICTIONS)
+            offset = base + victim * self.slot_size
+
+            # Mark the stripe, and write the slot so that it is never
+            # marked used while its contents are incomplete
+            struct.pack_into('<q', self._map, record, os.getpid())
+            self._map[offset] = 0
+            start = offset + SLOT_HEAD.size
+            self._map[start:start + len(data)] = data
+            crc = zlib.crc32(data, zlib.crc32(digest))
+            SLOT_HEAD.pack_into(self._map, offset, 1, 0, len(data), crc, digest)
+            struct.pack_into('<q', self._map, record, 0)
+            self._add(record, INSERTS)
+        return True
+
+    def _clock(self, index: int) -> int:
+        """Advance a set's CLOCK hand to a victim; the caller holds the stripe lock."""
+        hand = self._map[self._hands + index] % self.ways
+        base = self._slots + index * self.ways * self.slot_size
+        while self._map[base + hand * self.slot_size + 1]:
+            self._map[base + hand * self.slot_size + 1] = 0
+            hand = (hand + 1) % self.ways
+        self._map[self._hands + index] = (hand + 1) % self.ways
+        return hand
+
+    def get_or_compute(
+        self,
+        operation: str,
+        a: Decimal,
+        b: Decimal,
+        precision: int,
+        compute: Callable[[Decimal, Decimal, int], Decimal]
+    ) -> Decimal:
+        """
+        Get a result from the cache, or compute and store it.
+
+        Entries are keyed by result_key(). Computation runs without any lock
+        held, and failures are not cached.
+
+        Args:
+            operation (str): Operation name.
+            a (Decimal): First operand.
+            b (Decimal): Second operand.
+            precision (int): Significant digits of the result.
+            compute (Callable[[Decimal, Decimal, int], Decimal]): Computes the result on a miss.
+
+        Returns:
+            Decimal: The result.
+        """
+        key = result_key(operation, a, b, precision)
+        cached = self.get(key)
+        if cached is not None:
+            return Decimal(cached)
+        result = compute(a, b, precision)
+        self.put(key, str(result))
+        return result
+
+    def stats(self) -> CacheStats:
+        """
+        Get the counters of all stripes.
+
+        Returns:
+            CacheStats: Totals across every process using the cache.
+        """
+        stats = CacheStats()
+        for stripe in range(self.stripes):
+            _, hits, misses, inserts, evictions, recoveries = STRIPE.unpack_from(
+                self._map, HEADER_SIZE + stripe * STRIPE_SIZE
+            )
+            stats.hits += hits
+            stats.misses += misses
+            stats.inserts += inserts
+            stats.evictions += evictions
+            stats.recoveries += recoveries
+        return stats
+
+    def clear(self) -> None:
+        """Remove every entry and reset the counters."""
+        for stripe in range(self.stripes):
+            with self._stripe(stripe) as record:
+                self._map[record:record + STRIPE_SIZE] = bytes(STRIPE_SIZE)
+                for index in range(stripe, self.sets, self.stripes):
+                    for way in range(self.ways):
+                        self._map[self._slots + (index * self.ways + way) * self.slot_size] = 0
+
+    def close(self) -> None:
+        """Unmap the cache; the file and its contents stay for other processes."""
+        self._map.close()
+        os.close(self._fd)
+
+
+# One instance per file per process: closing any descriptor of a file drops
+# all of the process's fcntl locks on it
+_open_caches: Dict[Path, SharedResultCache] = {}
+
+
+def open_shared_cache(path: Path) -> SharedResultCache:
+    """
+    Get this process's instance of the cache at a path, opening it once.
+
+    Args:
+        path (Path): Cache file.
+
+    Returns:
+        SharedResultCache: The cache.
+    """
+    path = Path(path).resolve()
+    cache = _open_caches.get(path)
+    if cache is None:
+        cache = _open_caches[path] = SharedResultCache(path)
+    return cache
+
+
+def install_shared_cache(config: CalculatorConfig) -> Optional[SharedResultCache]:
+    """
+    Route this process's power and root results through the configured shared cache.
+
+    Does nothing unless config.shared_cache names a cache file.
+
+    Args:
+        config (CalculatorConfig): Configuration to read the cache path from.
+
+    Returns:
+        Optional[SharedResultCache]: The installed cache, if any.
+    """
+    if not config.shared_cache:
+        return None
+    cache = open_shared_cache(config.shared_cache)
+    decimal_math.set_result_cache(cache)
+    return cache
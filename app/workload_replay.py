@@ -0,0 +1,342 @@
+########################
+# Workload Replay      #
+########################
+
+import argparse
+from dataclasses import dataclass, field
+import datetime
+from decimal import Decimal, InvalidOperation
+import logging
+import math
+from pathlib import Path
+import re
+import tempfile
+import time
+from typing import Dict, Iterable, List, Optional
+
+import pandas as pd
+
+from app.calculator import Calculator
+from app.calculator_config import CalculatorConfig
+from app.exceptions import CalculatorError, OperationError
+from app.operations import OperationFactory
+
+# Matches the lines written by LoggingObserver, including the logging prefix
+# configured in Calculator._setup_logging
+LOG_LINE_PATTERN = re.compile(
+    r"^(?:(?P<asctime>\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2},\d{3}) - \w+ - )?"
+    r"Calculation performed: (?P<operation>\w+) "
+    r"\((?P<operand1>[^,]+), (?P<operand2>[^)]+)\) = (?P<result>\S+)\s*$"
+)
+
+# Timestamp format produced by logging's default '%(asctime)s'
+LOG_TIME_FORMAT = "%Y-%m-%d %H:%M:%S,%f"
+
+
+@dataclass
+class ReplayRecord:
+    """
+    A single recorded calculation to be replayed.
+
+    Records are produced from either the calculator log or the history CSV and
+    carry the operation class name exactly as it appears in those files.
+    """
+
+    operation: str                                  # Operation class name (e.g., "Addition")
+    operand1: str                                   # First operand as recorded
+    operand2: str                                   # Second operand as recorded
+    result: Optional[str] = None                    # Recorded result, if available
+    timestamp: Optional[datetime.datetime] = None   # When the calculation was recorded
+
+
+@dataclass
+class ReplayReport:
+    """
+    Summary of a replay run.
+
+    Holds per-calculation latencies alongside counts of mismatching and failing
+    calculations, and derives throughput and latency percentiles from them.
+    """
+
+    total: int = 0                                  # Number of records replayed
+    mismatches: int = 0                             # Results that differ from the recording
+    errors: int = 0                                 # Records that raised an error
+    elapsed: float = 0.0                            # Wall-clock seconds for the whole run
+    latencies: List[float] = field(default_factory=list)  # Seconds spent per calculation
+
+    @property
+    def throughput(self) -> float:
+        """
+        Get the number of calculations replayed per second.
+
+        Returns:
+            float: Calculations per second, or 0.0 if nothing was timed.
+        """
+        if self.elapsed <= 0:
+            return 0.0
+        return self.total / self.elapsed
+
+    def percentile(self, pct: float) -> float:
+        """
+        Get a latency percentile using the nearest-rank method.
+
+        Args:
+            pct (float): Percentile to compute, between 0 and 100.
+
+        Returns:
+            float: Latency in seconds, or 0.0 if no latencies were recorded.
+        """
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        rank = max(1, math.ceil(pct / 100 * len(ordered)))
+        return ordered[min(rank, len(ordered)) - 1]
+
+    def summary(self) -> str:
+        """
+        Return a human-readable summary of the replay.
+
+        Returns:
+            str: Multi-line report with throughput, latency percentiles and
+                result verification counts.
+        """
+        return "\n".join([
+            f"Replayed: {self.total} calculations in {self.elapsed:.3f}s",
+            f"Throughput: {self.throughput:.1f} ops/s",
+            f"Latency p50: {self.percentile(50) * 1e6:.1f}us",
+            f"Latency p95: {self.percentile(95) * 1e6:.1f}us",
+            f"Latency p99: {self.percentile(99) * 1e6:.1f}us",
+            f"Mismatches: {self.mismatches}",
+            f"Errors: {self.errors}",
+        ])
+
+
+def parse_log(path: Path) -> List[ReplayRecord]:
+    """
+    Parse calculations recorded by LoggingObserver.
+
+    Lines that are not calculation records are ignored.
+
+    Args:
+        path (Path): Path to the calculator log file.
+
+    Returns:
+        List[ReplayRecord]: Records in the order they were logged.
+    """
+    records = []
+    with open(path, encoding="utf-8") as log_file:
+        for line in log_file:
+            match = LOG_LINE_PATTERN.match(line)
+            if not match:
+                continue
+            timestamp = None
+            if match.group("asctime"):
+                timestamp = datetime.datetime.strptime(match.group("asctime"), LOG_TIME_FORMAT)
+            records.append(ReplayRecord(
+                operation=match.group("operation"),
+                operand1=match.group("operand1"),
+                operand2=match.group("operand2"),
+                result=match.group("result"),
+                timestamp=timestamp
+            ))
+    return records
+
+
+def parse_history_csv(path: Path) -> List[ReplayRecord]:
+    """
+    Parse calculations saved by Calculator.save_history.
+
+    Args:
+        path (Path): Path to the history CSV file.
+
+    Returns:
+        List[ReplayRecord]: Records in the order they were saved.
+    """
+    df = pd.read_csv(path, dtype=str)
+    return [
+        ReplayRecord(
+            operation=row['operation'],
+            operand1=row['operand1'],
+            operand2=row['operand2'],
+            result=row['result'],
+            timestamp=datetime.datetime.fromisoformat(row['timestamp'])
+        )
+        for _, row in df.iterrows()
+    ]
+
+
+def load_records(path: Path, source: Optional[str] = None) -> List[ReplayRecord]:
+    """
+    Load replay records from a log or history file.
+
+    Args:
+        path (Path): File to read.
+        source (Optional[str], optional): Either 'log' or 'csv'. Defaults to
+            detecting the format from the file extension.
+
+    Returns:
+        List[ReplayRecord]: Parsed records.
+
+    Raises:
+        ValueError: If the source format is unknown.
+    """
+    path = Path(path)
+    source = source or ('csv' if path.suffix.lower() == '.csv' else 'log')
+    if source == 'log':
+        return parse_log(path)
+    if source == 'csv':
+        return parse_history_csv(path)
+    raise ValueError(f"Unknown replay source: {source}")
+
+
+def _operation_names() -> Dict[str, str]:
+    """
+    Map operation class names to their OperationFactory identifiers.
+
+    Lazily registered operations, such as plugins, are loaded to learn their
+    class names; one that fails to load is skipped. A class registered under
+    several names maps to the first.
+
+    Returns:
+        Dict[str, str]: Class name (e.g., 'Addition') to factory name (e.g., 'add').
+    """
+    names: Dict[str, str] = {}
+    for name in OperationFactory.operation_names():
+        try:
+            names.setdefault(OperationFactory.operation_class(name).__name__, name)
+        except ValueError as e:
+            logging.warning(f"Skipping operation {name} for replay: {e}")
+    return names
+
+
+def _results_match(expected: Optional[str], actual: Decimal) -> bool:
+    """
+    Compare a recorded result with a replayed one.
+
+    Args:
+        expected (Optional[str]): Result as recorded, or None if unknown.
+        actual (Decimal): Result produced by the replay.
+
+    Returns:
+        bool: True if the results are equal or nothing was recorded.
+    """
+    if expected is None:
+        return True
+    try:
+        return Decimal(expected) == actual
+    except InvalidOperation:
+        return False
+
+
+def replay(
+    records: Iterable[ReplayRecord],
+    calculator: Calculator,
+    mode: str = 'max',
+    speed: float = 1.0
+) -> ReplayReport:
+    """
+    Re-drive recorded calculations through a calculator.
+
+    In 'max' mode calculations are issued back to back. In 'recorded' mode the
+    original spacing between timestamps is reproduced, divided by ``speed``.
+    Only the time spent inside the calculator counts towards latency.
+
+    Args:
+        records (Iterable[ReplayRecord]): Calculations to replay.
+        calculator (Calculator): Calculator to drive.
+        mode (str, optional): 'max' or 'recorded'. Defaults to 'max'.
+        speed (float, optional): Time compression factor for 'recorded' mode.
+            Defaults to 1.0.
+
+    Returns:
+        ReplayReport: Throughput, latency and verification results.
+
+    Raises:
+        ValueError: If the mode or speed is invalid.
+    """
+    if mode not in ('max', 'recorded'):
+        raise ValueError(f"Unknown replay mode: {mode}")
+    if speed <= 0:
+        raise ValueError("Replay speed must be positive")
+
+    names = _operation_names()
+    operations = {}
+    report = ReplayReport()
+    first_timestamp = None
+    start = time.perf_counter()
+
+    for record in records:
+        if mode == 'recorded' and record.timestamp is not None:
+            # Sleep until this record's offset from the first one has elapsed
+            if first_timestamp is None:
+                first_timestamp = record.timestamp
+            offset = (record.timestamp - first_timestamp).total_seconds() / speed
+            delay = offset - (time.perf_counter() - start)
+            if delay > 0:
+                time.sleep(delay)
+
+        report.total += 1
+        try:
+            # Parameterized operations record their parameter, e.g. ModularPower[97]
+            class_name, bracket, parameter = record.operation.partition('[')
+            name = names.get(class_name)
+            if name is None:
+                raise OperationError(f"Unknown operation: {record.operation}")
+            name += bracket + parameter
+            if name not in operations:
+                operations[name] = OperationFactory.create_operation(name)
+
+            began = time.perf_counter()
+            calculator.set_operation(operations[name])
+            calculator.perform_operation(record.operand1, record.operand2)
+            report.latencies.append(time.perf_counter() - began)
+        except (CalculatorError, ValueError) as e:
+            report.errors += 1
+            logging.warning(f"Replay of {record.operation} failed: {e}")
+            continue
+
+        # Verify against the history entry, which is what the log and CSV record
+        if not _results_match(record.result, calculator.history[-1].result):
+            report.mismatches += 1
+            logging.warning(
+                f"Replay mismatch for {record.operation}({record.operand1}, "
+                f"{record.operand2}): recorded {record.result}, "
+                f"got {calculator.history[-1].result}"
+            )
+
+    report.elapsed = time.perf_counter() - start
+    return report
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Command-line entry point for replaying a recorded workload.
+
+    Runs the replay against a calculator using a scratch directory, so the
+    local history and log files are left untouched.
+
+    Args:
+        argv (Optional[List[str]], optional): Command-line arguments. Defaults
+            to sys.argv.
+
+    Returns:
+        int: Exit status, non-zero if any result mismatched or failed.
+    """
+    parser = argparse.ArgumentParser(description="Replay a recorded calculator workload.")
+    parser.add_argument("path", type=Path, help="calculator.log or history CSV to replay")
+    parser.add_argument("--source", choices=['log', 'csv'], help="input format (default: by extension)")
+    parser.add_argument("--mode", choices=['max', 'recorded'], default='max', help="replay pacing")
+    parser.add_argument("--speed", type=float, default=1.0, help="time compression for recorded pacing")
+    args = parser.parse_args(argv)
+
+    records = load_records(args.path, args.source)
+    with tempfile.TemporaryDirectory() as scratch:
+        calculator = Calculator(CalculatorConfig(base_dir=Path(scratch), auto_save=False))
+        report = replay(records, calculator, mode=args.mode, speed=args.speed)
+
+    print(report.summary())
+    return 1 if report.mismatches or report.errors else 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    raise SystemExit(main())
@@ -0,0 +1,84 @@
+"""
+Compare numeric backends per operation.
+
+Run from the project root:
+
+    python -m benchmarks.bench_backends [rows]
+
+Decimal, hybrid and float are timed one pair at a time through the backend
+kernels, the way Calculator drives them; the hybrid column also shows how
+often its binary64 fast path was taken. NumPy is timed on whole columns of the same
+operands, which is how the bulk paths use it. All figures are nanoseconds per
+operand pair.
+"""
+
+from decimal import Decimal, localcontext
+import random
+import sys
+import time
+
+import numpy as np
+
+from app.numeric_backends import get_backend
+
+# Matches the CalculatorConfig default, which the hybrid backend can certify
+PRECISION = 10
+
+KERNELS = (
+    'add', 'subtract', 'multiply', 'divide', 'power',
+    'root', 'modulus', 'int_divide', 'percent', 'abs_diff',
+)
+
+
+def make_operands(rows: int):
+    """Generate positive operands that are valid for every kernel."""
+    rng = random.Random(42)
+    a = [round(rng.uniform(1, 1000), 3) for _ in range(rows)]
+    b = [round(rng.uniform(1, 5), 3) for _ in range(rows)]
+    return a, b
+
+
+def time_scalar(kernel, a_values, b_values) -> float:
+    """Return nanoseconds per pair for a scalar kernel."""
+    start = time.perf_counter()
+    for a, b in zip(a_values, b_values):
+        kernel(a, b)
+    return (time.perf_counter() - start) / len(a_values) * 1e9
+
+
+def time_vector(kernel, a_array, b_array) -> float:
+    """Return nanoseconds per element for a vectorized kernel."""
+    start = time.perf_counter()
+    kernel(a_array, b_array)
+    return (time.perf_counter() - start) / len(a_array) * 1e9
+
+
+def main(rows: int = 20_000) -> None:
+    a, b = make_operands(rows)
+    decimal_a = [Decimal(str(v)) for v in a]
+    decimal_b = [Decimal(str(v)) for v in b]
+    array_a, array_b = np.asarray(a), np.asarray(b)
+    backends = {name: get_backend(name) for name in ('decimal', 'float', 'numpy', 'hybrid')}
+
+    print(f"{rows} operand pairs, ns per pair (Decimal precision {PRECISION})")
+    print(
+        f"{'operation':<12}{'decimal':>12}{'hybrid':>12}{'fast %':>8}{'float':>12}{'numpy':>12}"
+        f"{'float x':>10}{'numpy x':>10}"
+    )
+    with localcontext() as ctx:
+        ctx.prec = PRECISION
+        for name in KERNELS:
+            decimal_ns = time_scalar(getattr(backends['decimal'], name), decimal_a, decimal_b)
+            backends['hybrid'].reset_stats()
+            hybrid_ns = time_scalar(getattr(backends['hybrid'], name), decimal_a, decimal_b)
+            fast_pct = backends['hybrid'].stats.fast_path_ratio * 100
+            float_ns = time_scalar(getattr(backends['float'], name), a, b)
+            numpy_ns = time_vector(getattr(backends['numpy'], name), array_a, array_b)
+            print(
+                f"{name:<12}{decimal_ns:>12.1f}{hybrid_ns:>12.1f}{fast_pct:>8.0f}{float_ns:>12.1f}"
+                f"{numpy_ns:>12.2f}{decimal_ns / float_ns:>10.1f}{decimal_ns / numpy_ns:>10.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20_000)
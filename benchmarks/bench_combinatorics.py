@@ -0,0 +1,61 @@
+"""
+Time repeated binomial coefficients and factorials, as a risk model's inner
+loop computes them.
+
+Run from the project root:
+
+    python -m benchmarks.bench_combinatorics [rows] [rounds]
+
+Each round computes C(n, k) for every 0 <= k <= n < rows, then n! for every
+n < 10 * rows. Rounds are timed four ways: math.comb and math.factorial
+called directly, a FactorialTable (the first round fills it, later rounds
+are lookups) and the Binomial and Factorial operations on Decimal operands,
+as the Calculator calls them, which add converting to int and back.
+Defaults: 300 rows and 5 rounds.
+"""
+
+import math
+import sys
+import time
+from decimal import Decimal
+
+from app.combinatorics import FactorialTable, set_factorial_table
+from app.number_theory import Binomial, Factorial
+
+
+def run_round(binomial, factorial, rows: int, convert) -> float:
+    start = time.perf_counter()
+    for n in range(rows):
+        for k in range(n + 1):
+            binomial(convert(n), convert(k))
+    for n in range(10 * rows):
+        factorial(convert(n), convert(1))
+    return time.perf_counter() - start
+
+
+def main(rows: int = 300, rounds: int = 5) -> None:
+    table = FactorialTable()
+    previous = set_factorial_table(FactorialTable())
+    try:
+        ways = {
+            'math.comb / math.factorial': (math.comb, lambda n, _: math.factorial(n), int),
+            'FactorialTable': (table.binomial, table.factorial, int),
+            'Binomial / Factorial ops': (Binomial().execute, Factorial().execute, Decimal),
+        }
+        results = {
+            name: [run_round(binomial, factorial, rows, convert) for _ in range(rounds)]
+            for name, (binomial, factorial, convert) in ways.items()
+        }
+    finally:
+        set_factorial_table(previous)
+    calls = rows * (rows + 1) // 2 + 10 * rows
+    print(f"{calls} calls per round, seconds")
+    print(f"{'':<30}{'first':>10}{'later':>10}")
+    for name, times in results.items():
+        later = min(times[1:]) if len(times) > 1 else times[0]
+        print(f"{name:<30}{times[0]:>10.4f}{later:>10.4f}")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    main(int(args[0]) if args else 300, int(args[1]) if len(args) > 1 else 5)
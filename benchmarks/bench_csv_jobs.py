@@ -0,0 +1,54 @@
+"""
+Measure the throughput of the CSV batch job runner.
+
+Run from the project root:
+
+    python -m benchmarks.bench_csv_jobs [rows] [backend] [workers]
+
+Writes a CSV of random operation,operand1,operand2 rows to a scratch
+directory, evaluates it with run_csv_job, and reports rows per second for
+the whole job: reading, evaluation, writing and checkpointing. Defaults:
+1,000,000 rows, the decimal backend, one worker per CPU.
+"""
+
+import csv
+import random
+import sys
+import tempfile
+from pathlib import Path
+
+from app.calculator_config import CalculatorConfig
+from app.csv_jobs import run_csv_job
+
+OPERATIONS = ('add', 'subtract', 'multiply', 'divide', 'power', 'root',
+              'modulus', 'int_divide', 'percent', 'abs_diff')
+
+
+def write_rows(path: Path, rows: int) -> None:
+    """Write random rows, with small second operands so power stays in range."""
+    rng = random.Random(42)
+    with open(path, 'w', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(['operation', 'operand1', 'operand2'])
+        for _ in range(rows):
+            writer.writerow((rng.choice(OPERATIONS), f"{rng.uniform(1, 1000):.6f}", rng.randint(1, 4)))
+
+
+def main(rows: int = 1_000_000, backend: str = 'decimal', workers: int = 0) -> None:
+    with tempfile.TemporaryDirectory() as scratch:
+        scratch = Path(scratch)
+        source = scratch / 'input.csv'
+        write_rows(source, rows)
+        config = CalculatorConfig(base_dir=scratch, auto_save=False, backend=backend)
+        report = run_csv_job(source, scratch / 'output.csv', config, workers=workers or None)
+        print(f"{rows} rows, {backend} backend")
+        print(report.summary())
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    main(
+        int(args[0]) if args else 1_000_000,
+        args[1] if len(args) > 1 else 'decimal',
+        int(args[2]) if len(args) > 2 else 0,
+    )
@@ -0,0 +1,85 @@
+"""
+Measure tail latency of cheap calculations next to adversarial ones.
+
+Run from the project root:
+
+    python -m benchmarks.bench_deadlines [precision] [calls]
+
+One thread keeps submitting fractional powers at a high precision, as an
+adversarial client would, while another times cheap additions in the same
+process. Without a deadline each power runs on its caller's thread for as
+long as it takes and competes with the cheap calls for the one interpreter;
+with one, it runs in a cancellable worker process and its caller gets an
+answer or an error within the deadline. Both the cheap calls and the
+adversarial ones are timed. Defaults: precision 2000 and 200 timed calls.
+"""
+
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from app.calculator import Calculator
+from app.calculator_config import CalculatorConfig
+from app.exceptions import OperationError
+
+
+def summarize(latencies: list) -> dict:
+    latencies = sorted(latencies)
+    return {
+        'p50': statistics.median(latencies),
+        'p99': latencies[int(len(latencies) * 0.99)],
+        'max': latencies[-1],
+    }
+
+
+def measure(config: CalculatorConfig, calls: int) -> dict:
+    calculator = Calculator(config)
+    cheap = Calculator(CalculatorConfig(base_dir=config.base_dir, auto_save=False))
+    stop = threading.Event()
+    slow = []
+
+    def adversary() -> None:
+        while not stop.is_set():
+            start = time.perf_counter()
+            try:
+                calculator.calculate('power', '2.5', '1.37')
+            except OperationError:
+                pass
+            slow.append(time.perf_counter() - start)
+
+    thread = threading.Thread(target=adversary)
+    thread.start()
+    latencies = []
+    try:
+        for n in range(calls):
+            start = time.perf_counter()
+            cheap.calculate('add', n, '0.5')
+            latencies.append(time.perf_counter() - start)
+            time.sleep(0.001)
+    finally:
+        stop.set()
+        thread.join()
+    return {'cheap add': summarize(latencies), 'adversarial power': summarize(slow)}
+
+
+def main(precision: int = 2000, calls: int = 200) -> None:
+    with tempfile.TemporaryDirectory() as scratch:
+        base = dict(base_dir=Path(scratch), auto_save=False, significant_digits=precision, max_history_size=10)
+        results = {
+            'inline': measure(CalculatorConfig(**base), calls),
+            'deadline 0.1s': measure(CalculatorConfig(**base, deadline=0.1), calls),
+        }
+    print(f"cheap additions next to power(2.5, 1.37) at precision {precision}, ms")
+    print(f"{'':<34}{'p50':>10}{'p99':>10}{'max':>10}")
+    for name, kinds in results.items():
+        for kind, stats in kinds.items():
+            label = f"{name}, {kind}"
+            print(f"{label:<34}" + ''.join(f"{stats[key] * 1000:>10.3f}" for key in ('p50', 'p99', 'max')))
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    main(int(args[0]) if args else 2000, int(args[1]) if len(args) > 1 else 200)
@@ -0,0 +1,73 @@
+"""
+Measure the per-call overhead of resolving an operation by name.
+
+Run from the project root:
+
+    python -m benchmarks.bench_dispatch [calls]
+
+Each round runs add, multiply and divide on small Decimal operands, cycling
+through the three, resolved four ways: a new instance per call from the
+registered class (what create_operation used to do), create_operation by
+name and by op code (both return the shared instance), and a function from
+the dispatch table looked up once per operation. The arithmetic is the same
+in every row, so the differences are the dispatch overhead, which is also
+timed on its own (resolving without executing). Each time is the best of
+five rounds. Default: 100,000 calls per round.
+"""
+
+import sys
+import time
+from decimal import Decimal
+
+from app.operations import OperationFactory
+
+NAMES = ('add', 'multiply', 'divide')
+
+
+def new_instance(name: str):
+    return OperationFactory.operation_class(name)().execute
+
+
+def shared(key):
+    return OperationFactory.create_operation(key).execute
+
+
+def table(kernel):
+    return kernel
+
+
+def timed(calls: int, resolve, keys: list, a: Decimal, b: Decimal, execute: bool) -> float:
+    start = time.perf_counter()
+    if execute:
+        for i in range(calls):
+            resolve(keys[i % 3])(a, b)
+    else:
+        for i in range(calls):
+            resolve(keys[i % 3])
+    return time.perf_counter() - start
+
+
+def main(calls: int = 100_000) -> None:
+    a, b = Decimal('1.5'), Decimal('0.25')
+    codes = [OperationFactory.op_code(name) for name in NAMES]
+    cases = [
+        ('new instance per call', new_instance, list(NAMES)),
+        ('create_operation(name)', shared, list(NAMES)),
+        ('create_operation(code)', shared, codes),
+        ('dispatch table', table, [OperationFactory.dispatch(code) for code in codes]),
+    ]
+    # Rounds interleave the cases, so drift in machine load affects them alike
+    best = {(name, execute): float('inf') for name, _, _ in cases for execute in (False, True)}
+    for _ in range(5):
+        for name, resolve, keys in cases:
+            for execute in (False, True):
+                seconds = timed(calls, resolve, keys, a, b, execute)
+                best[name, execute] = min(best[name, execute], seconds)
+    print(f"{calls} calls of {', '.join(NAMES)} per round, ns per call")
+    print(f"{'dispatch':<26}{'resolve':>10}{'+execute':>10}")
+    for name, _, _ in cases:
+        print(f"{name:<26}{best[name, False] / calls * 1e9:>10.0f}{best[name, True] / calls * 1e9:>10.0f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,69 @@
+"""
+Time the exact big-integer operations at 1k, 10k and 100k digits.
+
+Run from the project root:
+
+    python -m benchmarks.bench_number_theory [digits ...]
+
+For each size, gcd, lcm, int_root (square and cube), int_power (a number a
+hundredth of the size raised to the 100th power) and modpow (exponent 65537,
+modulus of the full size) run through their Operation on Decimal operands,
+as the Calculator calls them, so the times include converting to int and
+back. Next to each is the cost model's estimate. For comparison, the
+Decimal engine's power and square root are timed at a precision of the same
+number of digits; they round, where the integer operations are exact.
+"""
+
+import random
+import sys
+import time
+from decimal import Decimal, localcontext
+
+from app import decimal_math
+from app.cost_model import estimate_seconds
+from app.number_theory import (
+    GreatestCommonDivisor, IntegerPower, IntegerRoot, LeastCommonMultiple, ModularPower
+)
+
+
+def timed(function, *args) -> float:
+    start = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - start
+
+
+def measure(digits: int, rng: random.Random) -> list:
+    a = Decimal(rng.randrange(10 ** (digits - 1), 10 ** digits))
+    b = Decimal(rng.randrange(10 ** (digits - 1), 10 ** digits))
+    base = Decimal(rng.randrange(10 ** (digits // 100 - 1), 10 ** (digits // 100)))
+    modpow = ModularPower(b)
+    cases = [
+        ('gcd', GreatestCommonDivisor(), a, b),
+        ('lcm', LeastCommonMultiple(), a, b),
+        ('int_root(a, 2)', IntegerRoot(), a, Decimal(2)),
+        ('int_root(a, 3)', IntegerRoot(), a, Decimal(3)),
+        ('int_power(c, 100)', IntegerPower(), base, Decimal(100)),
+        ('modpow(a, 65537)', modpow, a, Decimal(65537)),
+    ]
+    rows = [
+        (name, timed(operation.execute, x, y), estimate_seconds(str(operation), x, y, 28))
+        for name, operation, x, y in cases
+    ]
+    with localcontext() as context:
+        context.prec = digits
+        rows.append(('Decimal power(c, 100)', timed(decimal_math.power, base, Decimal(100)), None))
+        rows.append(('Decimal root(a, 2)', timed(decimal_math.root, a, Decimal(2)), None))
+    return rows
+
+
+def main(sizes: tuple = (1000, 10_000, 100_000)) -> None:
+    rng = random.Random(42)
+    print(f"{'digits':>8}  {'operation':<24}{'seconds':>10}{'estimate':>10}")
+    for digits in sizes:
+        for name, seconds, estimate in measure(digits, rng):
+            shown = f"{estimate:>10.4f}" if estimate is not None else f"{'-':>10}"
+            print(f"{digits:>8}  {name:<24}{seconds:>10.4f}{shown}")
+
+
+if __name__ == "__main__":
+    main(tuple(int(arg) for arg in sys.argv[1:]) or (1000, 10_000, 100_000))
@@ -0,0 +1,91 @@
+"""
+Measure what operation plugins cost at startup and in batch jobs.
+
+Run from the project root:
+
+    python -m benchmarks.bench_plugins [plugins] [rows]
+
+A scratch plugin directory gets the given number of plugin modules (default
+50), each importing NumPy and defining one operation with an execute_batch
+kernel. Startup is timed three ways: scanning entry points and the
+directory to build the index, installing from the cached index, and
+importing every plugin module up front as eager registration would. Then
+one plugin is used for the first time, which imports its module. Finally
+its vectorized kernel is timed against execute row by row on the given
+number of float rows (default 100,000).
+"""
+
+import importlib.metadata
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from app import plugins
+from app.calculator_config import CalculatorConfig
+from app.operations import OperationFactory
+from app.plugins import install_plugins, load_plugin, plugin_index
+
+PLUGIN = '''
+import numpy as np
+from app.operations import Operation
+
+
+class Hypot{n}(Operation):
+    def execute(self, a, b):
+        return (a * a + b * b) ** 0.5
+
+    def execute_batch(self, a, b):
+        return np.hypot(a, b)
+
+
+OPERATIONS = {{"hypot{n}": Hypot{n}}}
+'''
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    value = function(*args)
+    return time.perf_counter() - start, value
+
+
+def main(count: int = 50, rows: int = 100_000) -> None:
+    with tempfile.TemporaryDirectory() as scratch:
+        config = CalculatorConfig(base_dir=Path(scratch), plugins=True)
+        config.plugin_dir.mkdir()
+        for n in range(count):
+            (config.plugin_dir / f"hypot{n}.py").write_text(PLUGIN.format(n=n))
+
+        started = time.perf_counter()
+        importlib.metadata.entry_points(group=plugins.ENTRY_POINT_GROUP)
+        entry_points = time.perf_counter() - started
+        cold, specs = timed(plugin_index, config.plugin_index, config.plugin_dir, True)
+        warm, _ = timed(plugin_index, config.plugin_index, config.plugin_dir)
+        install, names = timed(install_plugins, config)
+        first_use, operation = timed(OperationFactory.create_operation, names[0])
+        eager, _ = timed(lambda: [load_plugin(spec) for spec in specs[1:]])
+
+        print(f"{count} plugin modules")
+        print(f"{'startup':<40}{'ms':>10}")
+        print(f"{'  scan entry points':<40}{entry_points * 1000:>10.2f}")
+        print(f"{'  scan and index (cold)':<40}{cold * 1000:>10.2f}")
+        print(f"{'  read cached index (warm)':<40}{warm * 1000:>10.2f}")
+        print(f"{'  install lazily from index':<40}{install * 1000:>10.2f}")
+        print(f"{'  import every plugin up front':<40}{eager * 1000:>10.2f}")
+        print(f"{'first use of one plugin':<40}{first_use * 1000:>10.2f}")
+
+        a = np.random.default_rng(42).random(rows)
+        b = np.random.default_rng(43).random(rows)
+        batch, _ = timed(operation.execute_batch, a, b)
+        scalar, _ = timed(lambda: [operation.execute(x, y) for x, y in zip(a.tolist(), b.tolist())])
+        print(f"{rows} rows: execute_batch {batch * 1000:.2f} ms, execute per row {scalar * 1000:.2f} ms "
+              f"({scalar / batch:.0f}x)")
+        for name in [name for name in sys.modules if name.startswith(plugins.PLUGIN_PACKAGE + '.')]:
+            del sys.modules[name]
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    main(int(args[0]) if args else 50, int(args[1]) if len(args) > 1 else 100_000)
@@ -0,0 +1,63 @@
+"""
+Compare one in-process CalculatorManager with a sharded WorkerPool.
+
+Run from the project root:
+
+    python -m benchmarks.bench_pool [operations] [sessions]
+
+The same operations, spread over many sessions, are sent to the manager
+one by one and to pools of 1, 2 and 4 workers in batches of 1000 with
+calculate_many, which runs each worker's share in parallel. The pool pays
+for pickling every request and result, so it only wins once there are
+cores to spread the work over.
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from app.calculator_config import CalculatorConfig
+from app.calculator_manager import CalculatorManager
+from app.calculator_pool import WorkerPool
+
+OPERATIONS = ('add', 'multiply', 'divide', 'power', 'root')
+BATCH = 1000
+
+
+def make_items(operations: int, sessions: int):
+    """Generate (session_id, operation, a, b) tuples."""
+    rng = random.Random(42)
+    return [
+        (f"user-{rng.randrange(sessions)}", rng.choice(OPERATIONS), f"{rng.uniform(1, 1000):.4f}", str(rng.randint(2, 5)))
+        for _ in range(operations)
+    ]
+
+
+def main(operations: int = 20_000, sessions: int = 200) -> None:
+    items = make_items(operations, sessions)
+    print(f"{operations} operations over {sessions} sessions, {os.cpu_count()} CPUs")
+    print(f"{'mode':<16}{'ops/s':>10}")
+    with tempfile.TemporaryDirectory() as scratch:
+        config = CalculatorConfig(base_dir=Path(scratch) / 'manager', auto_save=False)
+        manager = CalculatorManager(config)
+        start = time.perf_counter()
+        for item in items:
+            manager.calculate(*item)
+        print(f"{'manager':<16}{operations / (time.perf_counter() - start):>10.0f}")
+
+        for workers in (1, 2, 4):
+            config = CalculatorConfig(base_dir=Path(scratch) / f'pool{workers}', auto_save=False)
+            with WorkerPool(config, workers=workers) as pool:
+                start = time.perf_counter()
+                for offset in range(0, operations, BATCH):
+                    pool.calculate_many(items[offset:offset + BATCH])
+                rate = operations / (time.perf_counter() - start)
+            print(f"{f'pool x{workers}':<16}{rate:>10.0f}")
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:3]]
+    main(*args)
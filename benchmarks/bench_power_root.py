@@ -0,0 +1,69 @@
+"""
+Benchmark the Decimal-native power and root engine against the float path.
+
+Run from the project root:
+
+    python -m benchmarks.bench_power_root
+
+The float path is what Power and Root used before: convert to float, call
+pow, convert back. It is only meaningful up to ~17 significant digits and
+1e308, which is shown in the 'correct digits' column.
+"""
+
+from decimal import Decimal, localcontext
+import timeit
+
+from app import decimal_math
+
+PRECISIONS = (10, 50, 500)
+
+CASES = [
+    # (label, engine function, base, exponent or degree, float equivalent)
+    ("power int", decimal_math.power, Decimal("1.0001"), Decimal("77"),
+     lambda a, b: Decimal(pow(float(a), float(b)))),
+    ("power frac", decimal_math.power, Decimal("2.5"), Decimal("3.75"),
+     lambda a, b: Decimal(pow(float(a), float(b)))),
+    ("root 2", decimal_math.root, Decimal("2"), Decimal("2"),
+     lambda a, b: Decimal(pow(float(a), 1 / float(b)))),
+    ("root 7", decimal_math.root, Decimal("123.456"), Decimal("7"),
+     lambda a, b: Decimal(pow(float(a), 1 / float(b)))),
+    ("root exact", decimal_math.root, Decimal("1000000"), Decimal("3"),
+     lambda a, b: Decimal(pow(float(a), 1 / float(b)))),
+]
+
+
+def correct_digits(value: Decimal, reference: Decimal, precision: int) -> int:
+    """Count the leading significant digits of value that match reference."""
+    if value == reference:
+        return precision
+    error = abs(value - reference) / abs(reference)
+    return min(precision, max(0, -error.adjusted() - 1))
+
+
+def time_call(func, *args, number: int = 200) -> float:
+    """Return the mean time per call in microseconds."""
+    return timeit.timeit(lambda: func(*args), number=number) / number * 1e6
+
+
+def main() -> None:
+    print(f"{'case':<12}{'digits':>8}{'engine us':>12}{'float us':>12}{'correct digits (engine/float)':>32}")
+    for label, engine, a, b, float_path in CASES:
+        for precision in PRECISIONS:
+            with localcontext() as ctx:
+                ctx.prec = precision + 20
+                reference = engine(a, b, precision + 20)
+                ctx.prec = precision
+                reference = +reference
+                engine_result = engine(a, b, precision)
+                float_result = float_path(a, b)
+                engine_us = time_call(engine, a, b, precision)
+                float_us = time_call(float_path, a, b)
+            print(
+                f"{label:<12}{precision:>8}{engine_us:>12.2f}{float_us:>12.2f}"
+                f"{correct_digits(engine_result, reference, precision):>20}/"
+                f"{correct_digits(float_result, reference, precision)}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Compare n-ary reductions with chains of binary operations.
+
+Run from the project root:
+
+    python -m benchmarks.bench_reductions [values] [workers]
+
+Sums a column of random Decimal literals three ways: N-1 perform_operation
+calls (each recording a Calculation and a memento), Calculator.reduce in
+this process, and Calculator.reduce on a process pool. Then it times the
+mean, variance and product reductions. Defaults: 1,000,000 values and one
+worker per CPU.
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from app.calculator import Calculator
+from app.calculator_config import CalculatorConfig
+from app.operations import OperationFactory
+
+CHAIN_SAMPLE = 100_000
+
+
+def main(count: int = 1_000_000, workers: int = 0) -> None:
+    rng = random.Random(42)
+    values = [f"{rng.uniform(-1000, 1000):.4f}" for _ in range(count)]
+    with tempfile.TemporaryDirectory() as scratch:
+        config = CalculatorConfig(base_dir=Path(scratch), auto_save=False, max_history_size=100)
+        calculator = Calculator(config)
+        calculator.set_operation(OperationFactory.create_operation('add'))
+
+        # The binary chain is timed on a prefix and scaled up
+        sample = min(count, CHAIN_SAMPLE)
+        start = time.perf_counter()
+        total = values[0]
+        for value in values[1:sample]:
+            total = calculator.perform_operation(total, value)
+        chain = (time.perf_counter() - start) * count / sample
+
+        timings = {'binary chain (scaled)': chain}
+        start = time.perf_counter()
+        calculator.reduce('sum', iter(values))
+        timings['reduce sum'] = time.perf_counter() - start
+        start = time.perf_counter()
+        calculator.reduce('sum', iter(values), workers=workers or os.cpu_count() or 1)
+        timings['reduce sum, pool'] = time.perf_counter() - start
+        for name in ('mean', 'variance', 'product'):
+            start = time.perf_counter()
+            calculator.reduce(name, iter(values[:100_000] if name == 'product' else values))
+            timings[f'reduce {name}' + (' (100k)' if name == 'product' else '')] = time.perf_counter() - start
+
+    print(f"{count} values, seconds")
+    for name, seconds in timings.items():
+        print(f"{name:<24}{seconds:>10.2f}")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    main(int(args[0]) if args else 1_000_000, int(args[1]) if len(args) > 1 else 0)
@@ -0,0 +1,114 @@
+"""
+Measure round-trip latency of the Unix-socket RPC against the HTTP service.
+
+Run from the project root:
+
+    python -m benchmarks.bench_rpc [requests]
+
+Both servers run in a child process with a scratch history directory, so
+client and server do not contend for one interpreter. 'round trip' is one blocking add at a time on a single
+connection; 'pipelined' sends requests in windows of MAX_IN_FLIGHT and
+reports the amortized time per request.
+"""
+
+import asyncio
+import multiprocessing
+import os
+from pathlib import Path
+import socket
+import sys
+import tempfile
+import time
+
+from app.calculator_config import CalculatorConfig
+from app.calculator_rpc import RPCClient, RPCServer
+from app.calculator_service import CalculatorService
+
+
+def serve(config, path, connection):
+    """Child process: run both servers on one event loop and report the HTTP port."""
+    async def run():
+        rpc = RPCServer(config)
+        http = CalculatorService(config)
+        await rpc.start(path)
+        await http.start("127.0.0.1", 0)
+        connection.send(http.port)
+        await asyncio.Event().wait()
+
+    asyncio.run(run())
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(p / 100 * len(values)))]
+
+
+def bench_rpc(path: str, requests: int) -> None:
+    with RPCClient(path, pool_size=1) as client:
+        for _ in range(200):
+            client.calculate('add', 1, 2)
+        samples = []
+        for i in range(requests):
+            start = time.perf_counter()
+            client.calculate('add', i, 2)
+            samples.append(time.perf_counter() - start)
+        items = [('add', i, 2) for i in range(requests)]
+        start = time.perf_counter()
+        client.calculate_many(items)
+        pipelined = (time.perf_counter() - start) / requests
+    print(f"{'rpc':<6}{percentile(samples, 50) * 1e6:>14.1f}{percentile(samples, 99) * 1e6:>14.1f}"
+          f"{pipelined * 1e6:>14.1f}")
+
+
+def bench_http(port: int, requests: int) -> None:
+    sock = socket.create_connection(("127.0.0.1", port))
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    body = b'{"operation": "add", "a": 1, "b": 2}'
+    request = (b"POST /calculate HTTP/1.1\r\nHost: localhost\r\nContent-Length: "
+               + str(len(body)).encode() + b"\r\n\r\n" + body)
+    reader = sock.makefile('rb')
+
+    def read_one():
+        length = 0
+        while True:
+            line = reader.readline()
+            if line.lower().startswith(b"content-length"):
+                length = int(line.split(b":")[1])
+            if line == b"\r\n":
+                return reader.read(length)
+
+    samples = []
+    for i in range(requests + 200):
+        start = time.perf_counter()
+        sock.sendall(request)
+        read_one()
+        samples.append(time.perf_counter() - start)
+    samples = samples[200:]
+    start = time.perf_counter()
+    sock.sendall(request * requests)
+    for _ in range(requests):
+        read_one()
+    pipelined = (time.perf_counter() - start) / requests
+    sock.close()
+    print(f"{'http':<6}{percentile(samples, 50) * 1e6:>14.1f}{percentile(samples, 99) * 1e6:>14.1f}"
+          f"{pipelined * 1e6:>14.1f}")
+
+
+def main(requests: int = 5_000) -> None:
+    with tempfile.TemporaryDirectory() as scratch:
+        config = CalculatorConfig(base_dir=Path(scratch), auto_save=False)
+        path = os.path.join(scratch, "calculator.sock")
+        parent, child = multiprocessing.Pipe()
+        server = multiprocessing.Process(target=serve, args=(config, path, child), daemon=True)
+        server.start()
+        port = parent.recv()
+
+        print(f"{requests} add requests, microseconds per request")
+        print(f"{'':<6}{'p50 round':>14}{'p99 round':>14}{'pipelined':>14}")
+        bench_rpc(path, requests)
+        bench_http(port, requests)
+        server.terminate()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5_000)
@@ -0,0 +1,62 @@
+"""
+Compare prefix scans with chains of binary operations.
+
+Run from the project root:
+
+    python -m benchmarks.bench_scans [values]
+
+Computes the running sum of a column of random Decimal literals three
+ways: N-1 perform_operation calls (each recording a Calculation and a
+memento, timed on a prefix and scaled up), a decimal-backend
+Calculator.scan and a numpy-backend Calculator.scan. Then it times the
+other scans on both backends, the running product over growth factors
+near 1. Defaults to 1,000,000 values.
+"""
+
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from app.calculator import Calculator
+from app.calculator_config import CalculatorConfig
+from app.operations import OperationFactory
+
+CHAIN_SAMPLE = 100_000
+
+
+def main(count: int = 1_000_000) -> None:
+    rng = random.Random(42)
+    values = [f"{rng.uniform(-5, 5):.4f}" for _ in range(count)]
+    # Growth factors near 1, so the running product stays in float range
+    factors = [f"{1 + float(value) / 100:.6f}" for value in values]
+    with tempfile.TemporaryDirectory() as scratch:
+        config = CalculatorConfig(base_dir=Path(scratch), auto_save=False, max_history_size=100)
+        calculator = Calculator(config)
+        calculator.set_operation(OperationFactory.create_operation('add'))
+        sample = min(count, CHAIN_SAMPLE)
+        start = time.perf_counter()
+        total = values[0]
+        for value in values[1:sample]:
+            total = calculator.perform_operation(total, value)
+        timings = {'binary chain (scaled)': (time.perf_counter() - start) * count / sample}
+
+        calculators = {
+            backend: Calculator(CalculatorConfig(base_dir=Path(scratch), auto_save=False, backend=backend))
+            for backend in ('decimal', 'numpy')
+        }
+        for name in ('cumsum', 'cumprod', 'cummax', 'compound'):
+            for backend, scanner in calculators.items():
+                start = time.perf_counter()
+                for _ in scanner.scan(name, iter(factors if name == 'cumprod' else values)):
+                    pass
+                timings[f'{name}, {backend}'] = time.perf_counter() - start
+
+    print(f"{count} values, seconds")
+    for name, seconds in timings.items():
+        print(f"{name:<24}{seconds:>10.3f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
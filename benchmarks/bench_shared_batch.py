@@ -0,0 +1,89 @@
+"""
+Compare the shared-memory batch transport with pickled lists.
+
+Run from the project root:
+
+    python -m benchmarks.bench_shared_batch [rows] [backend] [workers]
+
+For each operation the same rows go to the same process pool twice:
+'pickled' submits chunks as lists of Decimals (or floats) and gets result
+lists back, 'shared' writes the columns into a SharedColumns block and
+submits only chunk descriptors. Both include encoding the inputs and
+decoding the results in the parent. Defaults: 1,000,000 rows, the decimal
+backend, one worker per CPU.
+"""
+
+from decimal import Decimal
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from app.calculator_config import CalculatorConfig
+from app.shared_batch import DEFAULT_CHUNK_ROWS, SharedBatchExecutor, compute_decimal_rows, compute_float_rows
+
+OPERATIONS = ('add', 'subtract', 'multiply', 'divide', 'power', 'root',
+              'modulus', 'int_divide', 'percent', 'abs_diff')
+
+
+def pickled_decimal_chunk(operation, a, b):
+    """Worker side of the pickled transport for Decimal rows."""
+    texts, _ = compute_decimal_rows(operation, a, b, width=1 << 20)
+    return [Decimal(text) if text else None for text in texts]
+
+
+def pickled_float_chunk(operation, a, b):
+    """Worker side of the pickled transport for float rows."""
+    result = np.empty(len(a))
+    compute_float_rows(operation, np.array(a), np.array(b), result, np.empty(len(a), np.uint8))
+    return result.tolist()
+
+
+def run_pickled(executor: SharedBatchExecutor, operation: str, a: list, b: list) -> list:
+    """Send the rows as pickled lists, chunk by chunk."""
+    chunk = pickled_float_chunk if executor.kind == 'float' else pickled_decimal_chunk
+    futures = [
+        executor.executor.submit(chunk, operation, a[start:start + DEFAULT_CHUNK_ROWS], b[start:start + DEFAULT_CHUNK_ROWS])
+        for start in range(0, len(a), DEFAULT_CHUNK_ROWS)
+    ]
+    return [value for future in futures for value in future.result()]
+
+
+def make_operands(rows: int, kind: str):
+    """Generate operand columns with small second operands so power stays in range."""
+    rng = random.Random(42)
+    a = [rng.uniform(1, 1000) for _ in range(rows)]
+    b = [float(rng.randint(1, 4)) for _ in range(rows)]
+    if kind == 'decimal':
+        a = [Decimal(f"{value:.6f}") for value in a]
+        b = [Decimal(int(value)) for value in b]
+    return a, b
+
+
+def main(rows: int = 1_000_000, backend: str = 'decimal', workers: int = 0) -> None:
+    with tempfile.TemporaryDirectory() as scratch:
+        config = CalculatorConfig(base_dir=Path(scratch), auto_save=False, backend=backend)
+        with SharedBatchExecutor(config, workers=workers or None) as executor:
+            a, b = make_operands(rows, executor.kind)
+            print(f"{rows} rows, {backend} backend ({executor.kind} columns), seconds per batch")
+            print(f"{'operation':<12}{'pickled':>10}{'shared':>10}{'speedup':>10}")
+            for operation in OPERATIONS:
+                start = time.perf_counter()
+                run_pickled(executor, operation, a, b)
+                pickled = time.perf_counter() - start
+                start = time.perf_counter()
+                executor.run(operation, a, b)
+                shared = time.perf_counter() - start
+                print(f"{operation:<12}{pickled:>10.2f}{shared:>10.2f}{pickled / shared:>10.2f}")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    main(
+        int(args[0]) if args else 1_000_000,
+        args[1] if len(args) > 1 else 'decimal',
+        int(args[2]) if len(args) > 2 else 0,
+    )
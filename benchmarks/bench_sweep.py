@@ -0,0 +1,54 @@
+"""
+Compare parameter sweeps with nested perform_operation loops.
+
+Run from the project root:
+
+    python -m benchmarks.bench_sweep [rows]
+
+Builds the power table for a in 1..rows and b in 0..50 step 0.5 three
+ways: nested loops over Calculator.perform_operation (timed on the first
+100 rows and scaled up), a decimal-backend ParameterSweep and a
+numpy-backend ParameterSweep. Defaults to 10,000 rows (1,010,000 cells).
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from app.calculator import Calculator
+from app.calculator_config import CalculatorConfig
+from app.operations import OperationFactory
+from app.parameter_sweep import OperandRange, ParameterSweep
+
+LOOP_SAMPLE_ROWS = 100
+
+
+def main(rows: int = 10_000) -> None:
+    a, b = OperandRange(1, rows), OperandRange(0, 50, '0.5')
+    with tempfile.TemporaryDirectory() as scratch:
+        config = CalculatorConfig(base_dir=Path(scratch), auto_save=False, max_history_size=1)
+        calculator = Calculator(config)
+        calculator.set_operation(OperationFactory.create_operation('power'))
+        sample = min(rows, LOOP_SAMPLE_ROWS)
+        start = time.perf_counter()
+        for x in a.decimals(0, sample):
+            for y in b.decimals():
+                calculator.perform_operation(x, y)
+        loops = (time.perf_counter() - start) * rows / sample
+
+        results = {'nested loops (scaled)': loops}
+        for backend in ('decimal', 'numpy'):
+            sweep = ParameterSweep('power', a, b, CalculatorConfig(base_dir=Path(scratch), backend=backend))
+            start = time.perf_counter()
+            for _ in sweep.blocks():
+                pass
+            results[f'{backend} sweep'] = time.perf_counter() - start
+
+    print(f"power over {len(a)} x {len(b)} cells, seconds")
+    for name, seconds in results.items():
+        print(f"{name:<24}{seconds:>10.3f}{loops / seconds:>10.0f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000)
@@ -0,0 +1,59 @@
+"""
+Measure how calculate() scales with threads sharing one Calculator.
+
+Run from the project root:
+
+    python -m benchmarks.bench_threads [operations]
+
+Each thread count performs the same total number of operations, split
+evenly across the threads, on one shared instance. On a regular build the
+GIL serializes the arithmetic, so throughput stays flat at best; on a
+free-threaded build (python3.13t and later, GIL disabled) the validation
+and arithmetic run in parallel and only the history append is serialized.
+The header shows which kind of interpreter ran the benchmark.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from app.calculator import Calculator
+from app.calculator_config import CalculatorConfig
+
+OPERATIONS = ('add', 'multiply', 'divide', 'power', 'root')
+
+
+def run(calc: Calculator, threads: int, operations: int) -> float:
+    """Run the operations on the given number of threads; return ops per second."""
+    per_thread = operations // threads
+
+    def work(index: int) -> None:
+        for i in range(per_thread):
+            calc.calculate(OPERATIONS[i % len(OPERATIONS)], f"{index + i}.25", "3")
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(work, range(threads)))
+    return per_thread * threads / (time.perf_counter() - start)
+
+
+def main(operations: int = 40_000) -> None:
+    gil = getattr(sys, '_is_gil_enabled', lambda: True)()
+    print(f"Python {sys.version.split()[0]}, GIL {'enabled' if gil else 'disabled'}")
+    print(f"{'threads':>8}{'ops/s':>12}{'speedup':>10}")
+    with tempfile.TemporaryDirectory() as scratch:
+        config = CalculatorConfig(
+            base_dir=Path(scratch), auto_save=False, max_history_size=operations
+        )
+        baseline = None
+        for threads in (1, 2, 4, 8):
+            calc = Calculator(config)
+            rate = run(calc, threads, operations)
+            baseline = baseline or rate
+            print(f"{threads:>8}{rate:>12.0f}{rate / baseline:>10.2f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 40_000)
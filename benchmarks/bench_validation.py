@@ -0,0 +1,74 @@
+"""
+Compare per-value and bulk input validation.
+
+Run from the project root:
+
+    python -m benchmarks.bench_validation [rows]
+
+'uncached' is the original path (strip, str(), new Decimal, range check,
+normalize) for every operand, as validate_number did before the cache. 'validate_number' adds the Decimal/int fast
+path and the literal cache; 'validate_many' validates the whole column in
+one call. All figures are nanoseconds per value.
+"""
+
+from decimal import Decimal
+import random
+import sys
+import time
+
+from app.calculator_config import CalculatorConfig
+from app.input_validators import InputValidator, _validate_literal
+from app.numeric_backends import get_backend
+
+
+def make_inputs(rows: int):
+    """Generate input columns: repeated literals, unique literals and Decimals."""
+    rng = random.Random(42)
+    repeated = [str(rng.choice((1, 2, 5, 10, 12.5, 100))) for _ in range(rows)]
+    unique = [f"{rng.uniform(0, 1000):.6f}" for _ in range(rows)]
+    decimals = [Decimal(value) for value in unique]
+    return {'repeated literals': repeated, 'unique literals': unique, 'decimals': decimals}
+
+
+def time_per_value(func, values, repeat: int = 3) -> float:
+    """Return the best nanoseconds per value over several runs."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(values)
+        best = min(best, time.perf_counter() - start)
+    return best / len(values) * 1e9
+
+
+def main(rows: int = 50_000) -> None:
+    config = CalculatorConfig()
+
+    def uncached(values):
+        for value in values:
+            backend = get_backend(config.backend)
+            if isinstance(value, str):
+                value = value.strip()
+            number = Decimal(str(value))
+            if backend.exceeds(number, config.max_input_value):
+                raise ValueError(value)
+            number.normalize()
+
+    def per_value(values):
+        for value in values:
+            InputValidator.validate_number(value, config)
+
+    def bulk(values):
+        InputValidator.validate_many(values, config)
+
+    print(f"{rows} values, ns per value")
+    print(f"{'input':<20}{'uncached':>12}{'validate_number':>18}{'validate_many':>16}")
+    for label, values in make_inputs(rows).items():
+        _validate_literal.cache_clear()
+        uncached_ns = time_per_value(uncached, values)
+        number_ns = time_per_value(per_value, values)
+        many_ns = time_per_value(bulk, values)
+        print(f"{label:<20}{uncached_ns:>12.0f}{number_ns:>18.0f}{many_ns:>16.0f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50_000)
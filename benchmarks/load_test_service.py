@@ -0,0 +1,128 @@
+"""
+Load-test the HTTP/JSON calculator service on localhost.
+
+Run from the project root against a running service:
+
+    python -m app.calculator_service --port 8765 &
+    python -m benchmarks.load_test_service --port 8765
+
+or let the script start an in-process service on a free port with a scratch
+history directory:
+
+    python -m benchmarks.load_test_service --serve
+
+Each client opens one keep-alive connection with its own session and keeps
+up to --pipeline requests in flight. The report shows throughput and
+latency percentiles per request.
+"""
+
+import argparse
+import asyncio
+import json
+from pathlib import Path
+import random
+import tempfile
+import time
+
+from app.calculator_config import CalculatorConfig
+from app.calculator_service import CalculatorService
+
+OPERATIONS = ('add', 'subtract', 'multiply', 'divide', 'power', 'root')
+
+
+def build_request(host: str, session: str, rng: random.Random) -> bytes:
+    """Encode a random POST /calculate request."""
+    body = json.dumps({
+        'operation': rng.choice(OPERATIONS),
+        'a': f"{rng.uniform(1, 1000):.4f}",
+        'b': f"{rng.uniform(1, 5):.2f}",
+    }).encode()
+    head = (
+        f"POST /calculate HTTP/1.1\r\nHost: {host}\r\nX-Session-Id: {session}\r\n"
+        f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n"
+    )
+    return head.encode() + body
+
+
+async def read_response(reader: asyncio.StreamReader) -> int:
+    """Read one response and return its status code."""
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.decode('latin-1').split("\r\n")
+    length = next(int(line.split(':', 1)[1]) for line in lines if line.lower().startswith('content-length'))
+    await reader.readexactly(length)
+    return int(lines[0].split()[1])
+
+
+async def run_client(host: str, port: int, client: int, requests: int, pipeline: int, latencies: list) -> int:
+    """Send requests on one connection; return the number of non-200 responses."""
+    rng = random.Random(client)
+    reader, writer = await asyncio.open_connection(host, port)
+    sent_at = []
+    failures = 0
+    sent = received = 0
+    while received < requests:
+        # Top up the pipeline, then wait for the oldest response
+        while sent < requests and sent - received < pipeline:
+            writer.write(build_request(host, f"load-{client}", rng))
+            sent_at.append(time.perf_counter())
+            sent += 1
+        await writer.drain()
+        status = await read_response(reader)
+        latencies.append(time.perf_counter() - sent_at[received])
+        failures += status != 200
+        received += 1
+    writer.close()
+    await writer.wait_closed()
+    return failures
+
+
+async def run(host: str, port: int, clients: int, requests: int, pipeline: int) -> None:
+    """Run all clients concurrently and print the report."""
+    latencies: list = []
+    start = time.perf_counter()
+    failures = await asyncio.gather(*(
+        run_client(host, port, client, requests, pipeline, latencies) for client in range(clients)
+    ))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    total = len(latencies)
+
+    def percentile(p: float) -> float:
+        return latencies[min(total - 1, int(p / 100 * total))] * 1000
+
+    print(f"{clients} clients x {requests} requests, pipeline depth {pipeline}")
+    print(f"throughput: {total / elapsed:.0f} req/s ({elapsed:.2f}s), failures: {sum(failures)}")
+    print(f"latency ms: p50 {percentile(50):.2f}  p90 {percentile(90):.2f}  p99 {percentile(99):.2f}")
+
+
+async def serve_and_run(args: argparse.Namespace) -> None:
+    """Start an in-process service on a free port, then run the load test."""
+    with tempfile.TemporaryDirectory() as scratch:
+        service = CalculatorService(CalculatorConfig(base_dir=Path(scratch), auto_save=False), args.workers)
+        await service.start(args.host, 0)
+        try:
+            await run(args.host, service.port, args.clients, args.requests, args.pipeline)
+        finally:
+            await service.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load-test the calculator HTTP service.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--clients", type=int, default=16, help="concurrent connections")
+    parser.add_argument("--requests", type=int, default=500, help="requests per client")
+    parser.add_argument("--pipeline", type=int, default=8, help="requests in flight per connection")
+    parser.add_argument("--workers", type=int, default=4, help="worker pool size with --serve")
+    parser.add_argument("--serve", action="store_true", help="start an in-process service first")
+    args = parser.parse_args()
+
+    if args.serve:
+        asyncio.run(serve_and_run(args))
+    else:
+        asyncio.run(run(args.host, args.port, args.clients, args.requests, args.pipeline))
+
+
+if __name__ == "__main__":
+    main()
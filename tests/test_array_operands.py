@@ -0,0 +1,50 @@
+from decimal import Decimal
+import numpy as np
+import pytest
+from app.array_operands import ArrayRef, content_hash, reference
+from app.calculator_config import CalculatorConfig
+from app.exceptions import OperationError
+
+
+def test_reference_round_trips_through_text(tmp_path):
+    array = np.arange(6.0).reshape(2, 3)
+    ref = ArrayRef.of(array)
+    assert (ref.shape, ref.dtype, ref.path) == ((2, 3), "float64", None)
+    assert str(ref) == f"array<float64[2x3]:{ref.digest}>"
+    assert ArrayRef.parse(str(ref)) == ref
+    assert ArrayRef.parse("12.5") is None
+    # The hash covers the shape as well as the elements
+    assert content_hash(array) != content_hash(array.reshape(3, 2))
+    assert content_hash(array) == content_hash(np.asfortranarray(array))
+    with pytest.raises(OperationError, match="was not spilled"):
+        ref.load()
+
+
+def test_large_arrays_spill_to_content_addressed_files(tmp_path):
+    config = CalculatorConfig(base_dir=tmp_path, array_spill_bytes=64)
+    small, large = np.zeros(4), np.arange(100.0)
+    assert reference(small, config).path is None
+    assert reference(Decimal(2), config) == Decimal(2)
+    ref = reference(large, config)
+    assert ref.path == config.array_dir / f"{ref.digest}.npy"
+    assert reference(large.copy(), config) == ref
+    assert [p.name for p in config.array_dir.iterdir()] == [ref.path.name]
+    parsed = ArrayRef.parse(str(ref))
+    assert parsed.path == ref.path
+    assert np.array_equal(parsed.load(), large)
+
+    np.save(ref.path, large + 1)
+    with pytest.raises(OperationError, match="does not match its content hash"):
+        ref.load()
+    ref.path.unlink()
+    with pytest.raises(OperationError, match="Cannot load"):
+        ref.load()
+
+
+def test_failed_spill_leaves_no_temporary_file(tmp_path, monkeypatch):
+    def fail(*args):
+        raise OSError("disk full")
+    monkeypatch.setattr(np, "save", fail)
+    with pytest.raises(OSError, match="disk full"):
+        ArrayRef.of(np.ones(10), tmp_path, 0)
+    assert list(tmp_path.iterdir()) == []
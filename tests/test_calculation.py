@@ -1,7 +1,7 @@
 import pytest
 from decimal import Decimal
 from datetime import datetime
-from app.calculation import Calculation
+from app.calculation import Calculation, Reduction
 from app.exceptions import OperationError
 
 
@@ -136,9 +136,48 @@ def test_absolute_difference():
     assert calc.result == Decimal("7")
 
 def test_percent():
-    calc = Calculation("Percent", Decimal("200"), Decimal("15"))
-    assert calc.result == Decimal("30")
+    # The first operand as a percentage of the second, like Percent.execute
+    calc = Calculation("Percent", Decimal("30"), Decimal("200"))
+    assert calc.result == Decimal("15")
 
 
 
 
+
+def test_format_result_reuses_cached_quantum():
+    from app.calculation import _quantum
+    calc = Calculation("Division", Decimal("2"), Decimal("3"))
+    assert calc.format_result(3) == "0.667"
+    assert _quantum(3) is _quantum(3)
+    assert _quantum(3).as_tuple().exponent == -3
+
+
+def test_format_result_of_float_backend():
+    from app.numeric_backends import get_backend
+    calc = Calculation("Division", 2.0, 3.0, backend=get_backend("float"))
+    assert isinstance(calc.result, float)
+    assert calc.format_result(3) == "0.667"
+    assert Calculation("Addition", 0.1, 0.2, backend=get_backend("float")).format_result() == "0.3"
+
+def test_calculation_integers_are_exact_and_lossless():
+    from decimal import localcontext
+    with localcontext() as ctx:
+        ctx.prec = 5
+        calc = Calculation("Addition", Decimal("123456789"), Decimal("1"))
+    assert calc.result == Decimal("123456790")
+    assert calc.to_dict()["result"] == "123456790"
+    assert Calculation.from_dict(calc.to_dict()) == calc
+
+
+def test_calculation_truncating_integer_division_and_modulus():
+    assert Calculation("IntegerDivision", Decimal("-7"), Decimal("2")).result == Decimal("-3")
+    assert Calculation("Modulus", Decimal("-7"), Decimal("3")).result == Decimal("-1")
+
+
+def test_reduction_round_trips_with_stored_result():
+    reduction = Reduction(operation="Sum", operand1=Decimal(3), operand2=Decimal(0), value=Decimal("6.5"))
+    assert reduction.result == Decimal("6.5")
+    assert str(reduction) == "Sum of 3 values = 6.5"
+    loaded = Calculation.from_dict(reduction.to_dict())
+    assert isinstance(loaded, Reduction)
+    assert loaded == reduction and loaded.timestamp == reduction.timestamp
@@ -1,3 +1,5 @@
+import math
+import numpy as np
 import pytest
 from unittest.mock import patch, PropertyMock 
 from decimal import Decimal
@@ -241,8 +243,8 @@ def test_save_history_empty(tmp_path):
     df = pd.read_csv(config.history_file)
     assert df.empty
 
-def test_history_trims_to_max_size():
-    config = CalculatorConfig()
+def test_history_trims_to_max_size(tmp_path):
+    config = CalculatorConfig(base_dir=tmp_path)
     config.max_history_size = 3
     calc = Calculator(config=config)
 
@@ -295,4 +297,269 @@ def test_load_history_raises_operation_error(tmp_path):
         with pytest.raises(OperationError) as exc_info:
             calc.load_history()
 
-    assert "Failed to load history: File corrupted" in str(exc_info.value)
\ No newline at end of file
+    assert "Failed to load history: File corrupted" in str(exc_info.value)
+
+
+def test_perform_operation_uses_configured_significant_digits(tmp_path):
+    from decimal import getcontext
+    global_precision = getcontext().prec
+
+    calc = Calculator(CalculatorConfig(base_dir=tmp_path, significant_digits=5))
+    calc.set_operation(OperationFactory.create_operation("divide"))
+    result = calc.perform_operation("1", "3")
+
+    assert result == Decimal("0.33333")
+    assert calc.history[-1].result == Decimal("0.33333")
+    assert getcontext().prec == global_precision
+
+
+def test_display_precision_does_not_round_calculations(tmp_path):
+    calc = Calculator(CalculatorConfig(base_dir=tmp_path, auto_save=False, precision=3))
+    assert calc.calculate("add", "12345678901", "1") == Decimal("12345678902")
+    assert calc.calculate("add", "1234.5", "1") == Decimal("1235.5")
+    assert calc.calculate("subtract", "12345678901.5", "0.25") == Decimal("12345678901.25")
+
+
+def test_history_records_the_returned_result(tmp_path):
+    calc = Calculator(CalculatorConfig(base_dir=tmp_path, auto_save=False))
+    for name, a, b in (("percent", "1", "3"), ("divide", "1", "3"), ("root", "2", "3"), ("abs_diff", "3", "10")):
+        assert calc.calculate(name, a, b) == calc.history[-1].result
+    assert calc.history[0].result == Decimal("33.33333333333333333333333333")
+
+
+def test_calculators_keep_independent_precision(tmp_path):
+    low = Calculator(CalculatorConfig(base_dir=tmp_path / "low", significant_digits=4))
+    high = Calculator(CalculatorConfig(base_dir=tmp_path / "high", significant_digits=40))
+    low.set_operation(OperationFactory.create_operation("root"))
+    high.set_operation(OperationFactory.create_operation("root"))
+
+    assert low.perform_operation("2", "2") == Decimal("1.414")
+    assert len(str(high.perform_operation("2", "2"))) == 41
+
+
+def test_load_history_recomputes_at_configured_significant_digits(tmp_path):
+    config = CalculatorConfig(base_dir=tmp_path, significant_digits=6)
+    calc = Calculator(config=config)
+    calc.set_operation(OperationFactory.create_operation("divide"))
+    calc.perform_operation("2", "3")
+    calc.save_history()
+
+    restored = Calculator(config=config)
+    assert restored.history[0].result == Decimal("0.666667")
+
+
+def test_calculate_by_name_leaves_strategy_untouched(tmp_path):
+    calc = Calculator(CalculatorConfig(base_dir=tmp_path, auto_save=False))
+    calc.set_operation(Addition())
+    assert calc.calculate("Multiply", "3", "4") == Decimal("12")
+    assert calc.calculate(OperationFactory.create_operation("subtract"), 5, 2) == Decimal("3")
+    assert isinstance(calc.operation_strategy, Addition)
+    # Operations created by name or op code are shared
+    assert calc._operation("multiply") is calc._operation("MULTIPLY") is calc._operation(3)
+    assert [c.operation for c in calc.snapshot()] == ["Multiplication", "Subtraction"]
+    with pytest.raises(ValueError, match="Unknown operation"):
+        calc.calculate("nope", 1, 2)
+
+
+def test_calculate_binds_non_native_backend(tmp_path):
+    calc = Calculator(CalculatorConfig(base_dir=tmp_path, auto_save=False, backend="float"))
+    assert calc.calculate("divide", 1, 4) == 0.25
+    assert calc._operation("divide").backend is calc.backend
+    # Binding a backend never changes the shared native instance
+    shared = OperationFactory.create_operation("divide")
+    calc.set_operation(shared)
+    assert calc.operation_strategy.backend is calc.backend
+    assert shared.backend is None
+    assert calc.calculate(4, 1, 4) == 0.25
+
+
+def test_concurrent_calculate_stress(tmp_path):
+    import threading
+    threads, per_thread = 16, 200
+    config = CalculatorConfig(base_dir=tmp_path, auto_save=False, max_history_size=threads * per_thread)
+    calc = Calculator(config=config)
+    expected = {"add": lambda a, b: a + b, "multiply": lambda a, b: a * b, "subtract": lambda a, b: a - b}
+    names = {"add": "Addition", "multiply": "Multiplication", "subtract": "Subtraction"}
+    errors = []
+    start = threading.Barrier(threads + 1)
+    done = threading.Event()
+
+    def worker(index):
+        start.wait()
+        try:
+            for i in range(per_thread):
+                op = list(expected)[i % 3]
+                assert calc.calculate(op, index, i) == expected[op](index, i)
+        except Exception as e:  # pragma: no cover
+            errors.append(e)
+
+    def reader():
+        start.wait()
+        previous = 0
+        while not done.is_set():
+            snapshot = calc.snapshot()
+            # History only grows here, and every entry is complete
+            if len(snapshot) < previous or any(c.result is None for c in snapshot):
+                errors.append(AssertionError("inconsistent snapshot"))  # pragma: no cover
+            previous = len(snapshot)
+
+    workers = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+    watcher = threading.Thread(target=reader)
+    for thread in workers + [watcher]:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    done.set()
+    watcher.join()
+
+    assert errors == []
+    history = calc.snapshot()
+    assert len(history) == threads * per_thread
+    assert len(calc.undo_stack) == threads * per_thread
+    for calc_entry in history:
+        op = next(op for op, name in names.items() if name == calc_entry.operation)
+        assert calc_entry.result == expected[op](calc_entry.operand1, calc_entry.operand2)
+    # Each memento is the history just before one append
+    assert sorted(len(m.history) for m in calc.undo_stack) == list(range(threads * per_thread))
+
+
+def test_concurrent_calculate_trims_and_undoes(tmp_path):
+    from concurrent.futures import ThreadPoolExecutor
+    config = CalculatorConfig(base_dir=tmp_path, auto_save=False, max_history_size=10)
+    calc = Calculator(config=config)
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda i: calc.calculate("add", i, 1), range(400)))
+        list(pool.map(lambda _: calc.undo(), range(50)))
+    assert len(calc.undo_stack) == 350
+    assert len(calc.redo_stack) == 50
+    assert len(calc.snapshot()) == 10
+    assert calc.redo()
+    assert len(calc.snapshot()) == 10
+
+
+def test_reduce_records_one_history_entry(tmp_path):
+    config = CalculatorConfig(base_dir=tmp_path, auto_save=True, significant_digits=10)
+    calc = Calculator(config)
+    observer = DummyObserver()
+    calc.add_observer(observer)
+    assert calc.reduce("sum", (str(n) for n in range(1, 101)), chunk_size=16) == Decimal(5050)
+    assert calc.reduce("Variance", [2, 4, 4, 4, 5, 5, 7, 9]) == Decimal("4.571428571")
+    assert [str(c) for c in calc.history] == ["Sum of 100 values = 5050", "Variance of 8 values = 4.571428571"]
+    assert observer.last_calc is calc.history[-1]
+    assert calc.undo() and len(calc.history) == 1
+
+    calc.save_history()
+    reloaded = Calculator(config)
+    assert reloaded.history == calc.history
+
+    with pytest.raises(ValidationError):
+        calc.reduce("max", ["1", "abc"])
+    with pytest.raises(OperationError, match="fewer than 1 values"):
+        calc.reduce("mean", [])
+    with pytest.raises(OperationError, match="Product overflowed"):
+        calc.reduce("product", ["1e999"] * 2000)
+    with pytest.raises(ValueError, match="Unknown reduction"):
+        calc.reduce("median", [1])
+    assert len(calc.history) == 1
+
+
+def test_scan_records_one_history_entry(tmp_path):
+    config = CalculatorConfig(base_dir=tmp_path, auto_save=True)
+    calc = Calculator(config)
+    results = calc.scan("cumsum", (str(n) for n in range(1, 101)))
+    assert calc.history == []
+    assert list(results)[-3:] == [Decimal(4851), Decimal(4950), Decimal(5050)]
+    assert [str(c) for c in calc.history] == ["RunningSum of 100 values = 5050"]
+    assert len(calc.undo_stack) == 1
+    assert list(calc.scan("compound", [])) == [] and len(calc.history) == 1
+
+    calc.save_history()
+    assert Calculator(config).history == calc.history
+
+    failing = calc.scan("cummax", ["1", "abc"])
+    assert next(failing) == 1
+    with pytest.raises(ValidationError):
+        next(failing)
+    with pytest.raises(ValueError, match="Unknown scan"):
+        calc.scan("median", [1])
+    with pytest.raises(OperationError, match="RunningProduct overflowed"):
+        list(calc.scan("cumprod", ["1e999"] * 2000))
+    assert len(calc.history) == 1
+
+
+def test_scan_with_numpy_backend(tmp_path):
+    calc = Calculator(CalculatorConfig(base_dir=tmp_path, backend="numpy", auto_save=False))
+    assert list(calc.scan("cumprod", [2, 3, 4])) == [2.0, 6.0, 24.0]
+    assert str(calc.history[-1]) == "RunningProduct of 3 values = 24.0"
+    assert calc.history[-1].result == Decimal("24.0")
+    assert calc.history[-1].format_result() == "24"
+    assert len(calc.scan("cumsum", [])) == 0 and len(calc.history) == 1
+    with pytest.raises(ValidationError):
+        calc.scan("cumsum", [1, "abc"])
+
+
+def test_array_operands_are_recorded_by_reference(tmp_path):
+    config = CalculatorConfig(base_dir=tmp_path, auto_save=True, array_spill_bytes=32)
+    calc = Calculator(config)
+    result = calc.calculate("multiply", [[1, 2], [3, 4]], "2")
+    assert isinstance(result, np.ndarray) and result.tolist() == [[2, 4], [6, 8]]
+    assert calc.calculate("add", [1, 2], [3, 4]).tolist() == [4, 6]
+    calculation = calc.history[0]
+    assert calculation.operand2 == Decimal(2)
+    assert str(calculation) == f"Multiplication({calculation.operand1}, 2) = {calculation.result}"
+    assert calculation.result.shape == (2, 2) and np.array_equal(calculation.result.load(), result)
+    # Arrays below the threshold are only referenced, not kept
+    assert calc.history[1].result.path is None
+
+    calc.save_history()
+    reloaded = Calculator(config)
+    assert reloaded.history == calc.history
+    assert np.array_equal(reloaded.history[0].result.load(), result)
+
+    with pytest.raises(ValidationError):
+        calc.calculate("add", [1, "x"], 2)
+    with pytest.raises(OperationError, match="could not be broadcast"):
+        calc.calculate("add", [1, 2], [1, 2, 3])
+
+
+def test_expensive_calculations_are_rejected_or_cancelled(tmp_path):
+    config = CalculatorConfig(base_dir=tmp_path, auto_save=False, significant_digits=5000, cost_budget=1.0)
+    calc = Calculator(config)
+    with pytest.raises(OperationError, match="estimated to take .* over the budget of 1s"):
+        calc.calculate("power", "2.5", "1.37")
+    assert calc.calculate("add", "1", "2") == 3
+
+    # Slow calculations run in a worker that is stopped at the deadline
+    config = CalculatorConfig(base_dir=tmp_path, auto_save=False, significant_digits=3000, deadline=0.05)
+    calc = Calculator(config)
+    with pytest.raises(OperationError, match="did not finish within 0.05s"):
+        calc.calculate("power", "2.5", "1.37")
+    assert calc.history == []
+
+    calc.config.deadline = 30
+    calc.decimal_context.prec = 700
+    result = calc.calculate("power", "2.5", "1.37")
+    assert str(result).startswith("3.508955106374582586")
+    assert calc.history[-1].result == result
+
+
+def test_number_theory_operations_keep_every_digit(tmp_path):
+    from app.number_theory import ModularPower
+    config = CalculatorConfig(base_dir=tmp_path, auto_save=False, max_input_value=Decimal("1e5000"))
+    calc = Calculator(config)
+    # Operands are not rounded to the 28 digit working precision
+    big = 10 ** 2000 + 7
+    assert calc.calculate("gcd", str(big), str(big * 3)) == Decimal(big)
+    assert calc.calculate("int_power", "3", "3000") == Decimal(3 ** 3000)
+    assert calc.calculate("int_root", str(big * big), "2") == Decimal(big)
+    assert calc.calculate(ModularPower(big), str(big - 1), "2") == 1
+    assert calc.calculate("modpow[97]", "3", "1000") == pow(3, 1000, 97)
+    assert calc.calculate("binomial", "1000", "300") == Decimal(math.comb(1000, 300))
+    with pytest.raises(ValidationError, match="Integer operand required"):
+        calc.calculate("lcm", "2.5", "2")
+    with pytest.raises(OperationError, match="IntegerPower is estimated to take"):
+        calc.calculate("int_power", "10", "1000000")
+
+    calc.save_history()
+    assert Calculator(config).history == calc.history
+    assert calc.history[3].operation == f"ModularPower[{Decimal(big)}]"
@@ -66,3 +66,82 @@ def test_validate_max_input_value_failure():
     config = CalculatorConfig(max_input_value=Decimal("-1"))
     with pytest.raises(ConfigurationError, match="max_input_value must be positive"):
         config.validate()
+
+
+def test_fast_mode_defaults_off():
+    config = CalculatorConfig()
+    assert config.fast_mode is False
+
+
+def test_fast_mode_from_environment(monkeypatch):
+    monkeypatch.setenv("CALCULATOR_FAST_MODE", "1")
+    assert CalculatorConfig().fast_mode is True
+
+
+def test_create_decimal_context_uses_significant_digits():
+    assert CalculatorConfig(significant_digits=42).create_decimal_context().prec == 42
+    assert CalculatorConfig(precision=3).create_decimal_context().prec == 28
+
+
+def test_significant_digits_from_environment(monkeypatch):
+    monkeypatch.setenv("CALCULATOR_SIGNIFICANT_DIGITS", "50")
+    assert CalculatorConfig().significant_digits == 50
+
+
+def test_validate_significant_digits_failure():
+    config = CalculatorConfig(significant_digits=0)
+    with pytest.raises(ConfigurationError, match="significant_digits must be positive"):
+        config.validate()
+
+
+def test_create_decimal_context_fast_mode_caps_significant_digits():
+    config = CalculatorConfig(significant_digits=100, fast_mode=True)
+    assert config.create_decimal_context().prec == 16
+    config = CalculatorConfig(significant_digits=8, fast_mode=True)
+    assert config.create_decimal_context().prec == 8
+
+
+def test_backend_defaults_to_decimal():
+    assert CalculatorConfig().backend == "decimal"
+    assert CalculatorConfig(backend="NumPy").backend == "numpy"
+
+
+def test_validate_backend_failure():
+    config = CalculatorConfig(backend="quad")
+    with pytest.raises(ConfigurationError, match="backend must be one of"):
+        config.validate()
+
+
+def test_array_spill_settings(monkeypatch, tmp_path):
+    config = CalculatorConfig(base_dir=tmp_path)
+    assert config.array_spill_bytes is None
+    assert config.array_dir == (tmp_path / "history" / "arrays").resolve()
+    monkeypatch.setenv("CALCULATOR_ARRAY_SPILL_BYTES", "4096")
+    assert CalculatorConfig().array_spill_bytes == 4096
+    with pytest.raises(ConfigurationError, match="array_spill_bytes must not be negative"):
+        CalculatorConfig(array_spill_bytes=-1).validate()
+
+
+def test_cost_budget_and_deadline(monkeypatch):
+    config = CalculatorConfig()
+    assert config.cost_budget == 10.0 and config.deadline is None
+    monkeypatch.setenv("CALCULATOR_COST_BUDGET", "2.5")
+    monkeypatch.setenv("CALCULATOR_DEADLINE", "0.5")
+    config = CalculatorConfig()
+    assert (config.cost_budget, config.deadline) == (2.5, 0.5)
+    with pytest.raises(ConfigurationError, match="cost_budget must be positive"):
+        CalculatorConfig(cost_budget=0).validate()
+    with pytest.raises(ConfigurationError, match="deadline must be positive"):
+        CalculatorConfig(deadline=-1).validate()
+
+
+def test_plugin_settings(monkeypatch, tmp_path):
+    config = CalculatorConfig(base_dir=tmp_path)
+    assert config.plugins is False
+    assert config.plugin_dir == (tmp_path / "plugins").resolve()
+    assert config.plugin_index == (tmp_path / "history" / "plugin_index.json").resolve()
+    monkeypatch.setenv("CALCULATOR_PLUGINS", "true")
+    monkeypatch.setenv("CALCULATOR_PLUGIN_DIR", str(tmp_path / "ops"))
+    config = CalculatorConfig(base_dir=tmp_path)
+    assert config.plugins is True
+    assert config.plugin_dir == (tmp_path / "ops").resolve()
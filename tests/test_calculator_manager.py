@@ -0,0 +1,150 @@
+import pytest
+from decimal import Decimal
+from unittest.mock import patch
+from app.calculator import Calculator
+from app.calculator_config import CalculatorConfig
+from app.calculator_manager import (
+    CALCULATION_BYTES, SESSION_OVERHEAD_BYTES, CalculatorManager, JSONSessionStore,
+    estimate_session_bytes
+)
+from app.exceptions import ValidationError
+
+
+@pytest.fixture
+def config(tmp_path):
+    return CalculatorConfig(base_dir=tmp_path, auto_save=False)
+
+
+def test_sessions_share_config_logging_and_operations(config):
+    with patch("logging.basicConfig") as basic_config:
+        manager = CalculatorManager(config)
+        assert manager.calculate("alice", "add", "1", "2") == Decimal("3")
+        assert manager.calculate("bob", "ADD", "5", "5") == Decimal("10")
+    # Logging is configured once for the manager, not per session
+    assert basic_config.call_count == 1
+    alice, bob = manager.get("alice"), manager.get("bob")
+    assert alice.config is bob.config is config
+    assert alice.operation_strategy is bob.operation_strategy is manager.operation("add")
+    assert [len(alice.history), len(bob.history)] == [1, 1]
+
+
+def test_lightweight_calculator_skips_history_file(config):
+    full = Calculator(config)
+    full.set_operation(CalculatorManager(config).operation("multiply"))
+    full.perform_operation("3", "4")
+    full.save_history()
+    assert len(Calculator(config).history) == 1
+    assert Calculator(config, lightweight=True).history == []
+
+
+def test_errors_propagate_and_still_refresh(config):
+    manager = CalculatorManager(config)
+    with pytest.raises(ValidationError):
+        manager.calculate("alice", "divide", "1", "0")
+    with pytest.raises(ValueError, match="Unknown operation"):
+        manager.calculate("alice", "nope", "1", "0")
+    assert manager.memory_usage == SESSION_OVERHEAD_BYTES
+
+
+def test_lru_eviction_under_budget_and_restore(config):
+    # Room for two sessions with a few calculations each
+    manager = CalculatorManager(config, memory_budget=2 * SESSION_OVERHEAD_BYTES + 8 * CALCULATION_BYTES)
+    manager.calculate("a", "add", "1", "1")
+    manager.calculate("a", "add", "2", "2")
+    manager.get("a").undo()
+    manager.calculate("b", "subtract", "5", "1")
+    manager.get("a")  # a is now more recently used than b
+    manager.calculate("c", "power", "2", "8")
+
+    assert list(manager.sessions) == ["a", "c"]
+    assert manager.evictions == 1
+    assert manager.store.path("b").exists()
+
+    restored = manager.get("b")
+    assert restored.history[0].result == Decimal("4")
+    assert "a" not in manager.sessions
+
+    # Undo/redo stacks survive the round trip through the store
+    a = manager.get("a")
+    assert [c.result for c in a.history] == [Decimal("2")]
+    assert len(a.undo_stack) == 1 and len(a.redo_stack) == 1
+    assert a.redo()
+    assert [c.result for c in a.history] == [Decimal("2"), Decimal("4")]
+    assert a.history[0] is a.undo_stack[-1].history[0]
+
+
+def test_evict_idle_close_and_discard(config):
+    manager = CalculatorManager(config)
+    with patch("app.calculator_manager.time.monotonic", side_effect=[0.0, 100.0, 120.0]):
+        manager.get("old")
+        manager.get("new")
+        assert manager.evict_idle(50) == 1
+    assert list(manager.sessions) == ["new"]
+    assert not manager.evict("missing")
+
+    manager.close()
+    assert manager.sessions == {} and manager.memory_usage == 0
+    assert manager.store.path("new").exists()
+
+    manager.get("new")
+    manager.discard("new")
+    manager.discard("old")
+    assert not manager.store.path("new").exists()
+    assert not manager.store.path("old").exists()
+    assert manager.memory_usage == 0
+
+
+def test_undo_depth_is_bounded(config):
+    manager = CalculatorManager(config, max_undo_depth=3)
+    for i in range(10):
+        manager.calculate("s", "add", i, 1)
+    calc = manager.get("s")
+    assert len(calc.history) == 10 and len(calc.undo_stack) == 3
+    assert calc.undo() and calc.undo() and calc.undo() and not calc.undo()
+    assert len(calc.history) == 7
+
+    # Sessions saved with deeper stacks are trimmed when restored
+    manager.get("s").max_undo_depth = None
+    for i in range(5):
+        manager.calculate("s", "add", i, 1)
+    manager.close()
+    assert len(manager.get("s").undo_stack) == 3
+    assert len(CalculatorManager(config, max_undo_depth=None).get("s").undo_stack) == 5
+
+
+def test_held_sessions_are_not_evicted(config):
+    manager = CalculatorManager(config, memory_budget=1)
+    with manager.hold("busy") as calc:
+        calc.calculate("add", 1, 1)
+        manager.calculate("other", "add", 1, 1)
+        manager.calculate("third", "add", 1, 1)
+        assert list(manager.sessions) == ["busy", "third"]
+        with patch("app.calculator_manager.time.monotonic", return_value=1e9):
+            assert manager.evict_idle(1) == 1
+        assert list(manager.sessions) == ["busy"]
+    # Released, it is evicted like any other
+    manager.get("other")
+    assert list(manager.sessions) == ["other"]
+    assert len(manager.get("busy").history) == 1
+
+
+def test_store_quotes_session_ids_and_handles_missing(tmp_path, config):
+    store = JSONSessionStore(tmp_path / "sessions")
+    assert store.path("../a b").name == "..%2Fa%20b.json"
+    assert not store.load("absent", Calculator(config, lightweight=True))
+    store.delete("absent")
+
+
+def test_restore_with_non_native_backend(tmp_path):
+    config = CalculatorConfig(base_dir=tmp_path, auto_save=False, backend="float")
+    manager = CalculatorManager(config)
+    manager.calculate("s", "divide", "1", "4")
+    manager.close()
+    restored = manager.get("s")
+    assert restored.history[0].result == 0.25
+    assert restored.history[0].backend is restored.backend
+
+
+def test_estimate_session_bytes(config):
+    calc = Calculator(config, lightweight=True)
+    assert estimate_session_bytes(calc) == SESSION_OVERHEAD_BYTES
@@ -0,0 +1,227 @@
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+import pytest
+from app.calculator_config import CalculatorConfig
+from app.calculator_pool import WorkerPool, _serve, shard_for
+from app.exceptions import CalculatorError, ValidationError
+
+
+@pytest.fixture
+def config(tmp_path):
+    return CalculatorConfig(base_dir=tmp_path, auto_save=False)
+
+
+@pytest.fixture
+def pool(config):
+    with WorkerPool(config, workers=3) as pool:
+        yield pool
+
+
+def sessions_on(shard, shards, count=2):
+    """Return session ids that map to a given shard."""
+    found = []
+    n = 0
+    while len(found) < count:
+        if shard_for(f"s{n}", shards) == shard:
+            found.append(f"s{n}")
+        n += 1
+    return found
+
+
+def test_shard_for_is_stable_and_moves_few_sessions():
+    ids = [f"user-{n}" for n in range(2000)]
+    four = [shard_for(i, 4) for i in ids]
+    five = [shard_for(i, 5) for i in ids]
+    assert four == [shard_for(i, 4) for i in ids]
+    assert set(four) == {0, 1, 2, 3}
+    # Growing only moves sessions onto the new shard, about 1/5 of them
+    moved = [(a, b) for a, b in zip(four, five) if a != b]
+    assert all(b == 4 for _, b in moved)
+    assert 300 < len(moved) < 500
+    assert shard_for("anything", 1) == 0
+
+
+def test_sessions_live_in_their_shard(pool):
+    alice, bob = sessions_on(0, 3, 1)[0], sessions_on(2, 3, 1)[0]
+    assert pool.calculate(alice, "add", 1, 2) == Decimal("3")
+    assert pool.calculate(bob, "divide", 1, 8) == Decimal("0.125")
+    assert pool.calculate(alice, "multiply", "1.5", 2) == Decimal("3.0")
+    stats = pool.stats()
+    assert [s["sessions"] for s in stats] == [1, 0, 1]
+    assert len({s["pid"] for s in stats}) == 3
+    assert [c["operation"] for c in pool.history(alice)] == ["Addition", "Multiplication"]
+    assert pool.undo(alice) and pool.redo(alice)
+    assert not pool.redo(alice)
+
+
+def test_errors_come_back_from_workers(pool):
+    with pytest.raises(ValidationError, match="Division by zero"):
+        pool.calculate("alice", "divide", 1, 0)
+    with pytest.raises(ValueError, match="Unknown operation"):
+        pool.calculate("alice", "nope", 1, 0)
+    assert pool.calculate("alice", "subtract", 5, 3) == Decimal("2")
+
+
+def test_calculate_many_keeps_order_and_returns_errors(pool):
+    items = [(f"s{n % 7}", "add", n, 1) for n in range(30)] + [("x", "root", -1, 2)]
+    results = pool.calculate_many(items)
+    assert results[:30] == [Decimal(n + 1) for n in range(30)]
+    assert isinstance(results[30], ValidationError)
+    assert [Decimal(c["operand1"]) for c in pool.history("s3")] == [3, 10, 17, 24]
+
+
+def test_pool_is_thread_safe(pool):
+    def work(n):
+        return pool.calculate(f"t{n % 5}", "multiply", n, 2)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        assert list(executor.map(work, range(100))) == [Decimal(n * 2) for n in range(100)]
+    assert sum(len(pool.history(f"t{n}")) for n in range(5)) == 100
+
+
+def test_restart_keeps_sessions(pool):
+    session = sessions_on(1, 3, 1)[0]
+    pool.calculate(session, "add", 2, 2)
+    pid = pool.stats()[1]["pid"]
+    pool.restart(1)
+    stats = pool.stats()[1]
+    assert stats["pid"] != pid and stats["restarts"] == 1 and stats["sessions"] == 0
+    assert [c["result"] for c in pool.history(session)] == ["4"]
+    assert pool.undo(session)
+
+
+def test_resize_moves_sessions_through_the_store(pool):
+    ids = [f"r{n}" for n in range(20)]
+    pool.calculate_many([(sid, "add", n, n) for n, sid in enumerate(ids)])
+    pool.resize(5)
+    assert pool.size == 5
+    # Remaining workers kept only the sessions they still own
+    for index, stats in enumerate(pool.stats()[:3]):
+        assert stats["sessions"] == sum(shard_for(sid, 5) == index for sid in ids)
+    for n, sid in enumerate(ids):
+        assert pool.history(sid)[0]["result"] == str(2 * n)
+    pool.resize(1)
+    assert pool.shard(ids[0]) == 0
+    assert [len(pool.history(sid)) for sid in ids] == [1] * 20
+    with pytest.raises(ValueError, match="at least 1"):
+        pool.resize(0)
+
+
+def test_routing_retries_after_concurrent_resize(pool):
+    session = sessions_on(0, 3, 1)[0]
+    worker = pool._workers[0]
+    worker.lock.acquire()
+    result = []
+    caller = threading.Thread(target=lambda: result.append(pool.calculate(session, "add", 1, 1)))
+    batcher = threading.Thread(target=lambda: result.append(pool.calculate_many([(session, "add", 2, 2)])))
+    caller.start()
+    batcher.start()
+    time.sleep(0.1)
+    # Both callers routed to worker 0 and now wait for its lock
+    pool._workers = list(pool._workers)
+    worker.lock.release()
+    caller.join()
+    batcher.join()
+    assert sorted(map(str, result)) == ["2", "[Decimal('4')]"]
+
+
+def test_crashed_worker_is_replaced(pool):
+    session = sessions_on(2, 3, 1)[0]
+    other = sessions_on(0, 3, 1)[0]
+    pool.calculate(session, "add", 1, 1)
+    pool._workers[2].process.kill()
+    pool._workers[2].process.join()
+    results = pool.calculate_many([(session, "add", 1, 2), (other, "add", 1, 3)])
+    assert isinstance(results[0], CalculatorError) and "exited" in str(results[0])
+    assert results[1] == Decimal("4")
+    # The replacement serves the shard; unsaved history was lost with the process
+    assert pool.calculate(session, "add", 2, 3) == Decimal("5")
+    assert len(pool.history(session)) == 1
+    assert pool.stats()[2]["restarts"] == 1
+
+    pool._workers[2].process.kill()
+    pool._workers[2].process.join()
+    with pytest.raises(CalculatorError, match="exited"):
+        pool.calculate(session, "add", 1, 1)
+
+
+def test_crash_while_sending_is_reported(pool):
+    worker = pool._workers[1]
+    worker.process.kill()
+    worker.process.join()
+    worker.connection.close()
+    results = pool.calculate_many([(sessions_on(1, 3, 1)[0], "add", 1, 1)])
+    assert isinstance(results[0], CalculatorError)
+    # Stopping a dead worker does not raise
+    worker.process.kill()
+    worker.process.join()
+    with worker.lock:
+        worker.stop()
+        worker.start()
+
+
+def test_crash_while_waiting_for_reply(pool):
+    class DeadConnection:
+        def send(self, message):
+            pass
+
+        def recv(self):
+            raise EOFError
+
+        def close(self):
+            pass
+
+    worker = pool._workers[0]
+    worker.process.kill()
+    worker.process.join()
+    worker.connection = DeadConnection()
+    results = pool.calculate_many([(sessions_on(0, 3, 1)[0], "add", 1, 1)])
+    assert isinstance(results[0], CalculatorError)
+    assert pool.stats()[0]["restarts"] == 1
+
+
+def test_invalid_worker_count(config):
+    with pytest.raises(ValueError, match="at least 1"):
+        WorkerPool(config, workers=-1)
+
+
+def test_serve_in_process(config):
+    # Run the worker loop on a thread so the commands are covered in-process
+    parent, child = multiprocessing.Pipe()
+    thread = threading.Thread(target=_serve, args=(0, config, 1 << 20, child))
+    thread.start()
+    parent.send(("calculate", "a", "power", 2, 8))
+    assert parent.recv() == ("ok", Decimal("256"))
+    parent.send(("batch", [("a", "add", 1, 1), ("a", "divide", 1, 0)]))
+    status, [ok, error] = parent.recv()
+    assert ok == Decimal("2") and isinstance(error, ValidationError)
+    parent.send(("history", "a"))
+    assert len(parent.recv()[1]) == 2
+    parent.send(("undo", "a"))
+    assert parent.recv() == ("ok", True)
+    parent.send(("rebalance", 2))
+    assert parent.recv() == ("ok", 0)
+    parent.send(("rebalance", 7))  # "a" moves to shard 6
+    assert parent.recv() == ("ok", 1)
+    parent.send(("stats",))
+    assert parent.recv()[1]["memory_usage"] >= 0
+    parent.send(("bogus",))
+    status, error = parent.recv()
+    assert status == "error" and "Unknown command" in str(error)
+    parent.send(("close",))
+    assert parent.recv() == ("ok", None)
+    thread.join()
+    assert (config.history_dir / "sessions" / "a.json").exists()
+
+    # A worker whose pool disappears still saves its sessions
+    parent, child = multiprocessing.Pipe()
+    thread = threading.Thread(target=_serve, args=(0, config, 1 << 20, child))
+    thread.start()
+    parent.send(("calculate", "b", "add", 1, 1))
+    parent.recv()
+    parent.close()
+    thread.join()
+    assert (config.history_dir / "sessions" / "b.json").exists()
@@ -192,3 +192,26 @@ def test_repl_fatal_error_on_init(capsys):
 
 
 
+
+
+def test_repl_result_not_quantized_to_three_places(capsys):
+    with patch("builtins.input", side_effect=["divide", "1", "16", "exit"]):
+        calculator_repl()
+    output = capsys.readouterr().out
+    assert "Result: 0.0625" in output
+
+
+def test_repl_shows_exact_integer_results_in_full(capsys):
+    with patch("builtins.input", side_effect=["power", "2", "100", "exit"]):
+        calculator_repl()
+    output = capsys.readouterr().out
+    assert "Result: 1267650600228229401496703205376" in output
+
+
+def test_repl_rounds_results_to_display_precision(capsys, monkeypatch):
+    monkeypatch.setenv("CALCULATOR_PRECISION", "3")
+    with patch("builtins.input", side_effect=["divide", "1", "3", "subtract", "12345678901.5", "0.25", "exit"]):
+        calculator_repl()
+    output = capsys.readouterr().out
+    assert "Result: 0.333" in output and "Result: 0.3333" not in output
+    assert "Result: 12345678901.25" in output
@@ -0,0 +1,310 @@
+import asyncio
+import threading
+import time
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from app import calculator_rpc
+from app.calculator import Calculator
+from app.calculator_config import CalculatorConfig
+from app.calculator_manager import CalculatorManager
+from app.calculator_rpc import (
+    FRAME_HEADER, MAX_FRAME_SIZE, STATUS_OPERATION_ERROR, STATUS_PROTOCOL_ERROR, RPCClient,
+    RPCConnection, RPCServer, _raise_for_status, decode_operand, encode_operand, encode_request, main
+)
+from app.exceptions import CalculatorError, OperationError, ValidationError
+from app.operations import OperationFactory
+
+
+def run_server(server, path):
+    """Run the server on an event loop in a daemon thread; return a stop function."""
+    loop = asyncio.new_event_loop()
+    ready = threading.Event()
+
+    def run():
+        asyncio.set_event_loop(loop)
+        loop.run_until_complete(server.start(path))
+        ready.set()
+        loop.run_forever()
+        loop.run_until_complete(server.close())
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    ready.wait()
+
+    def stop():
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+    return stop
+
+
+@pytest.fixture
+def server(tmp_path):
+    rpc = RPCServer(CalculatorConfig(base_dir=tmp_path, auto_save=False))
+    path = str(tmp_path / "calc.sock")
+    stop = run_server(rpc, path)
+    yield rpc, path
+    stop()
+
+
+@pytest.mark.parametrize("value, expected", [
+    (42, 42),
+    (-(1 << 63), -(1 << 63)),
+    (1 << 70, str(1 << 70)),
+    (2.5, 2.5),
+    (Decimal("1.10"), "1.10"),
+    ("7", "7"),
+])
+def test_operand_round_trip(value, expected):
+    encoded = encode_operand(value)
+    assert decode_operand(b"x" + encoded, 1) == (expected, len(encoded) + 1)
+
+
+def test_decode_operand_rejects_bad_input():
+    with pytest.raises(ValueError, match="Unknown operand tag"):
+        decode_operand(bytes([9]), 0)
+    with pytest.raises(ValueError, match="Truncated"):
+        decode_operand(encode_operand("12345")[:-2], 0)
+
+
+def test_call_and_session_isolation(server):
+    rpc, path = server
+    with RPCClient(path, session="alice") as alice, RPCClient(path, session="bob") as bob:
+        assert alice.calculate("add", 1, 2) == Decimal("3")
+        assert alice.calculate("ADD", "0.1", 0.2) == Decimal("0.3")
+        assert alice.calculate("power", Decimal("2"), 10) == Decimal("1024")
+        assert bob.calculate("divide", 1, 8) == Decimal("0.125")
+        assert bob.calculate("factorial", 25, 1) == Decimal(15511210043330985984000000)
+    assert len(rpc.manager.sessions["alice"].history) == 3
+    assert len(rpc.manager.sessions["bob"].history) == 2
+    # One operation instance per op code, shared by every session
+    assert rpc.manager.sessions["bob"].operation_strategy is OperationFactory.create_operation(4)
+
+
+def test_errors_map_to_calculator_exceptions(server):
+    _, path = server
+    with RPCClient(path) as client:
+        with pytest.raises(ValidationError, match="Division by zero"):
+            client.calculate("divide", 1, 0)
+        with pytest.raises(ValidationError, match="Invalid number format"):
+            client.calculate("add", "abc", 1)
+        with pytest.raises(ValueError, match="Unknown operation: nope"):
+            client.calculate("nope", 1, 1)
+        # The connection is still usable after calculator errors
+        assert client.calculate("subtract", 5, 3) == Decimal("2")
+    with pytest.raises(OperationError, match="boom"):
+        _raise_for_status(STATUS_OPERATION_ERROR, "boom")
+
+
+def test_protocol_errors(server):
+    _, path = server
+    conn = RPCConnection(path)
+    with pytest.raises(CalculatorError, match="Unknown op code: 99"):
+        conn._request(99, 1, 2)
+    conn._send(FRAME_HEADER.pack(7) + b"\x00\x00\x00\x01\x01\x09\x00")
+    _, status, message = conn._receive()
+    with pytest.raises(CalculatorError, match="Unknown operand tag"):
+        _raise_for_status(status, message)
+    conn.close()
+
+
+def test_oversized_frame_closes_connection(server):
+    _, path = server
+    conn = RPCConnection(path)
+    conn._send(FRAME_HEADER.pack(MAX_FRAME_SIZE + 1))
+    _, status, message = conn._receive()
+    assert message == "Frame too large"
+    with pytest.raises(ConnectionError):
+        conn._receive()
+    conn.close()
+
+
+def test_pipeline_in_windows(server, monkeypatch):
+    monkeypatch.setattr(calculator_rpc, "MAX_IN_FLIGHT", 3)
+    rpc, path = server
+    items = [("multiply", i, 2) for i in range(10)] + [("root", -1, 2), ("modulus", 7, 4)]
+    with RPCClient(path, session="batch") as client:
+        results = client.calculate_many(items)
+    assert results[:10] == [Decimal(i * 2) for i in range(10)]
+    assert isinstance(results[10], ValidationError)
+    assert results[11] == Decimal("3")
+    assert len(rpc.manager.sessions["batch"].history) == 11
+
+
+def test_pool_bounds_connections_across_threads(server):
+    _, path = server
+    client = RPCClient(path, pool_size=2)
+    opened = []
+    original = RPCConnection.__init__
+
+    def tracking_init(self, *args, **kwargs):
+        original(self, *args, **kwargs)
+        opened.append(self)
+
+    RPCConnection.__init__ = tracking_init
+    try:
+        with ThreadPoolExecutor(max_workers=6) as pool:
+            results = list(pool.map(lambda i: client.calculate("add", i, 1), range(60)))
+    finally:
+        RPCConnection.__init__ = original
+    assert results == [Decimal(i + 1) for i in range(60)]
+    assert 1 <= len(opened) <= 2
+    client.close()
+
+
+def test_pool_discards_broken_connections(server):
+    _, path = server
+    client = RPCClient(path, pool_size=1)
+    with pytest.raises(ConnectionError):
+        with client.connection() as conn:
+            conn._send(FRAME_HEADER.pack(MAX_FRAME_SIZE + 1))
+            conn._receive()
+            conn._receive()
+    assert client._idle.empty()
+    assert client.calculate("add", 2, 2) == Decimal("4")
+    client.close()
+
+
+def test_float_backend_results(tmp_path):
+    rpc = RPCServer(CalculatorConfig(base_dir=tmp_path, auto_save=False, backend="float"))
+    path = str(tmp_path / "float.sock")
+    stop = run_server(rpc, path)
+    try:
+        with RPCClient(path) as client:
+            assert client.calculate("divide", 1, 4) == 0.25
+    finally:
+        stop()
+
+
+def test_start_replaces_stale_socket_and_close_removes_it(tmp_path):
+    path = tmp_path / "stale.sock"
+    path.write_text("stale")
+    rpc = RPCServer(CalculatorConfig(base_dir=tmp_path, auto_save=False))
+
+    async def run():
+        await rpc.start(str(path))
+        assert path.is_socket()
+        await rpc.close()
+
+    asyncio.run(run())
+    assert not path.exists()
+
+
+def test_serve_forever_prints_path(tmp_path, capsys):
+    rpc = RPCServer(CalculatorConfig(base_dir=tmp_path, auto_save=False))
+
+    async def run():
+        task = asyncio.create_task(rpc.serve_forever(str(tmp_path / "s.sock")))
+        await asyncio.sleep(0.1)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(run())
+    assert "Calculator RPC listening on" in capsys.readouterr().out
+
+
+def test_main_runs_server(monkeypatch):
+    calls = {}
+
+    async def fake_serve_forever(self, path):
+        calls["path"] = path
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(RPCServer, "serve_forever", fake_serve_forever)
+    assert main(["--socket", "/tmp/x.sock"]) == 0
+    assert calls["path"] == "/tmp/x.sock"
+
+
+def test_encode_request_layout():
+    frame = encode_request(7, 1, 1, 2)
+    (length,) = FRAME_HEADER.unpack_from(frame)
+    assert length == len(frame) - FRAME_HEADER.size
+
+
+def test_split_frames_and_operation_errors(server, monkeypatch):
+    rpc, path = server
+    conn = RPCConnection(path)
+    frame = encode_request(1, 1, 20, 22)
+    conn._send(frame[:5])
+    time.sleep(0.05)  # let the server see the partial frame first
+    conn._send(frame[5:])
+    assert _raise_for_status(*conn._receive()[1:]) == Decimal("42")
+
+    def failing_perform(self, op_code, a, b):
+        raise OperationError("Operation failed: overflow")
+
+    monkeypatch.setattr(calculator_rpc.RPCSession, "perform", failing_perform)
+    with pytest.raises(OperationError, match="overflow"):
+        conn.call("multiply", 10, 10)
+    conn.close()
+
+
+def test_heavy_operations_do_not_stall_other_connections(server, monkeypatch):
+    rpc, path = server
+    started, release = threading.Event(), threading.Event()
+    calculate = Calculator.calculate
+
+    def slow_calculate(self, operation, a, b):
+        if threading.current_thread().name.startswith("calculator-rpc"):
+            started.set()
+            release.wait(5)
+        return calculate(self, operation, a, b)
+
+    monkeypatch.setattr(Calculator, "calculate", slow_calculate)
+    slow = RPCConnection(path, session="slow")
+    slow._send(encode_request(1, OperationFactory.op_code("power"), 2, 10) + encode_request(2, 1, 1, 1))
+    assert started.wait(5)
+    # The loop still answers other connections while the power runs
+    with RPCClient(path, session="fast") as fast:
+        assert fast.calculate("add", 2, 3) == Decimal("5")
+    release.set()
+    # The slow connection's answers keep their request order
+    assert [slow._receive()[::2] for _ in range(2)] == [(1, Decimal(1024)), (2, Decimal(2))]
+    slow.close()
+
+
+def test_oversize_and_failed_heavy_results_are_answered(server, monkeypatch):
+    _, path = server
+    results = iter([Decimal("9" * 70000), RuntimeError("worker died")])
+
+    def odd_calculate(self, operation, a, b):
+        result = next(results)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    monkeypatch.setattr(Calculator, "calculate", odd_calculate)
+    conn = RPCConnection(path)
+    power = OperationFactory.op_code("power")
+    conn._send(encode_request(1, power, 2, 10) + encode_request(2, power, 2, 10) + encode_request(3, 1, 1, 1))
+    request_id, status, message = conn._receive()
+    assert (request_id, status) == (1, STATUS_OPERATION_ERROR)
+    assert "too long to encode: 70000 characters" in message
+    assert conn._receive()[:2] == (2, STATUS_PROTOCOL_ERROR)
+    # The connection keeps answering after both
+    assert conn._receive()[::2] == (3, Decimal(2))
+    with pytest.raises(OperationError, match="too long"):
+        encode_operand("1" * 70000)
+    conn.close()
+
+
+def test_sessions_are_hosted_by_the_manager(tmp_path):
+    config = CalculatorConfig(base_dir=tmp_path, auto_save=False)
+    manager = CalculatorManager(config, memory_budget=1, max_undo_depth=2)
+    rpc = RPCServer(config, manager=manager)
+    path = str(tmp_path / "managed.sock")
+    stop = run_server(rpc, path)
+    try:
+        with RPCClient(path, session="old") as old, RPCClient(path, session="new") as new:
+            for i in range(5):
+                old.calculate("add", i, 1)
+            assert new.calculate("add", 1, 1) == Decimal(2)
+            # Over the memory budget, the least recently used session was saved and dropped
+            assert "old" not in manager.sessions and manager.evictions >= 1
+            assert len(manager.sessions["new"].undo_stack) == 1
+            assert old.calculate("root", 4, 2) == Decimal(2)
+            assert len(manager.sessions["old"].history) == 6
+            assert len(manager.sessions["old"].undo_stack) == 2
+    finally:
+        stop()
@@ -0,0 +1,268 @@
+import asyncio
+import json
+import threading
+import pytest
+from app.calculator_config import CalculatorConfig
+from app.calculator_manager import CalculatorManager
+from app import calculator_service
+from app.calculator_service import CalculatorService, Request, encode_response, main
+
+
+@pytest.fixture
+def service(tmp_path):
+    return CalculatorService(CalculatorConfig(base_dir=tmp_path, auto_save=False), workers=2)
+
+
+def http(method, path, payload=None, session=None, headers="", version="HTTP/1.1"):
+    body = json.dumps(payload).encode() if payload is not None else b""
+    head = f"{method} {path} {version}\r\nHost: localhost\r\n{headers}"
+    if session:
+        head += f"X-Session-Id: {session}\r\n"
+    if body:
+        head += f"Content-Length: {len(body)}\r\n"
+    return (head + "\r\n").encode() + body
+
+
+async def read_response(reader):
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.decode().split("\r\n")
+    headers = dict(line.lower().split(": ", 1) for line in lines[1:] if line)
+    body = await reader.readexactly(int(headers["content-length"]))
+    return int(lines[0].split()[1]), headers, json.loads(body)
+
+
+def exchange(service, raw, responses=1):
+    """Send raw bytes on one connection and read the given number of responses."""
+    async def run():
+        await service.start("127.0.0.1", 0)
+        try:
+            reader, writer = await asyncio.open_connection("127.0.0.1", service.port)
+            writer.write(raw)
+            await writer.drain()
+            results = [await read_response(reader) for _ in range(responses)]
+            writer.close()
+            return results
+        finally:
+            await service.close()
+    return asyncio.run(run())
+
+
+def test_calculate_and_history(service):
+    raw = (
+        http("POST", "/calculate", {"operation": "add", "a": 2, "b": 3.5})
+        + http("POST", "/calculate", {"operation": "power", "a": "2", "b": "10"})
+        + http("GET", "/history?limit=1")
+    )
+    (s1, h1, add), (_, _, power), (_, _, history) = exchange(service, raw, 3)
+    assert s1 == 200 and h1["connection"] == "keep-alive"
+    assert add == {"result": "5.5"}
+    assert power == {"result": "1024"}
+    assert [entry["operation"] for entry in history["history"]] == ["Power"]
+
+
+def test_pipelined_sessions_have_separate_undo_redo(service):
+    raw = (
+        http("POST", "/calculate", {"operation": "multiply", "a": "4", "b": "2"}, session="alice")
+        + http("POST", "/calculate", {"operation": "subtract", "a": "9", "b": "1"}, session="bob")
+        + http("POST", "/undo", session="alice")
+        + http("POST", "/undo", session="alice")
+        + http("POST", "/redo", session="alice")
+        + http("GET", "/history", session="bob")
+        + http("GET", "/health")
+    )
+    responses = [payload for _, _, payload in exchange(service, raw, 7)]
+    assert responses[0] == {"result": "8"}
+    assert responses[2] == {"success": True, "history_size": 0}
+    assert responses[3] == {"success": False, "history_size": 0}
+    assert responses[4] == {"success": True, "history_size": 1}
+    assert responses[5]["history"][0]["result"] == "8"
+    assert responses[6] == {"status": "ok", "sessions": 2}
+
+
+def test_batch_reports_errors_per_item(service):
+    raw = http("POST", "/batch", {"operations": [
+        {"operation": "divide", "a": "1", "b": "4"},
+        {"operation": "divide", "a": "1", "b": "0"},
+        {"operation": "nope", "a": "1", "b": "2"},
+        {"operation": "add"},
+        {"operation": 3, "a": "6", "b": "7"},
+        {"operation": 99, "a": "1", "b": "2"},
+    ]})
+    [(status, _, payload)] = exchange(service, raw)
+    assert status == 200
+    results = payload["results"]
+    assert results[0] == {"result": "0.25"}
+    assert "Division by zero" in results[1]["error"]
+    assert "Unknown operation" in results[2]["error"]
+    assert "Expected an object" in results[3]["error"]
+    assert results[4] == {"result": "42"}
+    assert results[5] == {"error": "Unknown op code: 99"}
+
+
+@pytest.mark.parametrize("raw, status, message", [
+    (http("GET", "/nowhere"), 404, "Unknown endpoint"),
+    (http("GET", "/calculate"), 405, "not allowed"),
+    (http("POST", "/calculate", {"operation": "divide", "a": 1, "b": 0}), 400, "Division by zero"),
+    (http("POST", "/calculate", [1, 2]), 400, "must be a JSON object"),
+    (b"POST /calculate HTTP/1.1\r\nContent-Length: 3\r\n\r\n{x}", 400, "not valid JSON"),
+    (http("POST", "/calculate"), 400, "Expected an object"),
+    (http("POST", "/batch", {"operations": 1}), 400, "to be a list"),
+    (http("GET", "/history?limit=x"), 400, "limit must be an integer"),
+])
+def test_request_errors(service, raw, status, message):
+    [(code, _, payload)] = exchange(service, raw)
+    assert code == status
+    assert message in payload["error"]
+
+
+@pytest.mark.parametrize("raw, status", [
+    (b"GARBAGE\r\n\r\n", 400),
+    (b"GET / HTTP/1.1\r\nNoColon\r\n\r\n", 400),
+    (b"POST /batch HTTP/1.1\r\nTransfer-Encoding: chunked\r\n\r\n", 400),
+    (b"POST /batch HTTP/1.1\r\nContent-Length: abc\r\n\r\n", 400),
+    (b"POST /batch HTTP/1.1\r\nContent-Length: -1\r\n\r\n", 400),
+    (b"POST /batch HTTP/1.1\r\nContent-Length: 99999999\r\n\r\n", 413),
+])
+def test_protocol_errors_close_connection(service, raw, status):
+    [(code, headers, _)] = exchange(service, raw)
+    assert code == status
+    assert headers["connection"] == "close"
+
+
+def test_truncated_requests_are_rejected(tmp_path):
+    async def run(raw):
+        service = CalculatorService(CalculatorConfig(base_dir=tmp_path, auto_save=False))
+        await service.start("127.0.0.1", 0)
+        reader, writer = await asyncio.open_connection("127.0.0.1", service.port)
+        writer.write(raw)
+        writer.write_eof()
+        response = await read_response(reader)
+        writer.close()
+        await service.close()
+        return response
+
+    assert asyncio.run(run(b"GET /health HTTP/1.1\r\n"))[0] == 400
+    assert asyncio.run(run(b"POST /batch HTTP/1.1\r\nContent-Length: 10\r\n\r\n{}"))[0] == 400
+
+
+def test_connection_close_and_http10(service):
+    [(_, headers, _)] = exchange(service, http("GET", "/health", headers="Connection: close\r\n"))
+    assert headers["connection"] == "close"
+    [(_, headers, _)] = exchange(CalculatorService(service.config), http("GET", "/health", version="HTTP/1.0"))
+    assert headers["connection"] == "close"
+    request = Request("GET", "/", {}, "HTTP/1.0", {"connection": "keep-alive"})
+    assert request.keep_alive
+
+
+def test_unexpected_errors_return_500(service):
+    async def boom(request):
+        raise RuntimeError("boom")
+    service.routes["/health"]["GET"] = boom
+    [(status, _, payload)] = exchange(service, http("GET", "/health"))
+    assert status == 500
+    assert payload == {"error": "Internal server error"}
+
+
+def test_header_too_large(service):
+    async def run():
+        await service.start("127.0.0.1", 0)
+        reader, writer = await asyncio.open_connection("127.0.0.1", service.port)
+        writer.write(b"GET /health HTTP/1.1\r\nX-Big: " + b"a" * 70000 + b"\r\n\r\n")
+        response = await read_response(reader)
+        writer.close()
+        await service.close()
+        return response
+    assert asyncio.run(run())[0] == 400
+
+
+def test_client_disconnect_mid_pipeline(service):
+    async def run():
+        await service.start("127.0.0.1", 0)
+        _, writer = await asyncio.open_connection("127.0.0.1", service.port)
+        writer.write(http("POST", "/batch", {"operations": [{"operation": "root", "a": "2", "b": "3"}] * 50}) * 3)
+        await writer.drain()
+        writer.transport.abort()
+        await asyncio.sleep(0.2)
+        await service.close()
+        return service.manager.get("default").history
+    assert len(asyncio.run(run())) > 0
+
+
+def test_connection_reset_while_reading(service):
+    class ResetReader:
+        async def readuntil(self, separator):
+            raise ConnectionResetError
+
+    class Writer:
+        closed = False
+
+        def close(self):
+            self.closed = True
+
+    writer = Writer()
+    asyncio.run(service._handle_connection(ResetReader(), writer))
+    assert writer.closed
+
+
+def test_encode_response():
+    data = encode_response(200, {"ok": True}, keep_alive=False)
+    assert data.startswith(b"HTTP/1.1 200 OK\r\n")
+    assert b"Connection: close" in data
+    assert data.endswith(b'{"ok": true}')
+
+
+def test_main_runs_service(monkeypatch):
+    calls = {}
+
+    async def fake_serve_forever(self, host, port):
+        calls["args"] = (host, port, self.executor._max_workers)
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(calculator_service.CalculatorService, "serve_forever", fake_serve_forever)
+    assert main(["--port", "9999", "--workers", "3"]) == 0
+    assert calls["args"] == ("127.0.0.1", 9999, 3)
+
+
+def test_serve_forever_prints_address(service, capsys):
+    async def run():
+        task = asyncio.create_task(service.serve_forever("127.0.0.1", 0))
+        await asyncio.sleep(0.1)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+    asyncio.run(run())
+    assert "Calculator service listening on http://127.0.0.1:" in capsys.readouterr().out
+
+
+def test_heavy_operations_by_name_or_code_use_the_worker_pool(service, monkeypatch):
+    threads = []
+    perform = calculator_service._perform
+
+    def tracking_perform(calculator, item):
+        threads.append((item["operation"], threading.current_thread().name.startswith("calculator-worker")))
+        return perform(calculator, item)
+
+    monkeypatch.setattr(calculator_service, "_perform", tracking_perform)
+    raw = b"".join(
+        http("POST", "/calculate", {"operation": operation, "a": 2, "b": 3})
+        for operation in ("add", 5, "ROOT", 1, "nope")
+    )
+    results = [payload for _, _, payload in exchange(service, raw, 5)]
+    assert [results[0], results[1], results[3]] == [{"result": "5"}, {"result": "8"}, {"result": "5"}]
+    assert results[2]["result"].startswith("1.2599") and results[4] == {"error": "Unknown operation: nope"}
+    assert threads == [("add", False), (5, True), ("ROOT", True), (1, False), ("nope", False)]
+
+
+def test_sessions_are_hosted_by_the_manager(tmp_path):
+    config = CalculatorConfig(base_dir=tmp_path, auto_save=False)
+    manager = CalculatorManager(config, memory_budget=1, max_undo_depth=2)
+    service = CalculatorService(config, workers=1, manager=manager)
+    raw = b"".join(http("POST", "/calculate", {"operation": "add", "a": i, "b": 1}, session="a") for i in range(4))
+    raw += http("POST", "/calculate", {"operation": "add", "a": 1, "b": 1}, session="b")
+    raw += http("GET", "/health")
+    *_, (_, _, health) = exchange(service, raw, 6)
+    # Over the memory budget, only the most recently used session stays resident
+    assert health == {"status": "ok", "sessions": 1}
+    assert not service.sessions
+    restored = manager.get("a")
+    assert len(restored.history) == 4 and len(restored.undo_stack) == 2
@@ -0,0 +1,57 @@
+import multiprocessing
+import os
+import threading
+import time
+import pytest
+from app.cancellable import CancellableWorker, serve, shared_worker
+from app.exceptions import OperationError, ValidationError
+
+
+def fail(message):
+    raise ValidationError(message)
+
+
+def test_calls_run_in_reused_worker_processes():
+    worker = CancellableWorker()
+    try:
+        first = worker.call(os.getpid, (), 10)
+        assert first != os.getpid()
+        assert worker.call(os.getpid, (), 10) == first
+        with pytest.raises(ValidationError, match="bad input"):
+            worker.call(fail, ("bad input",), 10)
+        assert worker.call(pow, (2, 10), 10) == 1024
+    finally:
+        worker.close()
+        worker.close()
+
+
+def test_overrunning_call_is_cancelled():
+    worker = CancellableWorker()
+    start = time.perf_counter()
+    with pytest.raises(OperationError, match="did not finish within 0.2s"):
+        worker.call(time.sleep, (30,), 0.2)
+    assert time.perf_counter() - start < 5
+    assert worker._idle == []
+    with pytest.raises(OperationError, match="exited unexpectedly"):
+        worker.call(os._exit, (1,), 10)
+    assert worker.call(pow, (3, 2), 10) == 9
+    worker.close()
+
+
+def test_serve_in_process():
+    # Worker side, on a thread of this process so it is covered
+    parent, child = multiprocessing.Pipe()
+    thread = threading.Thread(target=serve, args=(child,))
+    thread.start()
+    parent.send((pow, (2, 5)))
+    assert parent.recv() == (True, 32)
+    parent.send((fail, ("nope",)))
+    ok, error = parent.recv()
+    assert not ok and isinstance(error, ValidationError)
+    parent.close()
+    thread.join(10)
+    assert not thread.is_alive()
+
+
+def test_shared_worker_is_created_once():
+    assert shared_worker() is shared_worker()
@@ -0,0 +1,69 @@
+import math
+import threading
+from decimal import Decimal
+from app.combinatorics import (
+    FactorialTable, factorial_table, range_product, set_factorial_table
+)
+
+
+def test_range_product_splits_exactly():
+    assert range_product(1, 1) == 1
+    assert range_product(1, 11) == math.factorial(10)
+    assert range_product(1, 2001) == math.factorial(2000)
+    # Double factorial 99!! steps down by two
+    assert range_product(99, 0, -2) == math.prod(range(99, 0, -2))
+
+
+def test_table_grows_on_demand_within_its_limit():
+    table = FactorialTable()
+    assert table.size == 1
+    assert table.factorial(20) == math.factorial(20)
+    assert table.size == 21
+    assert table.factorial(5) == 120 and table.size == 21
+
+    small = FactorialTable(max_bytes=2000, memo_bytes=0)
+    assert small.factorial(500) == math.factorial(500)
+    assert small.size < 500 and small.nbytes <= 2000
+    size = small.size
+    # Once full, the table stops growing; larger results are not remembered
+    assert small.factorial(600) == math.factorial(600)
+    assert small.size == size and small.nbytes <= 2000
+
+
+def test_memo_is_bounded_and_least_recently_used():
+    table = FactorialTable(memo_bytes=100)
+    assert table.binomial(60, 30) == math.comb(60, 30)
+    # C(n, k) and C(n, n - k) share an entry
+    assert table.binomial(60, 30) == table.binomial(60, 30)
+    assert table.binomial(10, 7) == table.binomial(10, 3) == 120
+    assert table.binomial(3, 5) == 0
+    assert table.permutations(10, 3) == 720 and table.permutations(3, 5) == 0
+    assert table.factorial(9, 2) == 945
+    assert table.nbytes - table._bytes <= 100
+    assert ('factorial', 9, 2) in table._memo and ('binomial', 60, 30) not in table._memo
+
+
+def test_shared_table_can_be_replaced():
+    table = FactorialTable(max_bytes=10_000)
+    previous = set_factorial_table(table)
+    try:
+        assert factorial_table() is table
+        threads = [threading.Thread(target=table.binomial, args=(200, k)) for k in range(20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len(table._memo) == 20
+    finally:
+        set_factorial_table(previous)
+    set_factorial_table(None)
+    assert isinstance(factorial_table(), FactorialTable)
+    set_factorial_table(previous)
+
+
+def test_decimal_results_are_remembered():
+    table = FactorialTable()
+    value = table.as_decimal("binomial", 3000, 1000)
+    assert value == Decimal(math.comb(3000, 1000))
+    assert table.as_decimal("binomial", 3000, 1000) is value
+    assert table.as_decimal("factorial", 25, 1) == Decimal(math.factorial(25))
@@ -0,0 +1,65 @@
+from decimal import Decimal
+from fractions import Fraction
+import numpy as np
+import pytest
+from app.cost_model import (
+    CALL_SECONDS, ELEMENT_SECONDS, check_budget, estimate_seconds, multiply_seconds
+)
+from app.exceptions import OperationError
+
+
+def test_fractional_powers_grow_fastest_with_precision():
+    low = estimate_seconds("Power", Decimal("2.5"), Decimal("1.37"), 10)
+    high = estimate_seconds("Power", Decimal("2.5"), Decimal("1.37"), 5000)
+    assert low < 1e-4 and 1 < high < 100
+    assert estimate_seconds("Root", Decimal(2), Decimal("0.5"), 5000) == high
+    # Integral roots and powers stay far cheaper at the same precision
+    assert estimate_seconds("Root", Decimal(2), Decimal(3), 5000) < high / 10
+    assert estimate_seconds("Power", Decimal(7), Decimal(12345), 5000) < high / 10
+    assert estimate_seconds("Power", 2, 1 << 100, 10) > estimate_seconds("Power", 2, 1 << 10, 10)
+
+
+def test_arithmetic_costs_by_operand_digits():
+    cheap = estimate_seconds("Addition", Decimal(1), Decimal(2), 10)
+    assert cheap == CALL_SECONDS + multiply_seconds(20)
+    assert estimate_seconds("Addition", Decimal("1" * 500), 2, 10) == CALL_SECONDS + multiply_seconds(500)
+    assert estimate_seconds("Division", Fraction(1, 10 ** 99), 3, 10) > estimate_seconds("Multiplication", 1, 3, 10)
+    assert estimate_seconds("Power", 2.0, np.ones(1000), 10) == CALL_SECONDS + 1000 * ELEMENT_SECONDS
+
+
+def test_check_budget():
+    assert check_budget("Addition", Decimal(1), Decimal(2), 10, 1.0) < 1e-4
+    with pytest.raises(OperationError, match=r"Power is estimated to take .*s, over the budget of 1s"):
+        check_budget("Power", Decimal("2.5"), Decimal("1.37"), 5000, 1.0)
+
+
+def test_integer_operations_cost_by_integer_size():
+    small = estimate_seconds("GreatestCommonDivisor", Decimal(10 ** 1000), Decimal(3), 10)
+    large = estimate_seconds("GreatestCommonDivisor", Decimal(10 ** 100000), Decimal(3), 10)
+    assert small < 1e-3 and 0.1 < large < 10
+    assert estimate_seconds("LeastCommonMultiple", 10 ** 1000, 3, 10) == small
+    # Precision does not matter, and normalized operands count every digit
+    assert estimate_seconds("IntegerRoot", Decimal("1E+100000"), Decimal(2), 5000) == large
+    # Powers cost by the size of their result
+    assert estimate_seconds("IntegerPower", Decimal(10), Decimal(10 ** 6), 10) > 100
+    assert estimate_seconds("IntegerPower", Decimal(1), Decimal(10 ** 18), 10) < 1e-4
+    assert estimate_seconds("IntegerPower", Decimal(2), Decimal(10 ** 19), 10) == float("inf")
+    # Modular powers by the size of the modulus and of the exponent
+    modulus = "ModularPower[" + "9" * 10000 + "]"
+    assert estimate_seconds(modulus, Decimal(3), Decimal(65537), 10) > 100 * estimate_seconds(
+        "ModularPower[97]", Decimal(3), Decimal(65537), 10
+    )
+
+
+def test_combinatorial_operations_cost_by_result_digits():
+    assert estimate_seconds("Factorial", Decimal(10), Decimal(1), 10) < 1e-4
+    full = estimate_seconds("Factorial", Decimal(100000), Decimal(1), 10)
+    assert 1 < full < 100
+    # A double factorial has about half the digits
+    assert estimate_seconds("Factorial", Decimal(100000), Decimal(2), 10) < full / 2
+    assert estimate_seconds("Factorial", Decimal("1E+400"), Decimal(1), 10) == float("inf")
+    # Choosing a few items of very many is cheap, and choosing too many is zero
+    assert estimate_seconds("Binomial", Decimal(10 ** 18), Decimal(1), 10) < 1e-4
+    assert estimate_seconds("Binomial", Decimal(3), Decimal(5), 10) < 1e-4
+    assert estimate_seconds("Permutations", Decimal(10 ** 6), Decimal(10), 10) < 1e-4
+    assert estimate_seconds("Binomial", Decimal(10 ** 6), Decimal(5 * 10 ** 5), 10) > 1
@@ -0,0 +1,136 @@
+import csv
+import json
+import pytest
+from app import csv_jobs
+from app.calculator_config import CalculatorConfig
+from app.csv_jobs import (
+    MALFORMED_ROW, UNKNOWN_OPERATION, JobReport, evaluate_rows, main, run_csv_job
+)
+from app.shared_batch import _init_worker
+
+ROWS = [
+    ["add", "1", "2"],
+    ["Divide", "1", "3"],
+    ["divide", "1", "0"],
+    ["power", "2", "10"],
+    ["cube", "1", "2"],
+    ["root", "16", "4"],
+    ["add", "x", "1"],
+    ["multiply", "2.5", "4"],
+]
+
+
+def make_config(tmp_path, backend="decimal"):
+    return CalculatorConfig(base_dir=tmp_path, auto_save=False, backend=backend, significant_digits=10)
+
+
+def write_input(path, rows=ROWS, header=True):
+    with open(path, "w", newline="") as file:
+        writer = csv.writer(file)
+        if header:
+            writer.writerow(["operation", "operand1", "operand2"])
+        writer.writerows(rows)
+    return path
+
+
+def read_output(path):
+    with open(path, newline="") as file:
+        return list(csv.reader(file))
+
+
+EXPECTED = [
+    ["operation", "operand1", "operand2", "result", "status"],
+    ["add", "1", "2", "3", "ok"],
+    ["Divide", "1", "3", "0.3333333333", "ok"],
+    ["divide", "1", "0", "", "validation_error"],
+    ["power", "2", "10", "1024", "ok"],
+    ["cube", "1", "2", "", UNKNOWN_OPERATION],
+    ["root", "16", "4", "2", "ok"],
+    ["add", "x", "1", "", "validation_error"],
+    ["multiply", "2.5", "4", "10.0", "ok"],
+]
+
+
+def test_job_writes_results_in_order(tmp_path):
+    source = write_input(tmp_path / "in.csv")
+    target = tmp_path / "out.csv"
+    report = run_csv_job(source, target, make_config(tmp_path), workers=2, chunk_rows=3)
+    assert read_output(target) == EXPECTED
+    assert (report.rows, report.chunks, report.failures, report.resumed_rows) == (8, 3, 3, 0)
+    assert not (tmp_path / "out.csv.checkpoint").exists()
+
+
+def test_job_without_header_and_with_float_backend(tmp_path):
+    source = write_input(tmp_path / "in.csv", [["multiply", "1.5", "2"], [], ["root", "-4", "2"]], header=False)
+    target = tmp_path / "out.csv"
+    report = run_csv_job(source, target, make_config(tmp_path, "numpy"), workers=1)
+    assert read_output(target)[1:] == [["multiply", "1.5", "2", "3.0", "ok"], ["root", "-4", "2", "", "validation_error"]]
+    assert report.rows == 2
+
+
+def test_evaluate_rows_in_process(tmp_path):
+    # Exercise the worker side in this process so it is covered
+    _init_worker(make_config(tmp_path))
+    rows = [["add", "1", "2"], ["add", "1"], ["nope", "1", "2"], [" Power ", "2", "0.5"]]
+    assert evaluate_rows(rows) == [
+        ("3", "ok"), ("", MALFORMED_ROW), ("", UNKNOWN_OPERATION), ("1.414213562", "ok")
+    ]
+    # Number theory operations are registered with OperationFactory at import
+    assert evaluate_rows([["factorial", "5", "1"], ["factorial", "5", "0"], ["modpow[97]", "3", "1000"]]) == [
+        ("120", "ok"), ("", "validation_error"), (str(pow(3, 1000, 97)), "ok")
+    ]
+    _init_worker(make_config(tmp_path, "float"))
+    assert evaluate_rows([["divide", "1", "4"], ["divide", "1", "0"], ["add", "abc", "1"]]) == [
+        ("0.25", "ok"), ("", "validation_error"), ("", "validation_error")
+    ]
+
+
+def test_killed_job_resumes_from_checkpoint(tmp_path, monkeypatch):
+    source = write_input(tmp_path / "in.csv")
+    target = tmp_path / "out.csv"
+    config = make_config(tmp_path)
+    save = csv_jobs._save_checkpoint
+    saved = []
+
+    def kill_after_two(checkpoint, state):
+        if len(saved) == 2:
+            raise KeyboardInterrupt
+        save(checkpoint, state)
+        saved.append(state["rows"])
+
+    monkeypatch.setattr(csv_jobs, "_save_checkpoint", kill_after_two)
+    with pytest.raises(KeyboardInterrupt):
+        run_csv_job(source, target, config, workers=1, chunk_rows=2)
+    monkeypatch.undo()
+    checkpoint = tmp_path / "out.csv.checkpoint"
+    assert json.loads(checkpoint.read_text())["rows"] == 4
+    # The third chunk reached the output before the kill; it is written again
+    assert len(read_output(target)) == 7
+
+    report = run_csv_job(source, target, config, workers=1, chunk_rows=2)
+    assert read_output(target) == EXPECTED
+    assert (report.resumed_rows, report.rows, report.chunks) == (4, 4, 2)
+    assert "Resumed after 4 rows" in report.summary()
+    assert not checkpoint.exists()
+
+
+def test_checkpoint_of_another_input_is_ignored(tmp_path, caplog):
+    source = write_input(tmp_path / "in.csv")
+    target = tmp_path / "out.csv"
+    (tmp_path / "out.csv.checkpoint").write_text(json.dumps(
+        {"input": "/elsewhere.csv", "input_size": 1, "input_mtime": 0, "rows": 99, "input_offset": 5, "output_offset": 5}
+    ))
+    report = run_csv_job(source, target, make_config(tmp_path), workers=1)
+    assert report.resumed_rows == 0 and read_output(target) == EXPECTED
+    assert "belongs to another input" in caplog.text
+
+
+def test_main(tmp_path, monkeypatch, capsys):
+    monkeypatch.setenv("CALCULATOR_BASE_DIR", str(tmp_path))
+    clean = write_input(tmp_path / "clean.csv", [["add", "1", "1"]])
+    assert main([str(clean), str(tmp_path / "clean-out.csv"), "--workers", "1"]) == 0
+    assert "Rows: 1 in 1 chunks (0 failed)" in capsys.readouterr().out
+    failing = write_input(tmp_path / "failing.csv")
+    checkpoint = tmp_path / "job.checkpoint"
+    assert main([str(failing), str(tmp_path / "out.csv"), "--chunk-rows", "4", "--checkpoint", str(checkpoint)]) == 1
+    assert JobReport().throughput == 0.0
@@ -0,0 +1,89 @@
+import pytest
+from decimal import Decimal, localcontext
+from app import decimal_math
+from app.operations import Power, Root
+
+
+def test_power_small_integer_fast_path():
+    assert decimal_math.power(Decimal("2"), Decimal("10")) == Decimal("1024")
+
+
+def test_power_zero_exponent_and_zero_base():
+    assert decimal_math.power(Decimal("5"), Decimal("0")) == Decimal("1")
+    assert decimal_math.power(Decimal("0"), Decimal("3")) == Decimal("0")
+    assert decimal_math.power(Decimal("0"), Decimal("0.5")) == Decimal("0")
+
+
+def test_power_by_squaring_beyond_float_range():
+    result = decimal_math.power(Decimal("1.5"), Decimal("2000"), precision=30)
+    assert result == Decimal("1.52236261857378246819990453058E+352")
+
+
+def test_power_negative_integer_exponent():
+    assert decimal_math.power(Decimal("2"), Decimal("-100"), precision=10) == Decimal("7.888609052E-31")
+
+
+def test_power_fractional_exponent():
+    assert decimal_math.power(Decimal("2"), Decimal("0.5"), precision=20) == Decimal("1.4142135623730950488")
+
+
+def test_power_fractional_large_argument():
+    # exp argument has a large integer part, which needs extra working digits
+    result = decimal_math.power(Decimal("10"), Decimal("300.5"), precision=15)
+    assert result == Decimal("3.16227766016838E+300")
+
+
+def test_power_undefined_cases():
+    with pytest.raises(ValueError, match="Negative base with fractional exponent"):
+        decimal_math.power(Decimal("-9"), Decimal("0.5"))
+    with pytest.raises(ValueError, match="Zero cannot be raised to a negative power"):
+        decimal_math.power(Decimal("0"), Decimal("-2"))
+    with pytest.raises(ValueError, match="Zero cannot be raised to a negative power"):
+        decimal_math.power(Decimal("0"), Decimal("-0.5"))
+
+
+def test_power_honors_context_precision():
+    with localcontext() as ctx:
+        ctx.prec = 5
+        assert decimal_math.power(Decimal("3"), Decimal("0.5")) == Decimal("1.7321")
+
+
+def test_root_exact_integer_fast_path():
+    assert decimal_math.root(Decimal("27"), Decimal("3")) == Decimal("3")
+    assert decimal_math.root(Decimal("1"), Decimal("5000")) == Decimal("1")
+
+
+def test_root_square_and_newton():
+    assert decimal_math.root(Decimal("2"), Decimal("2"), precision=20) == Decimal("1.4142135623730950488")
+    assert decimal_math.root(Decimal("10"), Decimal("3"), precision=20) == Decimal("2.1544346900318837218")
+    assert decimal_math.root(Decimal("2"), Decimal("5000"), precision=10) == Decimal("1.000138639")
+
+
+def test_root_high_precision():
+    result = decimal_math.root(Decimal("2"), Decimal("3"), precision=500)
+    with localcontext() as ctx:
+        ctx.prec = 520
+        reference = ctx.power(Decimal("2"), ctx.divide(1, 3))
+        ctx.prec = 500
+        assert result == +reference
+
+
+def test_root_special_degrees():
+    assert decimal_math.root(Decimal("9"), Decimal("1")) == Decimal("9")
+    assert decimal_math.root(Decimal("0"), Decimal("3")) == Decimal("0")
+    assert decimal_math.root(Decimal("8"), Decimal("-3")) == Decimal("0.5")
+    assert decimal_math.root(Decimal("2"), Decimal("0.5")) == Decimal("4")
+
+
+def test_root_undefined_cases():
+    with pytest.raises(ValueError, match="Zero root is undefined"):
+        decimal_math.root(Decimal("9"), Decimal("0"))
+    with pytest.raises(ValueError, match="Cannot calculate root of negative number"):
+        decimal_math.root(Decimal("-9"), Decimal("2"))
+    with pytest.raises(ValueError, match="Zero cannot be raised to a negative power"):
+        decimal_math.root(Decimal("0"), Decimal("-2"))
+
+
+def test_operations_no_longer_overflow_float_range():
+    assert Power().execute(Decimal("10"), Decimal("400")) == Decimal("1E+400")
+    assert Root().execute(Decimal("1E+600"), Decimal("2")) == Decimal("1E+300")
@@ -1,6 +1,6 @@
 import pytest
-from decimal import Decimal
-from app.input_validators import InputValidator
+from decimal import Decimal, localcontext
+from app.input_validators import InputValidator, _validate_literal
 from app.exceptions import ValidationError
 
 
@@ -31,3 +31,67 @@ def test_validate_number_exceeds_max():
 def test_validate_number_invalid_format():
     with pytest.raises(ValidationError, match="Invalid number format"):
         InputValidator.validate_number("not_a_number", DummyConfig())
+
+
+class BackendConfig:
+    max_input_value = Decimal("1000")
+
+    def __init__(self, backend):
+        self.backend = backend
+
+
+def test_validate_number_decimal_and_int_fast_path():
+    value = Decimal("2.50")
+    assert InputValidator.validate_number(value, DummyConfig()) == Decimal("2.5")
+    assert InputValidator.validate_number(12, DummyConfig()) == Decimal("12")
+    with pytest.raises(ValidationError, match="Value exceeds maximum allowed"):
+        InputValidator.validate_number(Decimal("1000.1"), DummyConfig())
+
+
+def test_validate_number_caches_string_literals():
+    _validate_literal.cache_clear()
+    for _ in range(3):
+        assert InputValidator.validate_number(" 1.50 ", DummyConfig()) == Decimal("1.5")
+    info = _validate_literal.cache_info()
+    assert (info.hits, info.misses) == (2, 1)
+
+
+def test_validate_number_cache_respects_context_precision():
+    _validate_literal.cache_clear()
+    with localcontext() as ctx:
+        ctx.prec = 3
+        assert InputValidator.validate_number("1.23456", DummyConfig()) == Decimal("1.23")
+    assert InputValidator.validate_number("1.23456", DummyConfig()) == Decimal("1.23456")
+
+
+def test_validate_number_invalid_literal_raises_every_time():
+    for _ in range(2):
+        with pytest.raises(ValidationError, match="Invalid number format: abc"):
+            InputValidator.validate_number(" abc ", DummyConfig())
+
+
+def test_validate_many_masks_invalid_rows():
+    result = InputValidator.validate_many(["1", "x", Decimal("2"), "5000", 3], DummyConfig())
+    assert result.values == [Decimal("1"), None, Decimal("2"), None, Decimal("3")]
+    assert result.invalid.tolist() == [False, True, False, True, False]
+    assert result.invalid_count == 2
+
+
+def test_validate_many_numpy_backend_is_vectorized():
+    import numpy as np
+    import pandas as pd
+    config = BackendConfig("numpy")
+
+    result = InputValidator.validate_many(np.array([1.5, np.inf, 2000.0, -3.0]), config)
+    assert result.invalid.tolist() == [False, True, True, False]
+    assert result.values[[0, 3]].tolist() == [1.5, -3.0]
+    assert np.isnan(result.values[[1, 2]]).all()
+
+    # A column with unparsable text falls back to row-by-row conversion
+    result = InputValidator.validate_many(pd.Series([" 7.5 ", "bad", None]), config)
+    assert result.invalid.tolist() == [False, True, True]
+    assert result.values[0] == 7.5
+
+
+def test_validate_number_numpy_backend_strips_strings():
+    assert InputValidator.validate_number(" 2.5 ", BackendConfig("numpy")) == 2.5
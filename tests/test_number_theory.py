@@ -0,0 +1,127 @@
+import math
+import random
+import pytest
+from decimal import Decimal
+from fractions import Fraction
+from app.calculation import Calculation
+from app.exceptions import OperationError, ValidationError
+from app.number_theory import (
+    Binomial, Factorial, GreatestCommonDivisor, IntegerPower, IntegerRoot, LeastCommonMultiple,
+    ModularPower, Permutations, integer_kernel, integer_root, to_integer
+)
+from app.numeric_backends import get_backend
+from app.operations import OperationFactory
+
+
+def test_to_integer_is_exact():
+    big = 10 ** 1200 + 1
+    assert to_integer(Decimal(big)) == big
+    assert to_integer(Decimal("1E+5")) == 100000
+    assert to_integer(Fraction(12, 4)) == 3
+    assert to_integer(2.0 ** 60) == 1 << 60
+    assert to_integer(7) == 7
+    for value in (Decimal("2.5"), Decimal("NaN"), Fraction(1, 3), 0.5):
+        with pytest.raises(ValidationError, match="Integer operand required"):
+            to_integer(value)
+
+
+def test_integer_root_rounds_down():
+    rng = random.Random(7)
+    for _ in range(500):
+        n = rng.randint(1, 30)
+        a = rng.getrandbits(rng.randint(0, 2000))
+        r = integer_root(a, n)
+        assert r ** n <= a < (r + 1) ** n
+    assert integer_root(10 ** 3000, 3) == 10 ** 1000
+    assert integer_root(10 ** 3000 - 1, 3) == 10 ** 1000 - 1
+    assert integer_root(1 << 5000, 2) == 1 << 2500
+
+
+def test_big_integer_operations_are_exact():
+    a, b = 2 ** 4000 * 3 ** 5, 2 ** 10 * 3 ** 900
+    assert GreatestCommonDivisor().execute(Decimal(a), Decimal(b)) == Decimal(2 ** 10 * 3 ** 5)
+    assert LeastCommonMultiple().execute(Decimal(a), Decimal(b)) == Decimal(2 ** 4000 * 3 ** 900)
+    # Beyond the Decimal engine's rounding and the range of floats
+    assert IntegerPower().execute(Decimal(3), Decimal(5000)) == Decimal(3 ** 5000)
+    assert IntegerPower(exact=True).execute(7, 3) == 343
+    assert IntegerRoot().execute(Decimal(3 ** 5000), Decimal(5)) == Decimal(3 ** 1000)
+    assert ModularPower(97).execute(Decimal(3), Decimal(10 ** 30)) == pow(3, 10 ** 30, 97)
+    assert ModularPower(97).execute(3, -1) == pow(3, -1, 97)
+
+
+def test_integer_operations_validate_operands():
+    with pytest.raises(ValidationError, match="Integer operand required: 2.5"):
+        GreatestCommonDivisor().execute(Decimal("2.5"), 4)
+    with pytest.raises(ValidationError, match="Negative exponents not supported"):
+        IntegerPower().execute(2, -1)
+    with pytest.raises(ValidationError, match="Cannot calculate root of negative number"):
+        IntegerRoot().execute(-8, 3)
+    with pytest.raises(ValidationError, match="Root degree must be a positive integer"):
+        IntegerRoot().execute(8, 0)
+    with pytest.raises(ValidationError, match="Modulus must be a positive integer"):
+        ModularPower(0)
+    with pytest.raises(ValidationError, match="Modular power needs a modulus"):
+        ModularPower().execute(2, 3)
+    with pytest.raises(ValidationError, match="Base has no inverse modulo the modulus"):
+        ModularPower(10).execute(4, -1)
+
+
+def test_registered_names_and_history_kernels():
+    assert isinstance(OperationFactory.create_operation("GCD"), GreatestCommonDivisor)
+    assert str(ModularPower()) == "ModularPower"
+    assert str(ModularPower(10 ** 5000 + 1)) == f"ModularPower[{Decimal(10 ** 5000 + 1)}]"
+
+    assert integer_kernel("Addition") is None
+    assert integer_kernel("LeastCommonMultiple")(Decimal(4), 6) == 12
+    assert integer_kernel("ModularPower[97]")(3, 1000) == pow(3, 1000, 97)
+
+    # History entries recompute from the operation name, modulus included
+    calc = Calculation("ModularPower[97]", Decimal(3), Decimal(1000))
+    assert calc.result == Decimal(pow(3, 1000, 97))
+    assert Calculation.from_dict(calc.to_dict()) == calc
+    float_backend = get_backend("float")
+    assert Calculation("IntegerPower", 2.0, 100.0, backend=float_backend).result == Decimal(2 ** 100)
+    with pytest.raises(OperationError, match="Unknown operation: ModularPower"):
+        Calculation("ModularPower", Decimal(3), Decimal(4))
+
+
+def test_modpow_takes_its_modulus_from_the_name():
+    operation = OperationFactory.create_operation("ModPow[97]")
+    assert isinstance(operation, ModularPower) and operation.modulus == 97
+    assert str(operation) == "ModularPower[97]"
+    assert OperationFactory.create_operation("modpow[1E+3]", exact=True).execute(3, 5) == 243
+    assert OperationFactory.has_operation("modpow[97]") and OperationFactory.has_operation("modpow")
+    assert not OperationFactory.has_operation("gcd[97]")
+    assert not OperationFactory.has_operation("nope[97]")
+    with pytest.raises(ValueError, match=r"Operation modpow needs a parameter, e\.g\. modpow\[n\]"):
+        OperationFactory.create_operation("modpow")
+    with pytest.raises(ValueError, match="needs a parameter"):
+        OperationFactory.dispatch(OperationFactory.op_code("modpow"))
+    with pytest.raises(ValueError, match="Unknown operation: gcd\\[2\\]"):
+        OperationFactory.create_operation("gcd[2]")
+    for modulus in ("0", "x", "2.5"):
+        with pytest.raises(ValueError, match=f"Invalid operation modpow\\[{modulus}\\]"):
+            OperationFactory.create_operation(f"modpow[{modulus}]")
+
+
+def test_combinatorics_operations():
+    for name, operation_class in (("factorial", Factorial), ("binomial", Binomial), ("permutations", Permutations)):
+        assert isinstance(OperationFactory.create_operation(name), operation_class)
+    assert Factorial().execute(Decimal(30), Decimal(1)) == Decimal(math.factorial(30))
+    assert Factorial().execute(Decimal(9), Decimal(2)) == Decimal(945)
+    assert Binomial().execute(Decimal(1000), Decimal(300)) == Decimal(math.comb(1000, 300))
+    assert Permutations().execute(Decimal(10), Decimal(3)) == Decimal(720)
+    # Exact mode returns ints
+    assert Permutations(exact=True).execute(10, 3) == 720
+    assert Binomial(exact=True).execute(10, 3) == 120
+    assert Factorial(exact=True).execute(5, 1) == 120
+    with pytest.raises(ValidationError, match="Factorial of a negative number is undefined"):
+        Factorial().execute(-1, 1)
+    with pytest.raises(ValidationError, match="Factorial step must be a positive integer"):
+        Factorial().execute(5, 0)
+    with pytest.raises(ValidationError, match="Binomial coefficients need non-negative operands"):
+        Binomial().execute(5, -1)
+    with pytest.raises(ValidationError, match="Permutations need non-negative operands"):
+        Permutations().execute(-5, 1)
+    for name, expected in (("Factorial", 3628800), ("Binomial", 1), ("Permutations", 3628800)):
+        assert Calculation(name, Decimal(10), Decimal(1 if name == "Factorial" else 10)).result == expected
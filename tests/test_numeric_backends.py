@@ -0,0 +1,216 @@
+import math
+import numpy as np
+import pytest
+from decimal import Decimal
+from app.array_operands import ArrayRef
+from app.calculation import Calculation
+from app.calculator import Calculator
+from app.calculator_config import CalculatorConfig
+from app.exceptions import ValidationError
+from app.numeric_backends import (
+    HYBRID_KERNELS, DecimalBackend, FloatBackend, HybridBackend, HybridStats,
+    NumpyBackend, get_backend
+)
+from app.operations import OperationFactory
+
+
+def test_get_backend_by_name():
+    assert isinstance(get_backend(), DecimalBackend)
+    assert isinstance(get_backend("FLOAT"), FloatBackend)
+    assert isinstance(get_backend("numpy"), NumpyBackend)
+    with pytest.raises(ValueError, match="Unknown numeric backend: quad"):
+        get_backend("quad")
+
+
+@pytest.mark.parametrize("kernel, a, b, expected", [
+    ("add", 2, 3, 5),
+    ("subtract", 5, 3, 2),
+    ("multiply", 4, 2.5, 10),
+    ("divide", 10, 4, 2.5),
+    ("power", 2, 10, 1024),
+    ("root", 27, 3, 3),
+    ("modulus", -7, 3, -1),
+    ("int_divide", -7, 2, -3),
+    ("percent", 15, 200, 7.5),
+    ("abs_diff", 3, 10, 7),
+])
+def test_backends_agree(kernel, a, b, expected):
+    decimal_backend = get_backend("decimal")
+    assert getattr(decimal_backend, kernel)(Decimal(a), Decimal(str(b))) == Decimal(str(expected))
+    assert getattr(get_backend("float"), kernel)(float(a), float(b)) == pytest.approx(expected)
+    result = getattr(get_backend("numpy"), kernel)(np.array([a, a]), np.array([b, b]))
+    assert np.allclose(result, [expected, expected])
+
+
+def test_float_backend_validation_predicates():
+    backend = FloatBackend()
+    assert backend.convert(" 2.5".strip()) == 2.5
+    assert backend.exceeds(math.inf, Decimal("1e999"))
+    assert backend.exceeds(2000.0, Decimal("1000"))
+    assert not backend.exceeds(2.0, Decimal("1000"))
+    with pytest.raises(ValueError):
+        backend.power(-8.0, 0.5)
+
+
+def test_numpy_backend_predicates_consider_every_element():
+    backend = NumpyBackend()
+    values = backend.convert([1, 0, -2])
+    assert backend.any_zero(values)
+    assert backend.any_negative(values)
+    assert backend.exceeds(backend.convert([1, np.nan]), Decimal("10"))
+    assert not backend.exceeds(backend.convert([1, 2]), Decimal("10"))
+
+
+def test_validator_dispatches_through_backend(tmp_path):
+    from app.input_validators import InputValidator
+    config = CalculatorConfig(base_dir=tmp_path, backend="float", max_input_value=Decimal("100"))
+    assert InputValidator.validate_number(" 2.5 ", config) == 2.5
+    with pytest.raises(ValidationError, match="Value exceeds maximum allowed"):
+        InputValidator.validate_number("1000", config)
+    with pytest.raises(ValidationError, match="Invalid number format"):
+        InputValidator.validate_number("abc", config)
+
+
+def test_operation_validation_uses_backend():
+    op = OperationFactory.create_operation("divide", backend=get_backend("numpy"))
+    with pytest.raises(ValidationError, match="Division by zero is not allowed"):
+        op.execute(np.array([1.0, 2.0]), np.array([1.0, 0.0]))
+    assert np.allclose(op.execute(np.array([1.0, 2.0]), np.array([2.0, 4.0])), [0.5, 0.5])
+
+
+def test_calculator_with_float_backend(tmp_path):
+    calc = Calculator(CalculatorConfig(base_dir=tmp_path, backend="float"))
+    calc.set_operation(OperationFactory.create_operation("percent"))
+    result = calc.perform_operation("15", "200")
+    assert isinstance(result, float)
+    assert result == 7.5
+    # The history entry records the same percent, computed by the backend
+    assert calc.history[-1].result == 7.5
+
+    calc.save_history()
+    restored = Calculator(CalculatorConfig(base_dir=tmp_path, backend="float"))
+    assert restored.history[0].result == 7.5
+    assert isinstance(restored.history[0].operand1, float)
+
+
+def test_calculator_with_numpy_backend(tmp_path):
+    calc = Calculator(CalculatorConfig(base_dir=tmp_path, backend="numpy", auto_save=False))
+    calc.set_operation(OperationFactory.create_operation("multiply"))
+    result = calc.perform_operation([1, 2, 3], [4, 5, 6])
+    assert np.array_equal(result, [4, 10, 18])
+    # The history keeps a reference to the array, not the array itself
+    assert calc.history[-1].result == ArrayRef.of(result)
+
+
+def test_calculation_with_backend_kernels():
+    backend = get_backend("float")
+    calc = Calculation("Root", 16.0, 2.0, backend=backend)
+    assert calc.result == 4.0
+
+
+@pytest.mark.parametrize("name, a, b, expected", [
+    ("add", 2, 3, 5),
+    ("subtract", 5, 3, 2),
+    ("multiply", 4, 2.5, 10),
+    ("divide", 10, 4, 2.5),
+    ("power", 2, 10, 1024),
+    ("root", 27, 3, 3),
+    ("modulus", -7, 3, -1),
+    ("int_divide", -7, 2, -3),
+    ("percent", 15, 200, 7.5),
+    ("abs_diff", 3, 10, 7),
+])
+def test_operations_dispatch_to_float_backend(name, a, b, expected):
+    op = OperationFactory.create_operation(name, backend=get_backend("float"))
+    result = op.execute(float(a), float(b))
+    assert isinstance(result, float)
+    assert result == pytest.approx(expected)
+
+
+def test_float_backend_rejects_negative_exponent():
+    op = OperationFactory.create_operation("power", backend=get_backend("float"))
+    with pytest.raises(ValidationError, match="Negative exponents not supported"):
+        op.execute(2.0, -1.0)
+
+
+def test_hybrid_backend_matches_decimal_and_counts_fast_path():
+    from decimal import localcontext
+    hybrid = HybridBackend(fast_kernels=HYBRID_KERNELS)
+    with localcontext() as ctx:
+        ctx.prec = 10
+        for kernel in ("add", "subtract", "multiply", "divide", "abs_diff", "power", "root"):
+            a, b = Decimal("12.345"), Decimal("2.5")
+            assert getattr(hybrid, kernel)(a, b) == getattr(get_backend("decimal"), kernel)(a, b)
+    assert hybrid.stats.fast_path == 7
+    assert hybrid.stats.fallback == 0
+    assert hybrid.stats.fast_path_ratio == 1.0
+
+
+@pytest.mark.parametrize("kernel, a, b", [
+    ("subtract", "1.000000000001", "1"),       # cancellation
+    ("abs_diff", "0.1", "0.1"),                # exact zero result
+    ("add", "2", "3"),                         # integral operands stay exact ints
+    ("multiply", "1E+400", "1.5"),             # beyond binary64 range
+    ("power", "-2.5", "3"),                    # no bound for negative bases
+    ("divide", "1.5", "1E-400"),               # operand below the normal range
+    ("root", "0", "2.5"),                      # no bound for a zero radicand
+    ("root", "0.00675", "0.00675"),            # result below the normal range
+])
+def test_hybrid_backend_falls_back_when_bound_is_not_enough(kernel, a, b):
+    from decimal import localcontext
+    hybrid = HybridBackend(fast_kernels=HYBRID_KERNELS)
+    with localcontext() as ctx:
+        ctx.prec = 10
+        result = getattr(hybrid, kernel)(Decimal(a), Decimal(b))
+        assert result == getattr(get_backend("decimal"), kernel)(Decimal(a), Decimal(b))
+    assert hybrid.stats.fallback == 1
+    assert hybrid.stats.fast_path == 0
+
+
+def test_hybrid_backend_tries_float_first_for_inexact_integral_results():
+    from decimal import localcontext
+    hybrid = HybridBackend(fast_kernels=HYBRID_KERNELS)
+    with localcontext() as ctx:
+        ctx.prec = 10
+        assert hybrid.root(Decimal(2), Decimal(3)) == get_backend("decimal").root(Decimal(2), Decimal(3))
+        assert hybrid.divide(Decimal(1), Decimal(7)) == Decimal(1) / Decimal(7)
+        assert hybrid.power(Decimal(3), Decimal(5)) == Decimal(243)
+        with hybrid.uncounted():
+            hybrid.root(Decimal(2), Decimal(3))
+    assert hybrid.stats.fast_path == 2
+    assert hybrid.stats.fallback == 1
+
+
+def test_hybrid_backend_falls_back_above_binary64_precision():
+    from decimal import localcontext
+    hybrid = get_backend("hybrid")
+    hybrid.reset_stats()
+    with localcontext() as ctx:
+        ctx.prec = 28
+        assert hybrid.divide(Decimal("1.5"), Decimal("7")) == Decimal("1.5") / Decimal("7")
+    assert hybrid.stats.fast_path_ratio == 0.0
+
+
+def test_hybrid_backend_handles_float_errors():
+    hybrid = get_backend("hybrid")
+    from decimal import localcontext
+    with localcontext() as ctx:
+        ctx.prec = 10
+        # math.pow overflows in binary64 but the Decimal engine does not
+        assert hybrid.power(Decimal("10.5"), Decimal("400.5")) > Decimal("1E+400")
+
+
+def test_calculator_with_hybrid_backend(tmp_path):
+    calc = Calculator(CalculatorConfig(base_dir=tmp_path, backend="hybrid", significant_digits=10, auto_save=False))
+    calc.backend.reset_stats()
+    calc.set_operation(OperationFactory.create_operation("root"))
+    assert calc.perform_operation("1.5", "7") == Decimal("1.059634023")
+    assert calc.history[-1].result == Decimal("1.059634023")
+    # The history entry recomputes the result without counting it again
+    assert calc.backend.stats.fast_path == 1
+
+    # Basic arithmetic is cheaper in Decimal, so it is not tried float-first by default
+    calc.set_operation(OperationFactory.create_operation("divide"))
+    assert calc.perform_operation("1.5", "7") == Decimal("0.2142857143")
+    assert calc.backend.stats.fallback == 1
+    assert HybridStats().fast_path_ratio == 0.0
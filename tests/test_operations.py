@@ -1,9 +1,10 @@
+import numpy as np
 import pytest
 from decimal import Decimal
 from app.operations import (
     Addition, Subtraction, Multiplication, Division,
     Power, Root, Modulus, IntegerDivision, Percent, 
-    AbsoluteDifference, OperationFactory
+    AbsoluteDifference, MatrixMultiplication, OperationFactory
 )
 from app.exceptions import ValidationError
 
@@ -72,7 +73,16 @@ def test_operation_factory_unknown():
         OperationFactory.create_operation("unknown")
 
 
-def test_operation_factory_register():
+@pytest.fixture
+def registry(monkeypatch):
+    """Undo operations registered by a test."""
+    for name in ("_operations", "_codes", "_instances", "_loaders"):
+        monkeypatch.setattr(OperationFactory, name, dict(getattr(OperationFactory, name)))
+    for name in ("_names", "_dispatch"):
+        monkeypatch.setattr(OperationFactory, name, list(getattr(OperationFactory, name)))
+
+
+def test_operation_factory_register(registry):
     class DummyOp(Addition): pass
     OperationFactory.register_operation("dummy", DummyOp)
     op = OperationFactory.create_operation("dummy")
@@ -83,6 +93,65 @@ def test_operation_factory_register_invalid():
     with pytest.raises(TypeError, match="Operation class must inherit from Operation"):
         OperationFactory.register_operation("bad", object)
 
+
+def test_operation_factory_shares_instances():
+    add = OperationFactory.create_operation("add")
+    assert OperationFactory.create_operation("ADD") is add
+    assert OperationFactory.create_operation(1) is add
+    assert OperationFactory.create_operation("add", exact=True) is not add
+    assert OperationFactory.create_operation("add", exact=True).exact
+
+
+def test_operation_factory_op_codes_and_dispatch():
+    assert [OperationFactory.op_code(name) for name in ("add", "Abs_Diff")] == [1, 10]
+    assert OperationFactory.operation_name(4) == "divide"
+    assert OperationFactory.has_operation("MODULUS")
+    assert not OperationFactory.has_operation("unknown")
+    assert OperationFactory.dispatch(4)(Decimal(1), Decimal(8)) == Decimal("0.125")
+    with pytest.raises(ValidationError, match="Division by zero"):
+        OperationFactory.dispatch(4)(Decimal(1), Decimal(0))
+    with pytest.raises(ValueError, match="Unknown operation: unknown"):
+        OperationFactory.op_code("unknown")
+    for code in (0, 99, -1):
+        with pytest.raises(ValueError, match=f"Unknown op code: {code}"):
+            OperationFactory.dispatch(code)
+
+
+def test_operation_factory_reregistration_keeps_op_code(registry):
+    class Doubled(Addition):
+        def execute(self, a, b):
+            return super().execute(a, b) * 2
+    OperationFactory.register_operation("doubled", Addition)
+    code = OperationFactory.op_code("doubled")
+    exact = OperationFactory.create_operation("doubled", exact=True)
+    OperationFactory.register_operation("Doubled", Doubled)
+    assert OperationFactory.op_code("doubled") == code
+    assert isinstance(OperationFactory.create_operation(code), Doubled)
+    assert OperationFactory.create_operation("doubled", exact=True) is not exact
+    assert OperationFactory.dispatch(code)(Decimal(1), Decimal(2)) == Decimal(6)
+
+
+def test_operation_factory_parameterized_names_need_a_loadable_class(registry):
+    def broken():
+        raise ImportError("gone")
+
+    OperationFactory.register_lazy("broken", broken)
+    assert OperationFactory.has_operation("broken")
+    assert not OperationFactory.has_operation("broken[2]")
+    assert OperationFactory.operation_names()[-1] == "broken"
+    assert OperationFactory.operation_class("MODULUS") is Modulus
+    with pytest.raises(ValueError, match="Unknown operation: nope"):
+        OperationFactory.operation_class("nope")
+
+
+def test_operation_factory_rejects_bool_op_codes():
+    for flag in (True, False):
+        with pytest.raises(ValueError, match=f"Unknown op code: {flag}"):
+            OperationFactory.create_operation(flag)
+        with pytest.raises(ValueError, match=f"Unknown op code: {flag}"):
+            OperationFactory.dispatch(flag)
+
+
 def test_operation_str_methods():
     assert str(Addition()) == "Addition"
     assert str(Subtraction()) == "Subtraction"
@@ -135,3 +204,107 @@ def test_percent_validation_error_on_zero_divisor():
 
 
 
+
+def test_integer_operands_use_exact_int_arithmetic():
+    from decimal import localcontext
+    with localcontext() as ctx:
+        ctx.prec = 5
+        assert Addition().execute(Decimal("123456789"), Decimal("1")) == Decimal("123456790")
+        assert Multiplication().execute(Decimal("99999"), Decimal("99999")) == Decimal("9999800001")
+        assert Power().execute(Decimal("3"), Decimal("40")) == Decimal("12157665459056928801")
+
+
+def test_decimal_operands_skip_the_numeric_tower(monkeypatch):
+    from app import operations
+
+    def lowered(*args):
+        raise AssertionError("promoted")
+
+    monkeypatch.setattr(operations, "promote", lowered)
+    assert Addition().execute(Decimal("1.5"), Decimal("0.25")) == Decimal("1.75")
+    assert Subtraction().execute(Decimal("12"), Decimal("5")) == Decimal("7")
+    assert Multiplication().execute(Decimal("1.5"), Decimal("4")) == Decimal("6")
+    assert Division().execute(Decimal("1"), Decimal("4")) == Decimal("0.25")
+
+
+def test_integer_division_rounds_toward_zero_like_decimal():
+    assert IntegerDivision().execute(Decimal("-7"), Decimal("2")) == Decimal("-3")
+    assert Modulus().execute(Decimal("-7"), Decimal("3")) == Decimal("-1")
+    assert Modulus().execute(Decimal("7"), Decimal("-3")) == Decimal("1")
+
+
+def test_inexact_integer_division_promotes_to_decimal():
+    result = Division().execute(Decimal("1"), Decimal("4"))
+    assert isinstance(result, Decimal)
+    assert result == Decimal("0.25")
+    assert Division().execute(Decimal("12"), Decimal("4")) == Decimal("3")
+
+
+def test_mixed_operands_promote_to_decimal():
+    assert Addition().execute(Decimal("1.5"), Decimal("2")) == Decimal("3.5")
+    assert Power().execute(Decimal("4"), Decimal("0.5")) == Decimal("2")
+
+
+def test_exact_mode_keeps_division_chains_exact():
+    from fractions import Fraction
+    divide = OperationFactory.create_operation("divide", exact=True)
+    multiply = OperationFactory.create_operation("multiply", exact=True)
+    third = divide.execute(Decimal("1"), Decimal("3"))
+    assert third == Fraction(1, 3)
+    assert multiply.execute(third, Decimal("3")) == 1
+    assert Percent(exact=True).execute(Decimal("1"), Decimal("3")) == Fraction(100, 3)
+    assert Subtraction(exact=True).execute(Decimal("0.1"), Fraction(1, 10)) == 0
+
+
+def test_numeric_tower_conversions():
+    from fractions import Fraction
+    from app.operations import promote, to_decimal, to_exact, exact_power
+    assert to_exact(Decimal("1E+3")) == 1000
+    assert isinstance(to_exact(Decimal("1E+3")), int)
+    assert to_exact(Decimal("0.5")) == Decimal("0.5")
+    assert to_exact(Decimal("0.5"), exact=True) == Fraction(1, 2)
+    assert to_exact(Decimal("Infinity")) == Decimal("Infinity")
+    assert to_decimal(Fraction(3, 4)) == Decimal("0.75")
+    assert to_decimal(Fraction(4, 2)) == Decimal("2")
+    assert promote(Fraction(1, 2), Decimal("0.25")) == (Fraction(1, 2), Fraction(1, 4))
+    assert promote(Fraction(1, 2), Decimal("Infinity")) == (Decimal("0.5"), Decimal("Infinity"))
+    assert exact_power(Fraction(1, 2), 3) == Fraction(1, 8)
+    # Results beyond the exact-power bit budget go through the Decimal engine
+    assert isinstance(exact_power(2, 10000), Decimal)
+
+
+def test_non_integral_operands_keep_decimal_semantics():
+    assert Division().execute(Decimal("7.5"), Decimal("2.5")) == Decimal("3")
+    assert IntegerDivision().execute(Decimal("-7.5"), Decimal("2")) == Decimal("-3")
+    assert Modulus().execute(Decimal("-7.5"), Decimal("2")) == Decimal("-1.5")
+
+
+def test_array_operands_are_computed_element_wise():
+    a = np.array([[1.0, 2.0], [3.0, 4.0]])
+    assert np.array_equal(Addition().execute(a, Decimal("0.5")), [[1.5, 2.5], [3.5, 4.5]])
+    assert np.array_equal(Power().execute(a, np.array([2.0, 0.0])), [[1, 1], [9, 1]])
+    assert np.array_equal(Root().execute(np.array([4.0, 9.0]), Decimal(2)), [2, 3])
+    with pytest.raises(ValidationError, match="Division by zero"):
+        Division().execute(a, np.array([1.0, 0.0]))
+    with pytest.raises(ValidationError, match="Negative exponents"):
+        Power().execute(Decimal(2), np.array([1.0, -1.0]))
+
+
+def test_array_backend_is_looked_up_on_first_use(monkeypatch):
+    from app import operations
+    monkeypatch.setattr(operations, "_array_backend", None)
+    assert np.array_equal(Addition().execute(np.array([1.0, 2.0]), np.array([3.0, 4.0])), [4, 6])
+    assert operations._array_backend.name == "numpy"
+
+
+def test_matrix_multiplication_is_opt_in():
+    with pytest.raises(ValueError, match="Unknown operation"):
+        OperationFactory.create_operation("matmul")
+    op = MatrixMultiplication()
+    a = np.array([[1.0, 2.0], [3.0, 4.0]])
+    assert np.array_equal(op.execute(a, np.array([1.0, 1.0])), [3, 7])
+    assert op.execute(np.array([1.0, 2.0]), np.array([3.0, 4.0])) == 11
+    with pytest.raises(ValidationError, match="not aligned"):
+        op.execute(a, np.ones((3, 2)))
+    with pytest.raises(ValidationError, match="needs vector or matrix operands"):
+        op.execute(a, Decimal(2))
@@ -0,0 +1,76 @@
+import csv
+from decimal import Decimal
+import numpy as np
+import pytest
+from app.calculator_config import CalculatorConfig
+from app.parameter_sweep import OperandRange, ParameterSweep
+from app.shared_batch import STATUS_OK, STATUS_VALIDATION_ERROR
+
+
+def make_config(tmp_path, backend="decimal"):
+    return CalculatorConfig(base_dir=tmp_path, auto_save=False, backend=backend)
+
+
+def test_operand_range():
+    steps = OperandRange(0, 1, "0.1")
+    assert len(steps) == 11
+    assert steps.decimals(9) == [Decimal("0.9"), Decimal("1.0")]
+    assert steps.floats(0, 3).tolist() == [0.0, 0.1, 0.2]
+    assert len(OperandRange(5, 1)) == 0
+    assert len(OperandRange(1, 10_000)) == 10_000
+    with pytest.raises(ValueError, match="positive"):
+        OperandRange(0, 1, 0)
+
+
+def test_float_sweep_broadcasts_in_blocks(tmp_path):
+    sweep = ParameterSweep("Power", OperandRange(1, 10), OperandRange(0, 3, "0.5"), make_config(tmp_path, "numpy"), block_cells=20)
+    assert sweep.shape == (10, 7) and sweep.block_rows == 2
+    blocks = list(sweep.blocks())
+    assert [block.start for block in blocks] == [0, 2, 4, 6, 8]
+    table = sweep.to_array()
+    a, b = np.meshgrid(np.arange(1, 11), np.arange(0, 3.5, 0.5), indexing="ij")
+    assert np.allclose(table, a ** b)
+
+
+def test_float_sweep_marks_failed_cells(tmp_path):
+    sweep = ParameterSweep("divide", [1, 2], [0, 4], make_config(tmp_path, "float"))
+    (block,) = sweep.blocks()
+    assert block.status.tolist() == [[STATUS_VALIDATION_ERROR, STATUS_OK]] * 2
+    assert np.isnan(block.values[:, 0]).all() and block.values[:, 1].tolist() == [0.25, 0.5]
+
+
+def test_decimal_sweep_is_exact(tmp_path):
+    sweep = ParameterSweep("multiply", OperandRange("0.1", "0.3", "0.1"), [3, "x"], make_config(tmp_path), block_cells=4)
+    blocks = list(sweep.blocks())
+    assert len(blocks) == 2
+    assert blocks[0].values.tolist() == [[Decimal("0.3"), None], [Decimal("0.6"), None]]
+    assert blocks[1].status.tolist() == [[STATUS_OK, STATUS_VALIDATION_ERROR]]
+    table = sweep.to_array(width=3)
+    assert table.tolist() == [[b"0.3", b""], [b"0.6", b""], [b"0.9", b""]]
+    # Results wider than the column are left empty
+    assert ParameterSweep("divide", [1], [3], make_config(tmp_path)).to_array(width=4).tolist() == [[b""]]
+
+
+def test_memory_mapped_output(tmp_path):
+    path = tmp_path / "table.npy"
+    sweep = ParameterSweep("add", OperandRange(1, 1000), OperandRange(0, 9), make_config(tmp_path, "numpy"), block_cells=1000)
+    table = sweep.to_array(path)
+    assert isinstance(table, np.memmap)
+    loaded = np.load(path, mmap_mode="r")
+    assert loaded.shape == (1000, 10) and loaded[999, 9] == 1009
+
+
+def test_csv_table(tmp_path):
+    path = tmp_path / "table.csv"
+    assert ParameterSweep("root", [4, -4], [2], make_config(tmp_path)).write_csv(path) == 1
+    with open(path, newline="") as file:
+        rows = list(csv.reader(file))
+    assert rows == [["a", "b", "result", "status"], ["4", "2", "2", "ok"], ["-4", "2", "", "validation_error"]]
+    ParameterSweep("root", [9], [2], make_config(tmp_path, "numpy")).write_csv(path)
+    with open(path, newline="") as file:
+        assert list(csv.reader(file))[1] == ["9.0", "2.0", "3.0", "ok"]
+
+
+def test_unknown_operation(tmp_path):
+    with pytest.raises(ValueError, match="Unknown operation"):
+        ParameterSweep("cube", [1], [1], make_config(tmp_path))
@@ -0,0 +1,184 @@
+import importlib.metadata
+import json
+import sys
+import textwrap
+from decimal import Decimal
+import numpy as np
+import pytest
+from app import plugins
+from app.calculation import Calculation
+from app.calculator import Calculator
+from app.calculator_config import CalculatorConfig
+from app.numeric_backends import get_backend
+from app.operations import Addition, OperationFactory
+from app.plugins import PluginSpec, install_plugins, plugin_index, plugin_kernel, scan_directory
+from app.shared_batch import STATUS_OK, STATUS_VALIDATION_ERROR, compute_float_rows
+
+HYPOT = '''
+import numpy as np
+from app.exceptions import ValidationError
+from app.operations import Operation
+
+calls = []
+
+
+class Hypotenuse(Operation):
+    def execute(self, a, b):
+        if a < 0 or b < 0:
+            raise ValidationError("Sides must not be negative")
+        return (a * a + b * b).sqrt() if hasattr(a, "sqrt") else (a * a + b * b) ** 0.5
+
+    def execute_batch(self, a, b):
+        calls.append(len(a))
+        if (a < 0).any() or (b < 0).any():
+            raise ValidationError("Sides must not be negative")
+        return np.hypot(a, b)
+
+
+OPERATIONS = {"Hypot": Hypotenuse}
+'''
+
+
+@pytest.fixture
+def isolated(monkeypatch):
+    """Give each test its own OperationFactory registry and installed plugins."""
+    for name in ("_operations", "_codes", "_instances", "_loaders"):
+        monkeypatch.setattr(OperationFactory, name, dict(getattr(OperationFactory, name)))
+    for name in ("_names", "_dispatch"):
+        monkeypatch.setattr(OperationFactory, name, list(getattr(OperationFactory, name)))
+    monkeypatch.setattr(plugins, "_installed", {})
+    monkeypatch.setattr(plugins, "_indexes", {})
+    monkeypatch.setattr(importlib.metadata, "entry_points", lambda group: [])
+    yield
+    for module in [name for name in sys.modules if name.startswith(plugins.PLUGIN_PACKAGE + ".")]:
+        del sys.modules[module]
+
+
+def make_config(tmp_path, **kwargs):
+    return CalculatorConfig(base_dir=tmp_path, auto_save=False, plugins=True, **kwargs)
+
+
+def write_plugin(tmp_path, name, source):
+    directory = tmp_path / "plugins"
+    directory.mkdir(exist_ok=True)
+    (directory / f"{name}.py").write_text(textwrap.dedent(source))
+
+
+def test_directory_plugins_load_on_first_use(tmp_path, isolated):
+    write_plugin(tmp_path, "hypot", HYPOT)
+    config = make_config(tmp_path)
+    calc = Calculator(config)
+    assert install_plugins(config) == ["hypot"]
+    assert OperationFactory.has_operation("HYPOT")
+    assert "calculator_plugins.hypot" not in sys.modules
+    code = OperationFactory.op_code("hypot")
+
+    assert calc.calculate("hypot", 3, 4) == Decimal(5)
+    assert "calculator_plugins.hypot" in sys.modules
+    assert calc.history[-1].operation == "Hypotenuse"
+    assert OperationFactory.dispatch(code)(Decimal(5), Decimal(12)) == Decimal(13)
+    # History entries recompute through the plugin
+    assert Calculation("Hypotenuse", Decimal(6), Decimal(8)).result == Decimal(10)
+    assert plugin_kernel("Hypotenuse", get_backend("float"))(6.0, 8.0) == 10.0
+    assert plugin_kernel("Nope") is None
+
+    # Installing again is free and keeps the loaded class
+    loaded = OperationFactory.create_operation("hypot")
+    assert install_plugins(config) == ["hypot"]
+    assert OperationFactory.create_operation("hypot") is loaded
+
+
+def test_plugins_are_opt_in(tmp_path, isolated):
+    write_plugin(tmp_path, "hypot", HYPOT)
+    config = CalculatorConfig(base_dir=tmp_path, auto_save=False)
+    assert install_plugins(config) == []
+    assert not OperationFactory.has_operation("hypot")
+
+
+def test_index_is_cached_until_plugins_change(tmp_path, isolated, monkeypatch):
+    write_plugin(tmp_path, "hypot", HYPOT)
+    config = make_config(tmp_path)
+    specs = plugin_index(config.plugin_index, config.plugin_dir)
+    assert specs == [PluginSpec("hypot", "calculator_plugins.hypot", "Hypotenuse", str(config.plugin_dir / "hypot.py"))]
+    assert json.loads(config.plugin_index.read_text())["plugins"][0]["attr"] == "Hypotenuse"
+
+    def no_scan(*args):
+        raise AssertionError("scanned")
+
+    monkeypatch.setattr(plugins, "scan_directory", no_scan)
+    assert plugin_index(config.plugin_index, config.plugin_dir) == specs
+    monkeypatch.setattr(plugins, "scan_directory", scan_directory)
+
+    # A new plugin file changes the fingerprint, so the directory is rescanned
+    write_plugin(tmp_path, "twice", '''
+        from app.operations import Multiplication
+        class Twice(Multiplication):
+            pass
+        OPERATIONS = {"twice": Twice}
+    ''')
+    assert [spec.name for spec in plugin_index(config.plugin_index, config.plugin_dir)] == ["hypot", "twice"]
+    config.plugin_index.write_text("{not json")
+    assert len(plugin_index(config.plugin_index, config.plugin_dir)) == 2
+    assert len(plugin_index(config.plugin_index, config.plugin_dir, refresh=True)) == 2
+
+
+def test_entry_point_plugins(tmp_path, isolated, monkeypatch):
+    group = plugins.ENTRY_POINT_GROUP
+    entry_points = [
+        importlib.metadata.EntryPoint("Plus", "app.operations:Addition", group),
+        importlib.metadata.EntryPoint("whole", "app.operations", group),
+    ]
+    monkeypatch.setattr(importlib.metadata, "entry_points", lambda group: entry_points)
+    assert plugins.scan_entry_points() == [PluginSpec("plus", "app.operations", "Addition")]
+    assert install_plugins(make_config(tmp_path)) == ["plus"]
+    assert isinstance(OperationFactory.create_operation("plus"), Addition)
+
+
+def test_bad_plugins_are_skipped_or_fail_on_use(tmp_path, isolated, caplog):
+    write_plugin(tmp_path, "_private", "OPERATIONS = {'private': Private}")
+    write_plugin(tmp_path, "broken", "def (")
+    write_plugin(tmp_path, "computed", "OPERATIONS = dict(x=1)")
+    write_plugin(tmp_path, "strings", "OPERATIONS = {'s': 'Strings'}")
+    write_plugin(tmp_path, "missing", "x = 1")
+    write_plugin(tmp_path, "taken", "from app.operations import Addition as Add\nOPERATIONS = {'add': Add, 'dup': Add}")
+    write_plugin(tmp_path, "unloadable", "from app.operations import Addition\nOPERATIONS = {'dup': Addition, 'notop': int}")
+    write_plugin(tmp_path, "zz_raises", "raise RuntimeError('boom')\nOPERATIONS = {'raises': X}")
+    config = make_config(tmp_path)
+    assert [spec.name for spec in scan_directory(config.plugin_dir)] == ["add", "dup", "dup", "notop", "raises"]
+    assert install_plugins(config) == ["dup", "notop", "raises"]
+    assert "the name is taken" in caplog.text and "duplicate" in caplog.text
+    assert "no literal OPERATIONS" in caplog.text and "must map operation names" in caplog.text
+
+    assert isinstance(OperationFactory.create_operation("add"), Addition)
+    assert OperationFactory.create_operation("dup").execute(Decimal(1), Decimal(2)) == Decimal(3)
+    with pytest.raises(ValueError, match="Cannot load operation notop: .*not an Operation class"):
+        OperationFactory.create_operation("notop")
+    for _ in range(2):
+        with pytest.raises(ValueError, match="Cannot load operation raises: boom"):
+            OperationFactory.dispatch(OperationFactory.op_code("raises"))
+        assert "calculator_plugins.zz_raises" not in sys.modules
+
+
+def test_refresh_picks_up_changed_plugins(tmp_path, isolated):
+    write_plugin(tmp_path, "ops", "from app.operations import Addition\nOPERATIONS = {'op': Addition}")
+    config = make_config(tmp_path)
+    install_plugins(config)
+    assert isinstance(OperationFactory.create_operation("op"), Addition)
+    write_plugin(tmp_path, "ops", "from app.operations import Subtraction\nOPERATIONS = {'op': Subtraction}")
+    del sys.modules["calculator_plugins.ops"]
+    assert install_plugins(config, refresh=True) == ["op"]
+    assert OperationFactory.create_operation("op").execute(Decimal(5), Decimal(2)) == Decimal(3)
+
+
+def test_batch_jobs_use_vectorized_kernel(tmp_path, isolated):
+    write_plugin(tmp_path, "hypot", HYPOT)
+    config = make_config(tmp_path)
+    install_plugins(config)
+    a, b = np.array([3.0, 5.0]), np.array([4.0, 12.0])
+    result, status = np.empty(2), np.empty(2, np.uint8)
+    compute_float_rows("hypot", a, b, result, status, config)
+    assert result.tolist() == [5.0, 13.0] and status.tolist() == [STATUS_OK] * 2
+    assert sys.modules["calculator_plugins.hypot"].calls == [2]
+    # A rejected chunk falls back to execute row by row
+    compute_float_rows("hypot", np.array([3.0, -1.0]), b, result, status, config)
+    assert result[0] == 5.0 and status.tolist() == [STATUS_OK, STATUS_VALIDATION_ERROR]
@@ -0,0 +1,101 @@
+from decimal import Decimal, localcontext
+import statistics
+import pytest
+from app.calculator_config import CalculatorConfig
+from app.decimal_math import GUARD_DIGITS
+from app.exceptions import OperationError, ValidationError
+from app.reductions import (
+    EXACT_CONTEXT, ReductionResult, _TreeAccumulator, get_reducer, reduce_chunk, reduce_values
+)
+
+
+def make_config(tmp_path, backend="decimal", digits=10):
+    return CalculatorConfig(base_dir=tmp_path, auto_save=False, backend=backend, significant_digits=digits)
+
+
+def test_sum_is_exact_until_the_final_rounding(tmp_path):
+    values = ["1E+20", "1", "-1E+20"] * 3
+    # A running 10-digit sum would lose every 1
+    assert reduce_values("sum", values, make_config(tmp_path), chunk_size=2).value == Decimal(3)
+    result = reduce_values("sum", iter(["0.1"] * 1000), make_config(tmp_path), chunk_size=64)
+    assert result == ReductionResult(Decimal("100.0"), 1000, 16)
+
+
+def test_product_min_max(tmp_path):
+    config = make_config(tmp_path)
+    assert reduce_values("product", range(1, 21), config, chunk_size=3).value == Decimal("2.432902008E+18")
+    assert reduce_values("Product", ["1.5", 2, "-3"], config).value == Decimal("-9.0")
+    assert reduce_values("min", [3, "-2.5", 7], config, chunk_size=1).value == Decimal("-2.5")
+    assert reduce_values("max", (n % 17 for n in range(100)), config, chunk_size=8).value == 16
+
+
+def test_product_state_stays_at_working_precision(tmp_path):
+    config = make_config(tmp_path)
+    _, state = reduce_chunk("product", ["1.000000007"] * 5000, config)
+    assert len(state.as_tuple().digits) <= 10 + GUARD_DIGITS
+    assert reduce_values("product", ["1.000000007"] * 5000, config, chunk_size=64).value == Decimal("1.000035001")
+
+
+def test_overflow_is_an_operation_error(tmp_path):
+    config = make_config(tmp_path)
+    for chunk_size in (2000, 1):
+        with pytest.raises(OperationError, match="Product overflowed"):
+            reduce_values("product", ["1e999"] * 2000, config, chunk_size=chunk_size)
+
+
+def test_mean_and_variance_match_statistics(tmp_path):
+    config = make_config(tmp_path, digits=20)
+    with localcontext(config.create_decimal_context()):
+        values = [Decimal(n) / 7 + Decimal("1E+6") for n in range(500)]
+        for chunk_size in (1, 33, 1000):
+            assert reduce_values("mean", values, config, chunk_size=chunk_size).value == +statistics.mean(values)
+            assert reduce_values("variance", values, config, chunk_size=chunk_size).value == +statistics.variance(values)
+            assert reduce_values("pvariance", values, config, chunk_size=chunk_size).value == +statistics.pvariance(values)
+
+
+def test_empty_and_undefined_inputs(tmp_path):
+    config = make_config(tmp_path)
+    assert reduce_values("sum", [], config) == ReductionResult(Decimal(0), 0, 0)
+    assert reduce_values("product", [], config).value == 1
+    for name in ("min", "max", "mean", "pvariance"):
+        with pytest.raises(OperationError, match="fewer than 1|no values"):
+            reduce_values(name, [], config)
+    with pytest.raises(OperationError, match="fewer than 2 values"):
+        reduce_values("variance", [5], config)
+    with pytest.raises(ValidationError):
+        reduce_values("sum", [1, "x"], config)
+    with pytest.raises(ValidationError):
+        reduce_values("sum", ["1E+1000"], config)
+    with pytest.raises(ValueError, match="Unknown reduction: median"):
+        get_reducer("median")
+
+
+def test_float_backend_config_reduces_in_decimal(tmp_path):
+    assert reduce_values("sum", ["0.1", "0.2"], make_config(tmp_path, "numpy")).value == Decimal("0.3")
+
+
+def test_tree_accumulator_merges_balanced_runs():
+    merges = []
+    reducer = get_reducer("sum")
+
+    class Recording:
+        def merge(self, left, right, context):
+            merges.append((left, right))
+            return reducer.merge(left, right, context)
+
+    accumulator = _TreeAccumulator(Recording(), EXACT_CONTEXT)
+    for state in map(Decimal, range(1, 6)):
+        accumulator.push(state)
+    assert [level for level, _ in accumulator.stack] == [2, 0]
+    assert accumulator.result() == 15
+    assert merges[:3] == [(1, 2), (3, 4), (3, 7)]
+    assert _TreeAccumulator(reducer, EXACT_CONTEXT).result() is None
+
+
+def test_parallel_reduction(tmp_path):
+    config = make_config(tmp_path)
+    values = (str(n) for n in range(10_000))
+    assert reduce_values("sum", values, config, chunk_size=500, workers=2) == ReductionResult(Decimal(49995000), 10_000, 20)
+    assert reduce_values("mean", range(7), config, chunk_size=2, workers=1).value == 3
+    # Worker side, in this process so it is covered
+    assert reduce_chunk("max", ["1", "3", "2"], config) == (3, Decimal(3))
@@ -0,0 +1,225 @@
+import multiprocessing
+import os
+import threading
+from decimal import Decimal
+import pytest
+from app import decimal_math, result_store
+from app.calculator import Calculator
+from app.calculator_config import CalculatorConfig
+from app.calculator_manager import CalculatorManager
+from app.result_store import (
+    PersistentResultStore, TieredResultCache, install_result_store, open_result_store
+)
+from app.shared_cache import SharedResultCache, result_key
+
+
+@pytest.fixture
+def no_refresh_delay(monkeypatch):
+    monkeypatch.setattr(result_store, "REFRESH_INTERVAL", 0.0)
+
+
+@pytest.fixture
+def restore_cache():
+    previous = decimal_math.set_result_cache(None)
+    yield
+    decimal_math.set_result_cache(previous)
+
+
+def test_results_survive_reopening(tmp_path):
+    path = tmp_path / "store"
+    store = PersistentResultStore(path)
+    assert store.get(b"missing") is None and len(store) == 0
+    assert store.put(b"k1", "1.5")
+    assert store.get(b"k1") == "1.5"      # pending results are visible at once
+    assert not store.put(b"wide", "9" * 97)
+    assert store.flush() == 1
+    assert store.flush() == 0             # nothing new to write
+    store.close()
+    store.close()
+
+    reopened = PersistentResultStore(path)
+    assert reopened._map is None          # nothing is read until the first lookup
+    assert reopened.get(b"k1") == "1.5"
+    assert len(reopened) == 1
+    assert (reopened.hits, reopened.misses) == (1, 0)
+    reopened.close()
+
+
+def test_flushes_after_enough_pending_results(tmp_path, no_refresh_delay):
+    store = PersistentResultStore(tmp_path / "store", flush_every=3)
+    for n in range(7):
+        store.put(str(n).encode(), str(n))
+    flusher = store._flusher
+    if flusher is not None:
+        flusher.join()
+    assert len(store._pending) < 3 and len(store) + len(store._pending) == 7
+    assert [store.get(str(n).encode()) for n in range(7)] == [str(n) for n in range(7)]
+
+
+def test_put_does_not_wait_for_background_flush(tmp_path, monkeypatch):
+    store = PersistentResultStore(tmp_path / "store", flush_every=2)
+    release = threading.Event()
+    rewrite = store._rewrite
+
+    def slow_rewrite(pending, counts):
+        release.wait()
+        return rewrite(pending, counts)
+
+    monkeypatch.setattr(store, "_rewrite", slow_rewrite)
+    for key in (b"a", b"b", b"c"):
+        assert store.put(key, key.decode())
+    # The flush is stuck writing a and b, which lookups still see
+    assert store._flusher.is_alive() and not store.path.exists()
+    assert [store.get(key) for key in (b"a", b"b", b"c")] == ["a", "b", "c"]
+    release.set()
+    store.close()
+    assert PersistentResultStore(store.path).get(b"c") == "c"
+
+
+def test_failed_background_flush_keeps_results(tmp_path, monkeypatch, caplog):
+    store = PersistentResultStore(tmp_path / "store", flush_every=1)
+
+    def fail(pending, counts):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(store, "_rewrite", fail)
+    store.put(b"k", "1")
+    store._flusher.join()
+    assert "Failed to flush result store" in caplog.text
+    assert store._flusher is None and store.get(b"k") == "1"
+    monkeypatch.undo()
+    assert store.flush() == 1
+
+
+def test_ttl_expires_entries(tmp_path, monkeypatch):
+    store = PersistentResultStore(tmp_path / "store", ttl=60)
+    store.put(b"old", "1")
+    store.flush()
+    now = result_store.time.time()
+    monkeypatch.setattr(result_store.time, "time", lambda: now + 61)
+    store.put(b"new", "2")
+    assert store.get(b"old") is None and store.get(b"new") == "2"
+    assert store.flush() == 1           # the expired entry is dropped
+    assert store.get(b"old") is None
+
+
+def test_evicts_least_frequently_used(tmp_path):
+    store = PersistentResultStore(tmp_path / "store", max_entries=2)
+    for key in (b"a", b"b", b"c"):
+        store.put(key, key.decode())
+    store.get(b"a")
+    store.get(b"a")
+    store.get(b"c")
+    assert store.flush() == 2
+    assert store.evictions == 1
+    assert [store.get(key) for key in (b"a", b"b", b"c")] == ["a", None, "c"]
+    # Hits made against the file carry over into the next one
+    store.put(b"d", "d")
+    store.flush()
+    assert store.get(b"a") == "a" and store.get(b"d") is None
+
+
+def test_read_only_store(tmp_path, monkeypatch):
+    path = tmp_path / "store"
+    writer = PersistentResultStore(path)
+    writer.put(b"k", "7")
+    writer.close()
+    monkeypatch.setattr(result_store.os, "access", lambda path, mode: False)
+    reader = PersistentResultStore(path)
+    assert reader.read_only
+    assert not reader.put(b"other", "8")
+    assert reader.get(b"k") == "7"
+    assert not reader._counts and reader.flush() == 0
+    reader.close()
+
+
+def test_writers_merge_and_readers_follow(tmp_path, no_refresh_delay):
+    path = tmp_path / "store"
+    first, second = PersistentResultStore(path), PersistentResultStore(path)
+    reader = PersistentResultStore(path, read_only=True)
+    assert reader.get(b"a") is None       # no file yet
+    first.put(b"a", "1")
+    first.flush()
+    assert reader.get(b"a") == "1"
+    second.put(b"b", "2")
+    second.flush()
+    # The second writer merged the first one's entry into its file
+    assert reader.get(b"a") == "1" and reader.get(b"b") == "2"
+    assert len(reader) == 2
+
+
+def test_ignores_foreign_files_and_cleans_up_failed_writes(tmp_path, monkeypatch):
+    path = tmp_path / "store"
+    path.write_bytes(b"not a result store")
+    store = PersistentResultStore(path)
+    assert store.get(b"k") is None
+    store.put(b"k", "1")
+
+    def fail(source, target):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(result_store.os, "replace", fail)
+    with pytest.raises(OSError, match="disk full"):
+        store.flush()
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["store", "store.lock"]
+    monkeypatch.undo()
+    assert store.flush() == 1
+
+
+def compute_in_child(path):
+    store = PersistentResultStore(path)
+    decimal_math.set_result_cache(store)
+    decimal_math.root(Decimal(7), Decimal(5), 30)
+    store.close()
+    os._exit(0)
+
+
+def test_results_outlive_the_process(tmp_path):
+    path = tmp_path / "store"
+    process = multiprocessing.get_context("fork").Process(target=compute_in_child, args=(path,))
+    process.start()
+    process.join()
+    store = PersistentResultStore(path)
+
+    def compute(a, b, precision):
+        raise AssertionError("should have been stored")  # pragma: no cover
+
+    expected = decimal_math._root(Decimal(7), Decimal(5), 30)
+    assert store.get_or_compute("root", Decimal(7), Decimal(5), 30, compute) == expected
+
+
+def test_install_from_config(tmp_path, monkeypatch, restore_cache):
+    assert install_result_store(CalculatorConfig(base_dir=tmp_path)) is None
+    path = tmp_path / "config-store"
+    monkeypatch.setenv("CALCULATOR_RESULT_STORE", str(path))
+    config = CalculatorConfig(base_dir=tmp_path, auto_save=False)
+    assert config.result_store == path
+    Calculator(config).calculate("root", 2, 3)
+    store = decimal_math._result_cache
+    assert store is open_result_store(path)
+    # Operation.execute and Calculation both compute the root; the second is a hit
+    assert (store.misses, store.hits) == (1, 1)
+    CalculatorManager(config).calculate("s", "root", 2, 3)
+    assert store.hits == 3
+
+
+def test_tiered_behind_shared_cache(tmp_path, restore_cache):
+    config = CalculatorConfig(
+        base_dir=tmp_path, auto_save=False,
+        shared_cache=tmp_path / "shared", result_store=tmp_path / "tiered-store"
+    )
+    Calculator(config)
+    tiered = decimal_math._result_cache
+    assert isinstance(tiered, TieredResultCache)
+    assert isinstance(tiered.front, SharedResultCache)
+    # Installing again keeps a single layer in front of the store
+    install_result_store(config)
+    assert decimal_math._result_cache.front is tiered.front
+
+    a, b = Decimal(5), Decimal(3)
+    decimal_math.root(a, b, 12)
+    tiered.back.flush()
+    tiered.front.clear()   # as after a reboot: the shared cache is empty, the store is not
+    assert decimal_math.root(a, b, 12) == decimal_math._root(a, b, 12)
+    assert tiered.back.hits == 1
+    assert tiered.front.get(result_key("root", a, b, 12)) is not None
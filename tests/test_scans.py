@@ -0,0 +1,74 @@
+from decimal import Decimal, InvalidOperation
+import itertools
+import numpy as np
+import pytest
+from app.calculator_config import CalculatorConfig
+from app.exceptions import OperationError, ValidationError
+from app.scans import RunningSum, get_scan, scan, scan_array, scan_decimal
+
+
+def make_config(tmp_path, backend="decimal", digits=10):
+    return CalculatorConfig(base_dir=tmp_path, auto_save=False, backend=backend, significant_digits=digits)
+
+
+def test_running_sum_is_exact_until_each_rounding(tmp_path):
+    results = list(scan_decimal("cumsum", ["1E+20", "1", "-1E+20", "1"], make_config(tmp_path)))
+    # A 10-digit running total would lose the 1s
+    assert results == [Decimal("1E+20"), Decimal("1.000000000E+20"), 1, 2]
+
+
+def test_decimal_scans_stream(tmp_path):
+    config = make_config(tmp_path)
+    assert list(scan_decimal("cumprod", ["1.5", 2, "-3"], config)) == [Decimal("1.5"), 3, -9]
+    assert list(scan_decimal("CumMax", [3, 1, 4, 1, 5], config)) == [3, 3, 4, 4, 5]
+    assert list(scan_decimal("cummin", [3, 1, 4, 0, 5], config)) == [3, 1, 1, 0, 0]
+    # Only as much input as is consumed is read
+    evens = scan_decimal("cumsum", itertools.count(0, 2), config)
+    assert list(itertools.islice(evens, 4)) == [0, 2, 6, 12]
+    assert list(scan_decimal("cumsum", [], config)) == []
+
+
+def test_compounded_percent(tmp_path):
+    config = make_config(tmp_path)
+    assert list(scan_decimal("compound", [10, -10, 100, -100], config)) == [10, -1, 98, -100]
+    results = scan_array("compound", [10, -10, 100], make_config(tmp_path, "numpy"))
+    np.testing.assert_allclose(results, [10, -1, 98])
+
+
+def test_numpy_scans_match_decimal(tmp_path):
+    values = [str(n % 7 - 3) for n in range(50)]
+    for name in ("cumsum", "cummax", "cummin"):
+        expected = [float(r) for r in scan_decimal(name, values, make_config(tmp_path))]
+        results = scan(name, values, make_config(tmp_path, "numpy"))
+        assert isinstance(results, np.ndarray)
+        np.testing.assert_array_equal(results, expected)
+    np.testing.assert_array_equal(scan_array("cumprod", [1, 2, "3"], make_config(tmp_path, "float")), [1, 2, 6])
+
+
+def test_invalid_values(tmp_path):
+    config = make_config(tmp_path)
+    results = scan_decimal("cumsum", [1, 2, "x"], config)
+    assert next(results) == 1 and next(results) == 3
+    with pytest.raises(ValidationError):
+        next(results)
+    with pytest.raises(ValidationError, match="position 2"):
+        scan_array("cumsum", [1, 2, "x"], make_config(tmp_path, "numpy"))
+    with pytest.raises(OperationError, match="RunningProduct overflowed at position 1"):
+        scan_array("cumprod", ["1e200", "1e200"], make_config(tmp_path, "numpy"))
+    with pytest.raises(ValueError, match="Unknown scan: median"):
+        get_scan("median")
+
+
+def test_decimal_overflow_is_an_operation_error(tmp_path, monkeypatch):
+    results = scan_decimal("cumprod", ["1e999"] * 2000, make_config(tmp_path))
+    assert next(results) == Decimal("1E+999")
+    with pytest.raises(OperationError, match="RunningProduct overflowed at position 1001"):
+        list(results)
+
+    def undefined(self, values, context, working):
+        yield next(values)
+        raise InvalidOperation
+
+    monkeypatch.setattr(RunningSum, "stream", undefined)
+    with pytest.raises(OperationError, match="RunningSum is undefined at position 1"):
+        list(scan_decimal("cumsum", [1, 2], make_config(tmp_path)))
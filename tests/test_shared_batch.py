@@ -0,0 +1,163 @@
+from decimal import Decimal
+import numpy as np
+import pytest
+from app.calculator_config import CalculatorConfig
+from app.exceptions import OperationError, ValidationError
+from app import shared_batch
+from app.shared_batch import (
+    STATUS_OK, STATUS_OPERATION_ERROR, STATUS_RESULT_TOO_WIDE, STATUS_VALIDATION_ERROR,
+    DECIMAL_WIDTH, SharedBatchExecutor, SharedColumns, _init_worker, _run_chunk, decimal_width,
+    encode_decimals, encode_floats
+)
+
+
+def make_config(tmp_path, backend="decimal"):
+    return CalculatorConfig(base_dir=tmp_path, auto_save=False, backend=backend, significant_digits=10)
+
+
+@pytest.mark.parametrize("backend", ["decimal", "hybrid"])
+def test_decimal_batch(tmp_path, backend):
+    with SharedBatchExecutor(make_config(tmp_path, backend), workers=2, chunk_rows=2) as executor:
+        assert executor.kind == "decimal"
+        result = executor.run("Divide", [1, "2", Decimal("3.5"), "x", 1], [4, 0, 7, 1, 3])
+        assert result.values[:4] == [Decimal("0.25"), None, Decimal("0.5"), None]
+        assert result.values[4] == Decimal("0.3333333333")
+        assert result.status.tolist() == [STATUS_OK, STATUS_VALIDATION_ERROR, STATUS_OK, STATUS_VALIDATION_ERROR, STATUS_OK]
+        assert result.failures == 2
+        wide = executor.run("power", [2, 10], [10, 60])
+        assert wide.values == [Decimal(1024), None]
+        assert wide.status.tolist() == [STATUS_OK, STATUS_RESULT_TOO_WIDE]
+
+
+@pytest.mark.parametrize("backend", ["float", "numpy"])
+def test_float_batch(tmp_path, backend):
+    with SharedBatchExecutor(make_config(tmp_path, backend), workers=1) as executor:
+        assert executor.kind == "float"
+        result = executor.run("root", [9, -8, "16", "x"], [2, 2, 4, 2])
+        assert result.values[[0, 2]].tolist() == [3.0, 2.0]
+        assert np.isnan(result.values[[1, 3]]).all()
+        assert result.status.tolist() == [STATUS_OK, STATUS_VALIDATION_ERROR, STATUS_OK, STATUS_VALIDATION_ERROR]
+        assert executor.run("multiply", [1.5, 2], [2, 3]).values.tolist() == [3.0, 6.0]
+
+
+def test_compute_in_place(tmp_path):
+    with SharedBatchExecutor(make_config(tmp_path, "numpy"), workers=1, chunk_rows=1000) as executor:
+        with executor.columns(2500) as columns:
+            columns.a[:] = np.arange(2500)
+            columns.b[:] = 2
+            assert executor.compute("add", columns) == 0
+            assert columns.result[-1] == 2501
+        with pytest.raises(ValueError, match="Unknown operation"):
+            executor.compute("nope", executor.columns(1))
+
+
+def test_run_rejects_mismatched_and_oversized_operands(tmp_path):
+    with SharedBatchExecutor(make_config(tmp_path), workers=1) as executor:
+        with pytest.raises(ValueError, match="same length"):
+            executor.run("add", [1, 2], [1])
+        with pytest.raises(ValidationError, match="does not fit"):
+            executor.run("add", ["1" * 60], [1])
+        assert executor.run("add", [], []).values == []
+
+
+def test_columns_layout_and_attach():
+    with SharedColumns(3, "decimal", width=8) as owner:
+        owner.a[:] = encode_decimals([1, "2.5", Decimal("-3")], 8)
+        owner.status[:] = [0, 1, 2]
+        other = SharedColumns(3, "decimal", width=8, name=owner.name)
+        assert other.a.tolist() == [b"1", b"2.5", b"-3"]
+        assert other.status.tolist() == [0, 1, 2]
+        other.close()
+        descriptor = owner.descriptor("add", 0, 3)
+        assert (descriptor.name, descriptor.rows, descriptor.stop) == (owner.name, 3, 3)
+    with pytest.raises(ValueError, match="Unknown column kind"):
+        SharedColumns(1, "complex")
+
+
+def test_encode_floats_marks_unparsable_rows():
+    assert encode_floats([1, "2.5"]).tolist() == [1.0, 2.5]
+    values = encode_floats(["1", "abc", None])
+    assert values[0] == 1.0 and np.isnan(values[1:]).all()
+
+
+def test_run_chunk_in_process(tmp_path):
+    # Exercise the worker side in this process so it is covered
+    _init_worker(make_config(tmp_path))
+    with SharedColumns(3, "decimal") as first, SharedColumns(1, "decimal", width=4) as narrow:
+        first.a[:] = encode_decimals([6, 1, 2])
+        first.b[:] = encode_decimals([3, 0, 3])
+        assert _run_chunk(first.descriptor("divide", 0, 3)) == 1
+        assert first.result.tolist()[0] == b"2"
+        assert first.status.tolist() == [STATUS_OK, STATUS_VALIDATION_ERROR, STATUS_OK]
+        # A different block replaces the attached one
+        narrow.a[:] = encode_decimals([1], 4)
+        narrow.b[:] = encode_decimals([3], 4)
+        assert _run_chunk(narrow.descriptor("divide", 0, 1)) == 1
+        assert narrow.status.tolist() == [STATUS_RESULT_TOO_WIDE]
+        shared_batch._columns.close()
+
+    _init_worker(make_config(tmp_path, "numpy"))
+    with SharedColumns(2, "float") as columns:
+        columns.a[:] = [1e308, 4]
+        columns.b[:] = [10, 0]
+        # One zero divisor forces the per-row path
+        assert _run_chunk(columns.descriptor("divide", 0, 2)) == 1
+        assert columns.status.tolist() == [STATUS_OK, STATUS_VALIDATION_ERROR]
+        assert _run_chunk(columns.descriptor("multiply", 0, 2)) == 1
+        assert columns.status.tolist() == [STATUS_OPERATION_ERROR, STATUS_OK]
+        columns.a[:] = [2, 10]
+        columns.b[:] = [-1, 2000]
+        # Per row, the float backend overflows where NumPy would return inf
+        assert _run_chunk(columns.descriptor("power", 0, 2)) == 2
+        assert columns.status.tolist() == [STATUS_VALIDATION_ERROR, STATUS_OPERATION_ERROR]
+        shared_batch._columns.close()
+
+
+def test_worker_reports_operation_errors(tmp_path, monkeypatch):
+    _init_worker(make_config(tmp_path))
+
+    def boom(a, b):
+        raise ArithmeticError("boom")
+
+    monkeypatch.setattr(shared_batch, "_kernel", lambda name, backend: boom)
+    texts, statuses = shared_batch.compute_decimal_rows("add", ["1"], ["2"], 48)
+    assert (texts, statuses) == ([""], [STATUS_OPERATION_ERROR])
+
+    _init_worker(make_config(tmp_path, "float"))
+    result, status = np.empty(2), np.empty(2, np.uint8)
+    # A failing vectorized call falls back to rows instead of failing the chunk
+    shared_batch.compute_float_rows("add", np.ones(2), np.ones(2), result, status)
+    assert status.tolist() == [STATUS_OPERATION_ERROR] * 2
+    assert np.isnan(result).all()
+
+
+def test_numpy_kernel_errors_only_fail_their_rows(tmp_path, monkeypatch):
+    _init_worker(make_config(tmp_path, "numpy"))
+
+    def kernel(name, backend):
+        def execute(a, b):
+            if backend == "numpy" or a == 0:
+                raise OperationError("boom")
+            return a + b
+        return execute
+
+    monkeypatch.setattr(shared_batch, "_kernel", kernel)
+    result, status = np.empty(2), np.empty(2, np.uint8)
+    shared_batch.compute_float_rows("add", np.array([0.0, 1.0]), np.ones(2), result, status)
+    assert status.tolist() == [STATUS_OPERATION_ERROR, STATUS_OK]
+    assert result[1] == 2.0
+
+
+def test_decimal_width_follows_precision(tmp_path):
+    assert decimal_width(make_config(tmp_path)) == DECIMAL_WIDTH
+    config = CalculatorConfig(base_dir=tmp_path, auto_save=False, significant_digits=100)
+    assert decimal_width(config) == 110
+    with SharedBatchExecutor(config, workers=1) as executor:
+        assert executor.width == 110
+        third = executor.run("divide", ["-1e-7"], [3]).values[0]
+        assert third.adjusted() == -8
+        assert len(third.as_tuple().digits) == 100
+        # Exact integer results are not rounded, so a wider column keeps them
+        assert executor.run("power", [10], [200]).status.tolist() == [STATUS_RESULT_TOO_WIDE]
+    with SharedBatchExecutor(config, workers=1, width=256) as executor:
+        assert executor.run("power", [10], [200]).values == [Decimal(10) ** 200]
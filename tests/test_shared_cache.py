@@ -0,0 +1,193 @@
+import multiprocessing
+import os
+from pathlib import Path
+import struct
+import tempfile
+import threading
+from decimal import Decimal, localcontext, ROUND_DOWN
+import pytest
+from app import decimal_math
+from app.calculator import Calculator
+from app.calculator_config import CalculatorConfig
+from app.calculator_manager import CalculatorManager
+from app.shared_cache import (
+    SLOT_HEAD, CacheStats, SharedResultCache, default_cache_path,
+    install_shared_cache, open_shared_cache
+)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = SharedResultCache(tmp_path / "cache", sets=16, ways=2, stripes=4, value_width=32)
+    yield cache
+    cache.close()
+
+
+@pytest.fixture
+def installed(tmp_path):
+    previous = decimal_math.set_result_cache(None)
+    cache = SharedResultCache(tmp_path / "installed")
+    decimal_math.set_result_cache(cache)
+    yield cache
+    decimal_math.set_result_cache(previous)
+    cache.close()
+
+
+def test_get_put_and_stats(cache):
+    assert cache.get(b"k1") is None
+    assert cache.put(b"k1", "1.5")
+    assert cache.put(b"k1", "1.5")  # already present
+    assert cache.get(b"k1") == "1.5"
+    assert not cache.put(b"wide", "9" * 33)
+    assert cache.stats() == CacheStats(hits=1, misses=1, inserts=1)
+    assert cache.stats().hit_rate == 0.5
+    assert CacheStats().hit_rate == 0.0
+    cache.clear()
+    assert cache.get(b"k1") is None
+    assert cache.stats() == CacheStats(misses=1)
+
+
+def test_clock_keeps_recently_used_entries(tmp_path):
+    cache = SharedResultCache(tmp_path / "clock", sets=1, ways=3, stripes=1)
+    for key in (b"a", b"b", b"c"):
+        cache.put(key, key.decode())
+    cache.get(b"a")
+    cache.get(b"c")
+    cache.put(b"d", "d")  # "b" is the only entry not referenced since insertion
+    assert [cache.get(key) for key in (b"a", b"b", b"c", b"d")] == ["a", None, "c", "d"]
+    # Every bit was cleared on the way, so the next victim follows the hand
+    cache.put(b"e", "e")
+    assert cache.stats().evictions == 2
+    assert sum(cache.get(key) is not None for key in (b"a", b"c", b"d", b"e")) == 3
+    cache.close()
+
+
+def test_existing_file_keeps_its_geometry(cache, tmp_path):
+    cache.put(b"key", "42")
+    other = SharedResultCache(tmp_path / "cache", sets=999, ways=9)
+    assert (other.sets, other.ways, other.value_width) == (16, 2, 32)
+    assert other.get(b"key") == "42"
+    other.close()
+
+
+def test_get_or_compute_keys_on_precision_and_rounding(cache):
+    calls = []
+
+    def compute(a, b, precision):
+        calls.append((a, b, precision))
+        return decimal_math._root(a, b, precision)
+
+    assert cache.get_or_compute("root", Decimal(2), Decimal(2), 10, compute) == Decimal("1.414213562")
+    assert cache.get_or_compute("root", Decimal(2), Decimal(2), 10, compute) == Decimal("1.414213562")
+    assert cache.get_or_compute("root", Decimal(2), Decimal(2), 5, compute) == Decimal("1.4142")
+    with localcontext() as ctx:
+        ctx.rounding = ROUND_DOWN
+        cache.get_or_compute("root", Decimal(2), Decimal(2), 10, compute)
+    assert len(calls) == 3
+
+
+def test_power_and_root_use_installed_cache(installed):
+    with localcontext() as ctx:
+        ctx.prec = 20
+        first = decimal_math.root(Decimal(3), Decimal(3))
+        assert decimal_math.root(Decimal(3), Decimal(3)) == first
+        assert decimal_math.power(Decimal("1.5"), Decimal("2.5")) == decimal_math._power(Decimal("1.5"), Decimal("2.5"), 20)
+        decimal_math.power(Decimal("1.5"), Decimal("2.5"))
+    stats = installed.stats()
+    assert (stats.hits, stats.misses) == (2, 2)
+    with pytest.raises(ValueError):
+        decimal_math.root(Decimal(-1), Decimal(2))
+    assert installed.stats().inserts == 2
+
+
+def test_concurrent_threads(installed):
+    errors = []
+
+    def work(offset):
+        for n in range(50):
+            value = Decimal(n % 10 + 2)
+            if decimal_math.root(value, Decimal(3), 15) != decimal_math._root(value, Decimal(3), 15):
+                errors.append(n)  # pragma: no cover
+
+    threads = [threading.Thread(target=work, args=(i,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    stats = installed.stats()
+    assert stats.hits + stats.misses == 400 and stats.hits >= 380
+
+
+def fill_from_child(path):
+    cache = SharedResultCache(path)
+    decimal_math.set_result_cache(cache)
+    decimal_math.root(Decimal(7), Decimal(5), 30)
+
+
+def die_holding_lock(path, key):
+    cache = SharedResultCache(path, sets=1, ways=2, stripes=1, value_width=32)
+    cache.put(b"survivor", "1")
+    cache.put(key, "12345")
+    with cache._stripe(0) as record:
+        # Mark the stripe and tear the slot holding key, then die with the lock held
+        struct.pack_into("<q", cache._map, record, os.getpid())
+        for way in range(2):
+            slot = cache._slots + way * cache.slot_size
+            if SLOT_HEAD.unpack_from(cache._map, slot)[4] == cache._locate(key)[0]:
+                cache._map[slot + SLOT_HEAD.size] = ord("9")
+        os._exit(1)
+
+
+def test_processes_share_results(tmp_path):
+    path = tmp_path / "shared"
+    process = multiprocessing.get_context("fork").Process(target=fill_from_child, args=(path,))
+    process.start()
+    process.join()
+    cache = SharedResultCache(path)
+    assert cache.stats().inserts == 1
+    assert cache.get_or_compute("root", Decimal(7), Decimal(5), 30, None) == decimal_math._root(Decimal(7), Decimal(5), 30)
+    assert cache.stats().hits == 1
+    cache.close()
+
+
+def test_recovers_stripe_after_holder_dies(tmp_path, caplog):
+    path = tmp_path / "crash"
+    process = multiprocessing.get_context("fork").Process(target=die_holding_lock, args=(path, b"torn"))
+    process.start()
+    process.join()
+    assert process.exitcode == 1
+    cache = SharedResultCache(path)
+    # The kernel released the dead process's lock; the torn slot is dropped
+    assert cache.get(b"torn") is None
+    assert cache.get(b"survivor") == "1"
+    assert cache.stats().recoveries == 1
+    assert "dropped 1 slots" in caplog.text
+    assert cache.put(b"torn", "2") and cache.get(b"torn") == "2"
+    cache.close()
+
+
+def test_open_and_install_from_config(tmp_path, monkeypatch):
+    assert install_shared_cache(CalculatorConfig(base_dir=tmp_path)) is None
+    path = tmp_path / "config-cache"
+    monkeypatch.setenv("CALCULATOR_SHARED_CACHE", str(path))
+    config = CalculatorConfig(base_dir=tmp_path, auto_save=False)
+    assert config.shared_cache == path
+    previous = decimal_math.set_result_cache(None)
+    try:
+        calc = Calculator(config)
+        cache = decimal_math._result_cache
+        assert cache is open_shared_cache(path)
+        calc.calculate("root", 2, 3)
+        # Operation.execute and Calculation both compute the root; the second is a hit
+        assert (cache.stats().misses, cache.stats().hits) == (1, 1)
+        CalculatorManager(config).calculate("s", "root", 2, 3)
+        assert cache.stats().hits == 3
+    finally:
+        decimal_math.set_result_cache(previous)
+    assert default_cache_path().name == "calculator-result-cache"
+
+
+def test_default_path_without_dev_shm(monkeypatch):
+    monkeypatch.setattr("app.shared_cache.Path.is_dir", lambda self: False)
+    assert default_cache_path().parent == Path(tempfile.gettempdir())
@@ -0,0 +1,144 @@
+import datetime
+import pytest
+from decimal import Decimal
+from app.calculator import Calculator
+from app.calculator_config import CalculatorConfig
+from app.operations import OperationFactory
+from app.workload_replay import (
+    ReplayRecord, ReplayReport, load_records, main, parse_history_csv,
+    parse_log, replay
+)
+
+
+LOG_TEXT = (
+    "2024-05-01 10:00:00,000 - INFO - Logging initialized at: /tmp/calculator.log\n"
+    "2024-05-01 10:00:00,100 - INFO - Calculation performed: Addition (2, 3) = 5\n"
+    "2024-05-01 10:00:00,150 - INFO - Calculation performed: Multiplication (4, 2.5) = 10.0\n"
+    "2024-05-01 10:00:00,200 - INFO - History auto-saved\n"
+    "2024-05-01 10:00:00,250 - INFO - Calculation performed: Division (1, 4) = 0.25\n"
+)
+
+
+@pytest.fixture
+def calculator(tmp_path):
+    return Calculator(CalculatorConfig(base_dir=tmp_path, auto_save=False))
+
+
+def test_parse_log(tmp_path):
+    log_file = tmp_path / "calculator.log"
+    log_file.write_text(LOG_TEXT)
+    records = parse_log(log_file)
+    assert [r.operation for r in records] == ["Addition", "Multiplication", "Division"]
+    assert records[1].operand2 == "2.5"
+    assert records[1].result == "10.0"
+    assert records[0].timestamp == datetime.datetime(2024, 5, 1, 10, 0, 0, 100000)
+
+
+def test_parse_history_csv(calculator, tmp_path):
+    from app.operations import Subtraction
+    calculator.set_operation(Subtraction())
+    calculator.perform_operation("7", "2")
+    calculator.save_history()
+    records = parse_history_csv(calculator.config.history_file)
+    assert len(records) == 1
+    assert records[0].operation == "Subtraction"
+    assert records[0].result == "5"
+
+
+def test_load_records_detects_format(tmp_path):
+    log_file = tmp_path / "calculator.log"
+    log_file.write_text(LOG_TEXT)
+    assert len(load_records(log_file)) == 3
+    with pytest.raises(ValueError, match="Unknown replay source"):
+        load_records(log_file, source="xml")
+
+
+def test_replay_max_speed(tmp_path, calculator):
+    log_file = tmp_path / "calculator.log"
+    log_file.write_text(LOG_TEXT)
+    report = replay(parse_log(log_file), calculator)
+    assert report.total == 3
+    assert report.mismatches == 0
+    assert report.errors == 0
+    assert len(report.latencies) == 3
+    assert report.throughput > 0
+    assert calculator.history[-1].result == Decimal("0.25")
+
+
+def test_replay_detects_mismatch_and_errors(calculator):
+    records = [
+        ReplayRecord("Addition", "2", "3", "6"),
+        ReplayRecord("Division", "1", "0", "0"),
+        ReplayRecord("Teleport", "1", "1", "1"),
+    ]
+    report = replay(records, calculator)
+    assert report.total == 3
+    assert report.mismatches == 1
+    assert report.errors == 2
+
+
+def test_replay_resolves_lazy_and_parameterized_operations(calculator, monkeypatch, caplog):
+    for name in ("_operations", "_codes", "_instances", "_loaders"):
+        monkeypatch.setattr(OperationFactory, name, dict(getattr(OperationFactory, name)))
+    for name in ("_names", "_dispatch"):
+        monkeypatch.setattr(OperationFactory, name, list(getattr(OperationFactory, name)))
+
+    def broken():
+        raise ImportError("gone")
+
+    OperationFactory.register_lazy("broken", broken)
+    records = [
+        ReplayRecord("GreatestCommonDivisor", "12", "18", "6"),
+        ReplayRecord("ModularPower[97]", "3", "1000", str(pow(3, 1000, 97))),
+        ReplayRecord("Addition[3]", "1", "1", "2"),
+    ]
+    report = replay(records, calculator)
+    assert (report.total, report.mismatches, report.errors) == (3, 0, 1)
+    assert "Skipping operation broken for replay" in caplog.text
+
+
+def test_replay_recorded_timing(calculator):
+    start = datetime.datetime(2024, 5, 1, 10, 0, 0)
+    records = [
+        ReplayRecord("Addition", "1", "1", "2", start),
+        ReplayRecord("Addition", "2", "2", "4", start + datetime.timedelta(seconds=0.2)),
+    ]
+    report = replay(records, calculator, mode="recorded", speed=2.0)
+    assert report.elapsed >= 0.1
+    assert report.mismatches == 0
+
+
+def test_replay_invalid_arguments(calculator):
+    with pytest.raises(ValueError, match="Unknown replay mode"):
+        replay([], calculator, mode="warp")
+    with pytest.raises(ValueError, match="Replay speed must be positive"):
+        replay([], calculator, speed=0)
+
+
+def test_report_percentiles_and_summary():
+    report = ReplayReport(total=4, elapsed=2.0, latencies=[0.004, 0.001, 0.003, 0.002])
+    assert report.throughput == 2.0
+    assert report.percentile(50) == 0.002
+    assert report.percentile(99) == 0.004
+    assert "Throughput: 2.0 ops/s" in report.summary()
+    assert ReplayReport().percentile(50) == 0.0
+    assert ReplayReport().throughput == 0.0
+
+
+def test_main_reports_summary(tmp_path, capsys):
+    log_file = tmp_path / "calculator.log"
+    log_file.write_text(LOG_TEXT)
+    assert main([str(log_file)]) == 0
+    assert "Replayed: 3 calculations" in capsys.readouterr().out
+
+
+def test_replay_without_or_with_unparseable_result(calculator, tmp_path):
+    records = [
+        ReplayRecord("Addition", "2", "3"),
+        ReplayRecord("Addition", "2", "3", "five"),
+    ]
+    report = replay(records, calculator)
+    assert report.mismatches == 1
+
+    calculator.save_history()
+    assert len(load_records(calculator.config.history_file)) == 2